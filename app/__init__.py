@@ -1,3 +1,4 @@
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 
@@ -10,26 +11,158 @@ def create_app():
 
     db.init_app(app)
 
-    # Register blueprints
-    from app.routes.dashboard import bp as dashboard_bp
-    from app.routes.projects import bp as projects_bp
-    from app.routes.tasks import bp as tasks_bp
-    from app.routes.milestones import bp as milestones_bp
-    from app.routes.updates import bp as updates_bp
-    from app.routes.export import bp as export_bp
-
-    app.register_blueprint(dashboard_bp)
-    app.register_blueprint(projects_bp, url_prefix='/projects')
-    app.register_blueprint(tasks_bp, url_prefix='/tasks')
-    app.register_blueprint(milestones_bp, url_prefix='/milestones')
-    app.register_blueprint(updates_bp, url_prefix='/updates')
-    app.register_blueprint(export_bp, url_prefix='/export')
+    # Tune every SQLite connection (WAL, busy_timeout, ...) per config profile
+    from app import sqlite_profile
+    sqlite_profile.init_app(app)
+
+    # Fresh connection pools in each worker forked by a pre-forking server
+    from app import server
+    server.init_app(app)
+
+    # Count and time SQL per request (Server-Timing header, slow-query log)
+    from app import query_stats
+    query_stats.init_app(app)
+
+    # page_url() template global for keyset-paginated lists
+    from app import pagination
+    pagination.init_app(app)
+
+    # Keep denormalized project rollups in sync with every flush
+    from app.rollups import register_listeners
+    register_listeners()
+
+    # Keep project-attorney links in sync with the free-text name columns
+    from app.attorneys import register_listeners as register_attorney_listeners
+    register_attorney_listeners()
+
+    # FTS5 search index, created alongside the tables
+    from app.search import register_listeners as register_search_listeners
+    register_search_listeners()
+
+    # Change log triggers for incremental sync clients
+    from app.changes import register_listeners as register_change_listeners
+    register_change_listeners()
+
+    # Dashboard snapshot cache, cleared whenever a write commits
+    from app import cache
+    cache.init_app(app)
+
+    # Live dashboard updates pushed from the change log
+    from app import live
+    live.init_app(app)
+
+    # Background job pool for exports and other slow work
+    from app import jobs
+    jobs.init_app(app)
+
+    # Register blueprints, now or on the first request
+    from app.routes import register_blueprints, register_blueprints_lazily
+    if app.config['LAZY_BLUEPRINTS']:
+        register_blueprints_lazily(app)
+    else:
+        register_blueprints(app)
 
     # CLI command to initialize database
     @app.cli.command('init-db')
     def init_db():
         """Initialize the database."""
-        db.create_all()
+        from app.schema import upgrade_database
+        upgrade_database()
         print('Database initialized.')
 
+    # CLI command to add new indexes to an existing database
+    @app.cli.command('upgrade-indexes')
+    def upgrade_indexes():
+        """Create any missing indexes on an existing database."""
+        from app.schema import add_missing_columns, create_missing_indexes
+        add_missing_columns()
+        created = create_missing_indexes()
+        for index in created:
+            print(f'Created index {index}.')
+        print(f'{len(created)} index(es) created.')
+
+    # CLI command to rebuild or verify project rollups
+    @app.cli.command('rebuild-rollups')
+    @click.option('--check', is_flag=True, help='Only report drifted projects; do not rewrite.')
+    def rebuild_rollups_command(check):
+        """Recompute denormalized project rollups and report drift."""
+        from app.rollups import find_rollup_drift, rebuild_rollups
+        drifted = find_rollup_drift()
+        if drifted:
+            print(f'{len(drifted)} project(s) with drifted rollups: '
+                  + ', '.join(str(project_id) for project_id in drifted))
+        else:
+            print('No rollup drift found.')
+        if check:
+            if drifted:
+                raise SystemExit(1)
+            return
+        count = rebuild_rollups()
+        print(f'Rebuilt rollups for {count} project(s).')
+
+    # CLI command to refill the full-text search index
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Rebuild the FTS5 search index from the source tables."""
+        from app.search import rebuild_search_index
+        print(f'Indexed {rebuild_search_index()} record(s) for search.')
+
+    # CLI command to re-split the free-text attorney columns into links
+    @app.cli.command('migrate-attorneys')
+    def migrate_attorneys_command():
+        """Link every project to attorneys parsed from its name columns."""
+        from app.attorneys import migrate_attorneys
+        projects, attorneys = migrate_attorneys()
+        print(f'Linked {projects} project(s) to {attorneys} attorney(s).')
+
+    # CLI command to prune the change log
+    @app.cli.command('compact-changes')
+    @click.option('--days', type=int, default=None,
+                  help='Keep this many days of changes (default: CHANGE_LOG_RETENTION_DAYS).')
+    def compact_changes_command(days):
+        """Delete change log entries past the retention period."""
+        from app.changes import compact_changes
+        days = app.config['CHANGE_LOG_RETENTION_DAYS'] if days is None else days
+        print(f'Deleted {compact_changes(days)} change(s) older than {days} day(s).')
+
+    # CLI command to drop old background jobs and their files
+    @app.cli.command('prune-jobs')
+    @click.option('--days', type=int, default=None,
+                  help='Keep finished jobs this many days (default: JOB_RETENTION_DAYS).')
+    def prune_jobs_command(days):
+        """Delete finished background jobs and their output files."""
+        from app.jobs import prune_jobs
+        days = app.config['JOB_RETENTION_DAYS'] if days is None else days
+        print(f'Deleted {prune_jobs(days)} job(s) finished over {days} day(s) ago.')
+
+    # CLI command to bulk-import records from CSV or JSON Lines
+    from app.importer import IMPORT_KINDS
+
+    @app.cli.command('import')
+    @click.argument('kind', type=click.Choice(IMPORT_KINDS))
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'format', type=click.Choice(['csv', 'jsonl']), default=None,
+                  help='File format (default: from the file extension).')
+    def import_command(kind, path, format):
+        """Import projects, tasks or status updates; rows with errors are skipped."""
+        from app.importer import import_file
+        try:
+            result = import_file(kind, path, format)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc), param_hint='PATH')
+        for line, message in result.errors:
+            print(f'line {line}: {message}')
+        if result.error_count > len(result.errors):
+            print(f'... and {result.error_count - len(result.errors)} more.')
+        print(f'Imported {result.imported} {kind}; {result.error_count} row(s) rejected.')
+        if result.error_count:
+            raise SystemExit(1)
+
+    # CLI command to move archived projects' history out of the hot tables
+    @app.cli.command('archive-cold')
+    def archive_cold_command():
+        """Move the children of archived projects into cold storage."""
+        from app.cold_storage import archive_backlog
+        print(f'Moved {archive_backlog()} archived project(s) to cold storage.')
+
     return app
@@ -0,0 +1,156 @@
+"""Normalized attorney links for projects.
+
+Projects keep their free-text `assigner` and `assigned_attorneys` columns for
+display and editing. Every flush that creates a project or changes either
+column splits the names and rewrites that project's rows in
+project_attorneys, so per-attorney filters and views are indexed equality
+joins instead of LIKE scans over comma-joined strings.
+
+Writes that bypass the ORM (raw SQL, bulk UPDATEs of those columns) are not
+seen by the hook; `flask migrate-attorneys` re-links every project from its
+strings.
+"""
+import re
+from itertools import chain
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Attorney, Project, ProjectAttorney
+
+# Separators between names in assigned_attorneys: , ; & / and the word "and"
+_NAME_SEPARATORS = re.compile(r'\s*(?:[,;&/]|\band\b)\s*', re.IGNORECASE)
+
+_WATCHED_COLUMNS = ('assigner', 'assigned_attorneys')
+
+
+def split_names(value):
+    """Split a free-text list of names into distinct names, in order.
+
+    Whitespace is collapsed and duplicates are dropped case-insensitively,
+    keeping the first spelling seen.
+    """
+    names = {}
+    for part in _NAME_SEPARATORS.split(value or ''):
+        name = ' '.join(part.split())
+        if name:
+            names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def project_attorney_names(project):
+    """Return [(name, role), ...] that `project`'s strings call for."""
+    assigner = ' '.join((project.assigner or '').split())
+    pairs = [(name, 'attorney') for name in split_names(project.assigned_attorneys)]
+    if assigner:
+        pairs.append((assigner, 'assigner'))
+    return pairs
+
+
+class _AttorneyLookup:
+    """get-or-create Attorney rows by case-insensitive name within one flush."""
+
+    def __init__(self, session):
+        self.session = session
+        self._by_name = {}
+
+    def load(self, names):
+        missing = {name for name in names if name.lower() not in self._by_name}
+        if missing:
+            with self.session.no_autoflush:
+                for attorney in self.session.scalars(
+                        select(Attorney).where(Attorney.name.in_(missing))):
+                    self._by_name[attorney.name.lower()] = attorney
+
+    def get(self, name):
+        attorney = self._by_name.get(name.lower())
+        if attorney is None:
+            attorney = self._by_name[name.lower()] = Attorney(name=name)
+        return attorney
+
+
+def sync_project_attorneys(session, projects):
+    """Make each project's attorney_links match its assigner/assigned_attorneys.
+
+    Links that are still wanted are left in place, so an unchanged name never
+    costs a DELETE and re-INSERT of the same key.
+    """
+    wanted = {project: project_attorney_names(project) for project in projects}
+    lookup = _AttorneyLookup(session)
+    lookup.load(name for pairs in wanted.values() for name, _ in pairs)
+    with session.no_autoflush:
+        for project, pairs in wanted.items():
+            keys = {(name.lower(), role) for name, role in pairs}
+            current = set()
+            for link in list(project.attorney_links):
+                key = (link.attorney.name.lower(), link.role)
+                if key in keys and key not in current:
+                    current.add(key)
+                else:
+                    project.attorney_links.remove(link)
+            for name, role in pairs:
+                if (name.lower(), role) not in current:
+                    project.attorney_links.append(
+                        ProjectAttorney(attorney=lookup.get(name), role=role))
+
+
+def _projects_needing_sync(session):
+    projects = []
+    for obj in chain(session.new, session.dirty):
+        if not isinstance(obj, Project):
+            continue
+        state = inspect(obj)
+        if state.pending or any(state.attrs[name].history.has_changes() for name in _WATCHED_COLUMNS):
+            projects.append(obj)
+    return projects
+
+
+def _before_flush(session, flush_context, instances):
+    projects = _projects_needing_sync(session)
+    if projects:
+        sync_project_attorneys(session, projects)
+
+
+def linked_to(name, role):
+    """Condition on Project: the project is linked to attorney `name` in `role`."""
+    return Project.id.in_(
+        select(ProjectAttorney.project_id).join(Attorney)
+        .where(Attorney.name == name, ProjectAttorney.role == role)
+    )
+
+
+def active_attorney_names(role):
+    """Sorted names of attorneys linked in `role` to an active project."""
+    return db.session.scalars(
+        select(Attorney.name).distinct()
+        .join(ProjectAttorney).join(Project)
+        .where(Project.status == 'active', ProjectAttorney.role == role)
+        .order_by(Attorney.name)
+    ).all()
+
+
+def migrate_attorneys():
+    """Re-link every project from its strings. Returns (projects, attorneys)."""
+    projects = db.session.scalars(select(Project).options(
+        selectinload(Project.attorney_links).joinedload(ProjectAttorney.attorney)
+    )).all()
+    sync_project_attorneys(db.session, projects)
+    db.session.commit()
+    return len(projects), db.session.scalar(select(func.count(Attorney.id)))
+
+
+def attorneys_need_migration():
+    """True when projects exist but none are linked to an attorney yet.
+
+    This is the state of an existing database the first time the attorney
+    tables are created for it.
+    """
+    has_links = db.session.execute(select(ProjectAttorney.project_id).limit(1)).first()
+    return not has_links and db.session.execute(select(Project.id).limit(1)).first() is not None
+
+
+def register_listeners():
+    """Attach the link maintenance hook to the Flask-SQLAlchemy session."""
+    if not event.contains(db.session, 'before_flush', _before_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
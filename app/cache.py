@@ -0,0 +1,345 @@
+"""Cached dashboard snapshot, keyed by day and change log cursor.
+
+A snapshot is stored under the day and the change log cursor
+(latest_change_id()) read before it was built. Every write to the tables
+the dashboard shows moves the cursor, in the same transaction, so a
+snapshot is only served while nothing has changed since it was built. A
+request that built from data read before a concurrent commit stores its
+snapshot under the old cursor, which no later request asks for.
+
+Superseded snapshots are garbage. A commit that flushed or bulk-wrote one of
+those tables (app.changes.TRACKED_MODELS) clears the cache to drop them;
+other writes, such as job bookkeeping, leave it alone.
+
+Backends (DASHBOARD_CACHE_BACKEND):
+
+- 'memory': an in-process LRU per worker process. Each worker builds its
+  own snapshots, but a write in another worker moves the cursor for all.
+- 'sqlite': a separate SQLite file (DASHBOARD_CACHE_PATH) shared by all
+  worker processes, so a snapshot is built once for all of them.
+- 'none': caching disabled.
+
+Entries also expire after DASHBOARD_CACHE_TTL seconds, which bounds how
+long staleness ages (days since last activity) can lag within a day.
+
+Rendering the snapshot is cached too, one project card at a time: the
+cached_fragment() template global keeps each card's markup in a per-process
+FragmentCache keyed by the card's version stamp (see
+ProjectCard.fragment_key), so after a write only the changed cards are
+rendered again. Versioned keys need no invalidation; superseded entries are
+evicted least recently used first, beyond FRAGMENT_CACHE_SIZE entries or
+FRAGMENT_CACHE_MAX_CHARS characters of markup.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+from app import db
+from app.changes import TRACKED_MODELS, latest_change_id
+from app.dashboard_engine import build_dashboard
+
+CACHE_BACKENDS = ('memory', 'sqlite', 'none')
+
+_EXTENSION_KEY = 'dashboard_cache'
+_FRAGMENT_EXTENSION_KEY = 'fragment_cache'
+
+
+class LRUCache:
+    """Thread-safe in-process LRU mapping with per-entry expiry."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """Pickled entries in a SQLite file shared by every worker process.
+
+    A short-lived connection is opened per call, so instances are safe to
+    use from any thread and survive forking.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl)
+            )
+
+    def clear(self):
+        with closing(self._connect()) as connection, connection:
+            connection.execute('DELETE FROM cache_entries')
+
+    def __len__(self):
+        with closing(self._connect()) as connection:
+            return connection.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+
+
+class NullCache:
+    """Backend that never stores anything."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Hit/miss/invalidation counters for this process."""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SnapshotCache:
+    """A backend plus counters; values are built on a miss."""
+
+    def __init__(self, backend, ttl, name):
+        self.backend = backend
+        self.ttl = ttl
+        self.name = name
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        if value is None:
+            value = build()
+            self.backend.set(key, value, self.ttl)
+        return value
+
+    def invalidate(self):
+        self.backend.clear()
+        with self._lock:
+            self.stats.invalidations += 1
+
+    def as_dict(self):
+        return {
+            'backend': self.name,
+            'entries': len(self.backend),
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'invalidations': self.stats.invalidations,
+            'hit_ratio': round(self.stats.hit_ratio, 4),
+        }
+
+
+class FragmentCache:
+    """Rendered markup keyed by content version, kept in this process.
+
+    Least recently used entries are evicted once there are more than
+    `max_entries` of them or more than `max_chars` characters in total;
+    max_entries=0 disables caching.
+    """
+
+    def __init__(self, max_entries, max_chars):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.stats = CacheStats()
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            markup = self._entries.get(key)
+            if markup is not None:
+                self.stats.hits += 1
+                self._entries.move_to_end(key)
+                return markup
+            self.stats.misses += 1
+        markup = render()
+        if self.max_entries and len(markup) <= self.max_chars:
+            self._store(key, markup)
+        return markup
+
+    def _store(self, key, markup):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = markup
+            self._chars += len(markup)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+                self.evictions += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'chars': self._chars,
+                'hits': self.stats.hits,
+                'misses': self.stats.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.stats.hit_ratio, 4),
+            }
+
+
+def create_backend(name, config):
+    """Build the backend called `name` from app config values."""
+    if name == 'memory':
+        return LRUCache(config['DASHBOARD_CACHE_SIZE'])
+    if name == 'sqlite':
+        return SQLiteCache(config['DASHBOARD_CACHE_PATH'])
+    if name == 'none':
+        return NullCache()
+    raise ValueError(
+        f'Unknown DASHBOARD_CACHE_BACKEND {name!r}; expected one of {", ".join(CACHE_BACKENDS)}'
+    )
+
+
+def get_cache():
+    """Return the current app's SnapshotCache."""
+    return current_app.extensions[_EXTENSION_KEY]
+
+
+def dashboard_snapshot(today):
+    """build_dashboard(today) served from the cache when nothing has changed."""
+    # Read the cursor first: everything the build reads is at least this new
+    change_id = latest_change_id()
+    return get_cache().get_or_build(f'dashboard:{today.isoformat()}:{change_id}',
+                                    lambda: build_dashboard(today, change_id))
+
+
+def get_fragment_cache():
+    """Return the current app's FragmentCache."""
+    return current_app.extensions[_FRAGMENT_EXTENSION_KEY]
+
+
+def cached_fragment(macro, key, *args):
+    """macro(*args), or its earlier output for the same `key` (template global)."""
+    return get_fragment_cache().get_or_render((macro.name, *key), lambda: macro(*args))
+
+
+def invalidate():
+    """Drop every cached snapshot (no-op outside an app with a cache)."""
+    if has_app_context() and _EXTENSION_KEY in current_app.extensions:
+        get_cache().invalidate()
+
+
+_DASHBOARD_MODELS = tuple(TRACKED_MODELS.values())
+
+
+def _after_flush(session, flush_context):
+    # new/dirty/deleted still hold what this flush wrote
+    if any(isinstance(obj, _DASHBOARD_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['dashboard_stale'] = True
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if orm_execute_state.statement.table.name in TRACKED_MODELS:
+            orm_execute_state.session.info['dashboard_stale'] = True
+
+
+def _after_commit(session):
+    if session.info.pop('dashboard_stale', False):
+        invalidate()
+
+
+def _after_rollback(session):
+    session.info.pop('dashboard_stale', None)
+
+
+def register_listeners():
+    """Attach the invalidation hooks to the Flask-SQLAlchemy session."""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'do_orm_execute', _do_orm_execute)
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
+
+
+def init_app(app):
+    """Create the configured caches and register the invalidation hooks."""
+    app.config.setdefault('DASHBOARD_CACHE_BACKEND', 'memory')
+    app.config.setdefault('DASHBOARD_CACHE_TTL', 300)
+    app.config.setdefault('DASHBOARD_CACHE_SIZE', 32)
+    name = app.config['DASHBOARD_CACHE_BACKEND']
+    backend = create_backend(name, app.config)
+    app.extensions[_EXTENSION_KEY] = SnapshotCache(backend, app.config['DASHBOARD_CACHE_TTL'], name)
+    register_listeners()
+
+    app.config.setdefault('FRAGMENT_CACHE_SIZE', 5000)
+    app.config.setdefault('FRAGMENT_CACHE_MAX_CHARS', 32 * 1024 * 1024)
+    app.extensions[_FRAGMENT_EXTENSION_KEY] = FragmentCache(
+        app.config['FRAGMENT_CACHE_SIZE'], app.config['FRAGMENT_CACHE_MAX_CHARS']
+    )
+    app.add_template_global(cached_fragment)
@@ -0,0 +1,191 @@
+"""Append-only change log for incremental sync clients.
+
+SQLite triggers on projects, tasks, milestones and status_updates append a
+row to change_log for every insert, update and delete, so bulk UPDATEs and
+raw SQL are captured along with ORM writes. Project updates that only touch
+the rollup columns (recomputed whenever a child changes) are not logged;
+the child's own entry already covers them. A child moved to another project
+is logged under both, so each entry's project_id names every project whose
+contents changed.
+
+Archiving moves a project's children to cold tables (app.cold_storage). The
+hot rows go, but the history does not, so those deletes are not logged: a
+client keeps archived history, and gets the rows again as inserts (to
+upsert) if the project is unarchived.
+
+Clients read the log with a "since" cursor, the id of the last entry they
+applied (see read_changes()). Entries carry the row's current state, so a
+client can upsert or delete each one in order.
+
+`flask compact-changes` drops entries older than CHANGE_LOG_RETENTION_DAYS.
+It always keeps the newest entry, so the log is only empty if nothing was
+ever written and a gap before the oldest entry always means pruning. A
+client whose cursor falls in that gap gets a ChangesPruned error and must
+re-export.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, func, select, text
+
+from app import db
+from app.models import COLD_MODELS, ChangeLog, Milestone, Project, StatusUpdate, Task
+
+CHANGE_TABLE = ChangeLog.__tablename__
+
+TRACKED_MODELS = {
+    model.__tablename__: model for model in (Project, Task, Milestone, StatusUpdate)
+}
+
+# Hot table -> the cold table its rows move to when their project is archived
+_COLD_TABLES = {hot.__table__.name: cold.__table__.name for hot, cold in COLD_MODELS.items()}
+
+# Rollups (and the updated_at they pin) are maintained by app.rollups
+_UNLOGGED_PROJECT_COLUMNS = {'updated_at'}
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+# SQLAlchemy's SQLite DateTime format, with microseconds
+_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+class ChangesPruned(Exception):
+    """The cursor points before the oldest retained change."""
+
+
+def _logged_update_columns(model):
+    if model is not Project:
+        return None
+    return [
+        column.name for column in Project.__table__.columns
+        if not column.name.startswith('rollup_') and column.name not in _UNLOGGED_PROJECT_COLUMNS
+    ]
+
+
+def _log_insert(table, row, operation, project_id, where=''):
+    where = f' WHERE {where}' if where else ''
+    return (f'INSERT INTO {CHANGE_TABLE} (table_name, record_id, project_id, operation, changed_at) '
+            f"SELECT '{table}', {row}.id, {project_id.format(r=row)}, '{operation}', {_NOW}{where};")
+
+
+def change_log_ddl():
+    """DROP and CREATE TRIGGER statements that feed change_log.
+
+    Dropping first replaces the triggers of databases created by an older
+    version.
+    """
+    statements = []
+    for table, model in TRACKED_MODELS.items():
+        project_id = '{r}.id' if model is Project else '{r}.project_id'
+        columns = _logged_update_columns(model)
+        update_of = f'UPDATE OF {", ".join(columns)}' if columns else 'UPDATE'
+        on_update = _log_insert(table, 'new', 'update', project_id)
+        if model is not Project:
+            # The project the row left changed too
+            on_update = (_log_insert(table, 'new', 'update', 'old.project_id',
+                                     'old.project_id IS NOT new.project_id') + ' ' + on_update)
+        moved = ''
+        if table in _COLD_TABLES:
+            # Moved to cold storage, not deleted: the row is already there
+            moved = (f'NOT EXISTS (SELECT 1 FROM {_COLD_TABLES[table]} '
+                     f'WHERE id = old.id AND project_id = old.project_id)')
+        prefix = f'{CHANGE_TABLE}_{table}'
+        for name in ('ai', 'au', 'ad'):
+            statements.append(f'DROP TRIGGER IF EXISTS {prefix}_{name}')
+        statements += [
+            f'CREATE TRIGGER {prefix}_ai AFTER INSERT ON {table} '
+            f'BEGIN {_log_insert(table, "new", "insert", project_id)} END',
+            f'CREATE TRIGGER {prefix}_au AFTER {update_of} ON {table} BEGIN {on_update} END',
+            f'CREATE TRIGGER {prefix}_ad AFTER DELETE ON {table} '
+            f'BEGIN {_log_insert(table, "old", "delete", project_id, moved)} END',
+        ]
+    return statements
+
+
+def _create_change_triggers(target, connection, **kw):
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in change_log_ddl():
+        connection.exec_driver_sql(statement)
+
+
+def register_listeners():
+    """Create the change log triggers alongside db.create_all()."""
+    if not event.contains(db.metadata, 'after_create', _create_change_triggers):
+        event.listen(db.metadata, 'after_create', _create_change_triggers)
+
+
+def latest_change_id():
+    """The id of the newest change ever logged (0 if none): a cursor for "now".
+
+    Read from sqlite_sequence so it is right even if the log has been emptied.
+    """
+    return db.session.execute(text(
+        f"SELECT seq FROM sqlite_sequence WHERE name = '{CHANGE_TABLE}'"
+    )).scalar() or 0
+
+
+@dataclass(slots=True)
+class ChangeBatch:
+    """One bounded read of the log; `cursor` is the since= for the next read."""
+    changes: list
+    cursor: int
+    has_more: bool
+
+
+def read_changes(since, limit=DEFAULT_LIMIT, serializers=None):
+    """Return the ChangeBatch of entries after `since`, oldest first.
+
+    `serializers` maps table name to a function turning a row into a dict;
+    each entry then carries its row's current state as `data` (None once
+    the row is gone). Rows are loaded with one query per table.
+    Raises ChangesPruned when entries after `since` have been compacted away.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    oldest = db.session.scalar(select(func.min(ChangeLog.id)))
+    if oldest is not None and since < oldest - 1:
+        raise ChangesPruned(f'Changes after {since} have been pruned; '
+                            f'the oldest retained change is {oldest}.')
+
+    entries = db.session.scalars(
+        select(ChangeLog).where(ChangeLog.id > since).order_by(ChangeLog.id).limit(limit + 1)
+    ).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    rows = {}
+    if serializers:
+        ids_by_table = {}
+        for entry in entries:
+            ids_by_table.setdefault(entry.table_name, set()).add(entry.record_id)
+        for table, ids in ids_by_table.items():
+            model = TRACKED_MODELS[table]
+            for row in db.session.scalars(select(model).where(model.id.in_(ids))):
+                rows[table, row.id] = serializers[table](row)
+
+    changes = [
+        {
+            'id': entry.id,
+            'table': entry.table_name,
+            'record_id': entry.record_id,
+            'project_id': entry.project_id,
+            'operation': entry.operation,
+            'changed_at': entry.changed_at.isoformat(),
+            'data': rows.get((entry.table_name, entry.record_id)),
+        }
+        for entry in entries
+    ]
+    cursor = entries[-1].id if entries else since
+    return ChangeBatch(changes=changes, cursor=cursor, has_more=has_more)
+
+
+def compact_changes(retention_days):
+    """Delete entries older than `retention_days`, keeping the newest. Returns the count."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    newest = select(func.max(ChangeLog.id)).scalar_subquery()
+    result = db.session.execute(
+        delete(ChangeLog).where(ChangeLog.changed_at < cutoff, ChangeLog.id < newest)
+    )
+    db.session.commit()
+    return result.rowcount
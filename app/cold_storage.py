@@ -0,0 +1,113 @@
+"""Cold storage for archived projects' history.
+
+Archiving a project moves its tasks, milestones and status updates out of
+the hot tables into cold_tasks, cold_milestones and cold_status_updates
+(same columns, one project_id index each), so the hot tables and their
+composite indexes only hold the live workload. Unarchiving moves them back.
+Project.archived_at is set while a project's rows are cold, and the Project
+accessors (get_pending_tasks() and friends) read from whichever side holds
+them.
+
+Rows keep their ids. The hot tables use AUTOINCREMENT so ids are never
+reused, but databases created before that can reuse the id of a row that
+was moved out; such a row gets a fresh id when it moves back.
+
+Rollups are not recomputed while a project is cold; they keep describing
+its history as it was when archived. The moves are plain SQL, inserting on
+one side before deleting on the other, so the search index and change log
+triggers can tell a move from a delete: cold history stays searchable
+(app.search), and sync clients see no deletes for it (app.changes).
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+
+from app import db
+from app.models import COLD_MODELS, Project
+from app.rollups import recompute_rollups
+
+
+def _move(source, target, project_ids):
+    """Move the rows of `project_ids` (a list or subquery) from table `source` to `target`."""
+    rows = source.c.project_id.in_(project_ids)
+    taken = db.session.scalars(
+        select(target.c.id).where(target.c.id.in_(select(source.c.id).where(rows)))
+    ).all()
+    names = [column.name for column in source.columns]
+
+    moved = db.session.execute(insert(target).from_select(
+        names, select(*(source.c[name] for name in names)).where(rows, source.c.id.not_in(taken))
+    )).rowcount
+    if taken:
+        renumbered = [name for name in names if name != 'id']
+        moved += db.session.execute(insert(target).from_select(
+            renumbered, select(*(source.c[name] for name in renumbered)).where(rows, source.c.id.in_(taken))
+        )).rowcount
+    db.session.execute(delete(source).where(rows))
+    return moved
+
+
+def move_to_cold(project):
+    """Archive `project`'s children to the cold tables. Returns the rows moved.
+
+    The caller commits.
+    """
+    moved = sum(_move(hot.__table__, cold.__table__, [project.id]) for hot, cold in COLD_MODELS.items())
+    project.archived_at = datetime.utcnow()
+    return moved
+
+
+def restore_from_cold(project):
+    """Move `project`'s children back to the hot tables and refresh its rollups.
+
+    Returns the rows moved. The caller commits.
+    """
+    project.archived_at = None
+    db.session.flush()
+    moved = sum(_move(cold.__table__, hot.__table__, [project.id]) for hot, cold in COLD_MODELS.items())
+    recompute_rollups(db.session.connection(), [project.id])
+    db.session.expire(project)
+    return moved
+
+
+def archive_job(job, project_id):
+    """Background job: move an archived project's children to cold storage.
+
+    Does nothing if the project was unarchived (or moved) in the meantime.
+    """
+    project = db.session.get(Project, project_id)
+    if project is None or project.status != 'archived' or project.in_cold_storage:
+        return {'moved': 0}
+    moved = move_to_cold(project)
+    db.session.commit()
+    return {'moved': moved}
+
+
+def _backlog():
+    return select(Project.id).where(Project.status == 'archived', Project.archived_at.is_(None))
+
+
+def cold_storage_backlog():
+    """Number of archived projects whose children are still in the hot tables."""
+    return db.session.scalar(select(func.count()).select_from(_backlog().subquery()))
+
+
+def archive_backlog():
+    """Move every archived project's children to cold storage. Returns the projects moved.
+
+    For databases with projects archived before cold storage existed; their
+    archive date is taken to be their last edit.
+    """
+    project_ids = db.session.scalars(_backlog()).all()
+    if not project_ids:
+        return 0
+    backlog = _backlog().scalar_subquery()
+    for hot, cold in COLD_MODELS.items():
+        _move(hot.__table__, cold.__table__, backlog)
+    db.session.execute(
+        Project.__table__.update().where(Project.id.in_(project_ids))
+        .values(archived_at=func.coalesce(Project.updated_at, func.current_timestamp()),
+                updated_at=Project.updated_at)
+    )
+    db.session.commit()
+    return len(project_ids)
@@ -0,0 +1,249 @@
+"""Dashboard data engine.
+
+Builds every dashboard card from a fixed number of queries, regardless of how
+many active projects exist:
+
+1. Active projects joined to their latest status update (window function)
+2. Pending tasks for all active projects
+3. Pending milestones for all active projects
+4. The change log position the cards were loaded at
+
+Bucketing and ordering use the projects' rollup columns (see app.rollups), so
+projects too far out to be shown are filtered in SQL and never loaded.
+
+The template receives plain view objects, so rendering never touches the
+database. Each card carries a version stamp, the project's newest change log
+entry, so its rendered markup can be reused until something on it changes,
+and the Dashboard records the change log position it was built at, from
+which live updates (app.live) carry on.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app import db
+from app.changes import latest_change_id
+from app.models import (
+    PRIORITY_ORDER, ChangeLog, Milestone, Project, StatusUpdate, Task, build_status_preview,
+    classify_staleness, priority_rank,
+)
+
+
+@dataclass(slots=True)
+class TaskView:
+    """A pending task as shown inline on a project card."""
+    id: int
+    project_id: int
+    target_type: str
+    target_name: str
+    due_date: date
+    description: str
+    priority: str
+
+
+@dataclass(slots=True)
+class MilestoneView:
+    """A pending milestone as shown inline on a project card."""
+    id: int
+    project_id: int
+    name: str
+    date: date
+
+
+@dataclass(slots=True)
+class ProjectCard:
+    """Everything the dashboard's project_card macro needs for one project."""
+    id: int
+    client_name: str
+    project_name: str
+    priority: str
+    days_since_update: int
+    # Newest change log entry for the project or any of its children
+    version: int = None
+    # Orders cards within a dashboard list as build_dashboard() does
+    sort_key: str = ''
+    status_preview: dict = None
+    tasks: list = field(default_factory=list)
+    milestones: list = field(default_factory=list)
+
+    @property
+    def staleness_level(self):
+        """Return 'critical', 'warning', or 'ok' based on days_since_update."""
+        return classify_staleness(self.days_since_update)
+
+    @property
+    def next_task(self):
+        """Return the pending task with the earliest due date, or None."""
+        return self.tasks[0] if self.tasks else None
+
+    def fragment_key(self, today):
+        """Key under which this card's rendered markup can be reused.
+
+        The change log version moves with every insert, update and delete of
+        the project or its children, including a child moving to another
+        project; `today` covers overdue styling and days_since_update the
+        staleness badge.
+        """
+        return (self.id, self.version, self.days_since_update, today)
+
+
+@dataclass(slots=True)
+class Dashboard:
+    """Project cards grouped into the dashboard's urgency buckets."""
+    due_today: list = field(default_factory=list)
+    due_tomorrow: list = field(default_factory=list)
+    due_this_week: list = field(default_factory=list)
+    due_later: list = field(default_factory=list)
+    no_tasks: list = field(default_factory=list)
+    # Newest change log entry when the cards were loaded
+    change_id: int = 0
+
+
+def _sort_key(row):
+    """Fixed-width string sorting like build_dashboard()'s ORDER BY (NULLs first)."""
+    due = row.rollup_next_task_due.isoformat() if row.rollup_next_task_due else '0000-00-00'
+    rank = PRIORITY_ORDER.get(row.rollup_next_task_priority, 1)
+    activity = row.rollup_last_activity_at
+    activity = activity.strftime('%Y-%m-%dT%H:%M:%S.%f') if activity else '0' * 26
+    return f'{due} {rank} {activity} {row.id:010d}'
+
+
+def _latest_updates_subquery():
+    """Latest status update per project, picked with ROW_NUMBER()."""
+    ranked = select(
+        StatusUpdate.project_id,
+        StatusUpdate.notes,
+        StatusUpdate.created_at,
+        func.row_number().over(
+            partition_by=StatusUpdate.project_id,
+            order_by=(StatusUpdate.created_at.desc(), StatusUpdate.id.desc())
+        ).label('rn')
+    ).subquery()
+    return select(ranked.c.project_id, ranked.c.notes, ranked.c.created_at)\
+        .where(ranked.c.rn == 1).subquery()
+
+
+def load_project_cards(project_filter=None, order_by=(), today=None):
+    """Load ProjectCard objects for active projects keyed by project id.
+
+    project_filter is an optional SQL expression on Project used to narrow
+    the set further. Cards are returned in `order_by` order.
+    days_since_update counts calendar days up to `today` (default: today),
+    so a card only changes with its data or the date.
+    """
+    today = today or date.today()
+    conditions = [Project.status == 'active']
+    if project_filter is not None:
+        conditions.append(project_filter)
+
+    latest = _latest_updates_subquery()
+    version = select(func.max(ChangeLog.id)).where(ChangeLog.project_id == Project.id)\
+        .scalar_subquery()
+    rows = db.session.execute(
+        select(
+            Project.id, Project.client_name, Project.project_name,
+            Project.priority, Project.rollup_last_activity_at, Project.created_at,
+            Project.rollup_next_task_due, Project.rollup_next_task_priority,
+            latest.c.notes, version.label('version'),
+        )
+        .outerjoin(latest, latest.c.project_id == Project.id)
+        .where(*conditions)
+        .order_by(*order_by)
+    ).all()
+
+    cards = {}
+    for row in rows:
+        reference_date = row.rollup_last_activity_at or row.created_at
+        cards[row.id] = ProjectCard(
+            id=row.id,
+            client_name=row.client_name,
+            project_name=row.project_name,
+            priority=row.priority,
+            days_since_update=(today - reference_date.date()).days,
+            version=row.version,
+            sort_key=_sort_key(row),
+            status_preview=build_status_preview(row.notes),
+        )
+
+    task_rows = db.session.execute(
+        select(
+            Task.id, Task.project_id, Task.target_type, Task.target_name,
+            Task.due_date, Task.description, Task.priority
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(Task.completed.is_(False), *conditions)
+        .order_by(Task.project_id, Task.due_date, Task.id)
+    ).all()
+    for row in task_rows:
+        cards[row.project_id].tasks.append(TaskView(*row))
+
+    milestone_rows = db.session.execute(
+        select(Milestone.id, Milestone.project_id, Milestone.name, Milestone.date)
+        .join(Project, Project.id == Milestone.project_id)
+        .where(Milestone.completed.is_(False), *conditions)
+        .order_by(Milestone.project_id, Milestone.date, Milestone.id)
+    ).all()
+    for row in milestone_rows:
+        cards[row.project_id].milestones.append(MilestoneView(*row))
+
+    return cards
+
+
+def bucket_for(card, today):
+    """Name of the Dashboard list `card` belongs in on `today`.
+
+    None if its next task is more than 14 days out, so it is not shown.
+    """
+    next_task = card.next_task
+    if next_task is None:
+        return 'no_tasks'
+    days = (next_task.due_date - today).days
+    if days <= 0:
+        return 'due_today'
+    if days == 1:
+        return 'due_tomorrow'
+    if days <= 7:
+        return 'due_this_week'
+    if days <= 14:
+        return 'due_later'
+    return None
+
+
+def build_dashboard(today=None, change_id=None):
+    """Categorize active projects by their next task due date.
+
+    Projects whose next task is more than 14 days out are not shown.
+    `change_id` is a change log cursor read before calling, which the data
+    is then at least as new as; by default it is read here.
+    """
+    today = today or date.today()
+    day_14 = today + timedelta(days=14)
+    if change_id is None:
+        change_id = latest_change_id()
+
+    # Next task due date, then its priority; projects without tasks have a
+    # NULL due date and fall back to most stale first.
+    cards = load_project_cards(
+        project_filter=db.or_(Project.rollup_next_task_due.is_(None),
+                              Project.rollup_next_task_due <= day_14),
+        order_by=(
+            Project.rollup_next_task_due,
+            priority_rank(Project.rollup_next_task_priority),
+            Project.rollup_last_activity_at,
+            Project.id,
+        ),
+        today=today,
+    )
+
+    dashboard = Dashboard(change_id=change_id)
+    for card in cards.values():
+        bucket = bucket_for(card, today)
+        if bucket is None:
+            # The SQL filter already leaves these out, unless the rollups drifted
+            current_app.logger.warning('Project %s fits no dashboard list; its rollups may be stale', card.id)
+            continue
+        getattr(dashboard, bucket).append(card)
+
+    return dashboard
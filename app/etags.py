@@ -0,0 +1,51 @@
+"""Strong ETags and conditional GET for JSON endpoints.
+
+An endpoint's ETag is a hash of the request path and query string plus the
+change log cursor, latest_change_id(). The change log triggers fire on every
+insert, update and delete of the tables the API serves (bulk SQL included),
+so any write that could change a body moves the cursor. Reading it is a
+single-row lookup in sqlite_sequence, whatever the size of the tables, so a
+client holding the current ETag gets its 304 without the body being built.
+
+The cursor is shared by all tables: a write anywhere changes every
+endpoint's ETag, at the cost of some 304s that a per-table watermark would
+have kept.
+"""
+import hashlib
+from functools import wraps
+
+from flask import Response, jsonify, request
+
+from app.changes import latest_change_id
+
+
+def compute_etag(*parts):
+    """Hash `parts` into an opaque ETag value."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def conditional_json(extra=None):
+    """Serve the view's JSON with a strong ETag; 304 when the client has it.
+
+    The view returns a JSON-able value and only runs when the client's
+    If-None-Match does not match. `extra` is an optional callable whose
+    result is mixed into the ETag, for bodies that also depend on something
+    other than the tables (e.g. today's date).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            parts = (request.full_path, latest_change_id())
+            if extra is not None:
+                parts += (extra(),)
+            etag = compute_etag(*parts)
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = jsonify(view(*args, **kwargs))
+            response.set_etag(etag)
+            # Let caches keep the body but make them revalidate every time
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,288 @@
+"""Bulk import of projects, tasks and status updates from CSV or JSON Lines.
+
+Files are read one row at a time and validated with the same rules as the
+entry forms (app.validators). Valid rows are inserted CHUNK_SIZE at a time,
+one executemany INSERT and one transaction per chunk; invalid rows are
+reported by line number and skipped, so one bad row never aborts the batch.
+Files are UTF-8; a row holding bytes that are not is reported the same way.
+
+An import job records its progress (the result so far and the last line
+imported) on its Job row in each chunk's transaction. If its process dies
+and app.jobs runs the job again, it carries on after that line instead of
+importing the committed chunks twice.
+
+Columns are the form field names. Task and status update rows name their
+project by `project_id` or `matter_number`, which must match exactly one
+active project; project rows may carry an `initial_update`, as on the new
+project form.
+
+The inserts bypass the ORM flush, so the importer does what the flush hooks
+would: it links new projects to their attorneys and recomputes the rollups
+of every project it touched. Change log and search index triggers fire as
+for any insert.
+
+`flask import KIND FILE` runs an import in the foreground; /import/ uploads a
+file and runs it as a background job.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from uuid import uuid4
+
+from flask import current_app
+from sqlalchemy import insert, or_, select
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.attorneys import sync_project_attorneys
+from app.models import Project, StatusUpdate, Task
+from app.rollups import recompute_rollups
+from app.validators import validate_project, validate_task, validate_update
+
+IMPORT_KINDS = ('projects', 'tasks', 'updates')
+
+# File extension -> format
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# Rows validated and inserted per transaction
+CHUNK_SIZE = 2000
+# Rejected rows listed in a result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+# The error for a row holding bytes that are not UTF-8
+_UNDECODABLE = 'Not valid UTF-8 text.'
+
+
+@dataclass(slots=True)
+class ImportResult:
+    """Outcome of one import: rows inserted, and the rows rejected and why."""
+    kind: str
+    imported: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)  # [(line, message), ...], the first MAX_REPORTED_ERRORS
+
+    @classmethod
+    def from_dict(cls, data):
+        """The ImportResult that as_dict() returned `data` for."""
+        return cls(data['kind'], data['imported'], data['error_count'],
+                   [tuple(error) for error in data['errors']])
+
+    def reject(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, ' '.join(messages)))
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'imported': self.imported,
+            'error_count': self.error_count,
+            'errors': [list(error) for error in self.errors],
+        }
+
+
+def detect_format(filename):
+    """The import format for `filename` from its extension; ValueError if unknown."""
+    suffix = Path(filename).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f'Unsupported file type {suffix or filename!r}; expected .csv or .jsonl')
+    return FORMATS[suffix]
+
+
+def _decodable(*texts):
+    """False if any of `texts` holds undecodable bytes (surrogateescape, see import_file)."""
+    try:
+        for text in texts:
+            text.encode('utf-8')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def read_rows(stream, format):
+    """Yield (line, row, error) for each record of a text stream.
+
+    row is a dict of field values, or None when the record cannot be parsed
+    (error says why).
+    """
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            texts = [text for item in row.items() for text in item if isinstance(text, str)]
+            if _decodable(*texts):
+                yield reader.line_num, row, None
+            else:
+                yield reader.line_num, None, _UNDECODABLE
+        return
+    for line, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        if not _decodable(text):
+            yield line, None, _UNDECODABLE
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError:
+            yield line, None, 'Invalid JSON.'
+            continue
+        if isinstance(row, dict):
+            yield line, row, None
+        else:
+            yield line, None, 'Expected a JSON object.'
+
+
+def _project_resolver(rows):
+    """Map each chunk row to (project id, error) with one query for the chunk."""
+    ids, matter_numbers = set(), set()
+    for _, row, _ in rows:
+        if row is None:
+            continue
+        project_id = str(row.get('project_id') or '').strip()
+        if project_id.isdigit():
+            ids.add(int(project_id))
+        elif row.get('matter_number'):
+            matter_numbers.add(str(row['matter_number']).strip())
+
+    by_id, by_matter = set(), {}
+    if ids or matter_numbers:
+        for id, matter_number in db.session.execute(
+            select(Project.id, Project.matter_number).where(
+                Project.status == 'active',
+                or_(Project.id.in_(ids), Project.matter_number.in_(matter_numbers)),
+            )
+        ):
+            by_id.add(id)
+            by_matter.setdefault(matter_number, []).append(id)
+
+    def resolve(row):
+        project_id = str(row.get('project_id') or '').strip()
+        matter_number = str(row.get('matter_number') or '').strip()
+        if project_id:
+            if project_id.isdigit() and int(project_id) in by_id:
+                return int(project_id), None
+            return None, 'Project not found or not active.'
+        if not matter_number:
+            return None, 'A project_id or matter_number is required.'
+        matches = by_matter.get(matter_number, [])
+        if len(matches) > 1:
+            return None, f'Matter number {matter_number} matches more than one active project.'
+        if not matches:
+            return None, 'Project not found or not active.'
+        return matches[0], None
+
+    return resolve
+
+
+def _import_projects(rows, result):
+    valid, initial_updates = [], []
+    now = datetime.utcnow()
+    for line, row, error in rows:
+        if error:
+            result.reject(line, [error])
+            continue
+        values, errors = validate_project(row)
+        if errors:
+            result.reject(line, errors)
+            continue
+        valid.append({**values, 'created_at': now, 'updated_at': now})
+        initial_updates.append(str(row.get('initial_update') or '').strip())
+    if not valid:
+        return
+
+    project_ids = db.session.scalars(
+        insert(Project).returning(Project.id, sort_by_parameter_order=True), valid
+    ).all()
+    projects = db.session.scalars(
+        select(Project).where(Project.id.in_(project_ids)).options(selectinload(Project.attorney_links))
+    ).all()
+    sync_project_attorneys(db.session, projects)
+    updates = [{'project_id': project_id, 'notes': notes}
+               for project_id, notes in zip(project_ids, initial_updates) if notes]
+    if updates:
+        db.session.execute(insert(StatusUpdate), updates)
+    db.session.flush()
+    recompute_rollups(db.session.connection(), project_ids)
+    result.imported += len(valid)
+
+
+def _child_importer(model, validate):
+    def import_chunk(rows, result):
+        resolve = _project_resolver(rows)
+        valid = []
+        for line, row, error in rows:
+            if error:
+                result.reject(line, [error])
+                continue
+            values, errors = validate(row)
+            project_id, project_error = resolve(row)
+            if project_error:
+                errors.insert(0, project_error)
+            if errors:
+                result.reject(line, errors)
+                continue
+            valid.append({**values, 'project_id': project_id})
+        if not valid:
+            return
+        db.session.execute(insert(model), valid)
+        recompute_rollups(db.session.connection(), {values['project_id'] for values in valid})
+        result.imported += len(valid)
+    return import_chunk
+
+
+_CHUNK_IMPORTERS = {
+    'projects': _import_projects,
+    'tasks': _child_importer(Task, validate_task),
+    'updates': _child_importer(StatusUpdate, validate_update),
+}
+
+
+def import_rows(kind, stream, format, chunk_size=CHUNK_SIZE, job=None):
+    """Import `kind` records from a text stream in `format`. Returns an ImportResult.
+
+    With a `job`, progress is saved on it with every chunk, and an import
+    the job already started resumes after the last line it saved.
+    """
+    if kind not in _CHUNK_IMPORTERS:
+        raise ValueError(f'Unknown import kind {kind!r}; expected one of {", ".join(IMPORT_KINDS)}')
+    import_chunk = _CHUNK_IMPORTERS[kind]
+    progress = job.result if job is not None and job.result else None
+    result = ImportResult.from_dict(progress) if progress else ImportResult(kind)
+    rows = read_rows(stream, format)
+    if progress:
+        rows = (row for row in rows if row[0] > progress['line'])
+    while chunk := list(islice(rows, chunk_size)):
+        import_chunk(chunk, result)
+        if job is not None:
+            # Committed with the chunk, so the two cannot disagree
+            job.result = {**result.as_dict(), 'line': chunk[-1][0]}
+        db.session.commit()
+    return result
+
+
+def import_file(kind, path, format=None, job=None):
+    """Import `kind` records from the file at `path` (format from its extension by default)."""
+    format = format or detect_format(path)
+    # utf-8-sig: spreadsheets often save CSV with a byte order mark.
+    # surrogateescape: a bad byte fails its row in read_rows(), not the file
+    with open(path, newline='', encoding='utf-8-sig', errors='surrogateescape') as stream:
+        return import_rows(kind, stream, format, job=job)
+
+
+def upload_path(filename):
+    """Where to keep an uploaded file until its import job has read it."""
+    directory = Path(current_app.config['JOB_OUTPUT_DIR']) / 'uploads'
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f'{uuid4().hex}{Path(filename).suffix.lower()}'
+
+
+def import_job(job, kind, path, format):
+    """Background job: import an uploaded file, then delete it.
+
+    A run after a crash resumes from the progress saved on `job`.
+    """
+    try:
+        return import_file(kind, path, format, job).as_dict()
+    finally:
+        Path(path).unlink(missing_ok=True)
@@ -0,0 +1,241 @@
+"""Background jobs: slow work moved off the request threads.
+
+A route calls enqueue(kind, **params), which records a Job row and hands its
+id to this process's JobRunner, a thread pool of JOB_WORKERS threads. The
+route returns at once with the job id; /jobs/<id> (or /api/v1/jobs/<id>)
+reports progress and /jobs/<id>/download serves a finished job's file.
+
+JOB_KINDS names the function behind each kind as "module:function",
+imported when the job runs, so job code is only loaded by the processes
+that run it. A job function receives the Job and its params as keyword
+arguments and returns a JSON-able result; files it writes go under
+job_output_path(job, name).
+
+The jobs table is the queue, so queued work survives a restart: when a
+process starts its pool (for its first job, or when a status page shows an
+unfinished job) it also picks up queued jobs. A running job records a
+heartbeat every JOB_HEARTBEAT_SECONDS; one silent for JOB_STALE_SECONDS
+belonged to a process that died (or hung), and is queued and run again.
+Stale jobs are looked for when the pool starts, on every enqueue() and on
+every status read of an unfinished job, so a crashed job is resumed while
+anyone is waiting for it. Process ids are not used for this, as a restarted
+container reuses them. A job is claimed with one conditional UPDATE, so it
+runs once however many processes try.
+`flask prune-jobs` drops finished jobs and their files after
+JOB_RETENTION_DAYS.
+
+With JOB_WORKERS = 0 jobs run inline in enqueue(), which is what the test
+suite does.
+"""
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import func, or_, select, update
+
+from app import db
+from app.models import Job
+
+# Job kind -> "module:function" running it
+JOB_KINDS = {
+    'export': 'app.routes.export:export_job',
+    'archive': 'app.cold_storage:archive_job',
+    'import': 'app.importer:import_job',
+}
+
+_EXTENSION_KEY = 'jobs'
+
+
+def job_function(kind):
+    """Import and return the function behind `kind`."""
+    module, name = JOB_KINDS[kind].split(':')
+    return getattr(__import__(module, fromlist=[name]), name)
+
+
+def job_directory(job_id):
+    return Path(current_app.config['JOB_OUTPUT_DIR']) / str(job_id)
+
+
+def job_output_path(job, name):
+    """Path for `job` to write its output file `name` to; the download serves it."""
+    directory = job_directory(job.id)
+    directory.mkdir(parents=True, exist_ok=True)
+    job.output_file = name
+    return directory / name
+
+
+def _heartbeat(app, job_id, stopped):
+    """Mark job `job_id` alive every JOB_HEARTBEAT_SECONDS until `stopped` is set."""
+    while not stopped.wait(app.config['JOB_HEARTBEAT_SECONDS']):
+        try:
+            with app.app_context():
+                db.session.execute(
+                    update(Job).where(Job.id == job_id, Job.status == 'running')
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+                db.session.commit()
+        except Exception:
+            # A missed beat is harmless until JOB_STALE_SECONDS of them
+            app.logger.exception('Heartbeat of job %s failed', job_id)
+
+
+def run_job(app, job_id):
+    """Claim job `job_id` if it is still queued, run it and record the outcome."""
+    with app.app_context():
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(Job).where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', started_at=now, heartbeat_at=now)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return
+
+        job = db.session.get(Job, job_id)
+        stopped = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat, args=(app, job_id, stopped),
+                                     name=f'job-{job_id}-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            result = job_function(job.kind)(job, **job.params)
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception('Job %s (%s) failed', job_id, job.kind)
+            job.status = 'failed'
+            job.error = f'{type(exc).__name__}: {exc}'
+        else:
+            job.status = 'succeeded'
+            job.result = result
+        finally:
+            stopped.set()
+            heartbeat.join()
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+def requeue_stale_jobs():
+    """Queue again the running jobs silent for JOB_STALE_SECONDS. Returns their ids.
+
+    Reads first, so the common case (nothing stale) takes no write lock.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_STALE_SECONDS'])
+    # Rows from before heartbeats were recorded fall back to started_at
+    stale = (Job.status == 'running',
+             or_(func.coalesce(Job.heartbeat_at, Job.started_at) < cutoff,
+                 func.coalesce(Job.heartbeat_at, Job.started_at).is_(None)))
+    job_ids = db.session.scalars(select(Job.id).where(*stale)).all()
+    if not job_ids:
+        return []
+    # The same conditions again: a late heartbeat keeps its job
+    job_ids = db.session.scalars(
+        update(Job).where(Job.id.in_(job_ids), *stale).values(status='queued').returning(Job.id)
+    ).all()
+    db.session.commit()
+    return sorted(job_ids)
+
+
+class JobRunner:
+    """This process's job thread pool, started with the first job."""
+
+    def __init__(self, app):
+        self.app = app
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, job_id):
+        pool = self.start()
+        if pool is None:
+            run_job(self.app, job_id)
+        else:
+            pool.submit(run_job, self.app, job_id)
+
+    def start(self):
+        """Return the pool, starting it (and recovering queued jobs) if needed.
+
+        None when JOB_WORKERS is 0.
+        """
+        if not self.app.config['JOB_WORKERS']:
+            return None
+        with self._lock:
+            # A forked worker gets its own pool; the parent's threads are not copied
+            started = self._pool is None or self._pid != os.getpid()
+            if started:
+                self._pool = ThreadPoolExecutor(self.app.config['JOB_WORKERS'], thread_name_prefix='job')
+                self._pid = os.getpid()
+        if started:
+            self.recover()
+        return self._pool
+
+    def recover(self):
+        """Queue again the stale running jobs and run every queued job."""
+        with self.app.app_context():
+            requeue_stale_jobs()
+            queued = db.session.scalars(select(Job.id).where(Job.status == 'queued').order_by(Job.id)).all()
+        for job_id in queued:
+            self._pool.submit(run_job, self.app, job_id)
+        return len(queued)
+
+    def resume_stale(self):
+        """Start the pool if needed, then run again any stale running jobs."""
+        self.start()
+        with self.app.app_context():
+            job_ids = requeue_stale_jobs()
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def shutdown(self):
+        """Wait for the running jobs and stop the pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+def get_runner():
+    """Return the current app's JobRunner."""
+    return current_app.extensions[_EXTENSION_KEY]
+
+
+def enqueue(kind, /, **params):
+    """Queue a `kind` job with `params` (JSON-able) and return it.
+
+    Commits the session, so call it after the request's own changes.
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f'Unknown job kind {kind!r}; expected one of {", ".join(JOB_KINDS)}')
+    job = Job(kind=kind, params=params)
+    db.session.add(job)
+    db.session.commit()
+    runner = get_runner()
+    runner.resume_stale()
+    runner.submit(job.id)
+    return job
+
+
+def prune_jobs(days):
+    """Delete finished jobs older than `days` days, and their files. Returns how many."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    job_ids = db.session.scalars(
+        select(Job.id).where(Job.status.in_(('succeeded', 'failed')), Job.finished_at < cutoff)
+    ).all()
+    for job_id in job_ids:
+        shutil.rmtree(job_directory(job_id), ignore_errors=True)
+    db.session.execute(Job.__table__.delete().where(Job.id.in_(job_ids)))
+    db.session.commit()
+    return len(job_ids)
+
+
+def init_app(app):
+    """Create the app's JobRunner; its pool starts with the first job."""
+    app.config.setdefault('JOB_WORKERS', 2)
+    app.config.setdefault('JOB_OUTPUT_DIR', os.path.join(app.instance_path, 'jobs'))
+    app.config.setdefault('JOB_RETENTION_DAYS', 7)
+    app.config.setdefault('JOB_HEARTBEAT_SECONDS', 30.0)
+    app.config.setdefault('JOB_STALE_SECONDS', 120.0)
+    app.extensions[_EXTENSION_KEY] = JobRunner(app)
@@ -0,0 +1,217 @@
+"""Live dashboard updates over Server-Sent Events.
+
+An open dashboard subscribes to /events. One ChangeFeed thread per process
+polls the change log every LIVE_POLL_SECONDS and, when something changed,
+loads the cards of the changed projects only and hands them to every
+subscriber. Each stream renders those cards through the fragment cache, so a
+card is rendered once per process however many dashboards are open, and
+sends one `card` event per project: its markup, the dashboard list it now
+belongs in (none once it has left the dashboard) and its sort key within
+that list. app.js moves, replaces or removes the card in place.
+
+The server's work grows with the number of changes, not with the number of
+open dashboards times how often they are refreshed.
+
+Every stream holds a server thread. It ends after LIVE_STREAM_SECONDS and
+the browser reconnects with Last-Event-ID, the change log id it has caught up
+to, so nothing is missed in between. A worker holds at most LIVE_MAX_STREAMS
+streams open, so dashboards left open all day cannot take every thread from
+ordinary requests; past that, /events answers like a poll (the changes since
+Last-Event-ID, then the end of the stream) and the browser asks again after
+BUSY_RETRY_MS. LIVE_MAX_STREAMS = 0 turns live updates off.
+"""
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.cache import cached_fragment
+from app.changes import latest_change_id
+from app.dashboard_engine import bucket_for, load_project_cards
+from app.models import ChangeLog, Project
+
+# Beyond this many changed projects in one batch the page reloads instead
+MAX_CARDS_PER_BATCH = 200
+# Idle seconds between keep-alive comments, which also detect closed streams
+KEEPALIVE_SECONDS = 15
+# Browser reconnect delay after a stream ends
+RETRY_MS = 3000
+# Reconnect delay when the worker already holds LIVE_MAX_STREAMS streams
+BUSY_RETRY_MS = 30000
+
+_EXTENSION_KEY = 'live_feed'
+
+
+@dataclass(slots=True)
+class Batch:
+    """Cards of the projects changed up to change log entry `last_id`.
+
+    cards maps project id to its ProjectCard, or None when the project is no
+    longer active; cards itself is None when too much changed to patch.
+    """
+    last_id: int
+    today: date
+    cards: dict = None
+
+
+def load_batch(since, today):
+    """The Batch of every project changed after change log entry `since`.
+
+    That includes a project a task or milestone moved away from; the change
+    log records such a move under both projects.
+    """
+    last_id = latest_change_id()
+    project_ids = db.session.scalars(
+        select(ChangeLog.project_id).where(ChangeLog.id > since, ChangeLog.id <= last_id).distinct()
+    ).all()
+    if len(project_ids) > MAX_CARDS_PER_BATCH:
+        return Batch(last_id, today)
+    cards = load_project_cards(Project.id.in_(project_ids), today=today) if project_ids else {}
+    return Batch(last_id, today, {project_id: cards.get(project_id) for project_id in project_ids})
+
+
+def format_event(event, data, id=None):
+    """One SSE message."""
+    lines = [f'event: {event}', f'data: {json.dumps(data)}']
+    if id is not None:
+        lines.insert(0, f'id: {id}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def batch_events(batch):
+    """SSE text for `batch`, one `card` event per changed project."""
+    if batch.cards is None:
+        return format_event('reload', {}, batch.last_id)
+    project_card = current_app.jinja_env.get_template('_project_card.html')\
+        .make_module({'today': batch.today}).project_card
+    events = []
+    for project_id, card in batch.cards.items():
+        bucket = bucket_for(card, batch.today) if card is not None else None
+        data = {'id': project_id, 'bucket': bucket, 'today': batch.today.isoformat()}
+        if bucket is not None:
+            data.update(sort_key=card.sort_key, html=str(
+                cached_fragment(project_card, card.fragment_key(batch.today), card)
+            ))
+        events.append(format_event('card', data, batch.last_id))
+    return ''.join(events)
+
+
+class ChangeFeed:
+    """Polls the change log for this process and fans batches out to streams.
+
+    The polling thread only runs while a stream is subscribed. At most
+    `max_streams` streams subscribe at once (None: no limit).
+    """
+
+    def __init__(self, app, interval, max_streams=None):
+        self.app = app
+        self.interval = interval
+        self.max_streams = max_streams
+        self.last_id = 0
+        self._subscribers = set()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, since):
+        """Return (queue of later Batches, change id the feed has reached).
+
+        None when max_streams streams are already subscribed.
+        """
+        subscription = queue.SimpleQueue()
+        with self._lock:
+            if self.max_streams is not None and len(self._subscribers) >= self.max_streams:
+                return None
+            if self._thread is None or not self._thread.is_alive():
+                self.last_id = since
+                self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+                self._thread.start()
+            self._subscribers.add(subscription)
+            return subscription, self.last_id
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                self.poll()
+            except Exception:
+                self.app.logger.exception('Live dashboard poll failed')
+
+    def poll(self):
+        """Publish the changes since the last poll, if there are any."""
+        with self.app.app_context():
+            batch = load_batch(self.last_id, date.today())
+        if batch.last_id == self.last_id:
+            return
+        with self._lock:
+            self.last_id = batch.last_id
+            for subscription in self._subscribers:
+                subscription.put(batch)
+
+
+def stream(since=None):
+    """Generate one /events stream, starting after change log entry `since`.
+
+    Runs in the request context (stream_with_context). Without `since` the
+    stream starts from now.
+    """
+    latest = latest_change_id()
+    position = latest if since is None else since
+    if position > latest:
+        # The client saw changes this database never had (restored backup)
+        yield format_event('reload', {}, latest)
+        return
+    feed = current_app.extensions[_EXTENSION_KEY]
+    subscribed = feed.subscribe(position)
+    if subscribed is None:
+        # Every stream this worker may hold is open: answer like a poll
+        # rather than hold another thread
+        yield f'retry: {BUSY_RETRY_MS}\n\n'
+        if position < latest:
+            yield batch_events(load_batch(position, date.today()))
+        return
+    subscription, feed_position = subscribed
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        if position < feed_position:
+            # The feed is past this client; catch up on what it missed
+            batch = load_batch(position, date.today())
+            yield batch_events(batch)
+            position = batch.last_id
+        # Do not hold a read transaction (and a pooled connection) while idle
+        db.session.close()
+
+        deadline = time.monotonic() + current_app.config['LIVE_STREAM_SECONDS']
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                batch = subscription.get(timeout=min(remaining, KEEPALIVE_SECONDS))
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            if batch.last_id > position:
+                yield batch_events(batch)
+                position = batch.last_id
+    finally:
+        feed.unsubscribe(subscription)
+
+
+def init_app(app):
+    """Create the app's ChangeFeed; its thread starts with the first stream."""
+    app.config.setdefault('LIVE_POLL_SECONDS', 2.0)
+    app.config.setdefault('LIVE_STREAM_SECONDS', 300.0)
+    app.config.setdefault('LIVE_MAX_STREAMS', 4)
+    app.extensions[_EXTENSION_KEY] = ChangeFeed(app, app.config['LIVE_POLL_SECONDS'],
+                                                app.config['LIVE_MAX_STREAMS'])
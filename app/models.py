@@ -1,6 +1,47 @@
 from datetime import datetime, date
 from app import db
 
+PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+# How an attorney is linked to a project: named in assigned_attorneys, or the assigner
+ATTORNEY_ROLES = ('attorney', 'assigner')
+
+
+def priority_rank(column):
+    """SQL expression ranking a priority column high=0, medium=1, low=2."""
+    return db.case(PRIORITY_ORDER, value=column, else_=1)
+
+
+def classify_staleness(days):
+    """Return 'critical' (14+ days), 'warning' (7-13 days), or 'ok' (< 7 days)."""
+    if days >= 14:
+        return 'critical'
+    elif days >= 7:
+        return 'warning'
+    return 'ok'
+
+
+def build_status_preview(notes, max_lines=3):
+    """Return first N lines of status notes with has_more flag.
+
+    Returns dict with 'text', 'has_more', 'full_text' keys, or None if notes are empty.
+    """
+    if not notes:
+        return None
+    lines = notes.strip().split('\n')
+    preview_lines = lines[:max_lines]
+    has_more = len(lines) > max_lines
+    return {
+        'text': '\n'.join(preview_lines),
+        'has_more': has_more,
+        'full_text': notes if has_more else None
+    }
+
+
+def _created_at_default(context):
+    """Column default: the created_at value being inserted with the row."""
+    return context.get_current_parameters()['created_at']
+
 
 class Project(db.Model):
     __tablename__ = 'projects'
@@ -17,83 +58,114 @@ class Project(db.Model):
     estimated_hours = db.Column(db.Float)
     actual_hours = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Set while the project's tasks, milestones and updates are in cold storage (see app.cold_storage)
+    archived_at = db.Column(db.DateTime)
+
+    # Denormalized rollups of child rows, kept current by app.rollups on every flush
+    # (and left as they were while the children are in cold storage)
+    rollup_pending_tasks = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rollup_next_task_id = db.Column(db.Integer)
+    rollup_next_task_due = db.Column(db.Date, index=True)
+    rollup_next_task_priority = db.Column(db.String(10))
+    rollup_last_update_at = db.Column(db.DateTime)
+    rollup_next_milestone_id = db.Column(db.Integer)
+    rollup_next_milestone_date = db.Column(db.Date)
+    # Latest of created_at, the last status update and the last task completion
+    rollup_last_activity_at = db.Column(db.DateTime, default=_created_at_default)
 
     # Relationships
     tasks = db.relationship('Task', backref='project', lazy='dynamic', cascade='all, delete-orphan')
     milestones = db.relationship('Milestone', backref='project', lazy='dynamic', cascade='all, delete-orphan')
     status_updates = db.relationship('StatusUpdate', backref='project', lazy='dynamic', cascade='all, delete-orphan')
+    # Normalized copy of assigner/assigned_attorneys, kept current by app.attorneys on every flush
+    attorney_links = db.relationship('ProjectAttorney', back_populates='project', cascade='all, delete-orphan')
 
     @property
     def last_update_date(self):
         """Get the datetime of the most recent status update, or None."""
-        from app.models import StatusUpdate
-        update = self.status_updates.order_by(StatusUpdate.created_at.desc()).first()
-        return update.created_at if update else None
+        return self.rollup_last_update_at
+
+    @property
+    def in_cold_storage(self):
+        """True while the project's children live in the cold tables."""
+        return self.archived_at is not None
+
+    def child_model(self, model):
+        """The model holding this project's `model` rows: hot, or its cold twin."""
+        return COLD_MODELS[model] if self.in_cold_storage else model
+
+    def _children(self, model):
+        model = self.child_model(model)
+        return model, model.query.filter(model.project_id == self.id)
+
+    def get_status_updates_ordered(self, limit=None):
+        """Get status updates ordered by created_at descending (newest first)."""
+        model, query = self._children(StatusUpdate)
+        return query.order_by(model.created_at.desc()).limit(limit).all()
 
-    def get_status_updates_ordered(self):
-        """Get all status updates ordered by created_at descending (newest first)."""
-        from app.models import StatusUpdate
-        return self.status_updates.order_by(StatusUpdate.created_at.desc()).all()
+    @property
+    def last_activity_at(self):
+        """Datetime of the last status update or task completion, else creation."""
+        return self.rollup_last_activity_at or self.created_at
 
     @property
     def days_since_update(self):
-        """Return days since last update, or days since creation if no updates."""
-        reference_date = self.last_update_date or self.created_at
-        return (datetime.utcnow() - reference_date).days
+        """Return days since last activity (status update or completed task)."""
+        return (datetime.utcnow() - self.last_activity_at).days
 
     @property
     def staleness_level(self):
         """Return 'critical' (14+ days), 'warning' (7-13 days), or 'ok' (< 7 days)."""
-        days = self.days_since_update
-        if days >= 14:
-            return 'critical'
-        elif days >= 7:
-            return 'warning'
-        return 'ok'
+        return classify_staleness(self.days_since_update)
 
     def get_pending_tasks(self):
         """Get all pending tasks ordered by due_date ascending, then priority."""
-        from app.models import Task
-        return self.tasks.filter_by(completed=False).order_by(Task.due_date.asc()).all()
+        model, query = self._children(Task)
+        return query.filter_by(completed=False).order_by(model.due_date.asc()).all()
 
     def get_completed_tasks(self):
         """Get all completed tasks ordered by completed_at descending (newest first)."""
-        from app.models import Task
-        return self.tasks.filter_by(completed=True).order_by(Task.completed_at.desc()).all()
+        model, query = self._children(Task)
+        return query.filter_by(completed=True).order_by(model.completed_at.desc()).all()
 
     @property
     def pending_task_count(self):
         """Return count of pending tasks."""
-        return self.tasks.filter_by(completed=False).count()
+        return self.rollup_pending_tasks or 0
 
     @property
     def next_task(self):
         """Return the next pending task (earliest due_date), or None."""
-        from app.models import Task
-        return self.tasks.filter_by(completed=False).order_by(Task.due_date.asc()).first()
+        return self._get_child(Task, self.rollup_next_task_id)
 
     def get_pending_milestones(self):
         """Get all pending milestones ordered by date ascending."""
-        from app.models import Milestone
-        return self.milestones.filter_by(completed=False).order_by(Milestone.date.asc()).all()
+        model, query = self._children(Milestone)
+        return query.filter_by(completed=False).order_by(model.date.asc()).all()
 
     def get_completed_milestones(self):
         """Get all completed milestones ordered by date descending."""
-        from app.models import Milestone
-        return self.milestones.filter_by(completed=True).order_by(Milestone.date.desc()).all()
+        model, query = self._children(Milestone)
+        return query.filter_by(completed=True).order_by(model.date.desc()).all()
 
     @property
     def next_milestone(self):
         """Return the next pending milestone (earliest date), or None."""
-        from app.models import Milestone
-        return self.milestones.filter_by(completed=False).order_by(Milestone.date.asc()).first()
+        return self._get_child(Milestone, self.rollup_next_milestone_id)
+
+    def _get_child(self, model, id):
+        if id is None:
+            return None
+        child = db.session.get(self.child_model(model), id)
+        # A rollup id can outlive a row renumbered by a move to or from cold storage
+        return child if child is not None and child.project_id == self.id else None
 
     @property
     def latest_status_update(self):
         """Return the most recent StatusUpdate object, or None."""
-        from app.models import StatusUpdate
-        return self.status_updates.order_by(StatusUpdate.created_at.desc()).first()
+        updates = self.get_status_updates_ordered(limit=1)
+        return updates[0] if updates else None
 
     def get_status_preview(self, max_lines=3):
         """Return first N lines of latest status notes with has_more flag.
@@ -101,23 +173,47 @@ class Project(db.Model):
         Returns dict with 'text', 'has_more', 'full_text' keys, or None if no updates.
         """
         update = self.latest_status_update
-        if not update or not update.notes:
+        if not update:
             return None
-        lines = update.notes.strip().split('\n')
-        preview_lines = lines[:max_lines]
-        has_more = len(lines) > max_lines
-        return {
-            'text': '\n'.join(preview_lines),
-            'has_more': has_more,
-            'full_text': update.notes if has_more else None
-        }
+        return build_status_preview(update.notes, max_lines)
 
     def __repr__(self):
         return f'<Project {self.client_name}: {self.project_name}>'
 
 
+class Attorney(db.Model):
+    __tablename__ = 'attorneys'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # NOCASE so "jones" and "Jones" are one attorney and equality filters use the index
+    name = db.Column(db.String(200, collation='NOCASE'), nullable=False, unique=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    project_links = db.relationship('ProjectAttorney', back_populates='attorney')
+
+    def __repr__(self):
+        return f'<Attorney {self.name}>'
+
+
+class ProjectAttorney(db.Model):
+    """Links a project to an attorney in one of ATTORNEY_ROLES."""
+    __tablename__ = 'project_attorneys'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), primary_key=True)
+    attorney_id = db.Column(db.Integer, db.ForeignKey('attorneys.id'), primary_key=True)
+    role = db.Column(db.String(10), primary_key=True)
+
+    project = db.relationship('Project', back_populates='attorney_links')
+    attorney = db.relationship('Attorney', back_populates='project_links')
+
+    def __repr__(self):
+        return f'<ProjectAttorney {self.attorney_id} {self.role} of project {self.project_id}>'
+
+
 class Task(db.Model):
     __tablename__ = 'tasks'
+    # Never reuse the id of a row moved to cold storage
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -129,6 +225,7 @@ class Task(db.Model):
     completed = db.Column(db.Boolean, nullable=False, default=False, index=True)
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def __repr__(self):
         return f'<Task {self.target_name} by {self.due_date}>'
@@ -136,6 +233,8 @@ class Task(db.Model):
 
 class Milestone(db.Model):
     __tablename__ = 'milestones'
+    # Never reuse the id of a row moved to cold storage
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
@@ -144,6 +243,7 @@ class Milestone(db.Model):
     date = db.Column(db.Date, nullable=False, index=True)
     completed = db.Column(db.Boolean, nullable=False, default=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def __repr__(self):
         return f'<Milestone {self.name} for project {self.project_id}>'
@@ -151,6 +251,8 @@ class Milestone(db.Model):
 
 class StatusUpdate(db.Model):
     __tablename__ = 'status_updates'
+    # Never reuse the id of a row moved to cold storage
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
@@ -159,3 +261,109 @@ class StatusUpdate(db.Model):
 
     def __repr__(self):
         return f'<StatusUpdate {self.id} for project {self.project_id}>'
+
+
+def _cold_table(hot, name, *index_columns):
+    """A copy of `hot`'s columns without its defaults and indexes.
+
+    Its one index is on project_id followed by `index_columns`.
+    """
+    columns = [
+        db.Column(column.name, column.type,
+                  *([db.ForeignKey('projects.id')] if column.name == 'project_id' else []),
+                  primary_key=column.primary_key, nullable=column.nullable)
+        for column in hot.columns
+    ]
+    return db.Table(name, *columns, db.Index(f'ix_{name}_project', 'project_id', *index_columns))
+
+
+class ColdTask(db.Model):
+    """A task of an archived project, moved out of the hot tasks table."""
+    __table__ = _cold_table(Task.__table__, 'cold_tasks')
+
+    def __repr__(self):
+        return f'<ColdTask {self.target_name} by {self.due_date}>'
+
+
+class ColdMilestone(db.Model):
+    """A milestone of an archived project, moved out of the hot milestones table."""
+    __table__ = _cold_table(Milestone.__table__, 'cold_milestones')
+
+    def __repr__(self):
+        return f'<ColdMilestone {self.name} for project {self.project_id}>'
+
+
+class ColdStatusUpdate(db.Model):
+    """A status update of an archived project, moved out of the hot table."""
+    # Ordered like ix_status_updates_project_created for the export's latest-notes lookup
+    __table__ = _cold_table(StatusUpdate.__table__, 'cold_status_updates', 'created_at')
+
+    def __repr__(self):
+        return f'<ColdStatusUpdate {self.id} for project {self.project_id}>'
+
+
+# Hot child model -> its cold storage twin
+COLD_MODELS = {Task: ColdTask, Milestone: ColdMilestone, StatusUpdate: ColdStatusUpdate}
+
+
+class ChangeLog(db.Model):
+    """One insert, update or delete of a tracked row, written by app.changes triggers."""
+    __tablename__ = 'change_log'
+    # AUTOINCREMENT so ids are never reused after old entries are pruned;
+    # sync clients use them as cursors
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(20), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+    project_id = db.Column(db.Integer)
+    operation = db.Column(db.String(10), nullable=False)  # insert, update, delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ChangeLog {self.id} {self.operation} {self.table_name}/{self.record_id}>'
+
+
+class Job(db.Model):
+    """A unit of background work queued by app.jobs."""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # key of app.jobs.JOB_KINDS
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    # queued, running, succeeded or failed
+    status = db.Column(db.String(10), nullable=False, default='queued', index=True)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    output_file = db.Column(db.String(255))  # file name under the job's output directory
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # last sign of life while running
+    finished_at = db.Column(db.DateTime)
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} {self.status}>'
+
+
+# Composite indexes for the hot "children of project X, filtered by completion,
+# ordered by date" access patterns. `flask upgrade-indexes` adds them to
+# existing databases.
+db.Index('ix_projects_status_next_task_due', Project.status, Project.rollup_next_task_due)
+db.Index('ix_projects_status_last_activity', Project.status, Project.rollup_last_activity_at)
+db.Index('ix_tasks_project_completed_due', Task.project_id, Task.completed, Task.due_date)
+db.Index('ix_tasks_project_completed_at', Task.project_id, Task.completed, Task.completed_at)
+db.Index('ix_milestones_project_completed_date', Milestone.project_id, Milestone.completed, Milestone.date)
+db.Index('ix_status_updates_project_created', StatusUpdate.project_id, StatusUpdate.created_at.desc())
+# Newest change per project, the dashboard card version stamp
+db.Index('ix_change_log_project_id', ChangeLog.project_id, ChangeLog.id)
+# Reverse lookup for per-attorney views: "projects where attorney X has role Y"
+db.Index('ix_project_attorneys_attorney_role', ProjectAttorney.attorney_id, ProjectAttorney.role,
+         ProjectAttorney.project_id)
+
+# Create the backref attributes (Task.project, ...) now rather than on first
+# query, so loader options like joinedload(Task.project) can name them.
+db.configure_mappers()
@@ -0,0 +1,185 @@
+"""Keyset (seek) pagination for list pages.
+
+Instead of OFFSET, each page continues from the sort key of the last row on
+the previous page:
+
+    WHERE (sort_key, id) > (:last_sort_key, :last_id) ORDER BY sort_key, id
+
+so fetching page 500 costs the same as page 1. The position travels between
+requests as an opaque cursor token; templates build the previous/next links
+with the page_url() global and the _pagination.html macro.
+
+Every sort key must be non-NULL and the last one must be unique (normally the
+primary key) so the order is total.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from flask import abort, request, url_for
+from sqlalchemy import and_, or_
+
+from app import db
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded or belongs to another sort."""
+
+
+@dataclass(slots=True)
+class SortKey:
+    """One ORDER BY term: a SQL expression and its direction."""
+    expression: object
+    descending: bool = False
+
+
+@dataclass(slots=True)
+class Page:
+    """One page of results plus the cursors of its neighbours."""
+    items: list = field(default_factory=list)
+    per_page: int = DEFAULT_PER_PAGE
+    next_cursor: str = None
+    prev_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'date': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'datetime' in value:
+            return datetime.fromisoformat(value['datetime'])
+        if 'date' in value:
+            return date.fromisoformat(value['date'])
+        raise InvalidCursor('Unknown cursor value type.')
+    if value is not None and not isinstance(value, (str, int, float)):
+        raise InvalidCursor('Unknown cursor value type.')
+    return value
+
+
+def encode_cursor(direction, values, sort_name=''):
+    """Return an opaque token for continuing after (`n`) or before (`p`) `values`."""
+    payload = {'d': direction, 's': sort_name, 'k': [_encode_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, sort_name='', key_count=None):
+    """Return (direction, values) from a token made by encode_cursor()."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction, values = payload['d'], [_decode_value(v) for v in payload['k']]
+        token_sort = payload['s']
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor('Malformed cursor.') from exc
+    if direction not in ('n', 'p'):
+        raise InvalidCursor('Unknown cursor direction.')
+    if token_sort != sort_name or (key_count is not None and len(values) != key_count):
+        raise InvalidCursor('Cursor does not match the current sort order.')
+    return direction, values
+
+
+def _seek_condition(sort_keys, values, backwards):
+    """Rows strictly after `values` in sort order (or before, if backwards).
+
+    Expanded as (k0 > v0) OR (k0 = v0 AND k1 > v1) OR ... so each key can
+    have its own direction.
+    """
+    clauses = []
+    for position, key in enumerate(sort_keys):
+        after = key.descending == backwards
+        value = values[position]
+        comparison = key.expression > value if after else key.expression < value
+        equal_prefix = [
+            earlier.expression == values[index]
+            for index, earlier in enumerate(sort_keys[:position])
+        ]
+        clauses.append(and_(*equal_prefix, comparison))
+    return or_(*clauses)
+
+
+def _order_terms(sort_keys, backwards):
+    terms = []
+    for key in sort_keys:
+        descending = key.descending != backwards
+        terms.append(key.expression.desc() if descending else key.expression.asc())
+    return terms
+
+
+def paginate(statement, sort_keys, cursor=None, per_page=DEFAULT_PER_PAGE, sort_name=''):
+    """Run `statement` for one page ordered by `sort_keys`.
+
+    `statement` must not have its own ORDER BY or LIMIT. `sort_name` ties
+    cursors to a sort option so a token from one ordering is rejected by
+    another. Raises InvalidCursor for a bad token.
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    width = len(statement.column_descriptions)
+
+    backwards = False
+    if cursor:
+        direction, values = decode_cursor(cursor, sort_name, len(sort_keys))
+        backwards = direction == 'p'
+        statement = statement.where(_seek_condition(sort_keys, values, backwards))
+
+    statement = statement.add_columns(*(key.expression for key in sort_keys))\
+        .order_by(*_order_terms(sort_keys, backwards))\
+        .limit(per_page + 1)
+    rows = db.session.execute(statement).all()
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    page = Page(
+        items=[row[0] if width == 1 else tuple(row[:width]) for row in rows],
+        per_page=per_page,
+    )
+    if rows:
+        first_keys, last_keys = rows[0][width:], rows[-1][width:]
+        if (more and not backwards) or (cursor and backwards):
+            page.next_cursor = encode_cursor('n', last_keys, sort_name)
+        if (more and backwards) or (cursor and not backwards):
+            page.prev_cursor = encode_cursor('p', first_keys, sort_name)
+    return page
+
+
+def paginate_request(statement, sort_keys, sort_name=''):
+    """paginate() driven by ?cursor= and ?per_page=; a bad cursor is a 400."""
+    per_page = request.args.get('per_page', type=int, default=DEFAULT_PER_PAGE)
+    try:
+        return paginate(statement, sort_keys, request.args.get('cursor'), per_page, sort_name)
+    except InvalidCursor:
+        abort(400)
+
+
+def page_url(cursor):
+    """URL of the current page with ?cursor= replaced, other arguments kept."""
+    args = request.args.to_dict()
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+
+def init_app(app):
+    """Expose page_url() to templates."""
+    app.jinja_env.globals['page_url'] = page_url
@@ -0,0 +1,93 @@
+"""Loader for the project detail page.
+
+The page shows a project with its attorneys, milestones, pending tasks, a page
+of completed tasks and its newest status updates. load_project_detail()
+fetches each of those in one query (the child relationships are dynamic, so
+they cannot be eager-loaded with the project) and splits milestones into
+pending and completed in memory, so rendering issues no queries of its own.
+Archived projects are read from cold storage.
+
+Long-running matters collect hundreds of status updates, so only the newest
+UPDATE_CHUNK_SIZE are rendered; update_chunk() serves older ones on demand.
+"""
+from dataclasses import dataclass
+
+from flask import abort
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Milestone, Project, ProjectAttorney, StatusUpdate, Task, priority_rank
+from app.pagination import Page, SortKey, paginate, paginate_request
+
+# Status updates rendered per chunk
+UPDATE_CHUNK_SIZE = 20
+
+
+@dataclass(slots=True)
+class ProjectDetail:
+    """Everything the detail page renders, already loaded.
+
+    pending_tasks holds read-only rows of the displayed columns; the other
+    collections hold model instances.
+    """
+    project: Project
+    pending_milestones: list
+    completed_milestones: list
+    pending_tasks: list
+    completed_tasks: Page
+    updates: Page
+
+
+def update_chunk(project, cursor=None):
+    """One chunk of `project`'s status updates, newest first, after `cursor`.
+
+    Raises InvalidCursor for a bad token.
+    """
+    model = project.child_model(StatusUpdate)
+    return paginate(
+        select(model).where(model.project_id == project.id),
+        [SortKey(model.created_at, descending=True), SortKey(model.id, descending=True)],
+        cursor, UPDATE_CHUNK_SIZE,
+    )
+
+
+def load_project_detail(id):
+    """Load the detail page for project `id`, or 404.
+
+    Completed tasks are paged by the request's ?cursor=.
+    """
+    project = db.session.scalar(
+        select(Project).where(Project.id == id)
+        .options(selectinload(Project.attorney_links).joinedload(ProjectAttorney.attorney))
+    )
+    if project is None:
+        abort(404)
+    milestone_model = project.child_model(Milestone)
+    task_model = project.child_model(Task)
+
+    milestones = db.session.scalars(
+        select(milestone_model).where(milestone_model.project_id == project.id)
+        .order_by(milestone_model.date, milestone_model.id)
+    ).all()
+    # Plain rows: busy matters have hundreds of pending tasks, held until rendered
+    pending_tasks = db.session.execute(
+        select(task_model.id, task_model.target_type, task_model.target_name, task_model.due_date,
+               task_model.priority, task_model.description)
+        .where(task_model.project_id == project.id, task_model.completed.is_(False))
+        .order_by(task_model.due_date, priority_rank(task_model.priority), task_model.id)
+    ).all()
+    completed_tasks = paginate_request(
+        select(task_model).where(task_model.project_id == project.id, task_model.completed.is_(True)),
+        [SortKey(task_model.completed_at, descending=True), SortKey(task_model.id, descending=True)],
+    )
+
+    return ProjectDetail(
+        project=project,
+        pending_milestones=[m for m in milestones if not m.completed],
+        completed_milestones=[m for m in reversed(milestones) if m.completed],
+        pending_tasks=pending_tasks,
+        completed_tasks=completed_tasks,
+        updates=update_chunk(project),
+    )
+
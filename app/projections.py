@@ -0,0 +1,111 @@
+"""Read-model projections for the task and milestone lists.
+
+The list pages only display a few columns of each row and of its project, so
+they select exactly those columns in one joined query and wrap each row in a
+slotted view object instead of loading full ORM instances (and their
+identity-map and change-tracking overhead). Filters are applied in SQL.
+"""
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import select
+
+from app.attorneys import linked_to
+from app.models import Milestone, Project, Task, priority_rank
+from app.pagination import SortKey, paginate_request
+
+
+@dataclass(slots=True)
+class TaskRow:
+    """A pending task with its project's display fields inlined."""
+    id: int
+    project_id: int
+    client_name: str
+    project_name: str
+    target_type: str
+    target_name: str
+    due_date: date
+    description: str
+    priority: str
+
+
+@dataclass(slots=True)
+class MilestoneRow:
+    """A pending milestone with its project's display fields inlined."""
+    id: int
+    project_id: int
+    client_name: str
+    project_name: str
+    name: str
+    date: date
+    description: str
+
+
+@dataclass(slots=True)
+class ListFilters:
+    """Optional filters shared by the task and milestone lists.
+
+    `attorney` is an assigned attorney's name; `start` and `end` bound the
+    due date (tasks) or date (milestones), inclusive. `target_type` only
+    applies to tasks.
+    """
+    attorney: str = ''
+    target_type: str = ''
+    start: date = None
+    end: date = None
+
+    @classmethod
+    def from_args(cls, args):
+        """Read ?attorney=, ?target_type=, ?start= and ?end= (ISO dates).
+
+        Dates that do not parse are ignored.
+        """
+        return cls(
+            attorney=args.get('attorney', '').strip(),
+            target_type=args.get('target_type', '').strip(),
+            start=args.get('start', type=date.fromisoformat),
+            end=args.get('end', type=date.fromisoformat),
+        )
+
+    def conditions(self, date_column):
+        """SQL conditions for the attorney and date window filters."""
+        conditions = []
+        if self.attorney:
+            conditions.append(linked_to(self.attorney, 'attorney'))
+        if self.start:
+            conditions.append(date_column >= self.start)
+        if self.end:
+            conditions.append(date_column <= self.end)
+        return conditions
+
+
+def _page(statement, sort_keys, view):
+    page = paginate_request(statement, sort_keys)
+    page.items = [view(*row) for row in page.items]
+    return page
+
+
+def pending_task_page(filters):
+    """One page of TaskRow for pending tasks, by due date then priority."""
+    statement = select(
+        Task.id, Task.project_id, Project.client_name, Project.project_name,
+        Task.target_type, Task.target_name, Task.due_date, Task.description, Task.priority,
+    ).join(Project, Project.id == Task.project_id)\
+        .where(Task.completed.is_(False), *filters.conditions(Task.due_date))
+    if filters.target_type:
+        statement = statement.where(Task.target_type == filters.target_type)
+    return _page(
+        statement,
+        [SortKey(Task.due_date), SortKey(priority_rank(Task.priority)), SortKey(Task.id)],
+        TaskRow,
+    )
+
+
+def pending_milestone_page(filters):
+    """One page of MilestoneRow for pending milestones, by date."""
+    statement = select(
+        Milestone.id, Milestone.project_id, Project.client_name, Project.project_name,
+        Milestone.name, Milestone.date, Milestone.description,
+    ).join(Project, Project.id == Milestone.project_id)\
+        .where(Milestone.completed.is_(False), *filters.conditions(Milestone.date))
+    return _page(statement, [SortKey(Milestone.date), SortKey(Milestone.id)], MilestoneRow)
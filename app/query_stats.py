@@ -0,0 +1,80 @@
+"""Per-request SQL statement counting, Server-Timing and slow-query logging.
+
+Every statement executed while handling a request is counted and timed via
+SQLAlchemy's cursor-execute events. The totals are reported in a
+``Server-Timing: db;dur=<ms>;desc="<n> queries"`` response header, and any
+statement slower than SLOW_QUERY_THRESHOLD_MS is logged with the endpoint
+that issued it. The hooks only do a counter increment and a clock read per
+statement, so they are cheap enough to leave on in production; set
+QUERY_STATS_ENABLED = False to skip registering them entirely.
+"""
+from dataclasses import dataclass
+from time import perf_counter
+
+from flask import current_app, has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+
+_ENVIRON_KEY = 'worklist.query_stats'
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """SQL statements executed during one request."""
+    count: int = 0
+    duration: float = 0.0  # seconds
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+
+def current_stats():
+    """Return the QueryStats for the current request, or None outside one."""
+    if not has_request_context():
+        return None
+    return request.environ.setdefault(_ENVIRON_KEY, QueryStats())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_times', []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info['query_start_times'].pop()
+    stats = current_stats()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.duration += elapsed
+
+    threshold_ms = current_app.config['SLOW_QUERY_THRESHOLD_MS']
+    if elapsed * 1000 >= threshold_ms:
+        current_app.logger.warning(
+            'Slow query (%.1f ms) in %s: %s', elapsed * 1000, request.endpoint, statement
+        )
+
+
+def _add_server_timing(response):
+    stats = request.environ.get(_ENVIRON_KEY)
+    if stats is not None:
+        response.headers.add(
+            'Server-Timing', f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries"'
+        )
+    return response
+
+
+def init_app(app):
+    """Install the engine hooks and the Server-Timing after_request handler."""
+    app.config.setdefault('QUERY_STATS_ENABLED', True)
+    app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', 100)
+    if not app.config['QUERY_STATS_ENABLED']:
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    app.after_request(_add_server_timing)
@@ -0,0 +1,144 @@
+"""Denormalized per-project rollups.
+
+Projects store a handful of values derived from their children (pending task
+count, next task, last status update, last activity, next milestone) so list
+and dashboard pages can sort and filter on them in SQL. The values are
+recomputed inside the same transaction whenever a flush touches a Task,
+Milestone or StatusUpdate, or changes a project's created_at. Code that
+writes children with bulk SQL must call recompute_rollups() itself.
+Projects in cold storage (see app.cold_storage) are skipped.
+"""
+from itertools import chain
+
+from sqlalchemy import event, func, inspect, or_, select
+
+from app import db
+from app.models import Milestone, Project, StatusUpdate, Task
+
+ROLLUP_CHILD_MODELS = (Task, Milestone, StatusUpdate)
+
+# SQLite limits the number of bound parameters per statement
+_BATCH_SIZE = 500
+
+
+def _next_task(column):
+    return select(column).where(Task.project_id == Project.id, Task.completed.is_(False))\
+        .order_by(Task.due_date, Task.id).limit(1).scalar_subquery()
+
+
+def _next_milestone(column):
+    return select(column).where(Milestone.project_id == Project.id, Milestone.completed.is_(False))\
+        .order_by(Milestone.date, Milestone.id).limit(1).scalar_subquery()
+
+
+def rollup_expressions():
+    """Return {column name: correlated SQL expression} for every rollup column."""
+    return {
+        'rollup_pending_tasks': select(func.count(Task.id))
+            .where(Task.project_id == Project.id, Task.completed.is_(False))
+            .scalar_subquery(),
+        'rollup_next_task_id': _next_task(Task.id),
+        'rollup_next_task_due': _next_task(Task.due_date),
+        'rollup_next_task_priority': _next_task(Task.priority),
+        'rollup_last_update_at': select(func.max(StatusUpdate.created_at))
+            .where(StatusUpdate.project_id == Project.id)
+            .scalar_subquery(),
+        'rollup_last_activity_at': func.max(
+            func.coalesce(select(func.max(StatusUpdate.created_at))
+                          .where(StatusUpdate.project_id == Project.id)
+                          .scalar_subquery(), Project.created_at),
+            func.coalesce(select(func.max(Task.completed_at))
+                          .where(Task.project_id == Project.id, Task.completed.is_(True))
+                          .scalar_subquery(), Project.created_at),
+            Project.created_at,
+        ),
+        'rollup_next_milestone_id': _next_milestone(Milestone.id),
+        'rollup_next_milestone_date': _next_milestone(Milestone.date),
+    }
+
+
+def _update_statement():
+    # Pin updated_at so recomputing rollups does not count as editing the project
+    values = rollup_expressions()
+    values['updated_at'] = Project.updated_at
+    # Projects in cold storage keep the rollups they were archived with
+    return Project.__table__.update().where(Project.archived_at.is_(None)).values(**values)
+
+
+def recompute_rollups(connection, project_ids):
+    """Recompute rollup columns for the given project ids on `connection`."""
+    project_ids = sorted(set(project_ids))
+    statement = _update_statement()
+    for start in range(0, len(project_ids), _BATCH_SIZE):
+        batch = project_ids[start:start + _BATCH_SIZE]
+        connection.execute(statement.where(Project.id.in_(batch)))
+
+
+def rebuild_rollups():
+    """Recompute rollups for every project not in cold storage. Returns the count."""
+    result = db.session.execute(_update_statement())
+    db.session.commit()
+    return result.rowcount
+
+
+def find_rollup_drift():
+    """Return ids of projects whose stored rollups differ from their children."""
+    expressions = rollup_expressions()
+    mismatches = [
+        getattr(Project, name).is_distinct_from(expression)
+        for name, expression in expressions.items()
+    ]
+    return db.session.scalars(
+        select(Project.id).where(Project.archived_at.is_(None), or_(*mismatches))
+        .order_by(Project.id)
+    ).all()
+
+
+def _touched_project_ids(session):
+    """Collect project ids (old and new) of children being flushed, and of
+    existing projects whose created_at changed."""
+    project_ids = set()
+    for obj in session.dirty:
+        if isinstance(obj, Project) and inspect(obj).attrs.created_at.history.has_changes():
+            project_ids.add(obj.id)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, ROLLUP_CHILD_MODELS):
+            continue
+        history = inspect(obj).attrs.project_id.history
+        project_ids.update(chain(history.added, history.unchanged, history.deleted))
+        project_ids.add(obj.project_id)
+    project_ids.discard(None)
+    return project_ids
+
+
+def _after_flush(session, flush_context):
+    project_ids = _touched_project_ids(session)
+    if project_ids:
+        session.info.setdefault('rollup_project_ids', set()).update(project_ids)
+
+
+def _after_flush_postexec(session, flush_context):
+    project_ids = session.info.pop('rollup_project_ids', None)
+    if not project_ids:
+        return
+    recompute_rollups(session.connection(), project_ids)
+
+    # Loaded projects must re-read their rollups on next access
+    rollup_names = list(rollup_expressions())
+    for obj in session.identity_map.values():
+        if isinstance(obj, Project) and obj.id in project_ids:
+            session.expire(obj, rollup_names)
+
+
+def _load_previous_project(target, value, oldvalue, initiator):
+    """No-op; registered with active_history so moving a child between
+    projects keeps the old project_id in its history even when expired."""
+
+
+def register_listeners():
+    """Attach the rollup maintenance hooks to the Flask-SQLAlchemy session."""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_flush_postexec', _after_flush_postexec)
+        for model in ROLLUP_CHILD_MODELS:
+            event.listen(model.project_id, 'set', _load_previous_project, active_history=True)
@@ -1 +1,50 @@
-# Routes package
+"""Routes package.
+
+BLUEPRINTS lists every blueprint module and its URL prefix. create_app()
+registers them all up front, or with LAZY_BLUEPRINTS on the first request,
+so processes that never serve one (CLI commands run from cron) skip
+importing the route modules and compiling the URL map.
+"""
+import threading
+
+# (module defining `bp`, URL prefix)
+BLUEPRINTS = (
+    ('app.routes.dashboard', None),
+    ('app.routes.projects', '/projects'),
+    ('app.routes.tasks', '/tasks'),
+    ('app.routes.milestones', '/milestones'),
+    ('app.routes.updates', '/updates'),
+    ('app.routes.export', '/export'),
+    ('app.routes.search', '/search'),
+    ('app.routes.attorneys', '/attorneys'),
+    ('app.routes.jobs', '/jobs'),
+    ('app.routes.imports', '/import'),
+    ('app.routes.api', '/api/v1'),
+)
+
+
+def register_blueprints(app):
+    """Import every blueprint module and register its blueprint on `app`."""
+    for module, url_prefix in BLUEPRINTS:
+        # __import__ rather than importlib.import_module, which -X importtime does not see
+        app.register_blueprint(__import__(module, fromlist=['bp']).bp, url_prefix=url_prefix)
+
+
+def register_blueprints_lazily(app):
+    """Register the blueprints when `app` receives its first request.
+
+    Until then url_for() and `flask routes` know none of their endpoints.
+    """
+    wsgi_app = app.wsgi_app
+    lock = threading.Lock()
+    registered = False
+
+    def register_then_dispatch(environ, start_response):
+        nonlocal registered
+        with lock:
+            if not registered:
+                register_blueprints(app)
+                registered = True
+        return wsgi_app(environ, start_response)
+
+    app.wsgi_app = register_then_dispatch
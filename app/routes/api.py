@@ -0,0 +1,276 @@
+"""Versioned JSON API (/api/v1) for widgets and scripts.
+
+Every endpoint answers conditional GETs: responses carry a strong ETag and a
+request whose If-None-Match matches gets a 304 without the body being built
+(see app.etags). Lists are keyset-paginated with the same ?cursor= and
+?per_page= parameters as the HTML pages.
+"""
+from datetime import date
+
+from flask import Blueprint, abort, jsonify, request, url_for
+from sqlalchemy import select
+
+from app import db
+
+from app.cache import dashboard_snapshot
+from app.changes import DEFAULT_LIMIT as CHANGES_LIMIT, ChangesPruned, latest_change_id, read_changes
+from app.etags import conditional_json
+from app.jobs import enqueue, get_runner
+from app.models import Job, Milestone, Project, StatusUpdate, Task
+from app.pagination import SortKey, paginate_request
+
+bp = Blueprint('api', __name__)
+
+DASHBOARD_BUCKETS = ('due_today', 'due_tomorrow', 'due_this_week', 'due_later', 'no_tasks')
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _flag(name, default=False):
+    """Read a boolean query parameter ("1"/"true"/"yes" are true)."""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def project_json(project):
+    return {
+        'id': project.id,
+        'client_name': project.client_name,
+        'project_name': project.project_name,
+        'matter_number': project.matter_number,
+        'client_number': project.client_number,
+        'assigner': project.assigner,
+        'assigned_attorneys': project.assigned_attorneys,
+        'priority': project.priority,
+        'status': project.status,
+        'estimated_hours': project.estimated_hours,
+        'actual_hours': project.actual_hours,
+        'pending_tasks': project.pending_task_count,
+        'next_task_due': _iso(project.rollup_next_task_due),
+        'next_milestone_date': _iso(project.rollup_next_milestone_date),
+        'last_update_at': _iso(project.rollup_last_update_at),
+        'last_activity_at': _iso(project.last_activity_at),
+        'created_at': _iso(project.created_at),
+        'updated_at': _iso(project.updated_at),
+    }
+
+
+def task_json(task):
+    return {
+        'id': task.id,
+        'project_id': task.project_id,
+        'target_type': task.target_type,
+        'target_name': task.target_name,
+        'due_date': _iso(task.due_date),
+        'description': task.description,
+        'priority': task.priority,
+        'completed': task.completed,
+        'completed_at': _iso(task.completed_at),
+        'created_at': _iso(task.created_at),
+        'updated_at': _iso(task.updated_at),
+    }
+
+
+def milestone_json(milestone):
+    return {
+        'id': milestone.id,
+        'project_id': milestone.project_id,
+        'name': milestone.name,
+        'description': milestone.description,
+        'date': _iso(milestone.date),
+        'completed': milestone.completed,
+        'created_at': _iso(milestone.created_at),
+        'updated_at': _iso(milestone.updated_at),
+    }
+
+
+def update_json(update):
+    return {
+        'id': update.id,
+        'project_id': update.project_id,
+        'notes': update.notes,
+        'created_at': _iso(update.created_at),
+    }
+
+
+def card_json(card):
+    return {
+        'id': card.id,
+        'client_name': card.client_name,
+        'project_name': card.project_name,
+        'priority': card.priority,
+        'days_since_update': card.days_since_update,
+        'staleness_level': card.staleness_level,
+        'status_preview': card.status_preview['text'] if card.status_preview else None,
+        'tasks': [
+            {'id': task.id, 'target_type': task.target_type, 'target_name': task.target_name,
+             'due_date': _iso(task.due_date), 'description': task.description,
+             'priority': task.priority}
+            for task in card.tasks
+        ],
+        'milestones': [
+            {'id': milestone.id, 'name': milestone.name, 'date': _iso(milestone.date)}
+            for milestone in card.milestones
+        ],
+    }
+
+
+def job_json(job):
+    data = {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'result': job.result,
+        'error': job.error,
+        'created_at': _iso(job.created_at),
+        'started_at': _iso(job.started_at),
+        'finished_at': _iso(job.finished_at),
+    }
+    if job.status == 'succeeded' and job.output_file:
+        data['download_url'] = url_for('jobs.download', id=job.id)
+    return data
+
+
+def _page_json(statement, sort_keys, serialize, sort_name=''):
+    page = paginate_request(statement, sort_keys, sort_name=sort_name)
+    return {
+        'items': [serialize(item) for item in page.items],
+        'next_cursor': page.next_cursor,
+        'prev_cursor': page.prev_cursor,
+    }
+
+
+@bp.errorhandler(400)
+@bp.errorhandler(404)
+@bp.errorhandler(410)
+def error(exc):
+    """API errors are JSON too."""
+    return jsonify({'error': exc.description}), exc.code
+
+
+@bp.route('/projects')
+@conditional_json()
+def projects():
+    """Projects by client name; ?status= (default active) and ?priority= filter."""
+    statement = select(Project).where(Project.status == request.args.get('status', 'active'))
+    if request.args.get('priority'):
+        statement = statement.where(Project.priority == request.args['priority'])
+    return _page_json(statement, [SortKey(Project.client_name), SortKey(Project.id)], project_json)
+
+
+@bp.route('/projects/<int:id>')
+@conditional_json()
+def project(id):
+    """One project with its pending tasks, pending milestones and latest updates."""
+    project = Project.query.get_or_404(id)
+    body = project_json(project)
+    body['tasks'] = [task_json(task) for task in project.get_pending_tasks()]
+    body['milestones'] = [milestone_json(m) for m in project.get_pending_milestones()]
+    body['updates'] = [update_json(update) for update in project.get_status_updates_ordered(limit=10)]
+    return body
+
+
+@bp.route('/tasks')
+@conditional_json()
+def tasks():
+    """Tasks by due date; ?completed= (default false) and ?project_id= filter."""
+    statement = select(Task).where(Task.completed.is_(_flag('completed')))
+    project_id = request.args.get('project_id', type=int)
+    if project_id is not None:
+        statement = statement.where(Task.project_id == project_id)
+    return _page_json(statement, [SortKey(Task.due_date), SortKey(Task.id)], task_json)
+
+
+@bp.route('/milestones')
+@conditional_json()
+def milestones():
+    """Milestones by date; ?completed= (default false) and ?project_id= filter."""
+    statement = select(Milestone).where(Milestone.completed.is_(_flag('completed')))
+    project_id = request.args.get('project_id', type=int)
+    if project_id is not None:
+        statement = statement.where(Milestone.project_id == project_id)
+    return _page_json(statement, [SortKey(Milestone.date), SortKey(Milestone.id)], milestone_json)
+
+
+@bp.route('/updates')
+@conditional_json()
+def updates():
+    """Status updates, newest first; ?project_id= filters."""
+    statement = select(StatusUpdate)
+    project_id = request.args.get('project_id', type=int)
+    if project_id is not None:
+        statement = statement.where(StatusUpdate.project_id == project_id)
+    return _page_json(
+        statement,
+        [SortKey(StatusUpdate.created_at, descending=True), SortKey(StatusUpdate.id, descending=True)],
+        update_json,
+    )
+
+
+@bp.route('/dashboard')
+@conditional_json(extra=lambda: date.today().isoformat())
+def dashboard():
+    """Today's dashboard buckets, served from the dashboard cache.
+
+    Staleness counts calendar days, so the body only changes with the
+    tables and the date the ETag already covers.
+    """
+    today = date.today()
+    snapshot = dashboard_snapshot(today)
+    return {
+        'date': today.isoformat(),
+        **{bucket: [card_json(card) for card in getattr(snapshot, bucket)]
+           for bucket in DASHBOARD_BUCKETS},
+    }
+
+
+# Serializers for change log entries, keyed by table name
+CHANGE_SERIALIZERS = {
+    'projects': project_json,
+    'tasks': task_json,
+    'milestones': milestone_json,
+    'status_updates': update_json,
+}
+
+
+@bp.route('/changes')
+def changes():
+    """Inserts, updates and deletes after ?since= (a change id), oldest first.
+
+    Pass the returned cursor as the next since=; has_more says whether to
+    ask again straight away. Without since= only the current cursor is
+    returned: fetch it, then export, to start syncing. A cursor older than
+    the retained log is a 410: re-export from a fresh cursor.
+    """
+    since = request.args.get('since', type=int)
+    if since is None:
+        return {'changes': [], 'cursor': latest_change_id(), 'has_more': False}
+    limit = request.args.get('limit', type=int, default=CHANGES_LIMIT)
+    try:
+        batch = read_changes(since, limit, CHANGE_SERIALIZERS)
+    except ChangesPruned as exc:
+        abort(410, description=str(exc))
+    return {'changes': batch.changes, 'cursor': batch.cursor, 'has_more': batch.has_more}
+
+
+@bp.route('/exports', methods=['POST'])
+def start_export():
+    """Start a CSV export job (?include_archived=1 for everything); poll its URL."""
+    job = enqueue('export', include_archived=_flag('include_archived'))
+    return job_json(job), 202, {'Location': url_for('api.job', id=job.id)}
+
+
+@bp.route('/jobs/<int:id>')
+def job(id):
+    """A background job's status, and its download_url once it has succeeded."""
+    job = db.session.get(Job, id)
+    if job is None:
+        abort(404)
+    # Resume the job if the process running it has died
+    if not job.done and get_runner().resume_stale():
+        db.session.refresh(job)
+    return job_json(job)
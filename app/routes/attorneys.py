@@ -0,0 +1,59 @@
+from flask import Blueprint, render_template
+from sqlalchemy import func, select
+from sqlalchemy.orm import contains_eager
+from app import db
+from app.models import Attorney, Project, ProjectAttorney, Task, priority_rank
+from app.pagination import SortKey, paginate_request
+
+bp = Blueprint('attorneys', __name__)
+
+
+def _active_projects(attorney_id, role):
+    """Active projects linked to the attorney in `role`, by client name."""
+    return db.session.scalars(
+        select(Project).join(ProjectAttorney)
+        .where(ProjectAttorney.attorney_id == attorney_id, ProjectAttorney.role == role,
+               Project.status == 'active')
+        .order_by(Project.client_name, Project.id)
+    ).all()
+
+
+@bp.route('/')
+def list():
+    """List attorneys with their active matter counts."""
+    rows = db.session.execute(
+        select(
+            Attorney,
+            func.count().filter(ProjectAttorney.role == 'attorney').label('matters'),
+            func.count().filter(ProjectAttorney.role == 'assigner').label('assigned'),
+        )
+        .join(ProjectAttorney).join(Project)
+        .where(Project.status == 'active')
+        .group_by(Attorney.id)
+        .order_by(Attorney.name)
+    ).all()
+    return render_template('attorneys/list.html', rows=rows)
+
+
+@bp.route('/<int:id>')
+def detail(id):
+    """One attorney's matters, the matters they assigned, and their pending tasks."""
+    attorney = Attorney.query.get_or_404(id)
+
+    # Pending tasks on the attorney's matters, a page at a time
+    tasks_page = paginate_request(
+        select(Task)
+        .join(ProjectAttorney, ProjectAttorney.project_id == Task.project_id)
+        .join(Task.project)
+        .where(ProjectAttorney.attorney_id == id, ProjectAttorney.role == 'attorney',
+               Project.status == 'active', Task.completed.is_(False))
+        .options(contains_eager(Task.project)),
+        [SortKey(Task.due_date), SortKey(priority_rank(Task.priority)), SortKey(Task.id)],
+    )
+
+    return render_template('attorneys/detail.html',
+                           attorney=attorney,
+                           matters=_active_projects(id, 'attorney'),
+                           assigned=_active_projects(id, 'assigner'),
+                           tasks=tasks_page.items,
+                           page=tasks_page)
@@ -1,8 +1,9 @@
-from datetime import date, timedelta
+from datetime import date
 
-from flask import Blueprint, render_template
+from flask import Blueprint, Response, abort, jsonify, render_template, request, stream_with_context
 
-from app.models import Project
+from app import live
+from app.cache import dashboard_snapshot, get_cache, get_fragment_cache
 
 bp = Blueprint('dashboard', __name__)
 
@@ -11,58 +12,38 @@ bp = Blueprint('dashboard', __name__)
 def index():
     """Dashboard - projects organized by next task due date."""
     today = date.today()
+    dashboard = dashboard_snapshot(today)
 
-    # Date boundaries
-    tomorrow = today + timedelta(days=1)
-    day_7 = today + timedelta(days=7)
-    day_14 = today + timedelta(days=14)
-
-    # Get all active projects
-    active_projects = Project.query.filter_by(status='active').all()
-
-    # Categorize projects by their next task due date
-    due_today = []       # Next task due today or overdue
-    due_tomorrow = []    # Next task due tomorrow
-    due_this_week = []   # Next task due in 2-7 days
-    due_later = []       # Next task due in 8-14 days
-    no_tasks = []        # Projects with no pending tasks
-
-    for project in active_projects:
-        next_task = project.next_task
-
-        if next_task is None:
-            no_tasks.append(project)
-        elif next_task.due_date <= today:
-            due_today.append(project)
-        elif next_task.due_date == tomorrow:
-            due_tomorrow.append(project)
-        elif next_task.due_date <= day_7:
-            due_this_week.append(project)
-        elif next_task.due_date <= day_14:
-            due_later.append(project)
-        # Projects with next task > 14 days out are not shown on dashboard
-
-    # Sort each category by next task due date, then by task priority
-    priority_order = {'high': 0, 'medium': 1, 'low': 2}
+    return render_template('dashboard.html',
+        due_today=dashboard.due_today,
+        due_tomorrow=dashboard.due_tomorrow,
+        due_this_week=dashboard.due_this_week,
+        due_later=dashboard.due_later,
+        no_tasks=dashboard.no_tasks,
+        change_id=dashboard.change_id,
+        today=today
+    )
 
-    def sort_key(p):
-        # All projects in these lists have a next_task (they were categorized based on it)
-        next_task = p.next_task
-        return (next_task.due_date, priority_order.get(next_task.priority, 1))
 
-    due_today.sort(key=sort_key)
-    due_tomorrow.sort(key=sort_key)
-    due_this_week.sort(key=sort_key)
-    due_later.sort(key=sort_key)
+@bp.route('/events')
+def events():
+    """Server-Sent Events stream of dashboard card changes (see app/live.py).
+
+    Starts after ?since= (the page's change id), or after Last-Event-ID when
+    the browser reconnects.
+    """
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    if since is not None and not since.isdigit():
+        abort(400)
+    return Response(
+        stream_with_context(live.stream(int(since) if since is not None else None)),
+        mimetype='text/event-stream',
+        # Stop proxies from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
-    # Sort no_tasks projects by staleness (most stale first)
-    no_tasks.sort(key=lambda p: -p.days_since_update)
 
-    return render_template('dashboard.html',
-        due_today=due_today,
-        due_tomorrow=due_tomorrow,
-        due_this_week=due_this_week,
-        due_later=due_later,
-        no_tasks=no_tasks,
-        today=today
-    )
+@bp.route('/cache-stats')
+def cache_stats():
+    """Dashboard cache hit/miss counters for this worker process, as JSON."""
+    return jsonify(dict(get_cache().as_dict(), fragments=get_fragment_cache().as_dict()))
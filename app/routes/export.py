@@ -1,47 +1,121 @@
-from flask import Blueprint, Response
+from flask import Blueprint, Response, redirect, request, stream_with_context, url_for
 from datetime import date
 import csv
 from io import StringIO
-from app.models import Project, StatusUpdate, Task
+from sqlalchemy import and_, case, func, select
+from app import db
+from app.jobs import enqueue, job_output_path
+from app.models import ColdMilestone, ColdStatusUpdate, Milestone, Project, StatusUpdate
 
 bp = Blueprint('export', __name__)
 
+# Rows fetched from the database (and flushed to the client) per batch
+EXPORT_BATCH_SIZE = 500
+
+HEADER = [
+    'Client', 'Project', 'Client #', 'Matter #',
+    'Attorneys', 'Priority',
+    'Current Status', 'Next Task', 'Next Milestone'
+]
+
+
+def export_statement(include_archived=False):
+    """One SELECT producing every export row.
+
+    The latest status update is a correlated subquery served by
+    ix_status_updates_project_created; next task and next milestone come from
+    the project rollups, so no per-project queries are issued. Projects in
+    cold storage read the same from the cold tables.
+    """
+    def latest_notes(model):
+        return select(model.notes)\
+            .where(model.project_id == Project.id)\
+            .order_by(model.created_at.desc(), model.id.desc())\
+            .limit(1).scalar_subquery()
+
+    hot = Project.archived_at.is_(None)
+
+    statement = select(
+        Project.client_name, Project.project_name,
+        Project.client_number, Project.matter_number,
+        Project.assigned_attorneys, Project.priority, Project.status,
+        case((hot, latest_notes(StatusUpdate)), else_=latest_notes(ColdStatusUpdate)).label('latest_notes'),
+        Project.rollup_next_task_due,
+        func.coalesce(Milestone.name, ColdMilestone.name).label('milestone_name'),
+        func.coalesce(Milestone.date, ColdMilestone.date).label('milestone_date'),
+    ).outerjoin(Milestone, and_(Milestone.id == Project.rollup_next_milestone_id, hot))\
+        .outerjoin(ColdMilestone, and_(ColdMilestone.id == Project.rollup_next_milestone_id,
+                                       ColdMilestone.project_id == Project.id, ~hot))\
+        .order_by(Project.id)
+
+    if not include_archived:
+        statement = statement.where(Project.status == 'active')
+    return statement
+
+
+def generate_csv(include_archived=False):
+    """Yield the export as CSV text, one chunk per batch of rows."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    header = HEADER + ['Status'] if include_archived else HEADER
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    result = db.session.execute(
+        export_statement(include_archived).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for batch in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            values = [
+                row.client_name,
+                row.project_name,
+                row.client_number or '',
+                row.matter_number or '',
+                row.assigned_attorneys,
+                row.priority,
+                row.latest_notes or '',
+                row.rollup_next_task_due.isoformat() if row.rollup_next_task_due else '',
+                f"{row.milestone_name} ({row.milestone_date.isoformat()})" if row.milestone_name else ''
+            ]
+            if include_archived:
+                values.append(row.status)
+            writer.writerow(values)
+        yield buffer.getvalue()
+
 
 @bp.route('/')
 def export_csv():
-    """Export active projects to CSV."""
-    output = StringIO()
-    writer = csv.writer(output)
-
-    # Header row
-    writer.writerow([
-        'Client', 'Project', 'Client #', 'Matter #',
-        'Attorneys', 'Priority',
-        'Current Status', 'Next Task', 'Next Milestone'
-    ])
-
-    # Data rows
-    for project in Project.query.filter_by(status='active').all():
-        latest_update = StatusUpdate.query.filter_by(project_id=project.id)\
-            .order_by(StatusUpdate.created_at.desc()).first()
-        next_task = Task.query.filter_by(project_id=project.id, completed=False)\
-            .order_by(Task.due_date.asc()).first()
-        next_milestone = project.next_milestone
-
-        writer.writerow([
-            project.client_name,
-            project.project_name,
-            project.client_number or '',
-            project.matter_number or '',
-            project.assigned_attorneys,
-            project.priority,
-            latest_update.notes if latest_update else '',
-            next_task.due_date.isoformat() if next_task else '',
-            f"{next_milestone.name} ({next_milestone.date.isoformat()})" if next_milestone else ''
-        ])
+    """Export projects to CSV, streamed in batches.
+
+    Active projects only by default; ?include_archived=1 exports every
+    project and adds a Status column.
+    """
+    include_archived = request.args.get('include_archived', type=int, default=0) == 1
 
     return Response(
-        output.getvalue(),
+        stream_with_context(generate_csv(include_archived)),
         mimetype='text/csv',
         headers={'Content-Disposition': f'attachment; filename=worklist_{date.today()}.csv'}
     )
+
+
+@bp.route('/', methods=['POST'])
+def start_export():
+    """Run the export as a background job and show its progress page.
+
+    ?include_archived=1 (or the form field) as for GET.
+    """
+    include_archived = request.values.get('include_archived', type=int, default=0) == 1
+    job = enqueue('export', include_archived=include_archived)
+    return redirect(url_for('jobs.detail', id=job.id))
+
+
+def export_job(job, include_archived=False):
+    """Background job: write the CSV export to the job's download file."""
+    path = job_output_path(job, f'worklist_{date.today()}.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as output:
+        output.writelines(generate_csv(include_archived))
+    return {'bytes': path.stat().st_size}
@@ -0,0 +1,38 @@
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+
+from app.importer import IMPORT_KINDS, detect_format, upload_path
+from app.jobs import enqueue
+
+bp = Blueprint('imports', __name__)
+
+
+@bp.route('/', methods=['GET', 'POST'])
+def upload():
+    """Upload a CSV or JSON Lines file and import it as a background job."""
+    if request.method == 'POST':
+        kind = request.form.get('kind', '')
+        upload = request.files.get('file')
+
+        errors = []
+        if kind not in IMPORT_KINDS:
+            errors.append('Choose what the file contains.')
+        format = None
+        if not upload or not upload.filename:
+            errors.append('Choose a file to import.')
+        else:
+            try:
+                format = detect_format(upload.filename)
+            except ValueError:
+                errors.append('The file must be .csv or .jsonl.')
+
+        if errors:
+            for error in errors:
+                flash(error, 'error')
+            return render_template('imports/upload.html', kinds=IMPORT_KINDS), 400
+
+        path = upload_path(upload.filename)
+        upload.save(path)
+        job = enqueue('import', kind=kind, path=str(path), format=format)
+        return redirect(url_for('jobs.detail', id=job.id))
+
+    return render_template('imports/upload.html', kinds=IMPORT_KINDS)
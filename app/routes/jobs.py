@@ -0,0 +1,27 @@
+from flask import Blueprint, abort, render_template, send_from_directory
+
+from app import db
+from app.jobs import get_runner, job_directory
+from app.models import Job
+
+bp = Blueprint('jobs', __name__)
+
+
+@bp.route('/<int:id>')
+def detail(id):
+    """A background job's progress; the page refreshes itself until the job is done."""
+    job = Job.query.get_or_404(id)
+    # Start this process's pool if needed, and run again jobs left queued or
+    # running by a process that has since exited
+    if not job.done and get_runner().resume_stale():
+        db.session.refresh(job)
+    return render_template('jobs/detail.html', job=job)
+
+
+@bp.route('/<int:id>/download')
+def download(id):
+    """The file written by a finished job."""
+    job = Job.query.get_or_404(id)
+    if job.status != 'succeeded' or not job.output_file:
+        abort(404)
+    return send_from_directory(job_directory(job.id), job.output_file, as_attachment=True)
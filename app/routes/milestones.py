@@ -1,16 +1,23 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
 from datetime import datetime
 from app import db
+from app.attorneys import active_attorney_names
 from app.models import Milestone, Project
+from app.projections import ListFilters, pending_milestone_page
 
 bp = Blueprint('milestones', __name__)
 
 
 @bp.route('/')
 def list():
-    """List all pending milestones."""
-    milestones = Milestone.query.filter_by(completed=False).order_by(Milestone.date).all()
-    return render_template('milestones/list.html', milestones=milestones)
+    """List pending milestones by date, a page at a time.
+
+    ?attorney= and a ?start=/?end= date window filter.
+    """
+    filters = ListFilters.from_args(request.args)
+    page = pending_milestone_page(filters)
+    return render_template('milestones/list.html', milestones=page.items, page=page,
+                           filters=filters, attorneys=active_attorney_names('attorney'))
 
 
 @bp.route('/new', methods=['GET', 'POST'])
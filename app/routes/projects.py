@@ -1,7 +1,14 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
+from sqlalchemy import select
 from app import db
-from app.models import Project, StatusUpdate
-from datetime import datetime
+from app.attorneys import active_attorney_names, linked_to
+from app.cold_storage import restore_from_cold
+from app.jobs import enqueue
+from app.models import Project, StatusUpdate, priority_rank
+from app.pagination import InvalidCursor, SortKey, paginate_request
+from app.project_detail import load_project_detail, update_chunk
+from app.validators import validate_project
+from datetime import datetime, timedelta
 
 bp = Blueprint('projects', __name__)
 
@@ -13,58 +20,61 @@ def list():
     priority = request.args.get('priority', '')
     attorney = request.args.get('attorney', '')
     assigner = request.args.get('assigner', '')
+    stale = request.args.get('stale', type=int)
     sort_by = request.args.get('sort_by', 'client_name')
     sort_order = request.args.get('sort_order', 'asc')
 
     # Build query with filters
-    query = Project.query.filter_by(status='active')
-
+    conditions = [Project.status == 'active']
     if priority:
-        query = query.filter(Project.priority == priority)
+        conditions.append(Project.priority == priority)
     if attorney:
-        query = query.filter(Project.assigned_attorneys.contains(attorney))
+        conditions.append(linked_to(attorney, 'attorney'))
     if assigner:
-        query = query.filter(Project.assigner == assigner)
+        conditions.append(linked_to(assigner, 'assigner'))
+    if stale:
+        # Range scan on the materialized last activity timestamp
+        cutoff = datetime.utcnow() - timedelta(days=stale)
+        conditions.append(Project.rollup_last_activity_at <= cutoff)
 
     # Validate sort column - only allow specific columns
     allowed_sort_columns = ['client_name', 'priority', 'staleness', 'created_at']
     if sort_by not in allowed_sort_columns:
         sort_by = 'client_name'
 
-    # Apply sorting
+    # Sort in SQL; staleness and priority sort on the project rollups
     if sort_by == 'staleness':
-        # Staleness is a computed property, sort in Python after fetching
-        projects = query.all()
-        reverse = (sort_order == 'desc')
-        projects.sort(key=lambda p: p.days_since_update, reverse=reverse)
+        # Most recent activity first means least stale first
+        sort_column = Project.rollup_last_activity_at
+        descending = (sort_order == 'asc')
     elif sort_by == 'priority':
         # Custom priority order: high > medium > low
-        projects = query.all()
-        priority_order = {'high': 0, 'medium': 1, 'low': 2}
-        reverse = (sort_order == 'desc')
-        projects.sort(key=lambda p: priority_order.get(p.priority, 1), reverse=reverse)
+        sort_column = priority_rank(Project.priority)
+        descending = (sort_order == 'desc')
     else:
-        # Database sorting for client_name or created_at
-        sort_column = getattr(Project, sort_by, Project.client_name)
-        if sort_order == 'desc':
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        projects = query.all()
+        sort_column = getattr(Project, sort_by)
+        descending = (sort_order == 'desc')
+
+    page = paginate_request(
+        select(Project).where(*conditions),
+        [SortKey(sort_column, descending), SortKey(Project.id)],
+        sort_name=f'{sort_by}:{sort_order}',
+    )
 
     # Get distinct values for filter dropdowns from all active projects
-    all_projects = Project.query.filter_by(status='active').all()
-    attorneys = sorted(set(p.assigned_attorneys for p in all_projects if p.assigned_attorneys))
-    assigners = sorted(set(p.assigner for p in all_projects if p.assigner))
+    attorneys = active_attorney_names('attorney')
+    assigners = active_attorney_names('assigner')
 
     return render_template('projects/list.html',
-                          projects=projects,
+                          projects=page.items,
+                          page=page,
                           attorneys=attorneys,
                           assigners=assigners,
                           current_filters={
                               'priority': priority,
                               'attorney': attorney,
                               'assigner': assigner,
+                              'stale': stale,
                               'sort_by': sort_by,
                               'sort_order': sort_order
                           })
@@ -74,42 +84,9 @@ def list():
 def new():
     """Create a new project."""
     if request.method == 'POST':
-        # Get form data
-        client_name = request.form.get('client_name', '').strip()
-        project_name = request.form.get('project_name', '').strip()
-        matter_number = request.form.get('matter_number', '').strip() or None
-        client_number = request.form.get('client_number', '').strip() or None
-        assigner = request.form.get('assigner', '').strip()
-        assigned_attorneys = request.form.get('assigned_attorneys', '').strip()
-        priority = request.form.get('priority', '').strip()
-        estimated_hours_str = request.form.get('estimated_hours', '').strip()
+        values, errors = validate_project(request.form)
         initial_update = request.form.get('initial_update', '').strip()
 
-        # Validate required fields
-        errors = []
-        if not client_name:
-            errors.append('Client name is required.')
-        if not project_name:
-            errors.append('Project name is required.')
-        if not assigner:
-            errors.append('Assigner is required.')
-        if not assigned_attorneys:
-            errors.append('Assigned attorneys is required.')
-        if not priority:
-            errors.append('Priority is required.')
-        elif priority not in ('high', 'medium', 'low'):
-            errors.append('Priority must be high, medium, or low.')
-
-        # Parse optional estimated_hours
-        estimated_hours = None
-        if estimated_hours_str:
-            try:
-                estimated_hours = float(estimated_hours_str)
-                if estimated_hours < 0:
-                    errors.append('Estimated hours cannot be negative.')
-            except ValueError:
-                errors.append('Estimated hours must be a valid number.')
-
         # If validation errors, flash them and re-render form
         if errors:
             for error in errors:
@@ -117,16 +94,7 @@ def new():
             return render_template('projects/form.html', project=None)
 
         # Create project
-        project = Project(
-            client_name=client_name,
-            project_name=project_name,
-            matter_number=matter_number,
-            client_number=client_number,
-            assigner=assigner,
-            assigned_attorneys=assigned_attorneys,
-            priority=priority,
-            estimated_hours=estimated_hours
-        )
+        project = Project(**values)
         db.session.add(project)
         db.session.flush()  # Get the project ID before committing
 
@@ -147,9 +115,28 @@ def new():
 
 @bp.route('/<int:id>')
 def detail(id):
-    """View project detail."""
+    """View project detail; completed tasks are paged, newest first.
+
+    Archived projects' history is read from cold storage.
+    """
+    detail = load_project_detail(id)
+    return render_template('projects/detail.html', project=detail.project, detail=detail)
+
+
+@bp.route('/<int:id>/updates')
+def updates(id):
+    """Older status updates of a project, one chunk per ?cursor=.
+
+    With ?partial=1 only the list items are returned, for the detail page's
+    "Show older updates" link to append in place.
+    """
     project = Project.query.get_or_404(id)
-    return render_template('projects/detail.html', project=project)
+    try:
+        chunk = update_chunk(project, request.args.get('cursor'))
+    except InvalidCursor:
+        abort(400)
+    template = 'projects/_update_items.html' if request.args.get('partial') else 'projects/updates.html'
+    return render_template(template, project=project, updates=chunk)
 
 
 @bp.route('/<int:id>/edit', methods=['GET', 'POST'])
@@ -157,50 +144,7 @@ def edit(id):
     """Edit a project."""
     project = Project.query.get_or_404(id)
     if request.method == 'POST':
-        # Get form data
-        client_name = request.form.get('client_name', '').strip()
-        project_name = request.form.get('project_name', '').strip()
-        matter_number = request.form.get('matter_number', '').strip() or None
-        client_number = request.form.get('client_number', '').strip() or None
-        assigner = request.form.get('assigner', '').strip()
-        assigned_attorneys = request.form.get('assigned_attorneys', '').strip()
-        priority = request.form.get('priority', '').strip()
-        estimated_hours_str = request.form.get('estimated_hours', '').strip()
-        actual_hours_str = request.form.get('actual_hours', '').strip()
-
-        # Validate required fields
-        errors = []
-        if not client_name:
-            errors.append('Client name is required.')
-        if not project_name:
-            errors.append('Project name is required.')
-        if not assigner:
-            errors.append('Assigner is required.')
-        if not assigned_attorneys:
-            errors.append('Assigned attorneys is required.')
-        if not priority:
-            errors.append('Priority is required.')
-        elif priority not in ('high', 'medium', 'low'):
-            errors.append('Priority must be high, medium, or low.')
-
-        # Parse optional float fields
-        estimated_hours = None
-        if estimated_hours_str:
-            try:
-                estimated_hours = float(estimated_hours_str)
-                if estimated_hours < 0:
-                    errors.append('Estimated hours cannot be negative.')
-            except ValueError:
-                errors.append('Estimated hours must be a valid number.')
-
-        actual_hours = None
-        if actual_hours_str:
-            try:
-                actual_hours = float(actual_hours_str)
-                if actual_hours < 0:
-                    errors.append('Actual hours cannot be negative.')
-            except ValueError:
-                errors.append('Actual hours must be a valid number.')
+        values, errors = validate_project(request.form, with_actual_hours=True)
 
         # If validation errors, flash them and re-render form
         if errors:
@@ -209,15 +153,8 @@ def edit(id):
             return render_template('projects/form.html', project=project)
 
         # Update project fields
-        project.client_name = client_name
-        project.project_name = project_name
-        project.matter_number = matter_number
-        project.client_number = client_number
-        project.assigner = assigner
-        project.assigned_attorneys = assigned_attorneys
-        project.priority = priority
-        project.estimated_hours = estimated_hours
-        project.actual_hours = actual_hours
+        for name, value in values.items():
+            setattr(project, name, value)
         project.updated_at = datetime.utcnow()
 
         db.session.commit()
@@ -229,7 +166,7 @@ def edit(id):
 
 @bp.route('/<int:id>/archive', methods=['GET', 'POST'])
 def archive(id):
-    """Archive a project."""
+    """Archive a project; a background job moves its history to cold storage."""
     project = Project.query.get_or_404(id)
 
     if request.method == 'POST':
@@ -251,6 +188,8 @@ def archive(id):
         project.status = 'archived'
         project.updated_at = datetime.utcnow()
         db.session.commit()
+        # Moving its history to cold storage can take a while for a big matter
+        enqueue('archive', project_id=project.id)
         flash(f'Project "{project.project_name}" has been archived.', 'success')
         return redirect(url_for('projects.list'))
 
@@ -259,10 +198,11 @@ def archive(id):
 
 @bp.route('/<int:id>/unarchive', methods=['POST'])
 def unarchive(id):
-    """Unarchive a project (reactivate)."""
+    """Unarchive a project (reactivate), bringing its history back from cold storage."""
     project = Project.query.get_or_404(id)
     project.status = 'active'
     project.updated_at = datetime.utcnow()
+    restore_from_cold(project)
     db.session.commit()
     flash(f'Project "{project.project_name}" has been reactivated.', 'success')
     return redirect(url_for('projects.detail', id=project.id))
@@ -270,9 +210,12 @@ def unarchive(id):
 
 @bp.route('/archived')
 def archived():
-    """List all archived projects."""
-    projects = Project.query.filter_by(status='archived').all()
-    return render_template('archived.html', projects=projects)
+    """List archived projects, a page at a time."""
+    page = paginate_request(
+        select(Project).where(Project.status == 'archived'),
+        [SortKey(Project.client_name), SortKey(Project.id)],
+    )
+    return render_template('archived.html', projects=page.items, page=page)
 
 
 @bp.route('/<int:id>/updates/new')
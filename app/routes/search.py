@@ -0,0 +1,17 @@
+from flask import Blueprint, jsonify, render_template, request
+
+from app.search import DEFAULT_LIMIT, search
+
+bp = Blueprint('search', __name__)
+
+
+@bp.route('/')
+def index():
+    """Ranked full-text search; JSON when the client asks for it."""
+    terms = request.args.get('q', '').strip()
+    limit = request.args.get('limit', type=int, default=DEFAULT_LIMIT)
+    results = search(terms, limit) if terms else []
+
+    if request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json':
+        return jsonify({'query': terms, 'results': [result.as_dict() for result in results]})
+    return render_template('search.html', terms=terms, results=results)
@@ -1,16 +1,39 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, jsonify
 from datetime import datetime, timedelta
+from sqlalchemy import func, update
 from app import db
+from app.attorneys import active_attorney_names
 from app.models import Task, Project
+from app.projections import ListFilters, pending_task_page
+from app.rollups import recompute_rollups
+from app.validators import PRIORITIES, TARGET_TYPES, validate_task
 
 bp = Blueprint('tasks', __name__)
 
+# Upper bound on tasks per bulk request (one bound parameter per id)
+BULK_MAX_TASKS = 500
+
+BULK_ACTION_LABELS = {
+    'complete': 'completed',
+    'snooze': 'snoozed',
+    'reassign': 'reassigned',
+    'prioritize': 'priority changed',
+}
+
 
 @bp.route('/')
 def list():
-    """List all pending tasks."""
-    tasks = Task.query.filter_by(completed=False).order_by(Task.due_date, Task.priority).all()
-    return render_template('tasks/list.html', tasks=tasks)
+    """List pending tasks by due date, a page at a time.
+
+    ?attorney=, ?target_type= and a ?start=/?end= due date window filter.
+    """
+    filters = ListFilters.from_args(request.args)
+    if filters.target_type not in TARGET_TYPES:
+        filters.target_type = ''
+    page = pending_task_page(filters)
+    return render_template('tasks/list.html', tasks=page.items, page=page, filters=filters,
+                           attorneys=active_attorney_names('attorney'),
+                           target_types=TARGET_TYPES)
 
 
 @bp.route('/new', methods=['GET', 'POST'])
@@ -18,35 +41,13 @@ def new():
     """Create a new task."""
     if request.method == 'POST':
         project_id = request.form.get('project_id')
-        target_type = request.form.get('target_type', '').strip()
-        target_name = request.form.get('target_name', '').strip()
-        due_date_str = request.form.get('due_date', '').strip()
-        description = request.form.get('description', '').strip()
-        priority = request.form.get('priority', '').strip()
 
         # Validate project exists and is active
         project = Project.query.filter_by(id=project_id, status='active').first()
         if not project:
             abort(404)
 
-        # Validate required fields
-        errors = []
-        if not target_name:
-            errors.append('Target name is required.')
-        if not due_date_str:
-            errors.append('Due date is required.')
-        if target_type and target_type not in ('self', 'associate', 'client', 'opposing_counsel', 'assigning_attorney'):
-            errors.append('Invalid target type.')
-        if priority and priority not in ('high', 'medium', 'low'):
-            errors.append('Invalid priority.')
-
-        # Parse due date
-        due_date = None
-        if due_date_str:
-            try:
-                due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date()
-            except ValueError:
-                errors.append('Due date must be a valid date (YYYY-MM-DD).')
+        values, errors = validate_task(request.form)
 
         # If validation errors, flash them and re-render form
         if errors:
@@ -59,14 +60,7 @@ def new():
                                    selected_project_id=project.id)
 
         # Create task
-        task = Task(
-            project_id=project.id,
-            target_type=target_type or 'self',
-            target_name=target_name,
-            due_date=due_date,
-            description=description or None,
-            priority=priority or 'medium'
-        )
+        task = Task(project_id=project.id, **values)
         db.session.add(task)
         db.session.commit()
 
@@ -105,6 +99,99 @@ def snooze(id):
     return redirect(request.referrer or url_for('dashboard.index'))
 
 
+@bp.route('/bulk', methods=['POST'])
+def bulk():
+    """Complete, snooze, reassign or re-prioritize many tasks at once.
+
+    Accepts a form (task_ids repeated) or a JSON body with the same fields.
+    All selected tasks are changed by one UPDATE ... WHERE id IN (...) in a
+    single transaction. JSON requests get a JSON summary; form posts get a
+    flash message and a redirect back.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = request.form.to_dict()
+        data['task_ids'] = request.form.getlist('task_ids')
+
+    errors = []
+    raw_ids = data.get('task_ids') or []
+    try:
+        # A JSON string would otherwise be read one digit at a time (and an
+        # object by its keys); numbers are not iterable and fail below
+        if isinstance(raw_ids, (str, dict)):
+            raise TypeError
+        task_ids = sorted({int(task_id) for task_id in raw_ids})
+    except (TypeError, ValueError):
+        task_ids = []
+        errors.append('Task ids must be a list of integers.')
+    if not task_ids and not errors:
+        errors.append('Select at least one task.')
+    if len(task_ids) > BULK_MAX_TASKS:
+        errors.append(f'At most {BULK_MAX_TASKS} tasks can be changed at once.')
+
+    action = data.get('action', '')
+    values = {}
+    conditions = [Task.id.in_(task_ids)]
+    if action == 'complete':
+        conditions.append(Task.completed.is_(False))
+        values = {'completed': True, 'completed_at': datetime.utcnow()}
+    elif action == 'snooze':
+        try:
+            days = max(1, min(int(data.get('days') or 1), 365))
+        except (TypeError, ValueError):
+            days = 1
+        # Push each task from its own due date, in SQL
+        values = {'due_date': func.date(Task.due_date, f'+{days} days', type_=db.Date)}
+    elif action == 'reassign':
+        target_type = (data.get('target_type') or '').strip() or 'self'
+        target_name = (data.get('target_name') or '').strip()
+        if target_type not in TARGET_TYPES:
+            errors.append('Invalid target type.')
+        if not target_name:
+            errors.append('Target name is required.')
+        values = {'target_type': target_type, 'target_name': target_name}
+    elif action == 'prioritize':
+        priority = (data.get('priority') or '').strip()
+        if priority not in PRIORITIES:
+            errors.append('Invalid priority.')
+        values = {'priority': priority}
+    else:
+        errors.append('Unknown bulk action.')
+
+    if errors:
+        if request.is_json:
+            return jsonify({'errors': errors}), 400
+        for error in errors:
+            flash(error, 'error')
+        return redirect(request.referrer or url_for('tasks.list'))
+
+    rows = db.session.execute(
+        update(Task).where(*conditions).values(**values)
+        .returning(Task.id, Task.project_id)
+        .execution_options(synchronize_session='fetch')
+    ).all()
+    # Bulk UPDATEs bypass the flush hooks that maintain project rollups
+    project_ids = sorted({row.project_id for row in rows})
+    recompute_rollups(db.session.connection(), project_ids)
+    db.session.commit()
+
+    summary = {
+        'action': action,
+        'requested': len(task_ids),
+        'updated': len(rows),
+        'task_ids': sorted(row.id for row in rows),
+        'project_ids': project_ids,
+    }
+    if request.is_json:
+        return jsonify(summary)
+    skipped = summary['requested'] - summary['updated']
+    message = f"{summary['updated']} task(s) updated ({BULK_ACTION_LABELS[action]})."
+    if skipped:
+        message += f' {skipped} skipped.'
+    flash(message, 'success')
+    return redirect(request.referrer or url_for('tasks.list'))
+
+
 @bp.route('/<int:id>/edit', methods=['GET', 'POST'])
 def edit(id):
     """Edit an existing task."""
@@ -112,35 +199,13 @@ def edit(id):
 
     if request.method == 'POST':
         project_id = request.form.get('project_id')
-        target_type = request.form.get('target_type', '').strip()
-        target_name = request.form.get('target_name', '').strip()
-        due_date_str = request.form.get('due_date', '').strip()
-        description = request.form.get('description', '').strip()
-        priority = request.form.get('priority', '').strip()
 
         # Validate project exists and is active
         project = Project.query.filter_by(id=project_id, status='active').first()
         if not project:
             abort(404)
 
-        # Validate required fields
-        errors = []
-        if not target_name:
-            errors.append('Target name is required.')
-        if not due_date_str:
-            errors.append('Due date is required.')
-        if target_type and target_type not in ('self', 'associate', 'client', 'opposing_counsel', 'assigning_attorney'):
-            errors.append('Invalid target type.')
-        if priority and priority not in ('high', 'medium', 'low'):
-            errors.append('Invalid priority.')
-
-        # Parse due date
-        due_date = None
-        if due_date_str:
-            try:
-                due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date()
-            except ValueError:
-                errors.append('Due date must be a valid date (YYYY-MM-DD).')
+        values, errors = validate_task(request.form)
 
         # If validation errors, flash them and re-render form
         if errors:
@@ -154,11 +219,8 @@ def edit(id):
 
         # Update task
         task.project_id = project.id
-        task.target_type = target_type or 'self'
-        task.target_name = target_name
-        task.due_date = due_date
-        task.description = description or None
-        task.priority = priority or 'medium'
+        for name, value in values.items():
+            setattr(task, name, value)
         db.session.commit()
 
         flash('Task updated successfully.', 'success')
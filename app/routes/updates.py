@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
 from app import db
 from app.models import Project, StatusUpdate
+from app.validators import validate_update
 
 bp = Blueprint('updates', __name__)
 
@@ -10,24 +11,21 @@ def new():
     """Create a new status update."""
     if request.method == 'POST':
         project_id = request.form.get('project_id')
-        notes = request.form.get('notes', '').strip()
 
         # Validate project exists and is active
         project = Project.query.filter_by(id=project_id, status='active').first()
         if not project:
             abort(404)
 
-        # Validate notes provided
-        if not notes:
-            flash('Status update notes are required.', 'error')
+        values, errors = validate_update(request.form)
+        if errors:
+            for error in errors:
+                flash(error, 'error')
             projects = Project.query.filter_by(status='active').order_by(Project.client_name).all()
             return render_template('updates/form.html', projects=projects, selected_project_id=project.id)
 
         # Create status update
-        status_update = StatusUpdate(
-            project_id=project.id,
-            notes=notes
-        )
+        status_update = StatusUpdate(project_id=project.id, **values)
         db.session.add(status_update)
         db.session.commit()
 
@@ -0,0 +1,115 @@
+"""In-place schema upgrades for existing worklist.db files.
+
+db.create_all() only creates missing tables. These helpers bring tables that
+already exist up to date with the models (new columns, new indexes) without
+touching their data.
+
+upgrade_database() (`flask init-db`) runs every step and records
+SCHEMA_VERSION in the database's user_version, so a starting process can
+tell with one PRAGMA whether there is anything to do.
+"""
+import os
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+
+from app import db
+
+# Bump whenever a change needs `flask init-db` on existing databases: new
+# tables, columns or indexes, or a data migration.
+SCHEMA_VERSION = 6
+
+
+def _database_file():
+    """Path of the SQLite database file, or None for an in-memory database."""
+    database = db.engine.url.database
+    return None if database in (None, '', ':memory:') else database
+
+
+def schema_version():
+    """The SCHEMA_VERSION the database was last upgraded to; 0 if never."""
+    database = _database_file()
+    if database is not None and not os.path.exists(database):
+        return 0
+    with db.engine.connect() as connection:
+        return connection.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def schema_is_current():
+    """True unless the database needs `flask init-db`."""
+    return schema_version() >= SCHEMA_VERSION
+
+
+def upgrade_database(echo=print):
+    """Create the database or bring it up to date, reporting each step with `echo`."""
+    from app.attorneys import attorneys_need_migration, migrate_attorneys
+    from app.cold_storage import archive_backlog, cold_storage_backlog
+    from app.rollups import rebuild_rollups
+    from app.search import rebuild_search_index, search_index_needs_rebuild
+
+    database = _database_file()
+    if database is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+    db.create_all()
+    added = add_missing_columns()
+    for column in added:
+        echo(f'Added column {column}.')
+    if any(column.startswith('projects.rollup_') for column in added):
+        echo(f'Rebuilt rollups for {rebuild_rollups()} project(s).')
+    for index in create_missing_indexes():
+        echo(f'Created index {index}.')
+    if search_index_needs_rebuild():
+        echo(f'Indexed {rebuild_search_index()} record(s) for search.')
+    if attorneys_need_migration():
+        projects, attorneys = migrate_attorneys()
+        echo(f'Linked {projects} project(s) to {attorneys} attorney(s).')
+    if cold_storage_backlog():
+        echo(f'Moved {archive_backlog()} archived project(s) to cold storage.')
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+
+def add_missing_columns():
+    """ALTER TABLE ... ADD COLUMN for every model column the database lacks.
+
+    Returns a list of "table.column" names that were added.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {ddl}')
+                added.append(f'{table.name}.{column.name}')
+    return added
+
+
+def create_missing_indexes():
+    """CREATE INDEX for every model index the database lacks, then ANALYZE.
+
+    Returns a list of index names that were created.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                if index.name in existing:
+                    continue
+                index.create(bind=connection)
+                created.append(index.name)
+        if created:
+            # Refresh planner statistics so SQLite picks up the new indexes
+            connection.exec_driver_sql('ANALYZE')
+    return created
@@ -0,0 +1,263 @@
+"""Full-text search over projects, status updates, tasks and milestones.
+
+Searchable text lives in an SQLite FTS5 table, search_index, kept in sync by
+triggers on the source tables. Triggers (rather than ORM events) also catch
+bulk UPDATEs and raw SQL. Each row's rowid encodes its source as
+``record_id * 4 + kind code``, so triggers replace or remove an entry with a
+rowid lookup instead of scanning the index.
+
+Archived projects' history lives in cold tables (app.cold_storage) and is
+indexed from there. A row moving between a hot table and its cold twin keeps
+its id, so its entry is simply kept: a delete only removes the entry when the
+row has not arrived on the other side.
+
+The table and triggers are created whenever db.create_all() runs; `flask
+rebuild-search-index` (re)fills the index from the source tables.
+"""
+from dataclasses import dataclass
+
+from markupsafe import Markup, escape
+from sqlalchemy import event, text
+
+from app import db
+
+SEARCH_TABLE = 'search_index'
+
+# Characters FTS5 never sees in user text, used to mark highlighted terms
+# before the snippet is HTML-escaped
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+@dataclass(frozen=True, slots=True)
+class SearchSource:
+    """How one table (and its cold twin) feeds the index; `{r}` is the row alias (new/old/table)."""
+    kind: str
+    code: int
+    table: str
+    title: str
+    body: str
+    project_id: str
+    watched: tuple
+    cold_table: str = None
+
+    @property
+    def tables(self):
+        return (self.table, self.cold_table) if self.cold_table else (self.table,)
+
+    def values(self, row):
+        return (f'{row}.id * 4 + {self.code}', f"'{self.kind}'", f'{row}.id',
+                self.project_id.format(r=row), self.title.format(r=row),
+                self.body.format(r=row))
+
+
+SEARCH_SOURCES = (
+    SearchSource(
+        kind='project', code=0, table='projects',
+        title="{r}.client_name || ': ' || {r}.project_name",
+        body="coalesce({r}.client_number, '') || ' ' || coalesce({r}.matter_number, '') || ' ' "
+             "|| {r}.assigner || ' ' || {r}.assigned_attorneys",
+        project_id='{r}.id',
+        watched=('client_name', 'project_name', 'client_number', 'matter_number',
+                 'assigner', 'assigned_attorneys'),
+    ),
+    SearchSource(
+        kind='update', code=1, table='status_updates',
+        title="''", body='{r}.notes', project_id='{r}.project_id',
+        watched=('notes', 'project_id'), cold_table='cold_status_updates',
+    ),
+    SearchSource(
+        kind='task', code=2, table='tasks',
+        title='{r}.target_name', body="coalesce({r}.description, '')",
+        project_id='{r}.project_id',
+        watched=('target_name', 'description', 'project_id'), cold_table='cold_tasks',
+    ),
+    SearchSource(
+        kind='milestone', code=3, table='milestones',
+        title='{r}.name', body="coalesce({r}.description, '')",
+        project_id='{r}.project_id',
+        watched=('name', 'description', 'project_id'), cold_table='cold_milestones',
+    ),
+)
+
+_COLUMNS = 'rowid, kind, record_id, project_id, title, body'
+
+
+def _insert(source, row):
+    # OR REPLACE: a row moving in from its twin table finds its entry there
+    return f'INSERT OR REPLACE INTO {SEARCH_TABLE} ({_COLUMNS}) VALUES ({", ".join(source.values(row))});'
+
+
+def _delete(source, row, twin=None):
+    statement = f'DELETE FROM {SEARCH_TABLE} WHERE rowid = {row}.id * 4 + {source.code}'
+    if twin:
+        # Moved, not deleted: the row is already in its twin table
+        statement += (f' AND NOT EXISTS (SELECT 1 FROM {twin} '
+                      f'WHERE id = {row}.id AND project_id = {row}.project_id)')
+    return statement + ';'
+
+
+def search_ddl():
+    """CREATE statements for the FTS5 table, and DROP and CREATE for its sync triggers.
+
+    Dropping first replaces the triggers of databases created by an older
+    version.
+    """
+    statements = [
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+        "kind UNINDEXED, record_id UNINDEXED, project_id UNINDEXED, title, body, "
+        "tokenize = 'porter unicode61')"
+    ]
+    for source in SEARCH_SOURCES:
+        for table in source.tables:
+            twin = next((other for other in source.tables if other != table), None)
+            prefix = f'{SEARCH_TABLE}_{table}'
+            for name in ('ai', 'au', 'ad'):
+                statements.append(f'DROP TRIGGER IF EXISTS {prefix}_{name}')
+            statements += [
+                f'CREATE TRIGGER {prefix}_ai AFTER INSERT ON {table} '
+                f'BEGIN {_insert(source, "new")} END',
+                f'CREATE TRIGGER {prefix}_au AFTER UPDATE OF {", ".join(source.watched)} '
+                f'ON {table} BEGIN {_delete(source, "old")} {_insert(source, "new")} END',
+                f'CREATE TRIGGER {prefix}_ad AFTER DELETE ON {table} '
+                f'BEGIN {_delete(source, "old", twin)} END',
+            ]
+    return statements
+
+
+def _create_search_index(target, connection, **kw):
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in search_ddl():
+        connection.exec_driver_sql(statement)
+
+
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name != 'sqlite':
+        return
+    connection.exec_driver_sql(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def register_listeners():
+    """Create/drop the search index alongside db.create_all()/drop_all()."""
+    if not event.contains(db.metadata, 'after_create', _create_search_index):
+        event.listen(db.metadata, 'after_create', _create_search_index)
+        event.listen(db.metadata, 'before_drop', _drop_search_index)
+
+
+def rebuild_search_index():
+    """Refill the index from the source tables. Returns the number of entries."""
+    connection = db.session.connection()
+    connection.exec_driver_sql(f'DELETE FROM {SEARCH_TABLE}')
+    for source in SEARCH_SOURCES:
+        for table in source.tables:
+            connection.exec_driver_sql(
+                f'INSERT OR REPLACE INTO {SEARCH_TABLE} ({_COLUMNS}) '
+                f'SELECT {", ".join(source.values(table))} FROM {table}'
+            )
+    connection.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    count = connection.exec_driver_sql(f'SELECT count(*) FROM {SEARCH_TABLE}').scalar()
+    db.session.commit()
+    return count
+
+
+def search_index_needs_rebuild():
+    """True when the index is empty but there is something to index, or a
+    cold row has no entry.
+
+    These are the states of an existing database the first time the search
+    table is created for it, and of cold history moved before it was indexed.
+    """
+    connection = db.session.connection()
+    if not connection.exec_driver_sql(f'SELECT 1 FROM {SEARCH_TABLE} LIMIT 1').first():
+        return any(
+            connection.exec_driver_sql(f'SELECT 1 FROM {table} LIMIT 1').first()
+            for source in SEARCH_SOURCES for table in source.tables
+        )
+    return any(
+        connection.exec_driver_sql(
+            f'SELECT 1 FROM {source.cold_table} AS c WHERE NOT EXISTS '
+            f'(SELECT 1 FROM {SEARCH_TABLE} WHERE rowid = c.id * 4 + {source.code}) LIMIT 1'
+        ).first()
+        for source in SEARCH_SOURCES if source.cold_table
+    )
+
+
+def build_match_query(terms):
+    """Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Words are quoted so FTS5 operators and punctuation in user input are
+    treated as plain text. Returns '' when there is nothing to search for.
+    """
+    words = [word.replace('"', '') for word in terms.split()]
+    return ' '.join(f'"{word}"*' for word in words if word)
+
+
+def _highlight(value):
+    """HTML-escape `value`, then turn the match markers into <mark> tags."""
+    escaped = str(escape(value))
+    return Markup(escaped.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """One ranked hit, with highlighted title and body snippet (safe HTML)."""
+    kind: str
+    record_id: int
+    project_id: int
+    client_name: str
+    project_name: str
+    project_status: str
+    title: Markup
+    snippet: Markup
+    rank: float
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'record_id': self.record_id,
+            'project_id': self.project_id,
+            'client_name': self.client_name,
+            'project_name': self.project_name,
+            'project_status': self.project_status,
+            'title': str(self.title),
+            'snippet': str(self.snippet),
+            'rank': self.rank,
+        }
+
+
+_SEARCH_SQL = text(f"""
+    SELECT s.kind, s.record_id, s.project_id,
+           p.client_name, p.project_name, p.status,
+           highlight({SEARCH_TABLE}, 3, :mark_start, :mark_end) AS title,
+           snippet({SEARCH_TABLE}, 4, :mark_start, :mark_end, '…', 16) AS snippet,
+           bm25({SEARCH_TABLE}, 0.0, 0.0, 0.0, 10.0, 1.0) AS rank
+    FROM {SEARCH_TABLE} AS s
+    JOIN projects AS p ON p.id = s.project_id
+    WHERE {SEARCH_TABLE} MATCH :query
+    ORDER BY rank
+    LIMIT :limit
+""")
+
+
+def search(terms, limit=DEFAULT_LIMIT):
+    """Return up to `limit` SearchResults for `terms`, best match first."""
+    query = build_match_query(terms)
+    if not query:
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    rows = db.session.execute(_SEARCH_SQL, {
+        'query': query, 'limit': limit,
+        'mark_start': _MARK_START, 'mark_end': _MARK_END,
+    }).all()
+    return [
+        SearchResult(
+            kind=row.kind, record_id=row.record_id, project_id=row.project_id,
+            client_name=row.client_name, project_name=row.project_name,
+            project_status=row.status, title=_highlight(row.title),
+            snippet=_highlight(row.snippet), rank=row.rank,
+        )
+        for row in rows
+    ]
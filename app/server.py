@@ -0,0 +1,57 @@
+"""Production serving: worker sizing and fork safety.
+
+wsgi.py is the WSGI entry point and gunicorn.conf.py the settings for a
+pre-forking server. The app is created once in the master process
+(preload_app), so every worker shares its imported code copy-on-write
+instead of importing it again. A pooled SQLite connection must never be used
+on both sides of a fork, so each forked process starts with empty connection
+pools.
+"""
+import os
+import weakref
+
+from app import db
+from config import Config
+
+# Engines of every app created in this process
+_engines = weakref.WeakSet()
+
+
+def worker_count(cpus=None):
+    """Worker processes: WORKLIST_WORKERS, else two per CPU plus one.
+
+    Page renders are CPU-bound Python, and most reads are served from the
+    SQLite page cache, so workers scale with cores; the extra ones cover
+    requests waiting on the single SQLite writer.
+    """
+    if os.environ.get('WORKLIST_WORKERS'):
+        return int(os.environ['WORKLIST_WORKERS'])
+    return 2 * (cpus or os.cpu_count() or 1) + 1
+
+
+def thread_count(live_streams=None):
+    """Threads per worker: WORKLIST_THREADS, else 2 plus one per live stream.
+
+    A second thread lets a worker keep serving while one request waits out
+    busy_timeout on a write lock. Each open live dashboard stream holds a
+    thread, up to LIVE_MAX_STREAMS (`live_streams`) per worker, so those
+    come on top.
+    """
+    if os.environ.get('WORKLIST_THREADS'):
+        return int(os.environ['WORKLIST_THREADS'])
+    return 2 + (Config.LIVE_MAX_STREAMS if live_streams is None else live_streams)
+
+
+def _reset_pools():
+    for engine in list(_engines):
+        # close=False: the parent still owns the connections it opened
+        engine.dispose(close=False)
+
+
+def init_app(app):
+    """Give every process forked from this one its own connection pools."""
+    with app.app_context():
+        _engines.update(db.engines.values())
+
+
+os.register_at_fork(after_in_child=_reset_pools)
@@ -0,0 +1,27 @@
+"""Apply the configured SQLite pragmas to every new database connection."""
+from sqlalchemy import event
+
+from app import db
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Run PRAGMA name=value for each entry on a raw DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def init_app(app):
+    """Register a connect hook applying app.config['SQLITE_PRAGMAS']."""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
@@ -52,14 +52,16 @@ document.addEventListener('DOMContentLoaded', function() {
     const confirmCancel = document.getElementById('confirm-cancel');
     let pendingForm = null;
 
-    // Handle forms with data-confirm attribute
-    document.querySelectorAll('form[data-confirm]').forEach(function(form) {
-        form.addEventListener('submit', function(e) {
-            e.preventDefault();
-            pendingForm = form;
-            modalMessage.textContent = form.getAttribute('data-confirm');
-            modal.style.display = 'flex';
-        });
+    // Handle forms with data-confirm attribute (delegated, so live-updated cards work too)
+    document.addEventListener('submit', function(e) {
+        const form = e.target.closest('form[data-confirm]');
+        if (!form) {
+            return;
+        }
+        e.preventDefault();
+        pendingForm = form;
+        modalMessage.textContent = form.getAttribute('data-confirm');
+        modal.style.display = 'flex';
     });
 
     // Modal cancel button
@@ -101,20 +103,137 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // Status preview expand/collapse
-    document.querySelectorAll('.btn-expand').forEach(function(button) {
-        button.addEventListener('click', function() {
-            var preview = this.closest('.status-preview');
-            var previewText = preview.querySelector('.preview-text');
-            var fullText = this.getAttribute('data-full-text');
-
-            if (this.textContent === 'Show more...') {
-                this.setAttribute('data-preview-text', previewText.textContent);
-                previewText.textContent = fullText;
-                this.textContent = 'Show less';
-            } else {
-                previewText.textContent = this.getAttribute('data-preview-text');
-                this.textContent = 'Show more...';
+    document.addEventListener('click', function(e) {
+        var button = e.target.closest('.btn-expand');
+        if (!button) {
+            return;
+        }
+        var preview = button.closest('.status-preview');
+        var previewText = preview.querySelector('.preview-text');
+        var fullText = button.getAttribute('data-full-text');
+
+        if (button.textContent.trim() === 'Show more...') {
+            button.setAttribute('data-preview-text', previewText.textContent);
+            previewText.textContent = fullText;
+            button.textContent = 'Show less';
+        } else {
+            previewText.textContent = button.getAttribute('data-preview-text');
+            button.textContent = 'Show more...';
+        }
+    });
+
+    // "Show older updates": fetch the next chunk and append it in place
+    document.addEventListener('click', function(e) {
+        const link = e.target.closest('a[data-load-more]');
+        if (!link) {
+            return;
+        }
+        e.preventDefault();
+        const url = new URL(link.href);
+        url.searchParams.set('partial', '1');
+        link.classList.add('disabled');
+        fetch(url).then(function(response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
             }
+            return response.text();
+        }).then(function(html) {
+            const item = link.closest('li');
+            item.insertAdjacentHTML('beforebegin', html);
+            item.remove();
+        }).catch(function() {
+            // Fall back to the full page of older updates
+            window.location.href = link.href;
         });
     });
+
+    // Bulk task actions: selection count, select-all, and per-action fields
+    const bulkForm = document.getElementById('bulk-form');
+    if (bulkForm) {
+        const selectAll = document.querySelector('[data-bulk-select-all]');
+        const count = bulkForm.querySelector('[data-bulk-count]');
+        const submit = bulkForm.querySelector('[data-bulk-submit]');
+        const action = bulkForm.querySelector('[data-bulk-action]');
+
+        // Looked up on each use: live updates replace dashboard cards
+        function checkboxes() {
+            return document.querySelectorAll('input[name="task_ids"][form="bulk-form"]');
+        }
+
+        function updateSelection() {
+            const selected = Array.from(checkboxes()).filter(function(box) { return box.checked; }).length;
+            count.textContent = selected + ' selected';
+            submit.disabled = selected === 0;
+        }
+
+        function updateFields() {
+            bulkForm.querySelectorAll('[data-bulk-field]').forEach(function(field) {
+                field.hidden = field.getAttribute('data-bulk-field') !== action.value;
+            });
+        }
+
+        document.addEventListener('change', function(e) {
+            if (e.target.matches('input[name="task_ids"][form="bulk-form"]')) {
+                updateSelection();
+            }
+        });
+        if (selectAll) {
+            selectAll.addEventListener('change', function() {
+                checkboxes().forEach(function(box) { box.checked = selectAll.checked; });
+                updateSelection();
+            });
+        }
+        action.addEventListener('change', updateFields);
+        updateSelection();
+        updateFields();
+    }
+
+    // Live dashboard: patch project cards from the server's change stream
+    const dashboard = document.querySelector('.dashboard[data-live-url]');
+    if (dashboard && window.EventSource) {
+        const source = new EventSource(dashboard.getAttribute('data-live-url'));
+
+        function updateEmptyState(section) {
+            const empty = section.querySelector('.project-list').children.length === 0;
+            const placeholder = section.querySelector('.placeholder');
+            if (placeholder) {
+                placeholder.hidden = !empty;
+            } else {
+                section.hidden = empty;
+            }
+        }
+
+        source.addEventListener('card', function(e) {
+            const change = JSON.parse(e.data);
+            if (change.today !== dashboard.getAttribute('data-today')) {
+                // A new day moves every card between lists
+                window.location.reload();
+                return;
+            }
+            const current = dashboard.querySelector('.project-card[data-project-id="' + change.id + '"]');
+            if (current) {
+                const section = current.closest('section');
+                current.remove();
+                updateEmptyState(section);
+            }
+            if (!change.bucket) {
+                return;
+            }
+            const section = dashboard.querySelector('section[data-bucket="' + change.bucket + '"]');
+            const list = section.querySelector('.project-list');
+            const template = document.createElement('template');
+            template.innerHTML = change.html.trim();
+            const card = template.content.firstElementChild;
+            const next = Array.from(list.children).find(function(item) {
+                return item.getAttribute('data-sort-key') > change.sort_key;
+            });
+            list.insertBefore(card, next || null);
+            card.classList.add('live-updated');
+            updateEmptyState(section);
+        });
+
+        source.addEventListener('reload', function() {
+            window.location.reload();
+        });
+    }
 });
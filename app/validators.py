@@ -0,0 +1,102 @@
+"""Validation rules shared by the entry forms and the bulk importer.
+
+Each validate_*() takes a mapping of raw field values (a request form, a CSV
+row or a decoded JSON object) and returns (values, errors): the cleaned
+column values and the error messages in form order. `values` is only
+meaningful when `errors` is empty.
+"""
+from datetime import datetime
+
+PRIORITIES = ('high', 'medium', 'low')
+
+TARGET_TYPES = ('self', 'associate', 'client', 'opposing_counsel', 'assigning_attorney')
+
+
+def _text(data, name):
+    value = data.get(name)
+    return '' if value is None else str(value).strip()
+
+
+def _hours(data, name, label, errors):
+    text = _text(data, name)
+    if not text:
+        return None
+    try:
+        hours = float(text)
+    except ValueError:
+        errors.append(f'{label} must be a valid number.')
+        return None
+    if hours < 0:
+        errors.append(f'{label} cannot be negative.')
+    return hours
+
+
+def validate_project(data, with_actual_hours=False):
+    """Project fields, as on the new project form (plus actual hours when editing)."""
+    values = {
+        'client_name': _text(data, 'client_name'),
+        'project_name': _text(data, 'project_name'),
+        'matter_number': _text(data, 'matter_number') or None,
+        'client_number': _text(data, 'client_number') or None,
+        'assigner': _text(data, 'assigner'),
+        'assigned_attorneys': _text(data, 'assigned_attorneys'),
+        'priority': _text(data, 'priority'),
+    }
+
+    errors = []
+    if not values['client_name']:
+        errors.append('Client name is required.')
+    if not values['project_name']:
+        errors.append('Project name is required.')
+    if not values['assigner']:
+        errors.append('Assigner is required.')
+    if not values['assigned_attorneys']:
+        errors.append('Assigned attorneys is required.')
+    if not values['priority']:
+        errors.append('Priority is required.')
+    elif values['priority'] not in PRIORITIES:
+        errors.append('Priority must be high, medium, or low.')
+
+    values['estimated_hours'] = _hours(data, 'estimated_hours', 'Estimated hours', errors)
+    if with_actual_hours:
+        values['actual_hours'] = _hours(data, 'actual_hours', 'Actual hours', errors)
+    return values, errors
+
+
+def validate_task(data):
+    """Task fields, as on the task form; the project is checked by the caller."""
+    target_type = _text(data, 'target_type')
+    target_name = _text(data, 'target_name')
+    due_date_str = _text(data, 'due_date')
+    priority = _text(data, 'priority')
+
+    errors = []
+    if not target_name:
+        errors.append('Target name is required.')
+    if not due_date_str:
+        errors.append('Due date is required.')
+    if target_type and target_type not in TARGET_TYPES:
+        errors.append('Invalid target type.')
+    if priority and priority not in PRIORITIES:
+        errors.append('Invalid priority.')
+
+    due_date = None
+    if due_date_str:
+        try:
+            due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            errors.append('Due date must be a valid date (YYYY-MM-DD).')
+
+    return {
+        'target_type': target_type or 'self',
+        'target_name': target_name,
+        'due_date': due_date,
+        'description': _text(data, 'description') or None,
+        'priority': priority or 'medium',
+    }, errors
+
+
+def validate_update(data):
+    """Status update fields, as on the status update form."""
+    notes = _text(data, 'notes')
+    return {'notes': notes}, [] if notes else ['Status update notes are required.']
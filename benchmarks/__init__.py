@@ -0,0 +1,9 @@
+"""Performance benchmarks for the Legal Work Tracker.
+
+Run individual benchmarks as modules, e.g. ``python -m benchmarks.query_plans``.
+``python -m benchmarks.run`` times every route against data from
+``benchmarks.datagen`` and compares the results with ``baseline.json``;
+``python -m benchmarks.startup`` profiles cold start against
+``startup_baseline.json``; ``python -m benchmarks.loadtest`` measures
+throughput under gunicorn at several worker counts.
+"""
@@ -0,0 +1,209 @@
+"""Seeded synthetic data at realistic firm volumes.
+
+The same scale and seed always produce the same rows (dated relative to the
+day they are generated), so timings from different runs and the stored
+baseline are comparable. Rows are written
+with executemany straight into the tables, bypassing the ORM; the search
+index and change log fill from their triggers as they would in production,
+and project rollups are rebuilt at the end.
+
+Work is spread unevenly, as in a real firm: attorney popularity follows a
+Zipf-like curve, so a few partners assign most matters and a few associates
+carry most of the work, and a minority of busy matters hold most of the
+tasks and status updates.
+
+Usage: python -m benchmarks.datagen DATA_DIR [--scale firm] [--seed 42]
+"""
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+
+@dataclass(frozen=True, slots=True)
+class Scale:
+    projects: int
+    tasks: int
+    milestones: int
+    updates: int
+    attorneys: int
+
+
+SCALES = {
+    # Quick local runs and CI smoke checks
+    'small': Scale(projects=500, tasks=10_000, milestones=2_500, updates=50_000, attorneys=30),
+    # A mid-sized firm after several years of use
+    'firm': Scale(projects=5_000, tasks=100_000, milestones=25_000, updates=500_000, attorneys=120),
+}
+
+TARGET_TYPES = ('self', 'associate', 'client', 'opposing_counsel', 'assigning_attorney')
+PRIORITIES = ('high', 'medium', 'low')
+PRIORITY_WEIGHTS = (2, 5, 3)
+WORDS = (
+    'motion', 'discovery', 'deposition', 'brief', 'filing', 'settlement', 'contract',
+    'review', 'draft', 'hearing', 'patent', 'trademark', 'lease', 'merger', 'subpoena',
+    'appeal', 'mediation', 'exhibit', 'witness', 'invoice', 'call', 'email', 'revise',
+)
+MILESTONE_NAMES = ('Initial Filing', 'Discovery Cutoff', 'Mediation', 'Trial', 'Closing')
+
+# Batch size for executemany; keeps memory flat at firm scale
+_CHUNK = 10_000
+
+
+def _timestamp(value):
+    """SQLAlchemy's SQLite DateTime storage format."""
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def _zipf_weights(count, exponent=1.1):
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def _insert(connection, sql, rows):
+    rows = iter(rows)
+    while True:
+        chunk = [row for _, row in zip(range(_CHUNK), rows)]
+        if not chunk:
+            return
+        connection.exec_driver_sql(sql, chunk)
+
+
+def _project_ids(rng, scale, count):
+    """`count` project ids skewed towards a busy minority of matters."""
+    weights = _zipf_weights(scale.projects, exponent=0.8)
+    ids = list(range(1, scale.projects + 1))
+    rng.shuffle(ids)
+    return rng.choices(ids, weights=weights, k=count)
+
+
+def populate(connection, scale, seed=42):
+    """Fill an empty schema on `connection` with `scale` worth of rows."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    today = date.today()
+
+    attorneys = [f'Attorney {i:03d}' for i in range(1, scale.attorneys + 1)]
+    attorney_weights = _zipf_weights(scale.attorneys)
+    partners = attorneys[:max(1, scale.attorneys // 6)]
+    partner_weights = attorney_weights[:len(partners)]
+
+    projects, links = [], []
+    for project_id in range(1, scale.projects + 1):
+        assigner = rng.choices(partners, weights=partner_weights)[0]
+        assigned = sorted(set(rng.choices(attorneys, weights=attorney_weights, k=rng.randint(1, 3))))
+        created = now - timedelta(days=rng.randint(0, 5 * 365), minutes=rng.randint(0, 1440))
+        status = 'active' if rng.random() < 0.6 else 'archived'
+        projects.append((
+            project_id, f'Client {rng.randint(1, scale.projects // 4):04d}',
+            f'{_sentence(rng, 3)[:-1]} matter', f'{created.year}-{project_id:05d}',
+            f'C{project_id % 997:04d}', assigner, ', '.join(assigned),
+            rng.choices(PRIORITIES, weights=PRIORITY_WEIGHTS)[0], status,
+            rng.choice((None, 10.0, 40.0, 120.0)), _timestamp(created), _timestamp(created),
+        ))
+        links.append((project_id, attorneys.index(assigner) + 1, 'assigner'))
+        links.extend((project_id, attorneys.index(name) + 1, 'attorney') for name in assigned)
+    created_at = {row[0]: datetime.strptime(row[10], '%Y-%m-%d %H:%M:%S.%f') for row in projects}
+
+    _insert(connection,
+            'INSERT INTO attorneys (id, name, created_at) VALUES (?, ?, ?)',
+            ((i, name, _timestamp(now)) for i, name in enumerate(attorneys, start=1)))
+    _insert(connection,
+            'INSERT INTO projects (id, client_name, project_name, matter_number, client_number, '
+            'assigner, assigned_attorneys, priority, status, estimated_hours, created_at, updated_at, '
+            'rollup_pending_tasks) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)',
+            projects)
+    _insert(connection,
+            'INSERT INTO project_attorneys (project_id, attorney_id, role) VALUES (?, ?, ?)',
+            links)
+
+    def tasks():
+        for project_id in _project_ids(rng, scale, scale.tasks):
+            created = created_at[project_id]
+            completed = rng.random() < 0.75
+            completed_at = created + (now - created) * rng.random() if completed else None
+            yield (
+                project_id, rng.choice(TARGET_TYPES), rng.choice(attorneys),
+                (today + timedelta(days=rng.randint(-45, 90))).isoformat(), _sentence(rng, 6),
+                rng.choices(PRIORITIES, weights=PRIORITY_WEIGHTS)[0], completed,
+                _timestamp(completed_at) if completed_at else None,
+                _timestamp(created), _timestamp(completed_at or created),
+            )
+
+    _insert(connection,
+            'INSERT INTO tasks (project_id, target_type, target_name, due_date, description, '
+            'priority, completed, completed_at, created_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            tasks())
+
+    def milestones():
+        for project_id in _project_ids(rng, scale, scale.milestones):
+            created = _timestamp(created_at[project_id])
+            yield (
+                project_id, rng.choice(MILESTONE_NAMES), _sentence(rng, 4),
+                (today + timedelta(days=rng.randint(-120, 240))).isoformat(),
+                rng.random() < 0.5, created, created,
+            )
+
+    _insert(connection,
+            'INSERT INTO milestones (project_id, name, description, date, completed, '
+            'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            milestones())
+
+    def updates():
+        for project_id in _project_ids(rng, scale, scale.updates):
+            created = created_at[project_id]
+            posted = created + (now - created) * rng.random()
+            notes = '\n'.join(_sentence(rng, rng.randint(5, 15)) for _ in range(rng.randint(1, 4)))
+            yield project_id, notes, _timestamp(posted)
+
+    _insert(connection,
+            'INSERT INTO status_updates (project_id, notes, created_at) VALUES (?, ?, ?)',
+            updates())
+
+
+def build_database(data_dir, scale_name='firm', seed=42):
+    """Create DATA_DIR/worklist.db filled with synthetic data; returns the app.
+
+    Must run before the app is imported elsewhere in the process, since the
+    data directory comes from WORKLIST_DATA_DIR at import time.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    os.environ['WORKLIST_DATA_DIR'] = data_dir
+
+    from app import create_app, db
+    from app.cold_storage import archive_backlog
+    from app.rollups import rebuild_rollups
+    from app.schema import upgrade_database
+
+    app = create_app()
+    with app.app_context():
+        upgrade_database(echo=lambda message: None)
+        with db.engine.begin() as connection:
+            populate(connection, SCALES[scale_name], seed)
+        rebuild_rollups()
+        archive_backlog()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('ANALYZE')
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('data_dir', help='directory for the new worklist.db')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='firm')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(os.path.join(args.data_dir, 'worklist.db')):
+        parser.error(f'{args.data_dir} already has a worklist.db')
+    build_database(args.data_dir, args.scale, args.seed)
+    print(f'Wrote {args.scale} data set ({SCALES[args.scale]}) to {args.data_dir}')
+
+
+if __name__ == '__main__':
+    main()
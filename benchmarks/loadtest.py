@@ -0,0 +1,141 @@
+"""Load-test one route under gunicorn at several worker counts.
+
+For each --workers count a gunicorn server is started from gunicorn.conf.py
+against the synthetic database (built with benchmarks.datagen if missing),
+warmed up, then hit by --concurrency client threads for --duration seconds.
+The report shows requests per second, latency percentiles and the speedup
+over the first worker count. The dashboard snapshot cache is disabled unless
+--cache is given, so every request renders the dashboard.
+
+Throughput can only scale up to the number of CPU cores; the client threads
+share the machine with the server.
+
+Usage: python -m benchmarks.loadtest [--workers 1,2,4] [--path /] [--scale small]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.datagen import SCALES
+from benchmarks.run import percentile
+
+ROOT = Path(__file__).parent.parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, threads, port, env):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '--workers', str(workers), '--threads', str(threads),
+         '--bind', f'127.0.0.1:{port}', 'wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url + '/cache-stats', timeout=5).read()
+            return process, url
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with status {process.returncode}')
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start within 60 s')
+
+
+def stop_server(process):
+    process.terminate()
+    process.wait(timeout=30)
+
+
+def load(url, concurrency, duration):
+    """Hit `url` from `concurrency` threads for `duration` seconds.
+
+    Returns (requests per second, latencies in ms, errors).
+    """
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=60).read()
+            except OSError:
+                with lock:
+                    errors += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return len(latencies) / (time.perf_counter() - started), latencies, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4',
+                        help='comma-separated worker counts to compare')
+    parser.add_argument('--threads', type=int, default=2, help='threads per worker')
+    parser.add_argument('--path', default='/', help='route to request')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per worker count')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir',
+                        help='reuse (or create) the synthetic database here instead of a temp dir')
+    parser.add_argument('--cache', action='store_true', help='keep the dashboard snapshot cache on')
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='worklist-load-')
+    if not os.path.exists(os.path.join(data_dir, 'worklist.db')):
+        from benchmarks.datagen import build_database
+        print(f'Generating {args.scale} data set in {data_dir} ...', file=sys.stderr)
+        build_database(data_dir, args.scale, args.seed)
+
+    env = dict(os.environ, WORKLIST_DATA_DIR=data_dir, WORKLIST_QUERY_STATS='0')
+    if not args.cache:
+        env['WORKLIST_DASHBOARD_CACHE'] = 'none'
+
+    print(f'GET {args.path}: {args.concurrency} clients, {args.duration:g} s per run, '
+          f'{args.threads} thread(s) per worker, {os.cpu_count()} CPU(s)')
+    print(f'{"workers":>7} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"errors":>7} {"speedup":>8}')
+    first = None
+    for workers in (int(count) for count in args.workers.split(',')):
+        process, url = start_server(workers, args.threads, free_port(), env)
+        try:
+            load(url + args.path, args.concurrency, min(2.0, args.duration))  # warm up
+            rps, latencies, errors = load(url + args.path, args.concurrency, args.duration)
+        finally:
+            stop_server(process)
+        first = first or rps
+        p50 = percentile(latencies, 50) if latencies else 0.0
+        p95 = percentile(latencies, 95) if latencies else 0.0
+        print(f'{workers:>7} {rps:>9.1f} {p50:>9.1f} {p95:>9.1f} {errors:>7} {rps / first:>7.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Show how the composite indexes change SQLite's query plans.
+
+Builds a throwaway database with synthetic data, drops the composite indexes
+to mimic a pre-upgrade worklist.db, and prints EXPLAIN QUERY PLAN output and
+timings for the hot per-project queries before and after
+``create_missing_indexes()`` (what ``flask upgrade-indexes`` runs).
+
+Usage: python -m benchmarks.query_plans [--projects N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+COMPOSITE_INDEXES = (
+    'ix_projects_status_next_task_due',
+    'ix_tasks_project_completed_due',
+    'ix_milestones_project_completed_date',
+    'ix_status_updates_project_created',
+)
+
+HOT_QUERIES = {
+    'pending tasks for project':
+        'SELECT * FROM tasks WHERE project_id = :p AND completed = 0 ORDER BY due_date',
+    'next task for project':
+        'SELECT id FROM tasks WHERE project_id = :p AND completed = 0 ORDER BY due_date, id LIMIT 1',
+    'pending milestones for project':
+        'SELECT * FROM milestones WHERE project_id = :p AND completed = 0 ORDER BY date',
+    'latest update for project':
+        'SELECT * FROM status_updates WHERE project_id = :p ORDER BY created_at DESC LIMIT 1',
+}
+
+
+def populate(connection, projects, tasks_per_project=20, updates_per_project=50):
+    """Insert synthetic rows with executemany."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    today = date.today()
+    connection.exec_driver_sql(
+        'INSERT INTO projects (id, client_name, project_name, assigner, assigned_attorneys, '
+        'priority, status, created_at, updated_at, rollup_pending_tasks) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)',
+        [(i, f'Client {i}', f'Matter {i}', 'Self', 'Associate', 'medium',
+          'active' if i % 5 else 'archived', now, now) for i in range(1, projects + 1)]
+    )
+    connection.exec_driver_sql(
+        'INSERT INTO tasks (project_id, target_type, target_name, due_date, priority, completed, created_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        [(p, 'self', 'Self', today + timedelta(days=rng.randint(-30, 60)), 'medium',
+          rng.random() < 0.7, now)
+         for p in range(1, projects + 1) for _ in range(tasks_per_project)]
+    )
+    connection.exec_driver_sql(
+        'INSERT INTO milestones (project_id, name, date, completed, created_at) VALUES (?, ?, ?, ?, ?)',
+        [(p, 'Milestone', today + timedelta(days=rng.randint(-60, 120)), rng.random() < 0.5, now)
+         for p in range(1, projects + 1) for _ in range(5)]
+    )
+    connection.exec_driver_sql(
+        'INSERT INTO status_updates (project_id, notes, created_at) VALUES (?, ?, ?)',
+        [(p, 'Progress note', now - timedelta(minutes=rng.randint(0, 500000)))
+         for p in range(1, projects + 1) for _ in range(updates_per_project)]
+    )
+
+
+def measure(connection, projects, repeat=500):
+    """Return {query name: (plan, mean ms)} for HOT_QUERIES."""
+    rng = random.Random(7)
+    results = {}
+    for name, sql in HOT_QUERIES.items():
+        plan = ' | '.join(row[-1] for row in
+                          connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}'.replace(':p', '1')))
+        ids = [rng.randint(1, projects) for _ in range(repeat)]
+        start = time.perf_counter()
+        for project_id in ids:
+            connection.exec_driver_sql(sql.replace(':p', '?'), (project_id,)).fetchall()
+        elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+        results[name] = (plan, elapsed_ms)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix='worklist-bench-')
+    os.environ['WORKLIST_DATA_DIR'] = data_dir
+
+    from app import create_app, db
+    from app.schema import create_missing_indexes
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            for name in COMPOSITE_INDEXES:
+                connection.exec_driver_sql(f'DROP INDEX {name}')
+            populate(connection, args.projects)
+            connection.exec_driver_sql('ANALYZE')
+
+        with db.engine.connect() as connection:
+            before = measure(connection, args.projects)
+        create_missing_indexes()
+        db.engine.dispose()
+        with db.engine.connect() as connection:
+            after = measure(connection, args.projects)
+
+    print(f'{args.projects} projects (database in {data_dir})\n')
+    for name in HOT_QUERIES:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        print(name)
+        print(f'  before: {ms_before:7.3f} ms  {plan_before}')
+        print(f'  after:  {ms_after:7.3f} ms  {plan_after}')
+
+
+if __name__ == '__main__':
+    main()
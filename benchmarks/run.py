@@ -0,0 +1,275 @@
+"""Time every page in-process against firm-scale data and compare to a baseline.
+
+Each route is requested through the Flask test client: one warm-up request,
+then --repeat timed requests for latency percentiles, plus one request under
+tracemalloc for peak Python memory. SQL statements per request are counted
+with an engine hook (app.query_stats itself is switched off so slow-query
+warnings do not flood the output). The dashboard snapshot cache is disabled
+so the dashboard numbers are the cost of building it.
+
+Results are compared with benchmarks/baseline.json. A route regresses when
+it issues more SQL statements than the baseline, or its p95 latency or peak
+memory grows past the tolerances. Any regression is reported; one on a
+gated route (dashboard and export) makes the run exit with status 1.
+
+Baselines are machine-specific: record one with --save-baseline on the
+machine that runs the comparison, at the scale it will run.
+
+Usage: python -m benchmarks.run [--scale firm] [--data-dir DIR] [--save-baseline]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from benchmarks.datagen import SCALES
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    name: str
+    path: str
+    gate: bool = False  # a regression here fails the run
+
+
+# Placeholders are filled from route_params()
+ROUTES = (
+    Route('dashboard', '/', gate=True),
+    Route('export', '/export/', gate=True),
+    Route('export_all', '/export/?include_archived=1', gate=True),
+    Route('api_dashboard', '/api/v1/dashboard', gate=True),
+    Route('projects', '/projects/'),
+    Route('projects_stale', '/projects/?sort_by=staleness&stale=14'),
+    Route('projects_attorney', '/projects/?attorney={attorney_name}'),
+    Route('projects_archived', '/projects/archived'),
+    Route('project_detail', '/projects/{project}'),
+    Route('tasks', '/tasks/'),
+    Route('milestones', '/milestones/'),
+    Route('attorneys', '/attorneys/'),
+    Route('attorney_detail', '/attorneys/{attorney}'),
+    Route('search', '/search/?q=deposition+settlement'),
+    Route('api_projects', '/api/v1/projects'),
+    Route('api_project', '/api/v1/projects/{project}'),
+    Route('api_tasks', '/api/v1/tasks'),
+)
+
+
+@dataclass(slots=True)
+class Measurement:
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    queries: int
+    peak_kib: float
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    route: str
+    metric: str
+    baseline: float
+    current: float
+    gate: bool
+
+    def __str__(self):
+        marker = 'FAIL' if self.gate else 'warn'
+        return f'[{marker}] {self.route}: {self.metric} {self.baseline:g} -> {self.current:g}'
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class StatementCounter:
+    """Count SQL statements on an engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _after_cursor_execute(self, *args):
+        self.count += 1
+
+
+def _get(client, path):
+    response = client.get(path)
+    response.get_data()  # drain streamed responses such as the export
+    if response.status_code != 200:
+        raise RuntimeError(f'GET {path} returned {response.status_code}')
+
+
+def measure_route(client, counter, path, repeat):
+    _get(client, path)
+
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        counter.count = 0
+        start = time.perf_counter()
+        _get(client, path)
+        timings.append((time.perf_counter() - start) * 1000)
+        queries = max(queries, counter.count)
+
+    tracemalloc.start()
+    _get(client, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return Measurement(
+        p50_ms=round(percentile(timings, 50), 2),
+        p95_ms=round(percentile(timings, 95), 2),
+        max_ms=round(max(timings), 2),
+        queries=queries,
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def route_params():
+    """Ids for the parameterized routes: the busiest active project and attorney."""
+    from sqlalchemy import func, select
+    from app import db
+    from app.models import Attorney, Project, ProjectAttorney, Task
+
+    project = db.session.scalar(
+        select(Task.project_id).join(Project)
+        .where(Project.status == 'active')
+        .group_by(Task.project_id).order_by(func.count().desc()).limit(1)
+    )
+    attorney = db.session.execute(
+        select(Attorney.id, Attorney.name).join(ProjectAttorney)
+        .where(ProjectAttorney.role == 'attorney')
+        .group_by(Attorney.id).order_by(func.count().desc()).limit(1)
+    ).one()
+    return {'project': project, 'attorney': attorney.id, 'attorney_name': attorney.name}
+
+
+def run(app, routes=ROUTES, repeat=20):
+    """Return {route name: Measurement}."""
+    from app import db
+
+    with app.app_context():
+        counter = StatementCounter(db.engine)
+        params = route_params()
+    client = app.test_client()
+    return {
+        route.name: measure_route(client, counter, route.path.format(**params), repeat)
+        for route in routes
+    }
+
+
+def compare(baseline, results, routes=ROUTES, time_tolerance=0.5, memory_tolerance=0.25,
+            time_slack_ms=2.0):
+    """Return the Regressions of `results` against baseline['routes'].
+
+    Statement counts are deterministic, so any increase counts. p95 latency
+    may grow by `time_tolerance` (a fraction) plus `time_slack_ms` to ride
+    out timer noise on fast routes; peak memory by `memory_tolerance`.
+    Routes missing from the baseline are skipped.
+    """
+    regressions = []
+    for route in routes:
+        before = baseline['routes'].get(route.name)
+        if before is None or route.name not in results:
+            continue
+        after = results[route.name]
+        checks = (
+            ('queries', before['queries'], after.queries, before['queries']),
+            ('p95_ms', before['p95_ms'], after.p95_ms,
+             before['p95_ms'] * (1 + time_tolerance) + time_slack_ms),
+            ('peak_kib', before['peak_kib'], after.peak_kib,
+             before['peak_kib'] * (1 + memory_tolerance)),
+        )
+        for metric, old, new, limit in checks:
+            if new > limit:
+                regressions.append(Regression(route.name, metric, old, new, route.gate))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    print(f'{"route":<20} {"p50 ms":>9} {"p95 ms":>9} {"max ms":>9} {"queries":>8} {"peak KiB":>10}'
+          + ('   (baseline p95 / queries)' if baseline else ''))
+    for name, m in results.items():
+        line = f'{name:<20} {m.p50_ms:>9.2f} {m.p95_ms:>9.2f} {m.max_ms:>9.2f} {m.queries:>8} {m.peak_kib:>10.1f}'
+        before = baseline and baseline['routes'].get(name)
+        if before:
+            line += f'   ({before["p95_ms"]:.2f} / {before["queries"]})'
+        print(line)
+
+
+def load_app(data_dir, scale, seed):
+    """Build the synthetic database in `data_dir` unless it is already there."""
+    os.environ['WORKLIST_DATA_DIR'] = data_dir
+    os.environ['WORKLIST_DASHBOARD_CACHE'] = 'none'
+    os.environ['WORKLIST_QUERY_STATS'] = '0'
+    if not os.path.exists(os.path.join(data_dir, 'worklist.db')):
+        from benchmarks.datagen import build_database
+        print(f'Generating {scale} data set in {data_dir} ...', file=sys.stderr)
+        return build_database(data_dir, scale, seed)
+    from app import create_app
+    return create_app()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='firm')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir',
+                        help='reuse (or create) the synthetic database here instead of a temp dir')
+    parser.add_argument('--repeat', type=int, default=20, help='timed requests per route')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write this run as the new baseline instead of comparing')
+    parser.add_argument('--time-tolerance', type=float, default=0.5,
+                        help='allowed fractional p95 growth (default 0.5 = +50%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                        help='allowed fractional peak memory growth (default 0.25)')
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='worklist-bench-')
+    app = load_app(data_dir, args.scale, args.seed)
+    results = run(app, repeat=args.repeat)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            'scale': args.scale,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'routes': {name: asdict(m) for name, m in results.items()},
+        }, indent=2) + '\n')
+        print_table(results)
+        print(f'\nBaseline written to {args.baseline}')
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    print_table(results, baseline)
+    if baseline is None:
+        print(f'\nNo baseline at {args.baseline}; run with --save-baseline to record one.')
+        return 0
+    if (baseline['scale'], baseline['seed']) != (args.scale, args.seed):
+        print(f'\nBaseline is for --scale {baseline["scale"]} --seed {baseline["seed"]}; '
+              'not comparing.', file=sys.stderr)
+        return 2
+
+    regressions = compare(baseline, results, time_tolerance=args.time_tolerance,
+                          memory_tolerance=args.memory_tolerance)
+    print()
+    for regression in regressions:
+        print(regression)
+    failed = [r for r in regressions if r.gate]
+    print(f'{len(regressions)} regression(s), {len(failed)} on gated routes.')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Profile cold start: importing the app and running create_app() in a fresh interpreter.
+
+Each sample runs `python -X importtime` on a snippet that imports app and
+calls create_app(), timing both in-process (interpreter startup itself is
+not counted). The report is the median cold start and the median import
+time per top-level package, compared with benchmarks/startup_baseline.json
+when it exists. The run exits with status 1 when the median cold start is
+over --budget-ms; tests/test_app_factory.py holds create_app() to the same
+budget.
+
+Baselines are machine-specific: record one with --save-baseline.
+
+Usage: python -m benchmarks.startup [--lazy] [--repeat 5] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name('startup_baseline.json')
+ROOT = Path(__file__).parent.parent
+
+# Median cold start allowed, generous enough for a loaded CI machine
+STARTUP_BUDGET_MS = 1500
+
+SNIPPET = '''
+import time
+start = time.perf_counter()
+from app import create_app
+create_app()
+print((time.perf_counter() - start) * 1000)
+'''
+
+
+def sample(lazy=False):
+    """One cold start. Returns (milliseconds, {module: self import time in ms})."""
+    env = dict(os.environ)
+    env['WORKLIST_LAZY_BLUEPRINTS'] = '1' if lazy else '0'
+    env.setdefault('WORKLIST_DATA_DIR', tempfile.gettempdir())
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SNIPPET],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us) / 1000
+    return float(result.stdout.strip().splitlines()[-1]), modules
+
+
+def by_package(modules):
+    """Sum self import times by top-level package."""
+    packages = defaultdict(float)
+    for name, ms in modules.items():
+        packages[name.split('.')[0]] += ms
+    return packages
+
+
+def measure(repeat=5, lazy=False):
+    """Median cold start and median per-package import ms over `repeat` samples."""
+    samples = [sample(lazy) for _ in range(repeat)]
+    packages = [by_package(modules) for _, modules in samples]
+    names = set().union(*packages)
+    return {
+        'cold_start_ms': round(statistics.median(ms for ms, _ in samples), 1),
+        'packages': {
+            name: round(statistics.median(p.get(name, 0.0) for p in packages), 1)
+            for name in sorted(names)
+        },
+    }
+
+
+def print_report(result, baseline=None, top=12):
+    packages = sorted(result['packages'].items(), key=lambda item: item[1], reverse=True)
+    before = baseline['packages'] if baseline else {}
+    print(f'{"package":<24} {"import ms":>10}' + (f' {"baseline":>10}' if baseline else ''))
+    for name, ms in packages[:top]:
+        line = f'{name:<24} {ms:>10.1f}'
+        if baseline:
+            line += f' {before.get(name, 0.0):>10.1f}'
+        print(line)
+    rest = sum(ms for _, ms in packages[top:])
+    print(f'{"(others)":<24} {rest:>10.1f}')
+    line = f'{"cold start":<24} {result["cold_start_ms"]:>10.1f}'
+    if baseline:
+        line += f' {baseline["cold_start_ms"]:>10.1f}'
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lazy', action='store_true', help='with WORKLIST_LAZY_BLUEPRINTS=1')
+    parser.add_argument('--repeat', type=int, default=5, help='cold starts to sample')
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write this run as the new baseline instead of comparing')
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat, args.lazy)
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(dict(result, lazy=args.lazy), indent=2) + '\n')
+        print_report(result)
+        print(f'\nBaseline written to {args.baseline}')
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    print_report(result, baseline)
+    if result['cold_start_ms'] > args.budget_ms:
+        print(f'\nCold start {result["cold_start_ms"]:g} ms is over the {args.budget_ms:g} ms budget.')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,89 @@ import os
 from pathlib import Path
 
 # Default to ./data/worklist.db relative to project root
-# Can be overridden with environment variable
+# Can be overridden with environment variable. Importing this module does not
+# touch the filesystem; `flask init-db` creates the directory.
 BASE_DIR = Path(__file__).parent
 DATA_DIR = Path(os.environ.get('WORKLIST_DATA_DIR', BASE_DIR / 'data'))
-DATA_DIR.mkdir(exist_ok=True)
+
+# SQLite tuning profiles, selected with WORKLIST_SQLITE_PROFILE.
+# 'pragmas' are applied to every new connection; 'engine_options' are passed
+# to SQLAlchemy's create_engine().
+SQLITE_PROFILES = {
+    # Several gunicorn workers sharing one file: WAL lets readers proceed
+    # while a writer commits, and busy_timeout waits out short write locks
+    # instead of failing with "database is locked".
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'mmap_size': 268435456,  # 256 MiB
+            'cache_size': -65536,    # 64 MiB (negative = KiB)
+            'temp_store': 'MEMORY',
+        },
+        'engine_options': {
+            'pool_size': 10,
+            'max_overflow': 5,
+            'pool_recycle': 3600,
+            'pool_pre_ping': True,
+        },
+    },
+    # Throwaway databases: durability does not matter, speed does.
+    'test': {
+        'pragmas': {
+            'journal_mode': 'MEMORY',
+            'synchronous': 'OFF',
+            'busy_timeout': 1000,
+            'temp_store': 'MEMORY',
+        },
+        'engine_options': {},
+    },
+}
+
+SQLITE_PROFILE = os.environ.get('WORKLIST_SQLITE_PROFILE', 'production')
+if SQLITE_PROFILE not in SQLITE_PROFILES:
+    raise ValueError(
+        f'Unknown WORKLIST_SQLITE_PROFILE {SQLITE_PROFILE!r}; '
+        f'expected one of {", ".join(sorted(SQLITE_PROFILES))}'
+    )
 
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATA_DIR / 'worklist.db'}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = SQLITE_PROFILES[SQLITE_PROFILE]['engine_options']
+    SQLITE_PRAGMAS = SQLITE_PROFILES[SQLITE_PROFILE]['pragmas']
+    # Per-request SQL instrumentation (see app/query_stats.py)
+    QUERY_STATS_ENABLED = os.environ.get('WORKLIST_QUERY_STATS', '1') != '0'
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('WORKLIST_SLOW_QUERY_MS', '100'))
+    # Dashboard snapshot cache (see app/cache.py): 'memory', 'sqlite' or 'none'
+    DASHBOARD_CACHE_BACKEND = os.environ.get('WORKLIST_DASHBOARD_CACHE', 'memory')
+    DASHBOARD_CACHE_TTL = int(os.environ.get('WORKLIST_DASHBOARD_CACHE_TTL', '300'))
+    DASHBOARD_CACHE_SIZE = 32
+    DASHBOARD_CACHE_PATH = DATA_DIR / 'dashboard_cache.db'
+    # Rendered dashboard cards kept per process; 0 entries disables it
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('WORKLIST_FRAGMENT_CACHE_SIZE', '5000'))
+    FRAGMENT_CACHE_MAX_CHARS = 32 * 1024 * 1024
+    # Days of change log kept by `flask compact-changes` (see app/changes.py)
+    CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('WORKLIST_CHANGE_LOG_RETENTION_DAYS', '90'))
+    # Live dashboard updates (see app/live.py): change log poll interval, how
+    # long one event stream holds a server thread before reconnecting, and
+    # how many streams a worker holds at once (0 turns live updates off;
+    # app/server.py adds that many threads per worker)
+    LIVE_POLL_SECONDS = float(os.environ.get('WORKLIST_LIVE_POLL_SECONDS', '2'))
+    LIVE_STREAM_SECONDS = float(os.environ.get('WORKLIST_LIVE_STREAM_SECONDS', '300'))
+    LIVE_MAX_STREAMS = int(os.environ.get('WORKLIST_LIVE_MAX_STREAMS', '4'))
+    # Background jobs (see app/jobs.py): threads per process (0 runs jobs
+    # inline), where their files go and how long `flask prune-jobs` keeps
+    # them; how often a running job records a heartbeat, and after how long
+    # without one it is run again
+    JOB_WORKERS = int(os.environ.get('WORKLIST_JOB_WORKERS', '2'))
+    JOB_OUTPUT_DIR = DATA_DIR / 'jobs'
+    JOB_RETENTION_DAYS = int(os.environ.get('WORKLIST_JOB_RETENTION_DAYS', '7'))
+    JOB_HEARTBEAT_SECONDS = float(os.environ.get('WORKLIST_JOB_HEARTBEAT_SECONDS', '30'))
+    JOB_STALE_SECONDS = float(os.environ.get('WORKLIST_JOB_STALE_SECONDS', '120'))
+    # Import and register blueprints on the first request instead of in
+    # create_app(), for processes that may never serve one (see app/routes)
+    LAZY_BLUEPRINTS = os.environ.get('WORKLIST_LAZY_BLUEPRINTS', '0') != '0'
@@ -0,0 +1,27 @@
+"""gunicorn settings: gunicorn -c gunicorn.conf.py wsgi:app
+
+Workers default to a count derived from the CPU count and threads to two
+plus one per live dashboard stream (see app/server.py); override them with
+WORKLIST_WORKERS and WORKLIST_THREADS or gunicorn's own command-line flags. Run `flask init-db` before the first start.
+"""
+import os
+
+# Share one SQLite-backed dashboard cache between workers, so a snapshot is
+# built once per change rather than once per worker.
+os.environ.setdefault('WORKLIST_DASHBOARD_CACHE', 'sqlite')
+
+from app.server import thread_count, worker_count  # noqa: E402
+
+bind = os.environ.get('WORKLIST_BIND', '127.0.0.1:8000')
+workers = worker_count()
+threads = thread_count()
+worker_class = 'gthread'
+
+# Create the app once in the master and fork workers from it, sharing its
+# memory copy-on-write; app.server gives each worker fresh connection pools.
+preload_app = True
+
+# Replace each worker after a while to bound memory growth; the jitter keeps
+# them from restarting together.
+max_requests = 2000
+max_requests_jitter = 200
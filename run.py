@@ -1,8 +1,11 @@
-from app import create_app, db
+from app import create_app
+from app.schema import schema_is_current, upgrade_database
 
 app = create_app()
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        # Only touch the schema when the database is behind this code
+        if not schema_is_current():
+            upgrade_database()
     app.run(debug=True)
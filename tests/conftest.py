@@ -5,6 +5,8 @@ from datetime import date, datetime, timedelta
 
 # Set test environment before importing app
 os.environ['WORKLIST_DATA_DIR'] = '/tmp/test_worklist'
+os.environ['WORKLIST_SQLITE_PROFILE'] = 'test'
+os.makedirs(os.environ['WORKLIST_DATA_DIR'], exist_ok=True)
 
 
 @pytest.fixture(scope='session')
@@ -18,6 +20,7 @@ def app():
         SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
         SQLALCHEMY_TRACK_MODIFICATIONS = False
         WTF_CSRF_ENABLED = False
+        JOB_WORKERS = 0
 
     app = create_app()
     app.config.from_object(TestConfig)
@@ -140,7 +143,71 @@ def sample_milestone(sample_project, db_session):
     return milestone
 
 
+@pytest.fixture
+def make_project(db_session):
+    """Factory for committed projects: ``make_project('Globex', priority='low')``.
+
+    Keyword arguments override the defaults below.
+    """
+    from app.models import Project
+
+    def make(client_name='Acme Corp', **kwargs):
+        values = dict(project_name='Matter', assigner='Partner Smith', assigned_attorneys='Associate Jones')
+        values.update(kwargs)
+        project = Project(client_name=client_name, **values)
+        db_session.add(project)
+        db_session.commit()
+        return project
+
+    return make
+
+
+@pytest.fixture
+def make_task(db_session):
+    """Factory for committed tasks due `days` from today: ``make_task(project, 3, priority='high')``."""
+    from app.models import Task
+
+    def make(project, days=0, **kwargs):
+        values = dict(target_type='self', target_name='Self')
+        values.update(kwargs)
+        task = Task(project_id=project.id, due_date=date.today() + timedelta(days=days), **values)
+        db_session.add(task)
+        db_session.commit()
+        return task
+
+    return make
+
+
 @pytest.fixture
 def runner(app):
     """Create CLI runner for testing CLI commands."""
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def query_counter(app, db_session):
+    """Count SQL statements executed against the test engine.
+
+    Usage: ``with query_counter() as counter: ...`` then ``counter.count``.
+    """
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    from app import db
+
+    class Counter:
+        count = 0
+
+    @contextmanager
+    def counting():
+        counter = Counter()
+
+        def before_cursor_execute(*args):
+            counter.count += 1
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counting
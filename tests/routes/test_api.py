@@ -0,0 +1,363 @@
+"""Tests for the /api/v1 JSON blueprint."""
+from datetime import date, datetime, timedelta
+
+from app.changes import latest_change_id
+from app.models import ChangeLog, Job, Milestone, StatusUpdate, Task
+
+
+class TestConditionalGet:
+    """ETag and If-None-Match handling shared by every endpoint."""
+
+    def test_response_has_strong_etag(self, client, sample_project):
+        """JSON responses carry a strong ETag and must be revalidated."""
+        response = client.get('/api/v1/projects')
+
+        assert response.status_code == 200
+        assert response.is_json
+        etag, weak = response.get_etag()
+        assert etag and not weak
+        assert 'no-cache' in response.headers['Cache-Control']
+
+    def test_matching_etag_is_304(self, client, sample_project):
+        """A client holding the current ETag gets an empty 304."""
+        etag = client.get('/api/v1/projects').get_etag()[0]
+
+        response = client.get('/api/v1/projects', headers={'If-None-Match': f'"{etag}"'})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.get_etag()[0] == etag
+
+    def test_304_does_not_build_the_body(self, client, sample_project, query_counter):
+        """Revalidation costs one change log query, however big the body."""
+        etag = client.get(f'/api/v1/projects/{sample_project.id}').get_etag()[0]
+
+        with query_counter() as counter:
+            response = client.get(f'/api/v1/projects/{sample_project.id}',
+                                  headers={'If-None-Match': f'"{etag}"'})
+
+        assert response.status_code == 304
+        assert counter.count == 1
+
+    def test_write_changes_etag(self, client, db_session, make_task, sample_project):
+        """After a write the old ETag no longer matches."""
+        etag = client.get('/api/v1/projects').get_etag()[0]
+        make_task(sample_project, target_name='New')
+
+        response = client.get('/api/v1/projects', headers={'If-None-Match': f'"{etag}"'})
+
+        assert response.status_code == 200
+        assert response.json['items'][0]['pending_tasks'] == 1
+        assert response.get_etag()[0] != etag
+
+    def test_query_string_is_part_of_etag(self, client, sample_project):
+        """Different filters or pages have different ETags."""
+        first = client.get('/api/v1/projects').get_etag()[0]
+        second = client.get('/api/v1/projects?priority=high').get_etag()[0]
+
+        assert first != second
+
+
+class TestProjects:
+    """Test /api/v1/projects."""
+
+    def test_lists_active_projects(self, client, db_session, make_project):
+        """Active projects by client name, with rollups and ISO dates."""
+        make_project('Beta')
+        make_project('Alpha')
+        make_project('Gone', status='archived')
+
+        items = client.get('/api/v1/projects').json['items']
+
+        assert [item['client_name'] for item in items] == ['Alpha', 'Beta']
+        assert items[0]['pending_tasks'] == 0
+        assert isinstance(items[0]['created_at'], str)
+        assert items[0]['last_activity_at'] == items[0]['created_at']
+
+    def test_filters(self, client, db_session, make_project):
+        """status and priority narrow the list."""
+        make_project('Gone', status='archived')
+        make_project('Low', priority='low')
+
+        archived = client.get('/api/v1/projects?status=archived').json['items']
+        low = client.get('/api/v1/projects?priority=low').json['items']
+
+        assert [item['client_name'] for item in archived] == ['Gone']
+        assert [item['client_name'] for item in low] == ['Low']
+
+    def test_pagination(self, client, db_session, make_project):
+        """per_page and the returned cursor walk the list."""
+        for name in ('A', 'B', 'C'):
+            make_project(name)
+
+        first = client.get('/api/v1/projects?per_page=2').json
+        second = client.get(f'/api/v1/projects?per_page=2&cursor={first["next_cursor"]}').json
+
+        assert [item['client_name'] for item in first['items']] == ['A', 'B']
+        assert [item['client_name'] for item in second['items']] == ['C']
+        assert second['next_cursor'] is None
+        assert second['prev_cursor']
+
+    def test_bad_cursor_is_json_400(self, client, db_session):
+        """A malformed cursor is a JSON error."""
+        response = client.get('/api/v1/projects?cursor=garbage')
+
+        assert response.status_code == 400
+        assert 'error' in response.json
+
+
+class TestProjectDetail:
+    """Test /api/v1/projects/<id>."""
+
+    def test_includes_children(self, client, db_session, sample_task, sample_milestone):
+        """Pending tasks, pending milestones and latest updates are embedded."""
+        project_id = sample_task.project_id
+        db_session.add(StatusUpdate(project_id=project_id, notes='Filed'))
+        db_session.commit()
+
+        body = client.get(f'/api/v1/projects/{project_id}').json
+
+        assert body['client_name'] == 'Acme Corp'
+        assert [task['id'] for task in body['tasks']] == [sample_task.id]
+        assert body['tasks'][0]['due_date'] == sample_task.due_date.isoformat()
+        assert [m['name'] for m in body['milestones']] == ['Initial Filing']
+        assert [u['notes'] for u in body['updates']] == ['Filed']
+
+    def test_archived_project_reads_cold_storage(self, client, db_session, sample_task):
+        """An archived project's children come from cold storage."""
+        project_id = sample_task.project_id
+        db_session.add(StatusUpdate(project_id=project_id, notes='Closed'))
+        db_session.commit()
+        client.post(f'/projects/{project_id}/archive')
+
+        body = client.get(f'/api/v1/projects/{project_id}').json
+
+        assert [task['target_name'] for task in body['tasks']] == ['John Doe']
+        assert [u['notes'] for u in body['updates']] == ['Closed']
+
+    def test_unknown_project_is_json_404(self, client, db_session):
+        """A missing project is a JSON 404."""
+        response = client.get('/api/v1/projects/999')
+
+        assert response.status_code == 404
+        assert 'error' in response.json
+
+
+class TestTasks:
+    """Test /api/v1/tasks."""
+
+    def test_pending_by_default(self, client, db_session, sample_project):
+        """Only pending tasks unless ?completed=1, in due date order."""
+        db_session.add_all([
+            Task(project_id=sample_project.id, target_type='self', target_name='Later',
+                 due_date=date.today() + timedelta(days=2)),
+            Task(project_id=sample_project.id, target_type='self', target_name='Sooner',
+                 due_date=date.today()),
+            Task(project_id=sample_project.id, target_type='self', target_name='Done',
+                 due_date=date.today(), completed=True),
+        ])
+        db_session.commit()
+
+        pending = client.get('/api/v1/tasks').json['items']
+        done = client.get('/api/v1/tasks?completed=true').json['items']
+
+        assert [task['target_name'] for task in pending] == ['Sooner', 'Later']
+        assert [task['target_name'] for task in done] == ['Done']
+
+    def test_project_filter(self, client, db_session, make_project, sample_task):
+        """?project_id= limits to one project."""
+        other = make_project('Other')
+
+        assert len(client.get(f'/api/v1/tasks?project_id={sample_task.project_id}').json['items']) == 1
+        assert client.get(f'/api/v1/tasks?project_id={other.id}').json['items'] == []
+
+
+class TestMilestones:
+    """Test /api/v1/milestones."""
+
+    def test_lists_and_filters(self, client, db_session, sample_milestone):
+        """Pending milestones by default, filterable by project and completion."""
+        db_session.add(Milestone(project_id=sample_milestone.project_id, name='Done',
+                                 date=date.today(), completed=True))
+        db_session.commit()
+
+        pending = client.get(f'/api/v1/milestones?project_id={sample_milestone.project_id}').json
+        done = client.get('/api/v1/milestones?completed=1').json
+
+        assert [m['name'] for m in pending['items']] == ['Initial Filing']
+        assert [m['name'] for m in done['items']] == ['Done']
+
+
+class TestUpdates:
+    """Test /api/v1/updates."""
+
+    def test_newest_first(self, client, db_session, make_project, sample_project):
+        """Status updates come newest first and filter by project."""
+        other = make_project('Other')
+        db_session.add_all([
+            StatusUpdate(project_id=sample_project.id, notes='First'),
+            StatusUpdate(project_id=sample_project.id, notes='Second'),
+            StatusUpdate(project_id=other.id, notes='Elsewhere'),
+        ])
+        db_session.commit()
+
+        items = client.get(f'/api/v1/updates?project_id={sample_project.id}').json['items']
+
+        assert [item['notes'] for item in items] == ['Second', 'First']
+        assert len(client.get('/api/v1/updates').json['items']) == 3
+
+
+class TestDashboard:
+    """Test /api/v1/dashboard."""
+
+    def test_buckets(self, client, db_session, sample_project):
+        """Projects land in the same buckets as on the HTML dashboard."""
+        db_session.add_all([
+            Task(project_id=sample_project.id, target_type='client', target_name='Today',
+                 due_date=date.today()),
+            StatusUpdate(project_id=sample_project.id, notes='Line one\nLine two'),
+            Milestone(project_id=sample_project.id, name='Hearing', date=date.today()),
+        ])
+        db_session.commit()
+
+        body = client.get('/api/v1/dashboard').json
+
+        assert body['date'] == date.today().isoformat()
+        card = body['due_today'][0]
+        assert card['id'] == sample_project.id
+        assert card['staleness_level'] == 'ok'
+        assert card['status_preview'] == 'Line one\nLine two'
+        assert card['tasks'][0]['target_name'] == 'Today'
+        assert card['milestones'][0]['name'] == 'Hearing'
+        assert body['no_tasks'] == []
+
+    def test_project_without_updates(self, client, db_session, sample_project):
+        """A project with no status update has no preview."""
+        card = client.get('/api/v1/dashboard').json['no_tasks'][0]
+
+        assert card['status_preview'] is None
+
+    def test_etag_includes_date(self, client, db_session, sample_project, monkeypatch):
+        """Yesterday's ETag does not match today's dashboard."""
+        import app.routes.api as api
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+
+        etag = client.get('/api/v1/dashboard').get_etag()[0]
+        monkeypatch.setattr(api, 'date', Tomorrow)
+
+        response = client.get('/api/v1/dashboard', headers={'If-None-Match': f'"{etag}"'})
+
+        assert response.status_code == 200
+
+
+class TestChanges:
+    """Test /api/v1/changes."""
+
+    def test_feed_with_row_data(self, client, db_session, sample_task):
+        """Changes after a cursor come back with each row's current JSON."""
+        since = latest_change_id() - 1
+
+        body = client.get(f'/api/v1/changes?since={since}').json
+
+        change = body['changes'][0]
+        assert change['table'] == 'tasks'
+        assert change['operation'] == 'insert'
+        assert change['data']['target_name'] == 'John Doe'
+        assert body['cursor'] == change['id']
+        assert body['has_more'] is False
+
+    def test_limit_bounds_the_batch(self, client, db_session, make_project):
+        """?limit= caps the batch and has_more says to keep reading."""
+        since = latest_change_id()
+        for name in ('A', 'B', 'C'):
+            make_project(name)
+
+        body = client.get(f'/api/v1/changes?since={since}&limit=2').json
+
+        assert len(body['changes']) == 2
+        assert body['has_more'] is True
+
+    def test_no_since_returns_current_cursor(self, client, sample_project):
+        """Without since= the response is just the cursor to start from."""
+        body = client.get('/api/v1/changes').json
+
+        assert body == {'changes': [], 'cursor': latest_change_id(), 'has_more': False}
+
+    def test_pruned_cursor_is_410(self, client, db_session, make_project):
+        """A cursor older than the retained log is a JSON 410."""
+        db_session.query(ChangeLog).delete()
+        make_project('A')
+        make_project('B')
+        oldest = db_session.query(ChangeLog.id).order_by(ChangeLog.id).first()[0]
+        db_session.query(ChangeLog).filter(ChangeLog.id == oldest).delete()
+        db_session.commit()
+
+        response = client.get(f'/api/v1/changes?since={oldest - 1}')
+
+        assert response.status_code == 410
+        assert 'pruned' in response.json['error']
+
+
+class TestJobs:
+    """Test POST /api/v1/exports and GET /api/v1/jobs/<id>."""
+
+    def test_start_export(self, app, client, sample_project, tmp_path, monkeypatch):
+        """Starting an export answers 202 with the job and where to poll it."""
+        monkeypatch.setitem(app.config, 'JOB_OUTPUT_DIR', tmp_path)
+
+        response = client.post('/api/v1/exports?include_archived=1')
+
+        job = Job.query.one()
+        assert response.status_code == 202
+        assert response.headers['Location'].endswith(f'/api/v1/jobs/{job.id}')
+        assert response.json['kind'] == 'export'
+        assert job.params == {'include_archived': True}
+
+    def test_job_status(self, client, db_session):
+        """A succeeded job with a file includes its download URL."""
+        job = Job(kind='export', params={}, status='succeeded', result={'bytes': 10},
+                  output_file='worklist.csv')
+        db_session.add(job)
+        db_session.commit()
+
+        body = client.get(f'/api/v1/jobs/{job.id}').json
+
+        assert body['status'] == 'succeeded'
+        assert body['result'] == {'bytes': 10}
+        assert body['download_url'] == f'/jobs/{job.id}/download'
+        assert body['started_at'] is None
+
+    def test_unfinished_job_has_no_download(self, client, db_session):
+        """Queued jobs have nothing to download yet."""
+        job = Job(kind='export', params={})
+        db_session.add(job)
+        db_session.commit()
+
+        body = client.get(f'/api/v1/jobs/{job.id}').json
+
+        assert body['status'] == 'queued'
+        assert 'download_url' not in body
+
+    def test_stale_job_is_resumed(self, app, client, db_session, tmp_path, monkeypatch):
+        """Polling a job whose process stopped heartbeating runs it again."""
+        monkeypatch.setitem(app.config, 'JOB_OUTPUT_DIR', tmp_path)
+        silent = datetime.utcnow() - timedelta(hours=1)
+        job = Job(kind='export', params={}, status='running', started_at=silent, heartbeat_at=silent)
+        db_session.add(job)
+        db_session.commit()
+
+        body = client.get(f'/api/v1/jobs/{job.id}').json
+
+        assert body['status'] == 'succeeded'
+        assert 'download_url' in body
+
+    def test_missing_job(self, client, db_session):
+        """Unknown jobs are a JSON 404."""
+        response = client.get('/api/v1/jobs/999')
+
+        assert response.status_code == 404
+        assert 'error' in response.json
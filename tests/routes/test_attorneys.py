@@ -0,0 +1,129 @@
+"""Tests for attorneys routes."""
+from datetime import date, timedelta
+
+from app.models import Attorney, Task
+
+
+def attorney_id(db_session, name):
+    return db_session.query(Attorney).filter_by(name=name).one().id
+
+
+class TestAttorneyList:
+    """Test GET /attorneys/."""
+
+    def test_lists_attorneys_with_counts(self, client, db_session, make_project):
+        """Each attorney appears once with active matter counts per role."""
+        make_project('Acme', assigned_attorneys='Jones, Lee')
+        make_project('Globex', assigned_attorneys='Jones')
+        make_project('Old Co', assigned_attorneys='Jones', status='archived')
+
+        response = client.get('/attorneys/')
+
+        assert response.status_code == 200
+        html = response.data.decode()
+        assert html.count('>Jones</a>') == 1
+        assert '>Lee</a>' in html
+        assert '>Partner Smith</a>' in html
+
+    def test_empty_state(self, client, db_session):
+        """No linked attorneys shows the empty message."""
+        response = client.get('/attorneys/')
+
+        assert b'No attorneys on active projects.' in response.data
+
+
+class TestAttorneyDetail:
+    """Test GET /attorneys/<id>."""
+
+    def test_shows_matters_and_assigned(self, client, db_session, make_project):
+        """Matters the attorney works on and matters they assigned are listed separately."""
+        make_project('Acme', assigned_attorneys='Jones')
+        make_project('Globex', assigned_attorneys='Lee', assigner='Jones')
+        make_project('Initech', assigned_attorneys='Lee')
+
+        response = client.get(f'/attorneys/{attorney_id(db_session, "Jones")}')
+
+        html = response.data.decode()
+        matters, assigned = html.split('Assigned by Jones')
+        assert 'Acme: Matter' in matters and 'Globex' not in matters
+        assert 'Globex: Matter' in assigned
+        assert 'Initech' not in html
+
+    def test_pending_tasks_are_from_own_active_matters(self, client, db_session, make_project):
+        """My tasks: pending tasks on the attorney's active matters only."""
+        mine = make_project('Acme', assigned_attorneys='Jones, Lee')
+        other = make_project('Globex', assigned_attorneys='Lee')
+        archived = make_project('Old Co', assigned_attorneys='Jones', status='archived')
+        soon = date.today() + timedelta(days=1)
+        db_session.add_all([
+            Task(project_id=mine.id, target_type='self', target_name='Mine Pending', due_date=soon),
+            Task(project_id=mine.id, target_type='self', target_name='Mine Done', due_date=soon,
+                 completed=True),
+            Task(project_id=other.id, target_type='self', target_name='Not Mine', due_date=soon),
+            Task(project_id=archived.id, target_type='self', target_name='Archived Task',
+                 due_date=soon),
+        ])
+        db_session.commit()
+
+        response = client.get(f'/attorneys/{attorney_id(db_session, "Jones")}')
+
+        assert b'Mine Pending' in response.data
+        assert b'Mine Done' not in response.data
+        assert b'Not Mine' not in response.data
+        assert b'Archived Task' not in response.data
+
+    def test_tasks_are_paginated(self, client, db_session, make_project):
+        """Tasks come a page at a time with a next link."""
+        project = make_project('Acme', assigned_attorneys='Jones')
+        for i in range(3):
+            db_session.add(Task(project_id=project.id, target_type='self', target_name=f'Task {i}',
+                                due_date=date.today() + timedelta(days=i)))
+        db_session.commit()
+
+        response = client.get(f'/attorneys/{attorney_id(db_session, "Jones")}?per_page=2')
+
+        assert b'Task 1' in response.data
+        assert b'Task 2' not in response.data
+        assert b'rel="next"' in response.data
+
+    def test_query_count_is_constant(self, client, db_session, make_project, query_counter):
+        """Matters and tasks are single joins, not a query per project."""
+        for i in range(5):
+            project = make_project(f'Client {i}', assigned_attorneys='Jones')
+            db_session.add(Task(project_id=project.id, target_type='self', target_name='T',
+                                due_date=date.today()))
+        db_session.commit()
+        url = f'/attorneys/{attorney_id(db_session, "Jones")}'
+
+        with query_counter() as counter:
+            client.get(url)
+
+        assert counter.count <= 4
+
+    def test_empty_sections(self, client, db_session, make_project):
+        """An attorney with no active work shows the empty messages."""
+        make_project('Old Co', assigned_attorneys='Jones', status='archived')
+
+        response = client.get(f'/attorneys/{attorney_id(db_session, "Jones")}')
+
+        assert b'No active matters.' in response.data
+        assert b'No active matters assigned.' in response.data
+        assert b'No pending tasks.' in response.data
+
+    def test_unknown_attorney_is_404(self, client, db_session):
+        """A missing attorney id returns 404."""
+        assert client.get('/attorneys/999').status_code == 404
+
+
+class TestProjectDetailLinks:
+    """The project page links each attorney to their view."""
+
+    def test_attorney_names_link_to_their_page(self, client, db_session, make_project):
+        """Assigner and attorneys are rendered as links."""
+        project = make_project('Acme', assigned_attorneys='Jones, Lee')
+
+        response = client.get(f'/projects/{project.id}')
+
+        html = response.data.decode()
+        assert f'/attorneys/{attorney_id(db_session, "Lee")}' in html
+        assert f'/attorneys/{attorney_id(db_session, "Partner Smith")}' in html
@@ -1,6 +1,11 @@
 """Tests for app/routes/dashboard.py - Dashboard routes."""
 
 from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.changes import latest_change_id
+from app.live import ChangeFeed
 from app.models import Project, Task, StatusUpdate
 
 
@@ -840,3 +845,181 @@ class TestDashboardConfirmationModal:
         response = client.get('/')
         data = response.data.decode('utf-8')
         assert 'data-confirm="Mark this task as complete?"' in data
+
+
+class TestDashboardQueryCount:
+    """Test that the dashboard page does not issue per-project queries."""
+
+    def test_page_query_count_stays_flat(self, client, db_session, query_counter):
+        """Rendering the dashboard costs the same for 2 and 12 projects."""
+        def add_projects(count):
+            for i in range(count):
+                project = Project(
+                    client_name=f'Flat Client {i}',
+                    project_name='Flat Project',
+                    assigner='Test Partner',
+                    assigned_attorneys='Test Attorney'
+                )
+                db_session.add(project)
+                db_session.flush()
+                db_session.add(Task(project_id=project.id, target_type='self', target_name='Self',
+                                    due_date=date.today(), priority='medium'))
+                db_session.add(StatusUpdate(project_id=project.id, notes='Working on it'))
+            db_session.commit()
+
+        add_projects(2)
+        with query_counter() as small:
+            client.get('/')
+
+        add_projects(10)
+        with query_counter() as large:
+            response = client.get('/')
+
+        assert response.status_code == 200
+        assert small.count == large.count
+
+
+class TestDashboardCache:
+    """Test the cached dashboard snapshot and its stats endpoint."""
+
+    def test_repeat_load_is_a_cache_hit(self, client, sample_task, db_session):
+        """A second load serves the snapshot without rebuilding it."""
+        client.get('/')
+        before = client.get('/cache-stats').get_json()
+
+        response = client.get('/')
+        after = client.get('/cache-stats').get_json()
+
+        assert b'Acme Corp' in response.data
+        assert after['hits'] == before['hits'] + 1
+        assert after['misses'] == before['misses']
+
+    def test_write_route_invalidates(self, client, sample_project, db_session):
+        """Adding a task through its route shows up on the next dashboard load."""
+        client.get('/')
+
+        client.post('/tasks/new', data={
+            'project_id': sample_project.id,
+            'target_name': 'Fresh Follow-up',
+            'due_date': date.today().isoformat(),
+        })
+        response = client.get('/')
+
+        assert b'Fresh Follow-up' in response.data
+
+    def test_unchanged_cards_reuse_markup(self, client, db_session):
+        """After a write only the changed project's card is rendered again."""
+        today = date.today()
+        for name in ('Steady Client', 'Changing Client'):
+            project = Project(client_name=name, project_name='Matter',
+                              assigner='Partner', assigned_attorneys='Associate')
+            db_session.add(project)
+            db_session.flush()
+            db_session.add(Task(project_id=project.id, target_type='self', target_name=f'{name} Task',
+                                due_date=today))
+        db_session.commit()
+        client.get('/')
+        before = client.get('/cache-stats').get_json()['fragments']
+
+        task = Task.query.filter_by(target_name='Changing Client Task').one()
+        client.post(f'/tasks/{task.id}/edit', data={
+            'project_id': task.project_id, 'target_type': 'self', 'target_name': 'Renamed Task',
+            'due_date': today.isoformat(),
+            'priority': 'medium',
+        })
+        response = client.get('/')
+        after = client.get('/cache-stats').get_json()['fragments']
+
+        assert b'Renamed Task' in response.data
+        assert b'Steady Client Task' in response.data
+        assert after['hits'] == before['hits'] + 1
+        assert after['misses'] == before['misses'] + 1
+
+    def test_moved_task_leaves_old_card(self, client, db_session, make_project, make_task):
+        """Moving a task to another project re-renders the card it left, not just the one it joined."""
+        def card(html, project):
+            start = html.index(f'data-project-id="{project.id}"')
+            return html[start:html.index('</li>', start)]
+
+        source, target = make_project('Source Client'), make_project('Target Client')
+        moving = make_task(source, target_name='Moving Task')
+        make_task(source, target_name='Staying Task')
+        make_task(target, target_name='Target Task')
+        client.get('/')
+
+        client.post(f'/tasks/{moving.id}/edit', data={
+            'project_id': target.id, 'target_type': 'self', 'target_name': 'Moving Task',
+            'due_date': date.today().isoformat(), 'priority': 'medium',
+        })
+        html = client.get('/').get_data(as_text=True)
+
+        assert 'Moving Task' not in card(html, source)
+        assert 'Staying Task' in card(html, source)
+        assert 'Moving Task' in card(html, target)
+
+    def test_cache_stats_endpoint(self, client, db_session):
+        """Counters and backend name are exposed as JSON."""
+        response = client.get('/cache-stats')
+
+        assert response.status_code == 200
+        assert set(response.get_json()) == {
+            'backend', 'entries', 'hits', 'misses', 'invalidations', 'hit_ratio', 'fragments'
+        }
+        assert response.get_json()['backend'] == 'memory'
+        assert set(response.get_json()['fragments']) == {
+            'entries', 'chars', 'hits', 'misses', 'evictions', 'hit_ratio'
+        }
+
+
+class TestDashboardEvents:
+    """Test GET /events, the live update stream."""
+
+    @pytest.fixture(autouse=True)
+    def feed(self, app, monkeypatch):
+        """A fresh feed with a thread that never polls, and streams that end at once."""
+        change_feed = ChangeFeed(app, interval=3600)
+        monkeypatch.setitem(app.extensions, 'live_feed', change_feed)
+        monkeypatch.setitem(app.config, 'LIVE_STREAM_SECONDS', 0)
+        return change_feed
+
+    def test_page_links_stream_at_its_change_id(self, client, sample_project, db_session):
+        """The dashboard subscribes from the change log position it shows."""
+        response = client.get('/')
+
+        assert f'data-live-url="/events?since={latest_change_id()}"'.encode() in response.data
+        assert f'data-today="{date.today().isoformat()}"'.encode() in response.data
+
+    def test_live_updates_off(self, app, client, db_session, monkeypatch):
+        """LIVE_MAX_STREAMS = 0 leaves the page without a stream to open."""
+        monkeypatch.setitem(app.config, 'LIVE_MAX_STREAMS', 0)
+
+        response = client.get('/')
+
+        assert response.status_code == 200
+        assert b'data-live-url' not in response.data
+
+    def test_stream_response(self, client, db_session):
+        """The endpoint streams text/event-stream without caching or buffering."""
+        response = client.get('/events')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        assert response.headers['X-Accel-Buffering'] == 'no'
+        assert response.data.startswith(b'retry: ')
+
+    def test_last_event_id_wins_over_since(self, client, sample_project, make_task, feed):
+        """A reconnecting browser resumes from Last-Event-ID, catching up on the way."""
+        since = latest_change_id()
+        make_task(sample_project, target_name='Pushed Task')
+        feed.subscribe(latest_change_id())
+
+        response = client.get('/events?since=0', headers={'Last-Event-ID': str(since)})
+
+        assert b'event: card' in response.data
+        assert b'Pushed Task' in response.data
+        assert b'Acme Corp' in response.data
+
+    def test_bad_cursor(self, client, db_session):
+        """A non-numeric position is a 400."""
+        assert client.get('/events?since=abc').status_code == 400
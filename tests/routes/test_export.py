@@ -3,6 +3,10 @@ from datetime import date, timedelta
 import csv
 from io import StringIO
 
+import pytest
+
+from app.models import Job
+
 
 class TestExportCSV:
     """Test GET /export/ route."""
@@ -107,3 +111,122 @@ class TestExportCSV:
         headers = next(reader)
 
         assert 'Next Task' in headers
+
+    def test_export_csv_includes_next_milestone(self, client, sample_milestone, db_session):
+        """Export CSV includes the next pending milestone with its date."""
+        response = client.get('/export/')
+
+        csv_content = response.data.decode('utf-8')
+        assert f'Initial Filing ({sample_milestone.date.isoformat()})' in csv_content
+
+
+class TestExportStreaming:
+    """Test the streamed, batched export."""
+
+    def make_projects(self, db_session, count, status='active'):
+        from app.models import Project, StatusUpdate
+
+        for i in range(count):
+            project = Project(
+                client_name=f'{status.title()} Client {i}',
+                project_name='Streamed Project',
+                assigner='Self',
+                assigned_attorneys='Test',
+                status=status
+            )
+            db_session.add(project)
+            db_session.flush()
+            db_session.add(StatusUpdate(project_id=project.id, notes=f'Note {i}'))
+        db_session.commit()
+
+    def test_export_response_is_streamed(self, client, db_session):
+        """The export is sent as a streamed response."""
+        response = client.get('/export/')
+
+        assert response.is_streamed
+
+    def test_export_spans_multiple_batches(self, client, db_session, monkeypatch):
+        """Rows beyond one batch are all exported, in project order."""
+        from app.routes import export
+        monkeypatch.setattr(export, 'EXPORT_BATCH_SIZE', 2)
+        self.make_projects(db_session, 5)
+
+        response = client.get('/export/')
+
+        rows = list(csv.reader(StringIO(response.data.decode('utf-8'))))
+        assert [row[0] for row in rows[1:]] == [f'Active Client {i}' for i in range(5)]
+        assert [row[6] for row in rows[1:]] == [f'Note {i}' for i in range(5)]
+
+    def test_export_query_count_independent_of_projects(self, client, db_session, query_counter):
+        """Exporting 2 or 12 projects issues the same number of queries."""
+        self.make_projects(db_session, 2)
+        with query_counter() as small:
+            client.get('/export/').get_data()
+
+        self.make_projects(db_session, 10)
+        with query_counter() as large:
+            client.get('/export/').get_data()
+
+        assert small.count == large.count
+
+    def test_include_archived_adds_archived_projects(self, client, db_session):
+        """?include_archived=1 exports archived projects with a Status column."""
+        self.make_projects(db_session, 1)
+        self.make_projects(db_session, 1, status='archived')
+
+        response = client.get('/export/?include_archived=1')
+
+        rows = list(csv.reader(StringIO(response.data.decode('utf-8'))))
+        assert rows[0][-1] == 'Status'
+        assert [(row[0], row[-1]) for row in rows[1:]] == [
+            ('Active Client 0', 'active'),
+            ('Archived Client 0', 'archived'),
+        ]
+
+    def test_include_archived_reads_cold_storage(self, client, sample_milestone, db_session):
+        """Archived projects export their notes and next milestone from cold storage."""
+        from app.models import StatusUpdate
+        project_id = sample_milestone.project_id
+        db_session.add(StatusUpdate(project_id=project_id, notes='Closed out'))
+        db_session.commit()
+        client.post(f'/projects/{project_id}/archive')
+
+        response = client.get('/export/?include_archived=1')
+
+        row = list(csv.reader(StringIO(response.data.decode('utf-8'))))[1]
+        assert row[6] == 'Closed out'
+        assert row[8].startswith('Initial Filing')
+        assert row[-1] == 'archived'
+
+
+class TestStartExport:
+    """Test POST /export/ - the export as a background job."""
+
+    @pytest.fixture(autouse=True)
+    def job_files(self, app, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'JOB_OUTPUT_DIR', tmp_path)
+
+    def test_redirects_to_job(self, client, sample_project, db_session):
+        """The request queues a job and shows its progress page."""
+        response = client.post('/export/')
+
+        job = Job.query.one()
+        assert response.status_code == 302
+        assert response.location.endswith(f'/jobs/{job.id}')
+        assert job.kind == 'export'
+        assert job.params == {'include_archived': False}
+
+    def test_job_writes_the_export(self, client, sample_project, db_session):
+        """The finished job's download is the same CSV as GET /export/."""
+        sample_project.status = 'archived'
+        db_session.commit()
+
+        client.post('/export/', data={'include_archived': '1'})
+
+        job = Job.query.one()
+        assert job.status == 'succeeded'
+        assert job.output_file == f'worklist_{date.today()}.csv'
+        download = client.get(f'/jobs/{job.id}/download')
+        assert download.data == client.get('/export/?include_archived=1').data
+        assert job.result == {'bytes': len(download.data)}
+        download.close()
@@ -0,0 +1,71 @@
+"""Tests for app/routes/imports.py - file upload for bulk import."""
+from io import BytesIO
+
+import pytest
+
+from app.models import Job, Project
+
+
+@pytest.fixture(autouse=True)
+def job_files(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'JOB_OUTPUT_DIR', tmp_path)
+
+
+PROJECTS = (
+    b'client_name,project_name,assigner,assigned_attorneys,priority\n'
+    b'Globex,Merger,Partner Smith,Associate Jones,high\n'
+    b'Initech,Lease,Partner Smith,Associate Jones,urgent\n'
+)
+
+
+class TestImportUpload:
+    """Test GET/POST /import/."""
+
+    def test_form(self, client, db_session):
+        """The form offers every import kind."""
+        response = client.get('/import/')
+
+        assert response.status_code == 200
+        assert b'enctype="multipart/form-data"' in response.data
+        assert b'value="updates"' in response.data
+
+    def test_upload_runs_job(self, client, db_session, tmp_path):
+        """The upload is imported by a job whose page lists the rejected rows."""
+        response = client.post('/import/', data={'kind': 'projects', 'file': (BytesIO(PROJECTS), 'firm.csv')},
+                               content_type='multipart/form-data')
+
+        job = Job.query.one()
+        assert response.location.endswith(f'/jobs/{job.id}')
+        assert job.status == 'succeeded'
+        assert Project.query.one().client_name == 'Globex'
+        assert not list((tmp_path / 'uploads').iterdir())
+
+        page = client.get(f'/jobs/{job.id}').data
+        assert b'Imported 1 projects; 1 row(s) rejected.' in page
+        assert b'Priority must be high, medium, or low.' in page
+
+    def test_listed_errors_are_capped(self, client, db_session):
+        """The job page says when only some rejected rows are listed."""
+        job = Job(kind='import', params={}, status='succeeded',
+                  result={'kind': 'tasks', 'imported': 0, 'error_count': 250, 'errors': [[2, 'Bad.']]})
+        db_session.add(job)
+        db_session.commit()
+
+        assert b'Only the first 1 rejected rows are listed.' in client.get(f'/jobs/{job.id}').data
+
+    def test_missing_kind_and_file(self, client, db_session):
+        """Both fields are required."""
+        response = client.post('/import/', data={'kind': 'clients'})
+
+        assert response.status_code == 400
+        assert b'Choose what the file contains.' in response.data
+        assert b'Choose a file to import.' in response.data
+        assert Job.query.count() == 0
+
+    def test_unsupported_file_type(self, client, db_session):
+        """Only CSV and JSON Lines files are accepted."""
+        response = client.post('/import/', data={'kind': 'tasks', 'file': (BytesIO(b''), 'tasks.xlsx')},
+                               content_type='multipart/form-data')
+
+        assert response.status_code == 400
+        assert b'The file must be .csv or .jsonl.' in response.data
@@ -0,0 +1,96 @@
+"""Tests for app/routes/jobs.py - job progress pages and downloads."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs import job_output_path
+from app.models import Job
+
+
+@pytest.fixture(autouse=True)
+def job_files(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'JOB_OUTPUT_DIR', tmp_path)
+
+
+def add_job(db_session, status, **columns):
+    job = Job(kind='export', params={}, status=status, **columns)
+    db_session.add(job)
+    db_session.commit()
+    return job
+
+
+class TestJobDetail:
+    """Test GET /jobs/<id>."""
+
+    def test_unfinished_job_refreshes(self, client, db_session):
+        """A queued job's page reloads itself."""
+        job = add_job(db_session, 'queued')
+
+        response = client.get(f'/jobs/{job.id}')
+
+        assert response.status_code == 200
+        assert b'Waiting to start' in response.data
+        assert b'http-equiv="refresh"' in response.data
+
+    def test_succeeded_job_links_download(self, client, db_session):
+        """A finished export links its file and stops refreshing."""
+        job = add_job(db_session, 'succeeded', output_file='worklist.csv',
+                      started_at=datetime.utcnow(), finished_at=datetime.utcnow())
+
+        response = client.get(f'/jobs/{job.id}')
+
+        assert f'/jobs/{job.id}/download'.encode() in response.data
+        assert b'Download worklist.csv' in response.data
+        assert b'http-equiv="refresh"' not in response.data
+
+    def test_failed_job_shows_error(self, client, db_session):
+        """A failed job shows why."""
+        job = add_job(db_session, 'failed', error='OSError: disk full', finished_at=datetime.utcnow())
+
+        response = client.get(f'/jobs/{job.id}')
+
+        assert b'Failed: OSError: disk full' in response.data
+        assert b'/download' not in response.data
+
+    def test_running_job(self, client, db_session):
+        """A running job says so."""
+        job = add_job(db_session, 'running', started_at=datetime.utcnow())
+
+        assert b'Running...' in client.get(f'/jobs/{job.id}').data
+
+    def test_stale_job_is_resumed(self, client, db_session):
+        """Viewing a job whose process stopped heartbeating runs it again."""
+        silent = datetime.utcnow() - timedelta(hours=1)
+        job = add_job(db_session, 'running', started_at=silent, heartbeat_at=silent)
+
+        response = client.get(f'/jobs/{job.id}')
+
+        assert b'Download worklist' in response.data
+
+    def test_missing_job(self, client, db_session):
+        """Unknown jobs are a 404."""
+        assert client.get('/jobs/999').status_code == 404
+
+
+class TestJobDownload:
+    """Test GET /jobs/<id>/download."""
+
+    def test_download(self, client, db_session):
+        """The job's file is served as an attachment."""
+        job = add_job(db_session, 'succeeded')
+        job_output_path(job, 'worklist.csv').write_text('Client\n')
+        db_session.commit()
+
+        response = client.get(f'/jobs/{job.id}/download')
+
+        assert response.status_code == 200
+        assert response.data == b'Client\n'
+        assert 'attachment; filename=worklist.csv' in response.headers['Content-Disposition']
+        response.close()
+
+    def test_unfinished_job_has_no_download(self, client, db_session):
+        """Only succeeded jobs with a file can be downloaded."""
+        job = add_job(db_session, 'running')
+
+        assert client.get(f'/jobs/{job.id}/download').status_code == 404
+        assert client.get('/jobs/999/download').status_code == 404
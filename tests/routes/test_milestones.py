@@ -42,6 +42,18 @@ class TestMilestoneList:
         assert b'Patent Application' in response.data
 
 
+    def test_list_filters(self, client, sample_milestone, db_session):
+        """Attorney and date window filters are applied in the query."""
+        in_window = client.get(f'/milestones/?attorney=Associate%20Jones'
+                               f'&start={sample_milestone.date.isoformat()}')
+        out_of_window = client.get(f'/milestones/?end={date.today().isoformat()}')
+        other_attorney = client.get('/milestones/?attorney=Someone%20Else')
+
+        assert b'Initial Filing' in in_window.data
+        assert b'Initial Filing' not in out_of_window.data
+        assert b'Initial Filing' not in other_attorney.data
+
+
 class TestMilestoneNew:
     """Test GET/POST /milestones/new routes."""
 
@@ -294,3 +306,33 @@ class TestMilestoneListUI:
         response = client.get('/milestones/')
         data = response.data.decode('utf-8')
         assert 'data-confirm="Mark this milestone as complete?"' in data
+
+
+class TestMilestoneListPagination:
+    """Test keyset pagination on GET /milestones/."""
+
+    def test_pages_follow_date_order(self, client, sample_project, db_session):
+        """Next links walk the pending milestones in date order without repeats."""
+        import html
+        import re
+
+        for day in range(5):
+            db_session.add(Milestone(project_id=sample_project.id, name=f'Phase {day}',
+                                     date=date.today() + timedelta(days=day)))
+        db_session.commit()
+
+        seen = []
+        url = '/milestones/?per_page=2'
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            seen += re.findall(r'Phase (\d)', response.data.decode())
+            match = re.search(r'href="([^"]+)"[^>]*rel="next"', response.data.decode())
+            url = html.unescape(match.group(1)) if match else None
+
+        assert seen == ['0', '1', '2', '3', '4']
+
+    def test_invalid_cursor_returns_400(self, client, db_session):
+        """A tampered cursor is rejected."""
+        response = client.get('/milestones/?cursor=garbage')
+        assert response.status_code == 400
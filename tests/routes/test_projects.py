@@ -440,6 +440,19 @@ class TestProjectDetail:
         assert b'Archive' in response.data
         assert b'Unarchive' not in response.data
 
+    def test_detail_shows_cold_history_read_only(self, client, sample_task, sample_milestone, db_session):
+        """An archived project's history is shown from cold storage without actions."""
+        project_id = sample_task.project_id
+        client.post(f'/projects/{project_id}/archive')
+
+        response = client.get(f'/projects/{project_id}')
+
+        assert b'John Doe' in response.data
+        assert b'Initial Filing' in response.data
+        assert b'read-only until it is unarchived' in response.data
+        assert b'Snooze' not in response.data
+        assert b'Mark this milestone as complete?' not in response.data
+
     def test_detail_shows_unarchive_button_for_archived(self, client, sample_project, db_session):
         """Project detail shows Unarchive button for archived projects."""
         sample_project.status = 'archived'
@@ -450,6 +463,102 @@ class TestProjectDetail:
         assert b'Unarchive' in response.data
 
 
+class TestProjectDetailLoading:
+    """Test that the detail page is built from a fixed number of queries."""
+
+    def add_history(self, db_session, project, count):
+        from datetime import datetime
+        from app.models import Milestone, StatusUpdate, Task
+
+        for i in range(count):
+            db_session.add_all([
+                StatusUpdate(project_id=project.id, notes=f'Update {i}'),
+                Task(project_id=project.id, target_type='self', target_name=f'Task {i}',
+                     due_date=date.today() + timedelta(days=i), completed=i % 2 == 0,
+                     completed_at=datetime.utcnow() if i % 2 == 0 else None),
+                Milestone(project_id=project.id, name=f'Milestone {i}',
+                          date=date.today() + timedelta(days=i), completed=i % 2 == 0),
+            ])
+        project.assigned_attorneys = ', '.join(f'Associate {i}' for i in range(count))
+        db_session.commit()
+
+    def test_query_count_independent_of_history(self, client, sample_project, db_session, query_counter):
+        """A project with 2 or 40 of each child costs the same number of queries."""
+        self.add_history(db_session, sample_project, 2)
+        with query_counter() as small:
+            client.get(f'/projects/{sample_project.id}')
+
+        self.add_history(db_session, sample_project, 38)
+        with query_counter() as large:
+            client.get(f'/projects/{sample_project.id}')
+
+        assert small.count == large.count
+
+    def test_only_newest_updates_are_rendered(self, client, sample_project, db_session):
+        """Updates beyond the first chunk are behind a "Show older updates" link."""
+        from app.project_detail import UPDATE_CHUNK_SIZE
+        self.add_history(db_session, sample_project, UPDATE_CHUNK_SIZE + 1)
+
+        response = client.get(f'/projects/{sample_project.id}')
+
+        assert response.data.count(b'class="update-item"') == UPDATE_CHUNK_SIZE
+        assert b'Show older updates' in response.data
+        assert f'/projects/{sample_project.id}/updates?cursor='.encode() in response.data
+
+
+class TestProjectUpdates:
+    """Test GET /projects/<id>/updates route."""
+
+    def next_chunk_url(self, client, project_id):
+        import re
+        response = client.get(f'/projects/{project_id}')
+        return re.search(rb'href="([^"]*/updates\?cursor=[^"]*)"', response.data).group(1).decode()
+
+    def test_full_page_continues_history(self, client, sample_project, db_session):
+        """Without JavaScript the link opens a page of the older updates."""
+        from app.models import StatusUpdate
+        from app.project_detail import UPDATE_CHUNK_SIZE
+        db_session.add_all([StatusUpdate(project_id=sample_project.id, notes=f'Note {i:02}')
+                            for i in range(UPDATE_CHUNK_SIZE + 1)])
+        db_session.commit()
+
+        response = client.get(self.next_chunk_url(client, sample_project.id))
+
+        assert response.status_code == 200
+        assert b'Back to Project' in response.data
+        assert response.data.count(b'class="update-item"') == 1
+        assert b'Show older updates' not in response.data
+
+    def test_partial_returns_list_items_only(self, client, sample_project, db_session):
+        """?partial=1 returns just the items for app.js to append."""
+        from app.models import StatusUpdate
+        from app.project_detail import UPDATE_CHUNK_SIZE
+        db_session.add_all([StatusUpdate(project_id=sample_project.id, notes=f'Note {i:02}')
+                            for i in range(UPDATE_CHUNK_SIZE + 1)])
+        db_session.commit()
+
+        response = client.get(self.next_chunk_url(client, sample_project.id) + '&partial=1')
+
+        assert response.data.strip().startswith(b'<li class="update-item">')
+        assert b'<html' not in response.data
+
+    def test_empty_history(self, client, sample_project, db_session):
+        """A project without updates shows an empty state."""
+        response = client.get(f'/projects/{sample_project.id}/updates')
+
+        assert b'No older status updates' in response.data
+
+    def test_bad_cursor_is_400(self, client, sample_project, db_session):
+        """A malformed cursor is rejected."""
+        response = client.get(f'/projects/{sample_project.id}/updates?cursor=garbage')
+
+        assert response.status_code == 400
+
+    def test_missing_project_is_404(self, client, db_session):
+        """Unknown projects return 404."""
+        assert client.get('/projects/99999/updates').status_code == 404
+
+
 class TestProjectEdit:
     """Test GET/POST /projects/<id>/edit routes."""
 
@@ -739,6 +848,17 @@ class TestProjectArchive:
         db_session.refresh(sample_project)
         assert sample_project.status == 'active'  # Not archived due to error
 
+    def test_archive_moves_history_to_cold_storage(self, client, sample_task, db_session):
+        """Archiving moves the project's tasks out of the hot table."""
+        from app.models import ColdTask, Task
+        project_id, task_id = sample_task.project_id, sample_task.id
+
+        client.post(f'/projects/{project_id}/archive')
+
+        db_session.expire_all()
+        assert db_session.get(Task, task_id) is None
+        assert db_session.get(ColdTask, task_id).project_id == project_id
+
 
 class TestProjectUnarchive:
     """Test POST /projects/<id>/unarchive route."""
@@ -791,6 +911,21 @@ class TestProjectUnarchive:
         assert sample_project.updated_at >= original_updated_at
 
 
+    def test_unarchive_restores_history(self, client, sample_task, db_session):
+        """Unarchiving brings the tasks back with their ids and rollups."""
+        from app.models import Project, Task
+        project_id, task_id = sample_task.project_id, sample_task.id
+        client.post(f'/projects/{project_id}/archive')
+
+        client.post(f'/projects/{project_id}/unarchive')
+
+        db_session.expire_all()
+        assert db_session.get(Task, task_id).project_id == project_id
+        project = db_session.get(Project, project_id)
+        assert project.archived_at is None
+        assert project.rollup_next_task_id == task_id
+
+
 class TestArchivedList:
     """Test GET /projects/archived route."""
 
@@ -915,7 +1050,7 @@ class TestProjectListFiltering:
         assert b'High Client' not in response.data
 
     def test_list_filter_by_attorney(self, client, db_session):
-        """Filter by attorney uses contains match."""
+        """Filter by attorney matches one of the project's attorneys by name."""
         from app.models import Project
 
         jones = Project(client_name='Jones Client', project_name='Jones Project',
@@ -930,6 +1065,23 @@ class TestProjectListFiltering:
         assert b'Jones Client' in response.data
         assert b'Smith Client' not in response.data
 
+    def test_list_filter_by_attorney_is_not_a_substring_match(self, client, db_session):
+        """Filtering for "Ann" does not match "Joanne"."""
+        from app.models import Project
+
+        db_session.add_all([
+            Project(client_name='Ann Client', project_name='P1', assigner='Self',
+                    assigned_attorneys='ann; Lee', priority='medium'),
+            Project(client_name='Joanne Client', project_name='P2', assigner='Self',
+                    assigned_attorneys='Joanne', priority='medium'),
+        ])
+        db_session.commit()
+
+        response = client.get('/projects/?attorney=Ann')
+
+        assert b'Ann Client' in response.data
+        assert b'Joanne Client' not in response.data
+
     def test_list_filter_by_assigner(self, client, db_session):
         """Filter by assigner uses exact match."""
         from app.models import Project
@@ -965,6 +1117,33 @@ class TestProjectListFiltering:
         assert b'Wrong Priority' not in response.data
         assert b'Wrong Attorney' not in response.data
 
+    def test_list_filter_by_stale_days(self, client, db_session):
+        """?stale=N keeps projects with no activity for N or more days."""
+        from app.models import Project, Task
+        from datetime import datetime
+
+        stale = Project(client_name='Stale Client', project_name='Stale Project',
+                        assigner='Self', assigned_attorneys='Me', priority='medium')
+        stale.created_at = datetime.utcnow() - timedelta(days=20)
+        revived = Project(client_name='Revived Client', project_name='Revived Project',
+                          assigner='Self', assigned_attorneys='Me', priority='medium')
+        revived.created_at = datetime.utcnow() - timedelta(days=20)
+        fresh = Project(client_name='Fresh Client', project_name='Fresh Project',
+                        assigner='Self', assigned_attorneys='Me', priority='medium')
+        db_session.add_all([stale, revived, fresh])
+        db_session.flush()
+        db_session.add(Task(project_id=revived.id, target_type='self', target_name='Self',
+                            due_date=date.today(), completed=True,
+                            completed_at=datetime.utcnow()))
+        db_session.commit()
+
+        response = client.get('/projects/?stale=14')
+
+        assert b'Stale Client' in response.data
+        assert b'Revived Client' not in response.data
+        assert b'Fresh Client' not in response.data
+        assert b'stale=14' in response.data
+
     def test_list_no_filters_shows_all(self, client, db_session):
         """Empty filters return all active projects."""
         from app.models import Project
@@ -1145,6 +1324,192 @@ class TestProjectListSorting:
         assert b'sort_by=client_name' in response.data
 
 
+    def test_list_sort_by_staleness_uses_latest_update(self, client, db_session):
+        """An old project with a recent update sorts as fresh."""
+        from app.models import Project, StatusUpdate
+        from datetime import datetime
+
+        old = Project(client_name='Old Updated', project_name='Old Project',
+                      assigner='Self', assigned_attorneys='Me', priority='medium')
+        old.created_at = datetime.utcnow() - timedelta(days=30)
+        middle = Project(client_name='Middle Client', project_name='Middle Project',
+                         assigner='Self', assigned_attorneys='Me', priority='medium')
+        middle.created_at = datetime.utcnow() - timedelta(days=5)
+        db_session.add_all([old, middle])
+        db_session.flush()
+        db_session.add(StatusUpdate(project_id=old.id, notes='Fresh news'))
+        db_session.commit()
+
+        response = client.get('/projects/?sort_by=staleness&sort_order=asc')
+
+        assert response.data.find(b'Old Updated') < response.data.find(b'Middle Client')
+
+    def test_list_sort_ties_break_on_id(self, client, db_session):
+        """Projects with equal sort keys keep creation order."""
+        from app.models import Project
+
+        first = Project(client_name='Same Client', project_name='First Tie',
+                        assigner='Self', assigned_attorneys='Me', priority='high')
+        second = Project(client_name='Same Client', project_name='Second Tie',
+                         assigner='Self', assigned_attorneys='Me', priority='high')
+        db_session.add_all([first, second])
+        db_session.commit()
+
+        for sort_by in ('priority', 'client_name'):
+            response = client.get(f'/projects/?sort_by={sort_by}&sort_order=desc')
+            assert response.data.find(b'First Tie') < response.data.find(b'Second Tie')
+
+
+class TestProjectListQueryCount:
+    """Test that the project list does not issue per-row queries."""
+
+    def test_list_query_count_stays_flat(self, client, db_session, query_counter):
+        """Listing costs the same for 2 and 12 projects with tasks and updates."""
+        from app.models import Project, StatusUpdate, Task
+
+        def add_projects(count):
+            for i in range(count):
+                project = Project(client_name=f'Flat Client {i}', project_name='Flat Project',
+                                  assigner=f'Partner {i}', assigned_attorneys=f'Associate {i}',
+                                  priority='medium')
+                db_session.add(project)
+                db_session.flush()
+                db_session.add(Task(project_id=project.id, target_type='self', target_name='Self',
+                                    due_date=date.today(), priority='medium'))
+                db_session.add(StatusUpdate(project_id=project.id, notes='Working on it'))
+            db_session.commit()
+
+        add_projects(2)
+        with query_counter() as small:
+            client.get('/projects/?sort_by=staleness')
+
+        add_projects(10)
+        with query_counter() as large:
+            response = client.get('/projects/?sort_by=staleness')
+
+        assert response.status_code == 200
+        assert small.count == large.count
+
+    def test_list_shows_rollup_columns(self, client, db_session):
+        """Next task due date and last update date come from the rollups."""
+        from app.models import Project, StatusUpdate, Task
+
+        project = Project(client_name='Rollup Client', project_name='Rollup Project',
+                          assigner='Self', assigned_attorneys='Me', priority='medium')
+        db_session.add(project)
+        db_session.flush()
+        due = date.today() + timedelta(days=3)
+        db_session.add(Task(project_id=project.id, target_type='self', target_name='Self',
+                            due_date=due, priority='medium'))
+        db_session.add(StatusUpdate(project_id=project.id, notes='Started'))
+        db_session.commit()
+
+        response = client.get('/projects/')
+
+        assert due.isoformat().encode() in response.data
+        assert project.rollup_last_update_at.strftime('%Y-%m-%d').encode() in response.data
+
+
+class TestProjectListPagination:
+    """Test keyset pagination on the project list, archive and detail pages."""
+
+    @staticmethod
+    def walk(client, url):
+        """Follow rel="next" links from `url`; return each page's HTML."""
+        import html
+        import re
+
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            pages.append(response.data.decode())
+            match = re.search(r'href="([^"]+)"[^>]*rel="next"', pages[-1])
+            url = html.unescape(match.group(1)) if match else None
+        return pages
+
+    @staticmethod
+    def add_projects(db_session, count, status='active'):
+        from app.models import Project
+
+        db_session.add_all([
+            Project(client_name=f'Paged {i:02d}', project_name='Matter', assigner='Self',
+                    assigned_attorneys='Me', priority='medium', status=status)
+            for i in range(count)
+        ])
+        db_session.commit()
+
+    def test_list_pages_keep_sort_and_filters(self, client, db_session):
+        """Next links preserve the sort order and filters of the first page."""
+        import re
+
+        self.add_projects(db_session, 5)
+        pages = self.walk(client, '/projects/?sort_by=client_name&sort_order=desc'
+                                  '&priority=medium&per_page=2')
+
+        names = [name for page in pages for name in re.findall(r'Paged (\d\d)', page)]
+        assert len(pages) == 3
+        assert names == ['04', '03', '02', '01', '00']
+
+    def test_list_previous_link(self, client, db_session):
+        """The second page links back to the first."""
+        import html
+        import re
+
+        self.add_projects(db_session, 3)
+        pages = self.walk(client, '/projects/?per_page=2')
+
+        prev = re.search(r'href="([^"]+)"[^>]*rel="prev"', pages[1]).group(1)
+        response = client.get(html.unescape(prev))
+        assert re.findall(r'Paged (\d\d)', response.data.decode()) == ['00', '01']
+        assert 'rel="prev"' not in response.data.decode()
+
+    def test_list_rejects_cursor_from_other_sort(self, client, db_session):
+        """A cursor made for one sort order is a 400 under another."""
+        import html
+        import re
+
+        self.add_projects(db_session, 3)
+        first = client.get('/projects/?sort_by=client_name&per_page=2').data.decode()
+        cursor = re.search(r'cursor=([^"&]+)', html.unescape(first)).group(1)
+
+        response = client.get(f'/projects/?sort_by=staleness&cursor={cursor}')
+        assert response.status_code == 400
+
+    def test_archived_is_paginated(self, client, db_session):
+        """The archive list is paged by client name."""
+        import re
+
+        self.add_projects(db_session, 3, status='archived')
+        pages = self.walk(client, '/projects/archived?per_page=2')
+
+        names = [name for page in pages for name in re.findall(r'Paged (\d\d)', page)]
+        assert names == ['00', '01', '02']
+
+    def test_detail_completed_tasks_are_paginated(self, client, sample_project, db_session):
+        """Completed-task history on the detail page is paged, newest first."""
+        import re
+        from datetime import datetime
+        from app.models import Task
+
+        now = datetime.utcnow()
+        for i in range(3):
+            db_session.add(Task(project_id=sample_project.id, target_type='self',
+                                target_name=f'Done {i}', due_date=date.today(), completed=True,
+                                completed_at=now - timedelta(hours=i)))
+        db_session.commit()
+
+        pages = self.walk(client, f'/projects/{sample_project.id}?per_page=2')
+
+        names = [name for page in pages for name in re.findall(r'Done (\d)', page)]
+        assert names == ['0', '1', '2']
+
+    def test_invalid_cursor_returns_400(self, client, sample_project, db_session):
+        """Tampered cursors are rejected on every paged page."""
+        for url in ('/projects/', '/projects/archived', f'/projects/{sample_project.id}'):
+            assert client.get(f'{url}?cursor=garbage').status_code == 400
+
+
 class TestProjectListTemplateContext:
     """Test that filter state and dropdown values are passed to template."""
 
@@ -1167,6 +1532,41 @@ class TestProjectListTemplateContext:
         assert b'Partner Bob' in response.data
         assert b'Partner Carol' in response.data
 
+    def test_list_dropdowns_are_distinct_and_active_only(self, client, db_session):
+        """Dropdowns list each active value once and skip archived projects."""
+        from app.models import Project
+
+        db_session.add_all([
+            Project(client_name='Client A', project_name='Project A', assigner='Partner Bob',
+                    assigned_attorneys='Associate Alice', priority='medium'),
+            Project(client_name='Client B', project_name='Project B', assigner='Partner Bob',
+                    assigned_attorneys='Associate Alice', priority='medium'),
+            Project(client_name='Client C', project_name='Project C', assigner='Partner Gone',
+                    assigned_attorneys='Associate Gone', priority='medium', status='archived'),
+        ])
+        db_session.commit()
+
+        response = client.get('/projects/')
+
+        assert response.data.count(b'<option value="Associate Alice"') == 1
+        assert response.data.count(b'<option value="Partner Bob"') == 1
+        assert b'Partner Gone' not in response.data
+        assert b'Associate Gone' not in response.data
+
+    def test_list_attorney_dropdown_splits_names(self, client, db_session):
+        """Each attorney in a comma-joined list gets its own option."""
+        from app.models import Project
+
+        db_session.add(Project(client_name='Client A', project_name='Project A', assigner='Self',
+                               assigned_attorneys='Alice, Bob', priority='medium'))
+        db_session.commit()
+
+        response = client.get('/projects/')
+
+        assert b'<option value="Alice"' in response.data
+        assert b'<option value="Bob"' in response.data
+        assert b'<option value="Alice, Bob"' not in response.data
+
     def test_list_shows_filter_form(self, client, db_session):
         """Template displays filter form controls."""
         response = client.get('/projects/')
@@ -0,0 +1,54 @@
+"""Tests for app/routes/search.py - Search routes."""
+from app.models import StatusUpdate
+
+
+class TestSearchPage:
+    """Test GET /search/ route."""
+
+    def test_empty_search_shows_form(self, client, db_session):
+        """Without a query the page just shows the search box."""
+        response = client.get('/search/')
+
+        assert response.status_code == 200
+        assert b'name="q"' in response.data
+        assert b'No results' not in response.data
+
+    def test_results_link_to_project(self, client, sample_project, db_session):
+        """Hits are listed with a link to their project and highlighted terms."""
+        db_session.add(StatusUpdate(project_id=sample_project.id, notes='Examiner interview went well'))
+        db_session.commit()
+
+        response = client.get('/search/?q=examiner')
+
+        assert f'/projects/{sample_project.id}'.encode() in response.data
+        assert b'<mark>Examiner</mark> interview' in response.data
+
+    def test_archived_projects_are_labelled(self, client, sample_project, db_session):
+        """Hits in archived projects say so."""
+        sample_project.status = 'archived'
+        db_session.commit()
+
+        response = client.get('/search/?q=acme')
+
+        assert b'(archived)' in response.data
+
+    def test_no_results_message(self, client, db_session):
+        """A query with no hits says so."""
+        response = client.get('/search/?q=nothing')
+
+        assert b'No results for "nothing".' in response.data
+
+    def test_json_results(self, client, sample_project, db_session):
+        """Clients asking for JSON get the ranked results as JSON."""
+        response = client.get('/search/?q=acme&limit=5', headers={'Accept': 'application/json'})
+
+        body = response.get_json()
+        assert body['query'] == 'acme'
+        assert body['results'][0]['project_id'] == sample_project.id
+        assert body['results'][0]['kind'] == 'project'
+
+    def test_nav_links_to_search(self, client, db_session):
+        """The main navigation has a Search link."""
+        response = client.get('/')
+
+        assert b'href="/search/"' in response.data
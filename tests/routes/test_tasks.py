@@ -28,6 +28,66 @@ class TestTaskList:
         assert b'John Doe' not in response.data
 
 
+    def test_list_filters(self, client, sample_project, db_session):
+        """Target type and due date window filters are applied."""
+        db_session.add_all([
+            Task(project_id=sample_project.id, target_type='client', target_name='Client Soon',
+                 due_date=date.today() + timedelta(days=1)),
+            Task(project_id=sample_project.id, target_type='self', target_name='Self Soon',
+                 due_date=date.today() + timedelta(days=1)),
+            Task(project_id=sample_project.id, target_type='client', target_name='Client Later',
+                 due_date=date.today() + timedelta(days=30)),
+        ])
+        db_session.commit()
+        end = (date.today() + timedelta(days=7)).isoformat()
+
+        response = client.get(f'/tasks/?target_type=client&end={end}')
+
+        assert b'Client Soon' in response.data
+        assert b'Self Soon' not in response.data
+        assert b'Client Later' not in response.data
+        assert f'value="{end}"'.encode() in response.data
+
+    def test_list_filter_by_attorney(self, client, sample_task, db_session):
+        """The attorney filter matches assigned attorneys and is offered in the form."""
+        shown = client.get('/tasks/?attorney=Associate%20Jones')
+        hidden = client.get('/tasks/?attorney=Someone%20Else')
+
+        assert b'John Doe' in shown.data
+        assert b'<option value="Associate Jones" selected' in shown.data
+        assert b'John Doe' not in hidden.data
+
+    def test_list_ignores_unknown_target_type(self, client, sample_task, db_session):
+        """An unknown target type is treated as no filter."""
+        response = client.get('/tasks/?target_type=bogus')
+
+        assert b'John Doe' in response.data
+
+    def test_list_query_count_stays_flat(self, client, db_session, query_counter):
+        """Project names come from the joined query, not a lookup per row."""
+        from app.models import Project
+
+        def add_tasks(count):
+            for i in range(count):
+                project = Project(client_name=f'Flat {i}', project_name='Flat Matter',
+                                  assigner='Partner', assigned_attorneys='Associate')
+                db_session.add(project)
+                db_session.flush()
+                db_session.add(Task(project_id=project.id, target_type='self',
+                                    target_name='Self', due_date=date.today()))
+            db_session.commit()
+
+        add_tasks(2)
+        with query_counter() as small:
+            client.get('/tasks/')
+        add_tasks(10)
+        with query_counter() as large:
+            response = client.get('/tasks/')
+
+        assert b'Flat 9: Flat Matter' in response.data
+        assert small.count == large.count
+
+
 class TestTaskNew:
     """Test GET/POST /tasks/new routes."""
 
@@ -354,6 +414,213 @@ class TestTaskSnooze:
         assert response.location == '/projects/1'
 
 
+class TestTaskBulk:
+    """Test POST /tasks/bulk route."""
+
+    @staticmethod
+    def make_tasks(db_session, project, count, **kwargs):
+        tasks = [
+            Task(project_id=project.id, target_type='self', target_name=f'Bulk {i}',
+                 due_date=date.today() + timedelta(days=i), **kwargs)
+            for i in range(count)
+        ]
+        db_session.add_all(tasks)
+        db_session.commit()
+        return tasks
+
+    def test_complete_many_tasks(self, client, sample_project, db_session):
+        """Complete marks every selected task done and returns a summary."""
+        tasks = self.make_tasks(db_session, sample_project, 3)
+
+        response = client.post('/tasks/bulk', json={
+            'task_ids': [t.id for t in tasks[:2]], 'action': 'complete'
+        })
+
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'action': 'complete', 'requested': 2, 'updated': 2,
+            'task_ids': [tasks[0].id, tasks[1].id], 'project_ids': [sample_project.id],
+        }
+        for task in tasks:
+            db_session.refresh(task)
+        assert [t.completed for t in tasks] == [True, True, False]
+        assert tasks[0].completed_at is not None
+
+    def test_complete_skips_already_completed(self, client, sample_project, db_session):
+        """Already-completed tasks keep their completion time and are counted as skipped."""
+        from datetime import datetime
+
+        done_at = datetime(2024, 1, 1, 9, 0)
+        done = self.make_tasks(db_session, sample_project, 1, completed=True, completed_at=done_at)[0]
+        pending = self.make_tasks(db_session, sample_project, 1)[0]
+
+        response = client.post('/tasks/bulk', json={
+            'task_ids': [done.id, pending.id, 99999], 'action': 'complete'
+        })
+
+        assert response.get_json()['requested'] == 3
+        assert response.get_json()['updated'] == 1
+        db_session.refresh(done)
+        assert done.completed_at == done_at
+
+    def test_snooze_pushes_each_due_date(self, client, sample_project, db_session):
+        """Snooze moves each task from its own due date."""
+        tasks = self.make_tasks(db_session, sample_project, 2)
+        originals = [t.due_date for t in tasks]
+
+        client.post('/tasks/bulk', json={'task_ids': [t.id for t in tasks],
+                                         'action': 'snooze', 'days': 30})
+
+        for task, original in zip(tasks, originals):
+            db_session.refresh(task)
+            assert task.due_date == original + timedelta(days=30)
+
+    def test_snooze_days_are_clamped(self, client, sample_project, db_session):
+        """Snooze days are forced into 1..365, defaulting to 1 when unparseable."""
+        tasks = self.make_tasks(db_session, sample_project, 2)
+        originals = [t.due_date for t in tasks]
+
+        client.post('/tasks/bulk', json={'task_ids': [tasks[0].id], 'action': 'snooze', 'days': 9999})
+        client.post('/tasks/bulk', json={'task_ids': [tasks[1].id], 'action': 'snooze', 'days': 'x'})
+
+        db_session.refresh(tasks[0])
+        db_session.refresh(tasks[1])
+        assert tasks[0].due_date == originals[0] + timedelta(days=365)
+        assert tasks[1].due_date == originals[1] + timedelta(days=1)
+
+    def test_reassign(self, client, sample_project, db_session):
+        """Reassign sets the target type and name."""
+        tasks = self.make_tasks(db_session, sample_project, 2)
+
+        client.post('/tasks/bulk', json={'task_ids': [t.id for t in tasks], 'action': 'reassign',
+                                         'target_type': 'associate', 'target_name': 'Jane Roe'})
+
+        for task in tasks:
+            db_session.refresh(task)
+            assert (task.target_type, task.target_name) == ('associate', 'Jane Roe')
+
+    def test_prioritize(self, client, sample_project, db_session):
+        """Prioritize sets the priority."""
+        tasks = self.make_tasks(db_session, sample_project, 2)
+
+        client.post('/tasks/bulk', json={'task_ids': [t.id for t in tasks],
+                                         'action': 'prioritize', 'priority': 'high'})
+
+        for task in tasks:
+            db_session.refresh(task)
+            assert task.priority == 'high'
+
+    def test_single_update_statement(self, client, sample_project, db_session):
+        """The tasks are changed by one UPDATE regardless of how many are selected."""
+        tasks = self.make_tasks(db_session, sample_project, 25)
+        statements = []
+
+        from sqlalchemy import event
+        from app import db
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            client.post('/tasks/bulk', json={'task_ids': [t.id for t in tasks], 'action': 'complete'})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        task_updates = [s for s in statements if s.startswith('UPDATE tasks')]
+        assert len(task_updates) == 1
+
+    def test_rollups_follow_bulk_changes(self, client, sample_project, db_session):
+        """Project rollups reflect the bulk update."""
+        tasks = self.make_tasks(db_session, sample_project, 3)
+
+        client.post('/tasks/bulk', json={'task_ids': [t.id for t in tasks[:2]], 'action': 'complete'})
+
+        db_session.refresh(sample_project)
+        assert sample_project.rollup_pending_tasks == 1
+        assert sample_project.rollup_next_task_id == tasks[2].id
+
+    def test_form_post_flashes_summary_and_redirects(self, client, sample_project, db_session):
+        """Form posts flash a summary and go back to the referring page."""
+        tasks = self.make_tasks(db_session, sample_project, 2)
+
+        response = client.post('/tasks/bulk', data={
+            'task_ids': [str(tasks[0].id), str(tasks[1].id), '99999'], 'action': 'complete'
+        }, headers={'Referer': '/'})
+
+        assert response.status_code == 302
+        assert response.location == '/'
+        page = client.get('/')
+        assert b'2 task(s) updated (completed). 1 skipped.' in page.data
+
+    def test_form_post_without_referrer_goes_to_list(self, client, sample_task, db_session):
+        """Without a referrer the form post lands on the task list."""
+        response = client.post('/tasks/bulk', data={'task_ids': [str(sample_task.id)],
+                                                    'action': 'prioritize', 'priority': 'low'})
+
+        assert response.location == '/tasks/'
+
+    def test_validation_errors_json(self, client, sample_task, db_session):
+        """Bad input is a 400 listing every problem, and nothing changes."""
+        cases = [
+            ({'action': 'complete'}, 'Select at least one task.'),
+            ({'task_ids': ['a'], 'action': 'complete'}, 'Task ids must be a list of integers.'),
+            ({'task_ids': [sample_task.id], 'action': 'explode'}, 'Unknown bulk action.'),
+            ({'task_ids': [sample_task.id], 'action': 'prioritize', 'priority': 'urgent'},
+             'Invalid priority.'),
+            ({'task_ids': [sample_task.id], 'action': 'reassign', 'target_type': 'judge'},
+             'Invalid target type.'),
+            ({'task_ids': [sample_task.id], 'action': 'reassign'}, 'Target name is required.'),
+            ({'task_ids': list(range(1, 502)), 'action': 'complete'},
+             'At most 500 tasks can be changed at once.'),
+        ]
+        for body, error in cases:
+            response = client.post('/tasks/bulk', json=body)
+            assert response.status_code == 400
+            assert error in response.get_json()['errors']
+
+        db_session.refresh(sample_task)
+        assert sample_task.completed is False
+
+    def test_task_ids_string_is_rejected(self, client, db_session, sample_project):
+        """A JSON string of ids is a 400, not the tasks named by its digits."""
+        tasks = [Task(project_id=sample_project.id, target_type='self', target_name=f'Task {n}',
+                      due_date=date.today()) for n in range(2)]
+        db_session.add_all(tasks)
+        db_session.commit()
+        ids = ''.join(str(task.id) for task in tasks)
+
+        for task_ids in (ids, {ids: 1}, int(ids)):
+            response = client.post('/tasks/bulk', json={'task_ids': task_ids, 'action': 'complete'})
+
+            assert response.status_code == 400
+            assert response.get_json()['errors'] == ['Task ids must be a list of integers.']
+        for task in tasks:
+            db_session.refresh(task)
+            assert task.completed is False
+
+    def test_validation_errors_form(self, client, db_session):
+        """Bad form posts flash the error and redirect."""
+        response = client.post('/tasks/bulk', data={'action': 'complete'}, follow_redirects=True)
+
+        assert b'Select at least one task.' in response.data
+
+    def test_list_has_checkboxes_and_toolbar(self, client, sample_task, db_session):
+        """The task list renders the bulk toolbar and a checkbox per task."""
+        response = client.get('/tasks/')
+
+        assert b'id="bulk-form"' in response.data
+        assert f'name="task_ids" value="{sample_task.id}" form="bulk-form"'.encode() in response.data
+        assert b'data-bulk-select-all' in response.data
+
+    def test_dashboard_has_checkboxes_and_toolbar(self, client, sample_task, db_session):
+        """The dashboard renders the bulk toolbar and a checkbox per inline task."""
+        response = client.get('/')
+
+        assert b'id="bulk-form"' in response.data
+        assert f'name="task_ids" value="{sample_task.id}" form="bulk-form"'.encode() in response.data
+
+
 class TestProjectTasksNew:
     """Test GET /projects/<id>/tasks/new route."""
 
@@ -737,3 +1004,39 @@ class TestProjectDetailTaskEditUI:
         data = response.data.decode('utf-8')
 
         assert f'/tasks/{sample_task.id}/edit' in data
+
+
+class TestTaskListPagination:
+    """Test keyset pagination on GET /tasks/."""
+
+    def test_pages_follow_due_date_order(self, client, sample_project, db_session):
+        """Next links walk the pending tasks in due date order without repeats."""
+        import html
+        import re
+
+        for day in range(5):
+            db_session.add(Task(project_id=sample_project.id, target_type='self',
+                                target_name=f'Target {day}',
+                                due_date=date.today() + timedelta(days=day)))
+        db_session.commit()
+
+        seen = []
+        url = '/tasks/?per_page=2'
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            seen += re.findall(r'Target (\d)', response.data.decode())
+            match = re.search(r'href="([^"]+)"[^>]*rel="next"', response.data.decode())
+            url = html.unescape(match.group(1)) if match else None
+
+        assert seen == ['0', '1', '2', '3', '4']
+
+    def test_invalid_cursor_returns_400(self, client, db_session):
+        """A tampered cursor is rejected."""
+        response = client.get('/tasks/?cursor=garbage')
+        assert response.status_code == 400
+
+    def test_single_page_has_no_controls(self, client, sample_task, db_session):
+        """Pagination controls only appear when there is another page."""
+        response = client.get('/tasks/')
+        assert b'class="pagination"' not in response.data
@@ -64,3 +64,117 @@ class TestInitDbCommand:
             assert 'tasks' in tables
             assert 'milestones' in tables
             assert 'status_updates' in tables
+
+    def test_init_db_adds_missing_columns(self, runner, app):
+        """init-db upgrades existing tables with new model columns."""
+        from app import db
+        with app.app_context():
+            db.create_all()
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql('DROP INDEX ix_tasks_project_completed_due')
+                connection.exec_driver_sql('ALTER TABLE projects DROP COLUMN rollup_next_milestone_date')
+            db.engine.dispose()
+
+        result = runner.invoke(args=['init-db'])
+
+        assert 'Added column projects.rollup_next_milestone_date.' in result.output
+        assert 'Rebuilt rollups for 0 project(s).' in result.output
+        assert 'Created index ix_tasks_project_completed_due.' in result.output
+
+
+    def test_init_db_records_schema_version(self, runner, app):
+        """init-db stamps the database with the current schema version."""
+        from app.schema import SCHEMA_VERSION, schema_version
+
+        runner.invoke(args=['init-db'])
+
+        with app.app_context():
+            assert schema_version() == SCHEMA_VERSION
+
+
+class TestUpgradeIndexesCommand:
+    """Test upgrade-indexes CLI command."""
+
+    def test_upgrade_indexes_creates_missing_indexes(self, runner, app):
+        """upgrade-indexes adds composite indexes to an existing database."""
+        from app import db
+        with app.app_context():
+            db.create_all()
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql('DROP INDEX ix_milestones_project_completed_date')
+
+        result = runner.invoke(args=['upgrade-indexes'])
+
+        assert result.exit_code == 0
+        assert 'Created index ix_milestones_project_completed_date.' in result.output
+        assert '1 index(es) created.' in result.output
+
+    def test_upgrade_indexes_is_idempotent(self, runner, app):
+        """Running upgrade-indexes on a current database changes nothing."""
+        from app import db
+        with app.app_context():
+            db.create_all()
+
+        result = runner.invoke(args=['upgrade-indexes'])
+
+        assert '0 index(es) created.' in result.output
+
+    def test_api_blueprint_registered(self, app):
+        """JSON API blueprint is registered with /api/v1 prefix."""
+        assert app.url_map.bind('localhost').match('/api/v1/projects')[0] == 'api.projects'
+
+    def test_attorneys_blueprint_registered(self, app):
+        """Attorneys blueprint is registered with /attorneys prefix."""
+        assert 'attorneys' in app.blueprints
+
+    def test_search_blueprint_registered(self, app):
+        """Search blueprint is registered with /search prefix."""
+        assert 'search' in app.blueprints
+
+
+class TestLazyBlueprints:
+    """Test register_blueprints_lazily()."""
+
+    def test_create_app_defers_blueprints_when_configured(self, monkeypatch):
+        """With LAZY_BLUEPRINTS, create_app() registers no blueprint."""
+        import config
+        from app import create_app
+        monkeypatch.setattr(config.Config, 'LAZY_BLUEPRINTS', True)
+
+        assert create_app().blueprints == {}
+
+    def test_blueprints_registered_on_first_request(self):
+        """No blueprint exists until the first request, which registers them all once."""
+        from app.routes import BLUEPRINTS, register_blueprints_lazily
+        lazy_app = Flask(__name__)
+        register_blueprints_lazily(lazy_app)
+
+        assert lazy_app.blueprints == {}
+
+        client = lazy_app.test_client()
+        assert client.get('/no-such-page').status_code == 404
+        assert client.get('/no-such-page').status_code == 404
+        assert len(lazy_app.blueprints) == len(BLUEPRINTS)
+        assert lazy_app.url_map.bind('localhost').match('/api/v1/projects')[0] == 'api.projects'
+
+
+class TestStartup:
+    """Cold start of a fresh interpreter (see benchmarks/startup.py)."""
+
+    def test_cold_start_within_budget(self):
+        """Importing the app and calling create_app() stays under the startup budget."""
+        from benchmarks.startup import STARTUP_BUDGET_MS, sample
+
+        milliseconds, modules = sample()
+
+        assert milliseconds < STARTUP_BUDGET_MS
+        assert 'app.routes.projects' in modules
+
+    def test_lazy_start_skips_route_modules(self):
+        """With lazy blueprints, create_app() imports no route module."""
+        from benchmarks.startup import sample
+
+        _, modules = sample(lazy=True)
+
+        assert 'app.models' in modules
+        assert not [name for name in modules if name.startswith('app.routes.')]
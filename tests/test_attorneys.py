@@ -0,0 +1,160 @@
+"""Tests for app/attorneys.py - normalized project-attorney links."""
+from sqlalchemy import select
+
+from app import db
+from app.attorneys import attorneys_need_migration, migrate_attorneys, split_names
+from app.models import Attorney, Project, ProjectAttorney
+
+
+def links(project):
+    """Return sorted (name, role) pairs stored for `project`."""
+    return sorted(db.session.execute(
+        select(Attorney.name, ProjectAttorney.role).join(ProjectAttorney)
+        .where(ProjectAttorney.project_id == project.id)
+    ).tuples().all())
+
+
+class TestSplitNames:
+    """Test parsing of the free-text attorney list."""
+
+    def test_common_separators(self):
+        """Commas, semicolons, ampersands, slashes and "and" all separate names."""
+        assert split_names('Jones, Lee; Park & Kim / Diaz and Wu') == [
+            'Jones', 'Lee', 'Park', 'Kim', 'Diaz', 'Wu']
+
+    def test_whitespace_and_duplicates(self):
+        """Whitespace is collapsed and repeats are dropped, keeping the first spelling."""
+        assert split_names('  Ann   Lee ,ann lee,, Bo ') == ['Ann Lee', 'Bo']
+
+    def test_and_inside_a_name_is_kept(self):
+        """Only the whole word "and" separates names."""
+        assert split_names('Anderson, Randall') == ['Anderson', 'Randall']
+
+    def test_blank(self):
+        """Empty or missing values give no names."""
+        assert split_names('') == []
+        assert split_names(None) == []
+
+
+class TestLinkSync:
+    """The before_flush hook keeps project_attorneys in step with the strings."""
+
+    def test_new_project_is_linked(self, db_session, make_project):
+        """Each listed attorney and the assigner get a link with their role."""
+        project = make_project(assigned_attorneys='Jones, Lee')
+
+        assert links(project) == [
+            ('Jones', 'attorney'), ('Lee', 'attorney'), ('Partner Smith', 'assigner'),
+        ]
+
+    def test_attorneys_are_shared_case_insensitively(self, db_session, make_project):
+        """Projects naming the same attorney in any case share one Attorney row."""
+        first = make_project(assigned_attorneys='Jones')
+        second = make_project(assigned_attorneys='JONES')
+
+        assert db_session.scalar(select(db.func.count(Attorney.id))) == 2
+        assert first.attorney_links[0].attorney is second.attorney_links[0].attorney
+
+    def test_editing_the_string_relinks(self, db_session, make_project):
+        """Removed names lose their link; unchanged links are kept as-is."""
+        project = make_project(assigned_attorneys='Jones, Lee')
+        kept = next(link for link in project.attorney_links if link.attorney.name == 'Jones')
+
+        project.assigned_attorneys = 'Jones, Park'
+        project.assigner = 'Self'
+        db_session.commit()
+
+        assert links(project) == [('Jones', 'attorney'), ('Park', 'attorney'), ('Self', 'assigner')]
+        assert kept in project.attorney_links
+
+    def test_unrelated_edits_do_not_touch_links(self, db_session, make_project, query_counter):
+        """Changing other columns skips the link sync entirely."""
+        project = make_project()
+        db_session.expire(project)
+
+        project.priority = 'low'
+        with query_counter() as counter:
+            db_session.commit()
+
+        # The UPDATE itself, plus loading the expired row first
+        assert counter.count <= 2
+        assert links(project) == [('Associate Jones', 'attorney'), ('Partner Smith', 'assigner')]
+
+    def test_attorney_who_is_also_assigner(self, db_session, make_project):
+        """One person can hold both roles on a project."""
+        project = make_project(assigner='Jones', assigned_attorneys='jones')
+
+        assert links(project) == [('jones', 'assigner'), ('jones', 'attorney')]
+        assert db_session.scalar(select(db.func.count(Attorney.id))) == 1
+
+    def test_blank_names_link_nothing(self, db_session, make_project):
+        """A project with no names has no links."""
+        project = make_project(assigner=' ', assigned_attorneys=',')
+
+        assert links(project) == []
+
+
+class TestMigrate:
+    """Test migrate_attorneys() and the CLI commands that call it."""
+
+    def test_migrate_links_unlinked_projects(self, db_session, make_project):
+        """Projects whose links were written outside the ORM are re-linked."""
+        project = make_project(assigned_attorneys='Jones; Lee')
+        db_session.execute(ProjectAttorney.__table__.delete())
+        db_session.commit()
+        assert attorneys_need_migration()
+
+        assert migrate_attorneys() == (1, 3)
+        assert ('Lee', 'attorney') in links(project)
+        assert not attorneys_need_migration()
+
+    def test_migrate_follows_raw_sql_edits(self, db_session, make_project):
+        """Bulk SQL that rewrites the string is picked up by a migration run."""
+        project = make_project(assigned_attorneys='Jones')
+        db_session.execute(db.update(Project).values(assigned_attorneys='Kim'))
+        db_session.commit()
+
+        migrate_attorneys()
+
+        assert ('Kim', 'attorney') in links(project)
+        assert ('Jones', 'attorney') not in links(project)
+
+    def test_empty_database_needs_no_migration(self, db_session):
+        """No projects means nothing to link."""
+        assert not attorneys_need_migration()
+
+    def test_migrate_command(self, runner, sample_project):
+        """flask migrate-attorneys reports what it linked."""
+        result = runner.invoke(args=['migrate-attorneys'])
+
+        assert result.exit_code == 0
+        assert 'Linked 1 project(s) to 2 attorney(s).' in result.output
+
+    def test_init_db_links_an_existing_database(self, runner, db_session, make_project):
+        """init-db splits the strings the first time the link table is created."""
+        make_project()
+        db_session.execute(ProjectAttorney.__table__.delete())
+        db_session.commit()
+
+        result = runner.invoke(args=['init-db'])
+
+        assert 'Linked 1 project(s) to 2 attorney(s).' in result.output
+
+    def test_init_db_skips_linked_database(self, runner, sample_project):
+        """init-db leaves existing links alone."""
+        result = runner.invoke(args=['init-db'])
+
+        assert 'Linked' not in result.output
+
+
+class TestRegisterListeners:
+    """Test listener registration."""
+
+    def test_register_listeners_is_idempotent(self, app):
+        """Registering twice does not attach the hook twice."""
+        from sqlalchemy import event
+        from app.attorneys import _before_flush, register_listeners
+
+        register_listeners()
+
+        assert event.contains(db.session, 'before_flush', _before_flush)
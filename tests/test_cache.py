@@ -0,0 +1,373 @@
+"""Tests for app/cache.py - dashboard snapshot cache."""
+import threading
+from datetime import date, timedelta
+
+import pytest
+from flask import Flask
+from markupsafe import Markup
+
+from app import cache, db
+from app.cache import (
+    FragmentCache, LRUCache, NullCache, SnapshotCache, SQLiteCache, cached_fragment, create_backend,
+    dashboard_snapshot, get_cache, get_fragment_cache,
+)
+from app.dashboard_engine import Dashboard
+from app.models import Job, Project
+
+
+@pytest.fixture
+def dashboard_cache(app):
+    """The app's SnapshotCache, emptied and with fresh counters."""
+    snapshot_cache = app.extensions['dashboard_cache']
+    snapshot_cache.backend.clear()
+    snapshot_cache.stats = cache.CacheStats()
+    return snapshot_cache
+
+
+class TestLRUCache:
+    """Test the in-process LRU backend."""
+
+    def test_get_and_set(self):
+        """Stored values come back; unknown keys are None."""
+        lru = LRUCache()
+        lru.set('a', 1, ttl=60)
+
+        assert lru.get('a') == 1
+        assert lru.get('b') is None
+
+    def test_evicts_least_recently_used(self):
+        """The entry untouched for longest is evicted past max_entries."""
+        lru = LRUCache(max_entries=2)
+        lru.set('a', 1, ttl=60)
+        lru.set('b', 2, ttl=60)
+        lru.get('a')
+        lru.set('c', 3, ttl=60)
+
+        assert lru.get('b') is None
+        assert lru.get('a') == 1
+        assert len(lru) == 2
+
+    def test_expired_entries_are_dropped(self):
+        """An entry past its ttl is a miss and is removed."""
+        lru = LRUCache()
+        lru.set('a', 1, ttl=-1)
+
+        assert lru.get('a') is None
+        assert len(lru) == 0
+
+    def test_clear(self):
+        """clear() empties the cache."""
+        lru = LRUCache()
+        lru.set('a', 1, ttl=60)
+        lru.clear()
+
+        assert len(lru) == 0
+
+
+class TestSQLiteCache:
+    """Test the SQLite-file backend shared across processes."""
+
+    def test_round_trip_between_instances(self, tmp_path):
+        """A value stored by one instance is read by another on the same file."""
+        path = tmp_path / 'cache.db'
+        SQLiteCache(path).set('dashboard', Dashboard(no_tasks=['x']), ttl=60)
+
+        assert SQLiteCache(path).get('dashboard') == Dashboard(no_tasks=['x'])
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Entries past their ttl are not returned."""
+        sqlite_cache = SQLiteCache(tmp_path / 'cache.db')
+        sqlite_cache.set('a', 1, ttl=-1)
+
+        assert sqlite_cache.get('a') is None
+
+    def test_clear_is_seen_by_other_instances(self, tmp_path):
+        """Clearing from one worker clears it for every worker."""
+        path = tmp_path / 'cache.db'
+        writer, other = SQLiteCache(path), SQLiteCache(path)
+        writer.set('a', 1, ttl=60)
+        assert len(other) == 1
+
+        writer.clear()
+
+        assert other.get('a') is None
+        assert len(other) == 0
+
+    def test_usable_from_other_threads(self, tmp_path):
+        """Connections are per call, so any thread can use the instance."""
+        sqlite_cache = SQLiteCache(tmp_path / 'cache.db')
+        thread = threading.Thread(target=sqlite_cache.set, args=('a', 1, 60))
+        thread.start()
+        thread.join()
+
+        assert sqlite_cache.get('a') == 1
+
+
+class TestNullCache:
+    """Test the disabled backend."""
+
+    def test_never_stores(self):
+        """Nothing set is ever returned."""
+        null = NullCache()
+        null.set('a', 1, ttl=60)
+        null.clear()
+
+        assert null.get('a') is None
+        assert len(null) == 0
+
+
+class TestSnapshotCache:
+    """Test counters and build-on-miss."""
+
+    def test_builds_on_miss_and_counts(self):
+        """The first lookup builds, the second is a hit."""
+        snapshot_cache = SnapshotCache(LRUCache(), ttl=60, name='memory')
+        calls = []
+
+        def build():
+            calls.append(1)
+            return 'value'
+
+        assert snapshot_cache.get_or_build('k', build) == 'value'
+        assert snapshot_cache.get_or_build('k', build) == 'value'
+
+        assert len(calls) == 1
+        assert snapshot_cache.as_dict() == {
+            'backend': 'memory', 'entries': 1, 'hits': 1, 'misses': 1,
+            'invalidations': 0, 'hit_ratio': 0.5,
+        }
+
+    def test_invalidate_counts_and_clears(self):
+        """invalidate() empties the backend and is counted."""
+        snapshot_cache = SnapshotCache(LRUCache(), ttl=60, name='memory')
+        snapshot_cache.get_or_build('k', lambda: 'value')
+
+        snapshot_cache.invalidate()
+
+        assert snapshot_cache.stats.invalidations == 1
+        assert len(snapshot_cache.backend) == 0
+
+    def test_hit_ratio_without_lookups(self):
+        """No lookups means a 0.0 hit ratio rather than a division error."""
+        assert cache.CacheStats().hit_ratio == 0.0
+
+
+class TestFragmentCache:
+    """Test rendered fragment reuse and its eviction limits."""
+
+    def test_renders_on_miss_and_counts(self):
+        """The first lookup renders, the second reuses the markup."""
+        fragments = FragmentCache(max_entries=10, max_chars=100)
+        calls = []
+
+        def render():
+            calls.append(1)
+            return '<li>card</li>'
+
+        assert fragments.get_or_render(('card', 1), render) == '<li>card</li>'
+        assert fragments.get_or_render(('card', 1), render) == '<li>card</li>'
+
+        assert len(calls) == 1
+        assert fragments.as_dict() == {
+            'entries': 1, 'chars': 13, 'hits': 1, 'misses': 1, 'evictions': 0, 'hit_ratio': 0.5,
+        }
+
+    def test_evicts_beyond_max_entries(self):
+        """The least recently used entry goes first."""
+        fragments = FragmentCache(max_entries=2, max_chars=100)
+        fragments.get_or_render('a', lambda: 'A')
+        fragments.get_or_render('b', lambda: 'B')
+        fragments.get_or_render('a', lambda: 'A')  # a is now most recent
+
+        fragments.get_or_render('c', lambda: 'C')
+
+        assert fragments.get_or_render('a', lambda: 'new') == 'A'
+        assert fragments.get_or_render('b', lambda: 'new') == 'new'
+        assert fragments.evictions == 2
+
+    def test_evicts_beyond_max_chars(self):
+        """Total markup size is bounded, and oversized fragments are never kept."""
+        fragments = FragmentCache(max_entries=10, max_chars=10)
+        fragments.get_or_render('a', lambda: 'x' * 6)
+        fragments.get_or_render('b', lambda: 'y' * 6)
+
+        assert fragments.as_dict()['entries'] == 1
+        assert fragments.as_dict()['chars'] == 6
+
+        assert fragments.get_or_render('big', lambda: 'z' * 11) == 'z' * 11
+        assert fragments.as_dict()['entries'] == 1
+        assert fragments.evictions == 1
+
+    def test_replacing_a_key_keeps_size_accurate(self):
+        """Storing a key again does not double count its markup."""
+        fragments = FragmentCache(max_entries=10, max_chars=100)
+        fragments._store('a', 'x' * 6)
+        fragments._store('a', 'y' * 4)
+
+        assert fragments.as_dict()['chars'] == 4
+
+    def test_zero_entries_disables(self):
+        """max_entries=0 renders every time and stores nothing."""
+        fragments = FragmentCache(max_entries=0, max_chars=100)
+
+        fragments.get_or_render('a', lambda: 'A')
+        fragments.get_or_render('a', lambda: 'A')
+
+        assert fragments.as_dict()['entries'] == 0
+        assert fragments.stats.misses == 2
+
+    def test_cached_fragment_keys_by_macro(self, app):
+        """cached_fragment() renders a macro once per key and macro name."""
+        template = app.jinja_env.from_string(
+            '{% macro card(n) %}<b>{{ n }}</b>{% endmacro %}'
+            '{{ cached_fragment(card, key, n) }}'
+        )
+        with app.app_context():
+            get_fragment_cache().get_or_render(('card', 'k'), lambda: Markup('<b>cached</b>'))
+
+            assert template.render(key=('k',), n=1) == '<b>cached</b>'
+            assert template.render(key=('other',), n=2) == '<b>2</b>'
+
+
+class TestCreateBackend:
+    """Test backend selection from config."""
+
+    def test_known_backends(self, tmp_path):
+        """Each backend name maps to its class."""
+        config = {'DASHBOARD_CACHE_SIZE': 4, 'DASHBOARD_CACHE_PATH': tmp_path / 'cache.db'}
+
+        assert isinstance(create_backend('memory', config), LRUCache)
+        assert create_backend('memory', config).max_entries == 4
+        assert isinstance(create_backend('sqlite', config), SQLiteCache)
+        assert isinstance(create_backend('none', config), NullCache)
+
+    def test_unknown_backend_rejected(self):
+        """An unknown backend name is a ValueError naming the valid ones."""
+        with pytest.raises(ValueError, match='memory, sqlite, none'):
+            create_backend('redis', {})
+
+    def test_init_app_uses_config(self, tmp_path):
+        """init_app() builds the configured backend with defaults for the rest."""
+        app = Flask(__name__)
+        app.config['DASHBOARD_CACHE_BACKEND'] = 'sqlite'
+        app.config['DASHBOARD_CACHE_PATH'] = tmp_path / 'cache.db'
+
+        cache.init_app(app)
+
+        snapshot_cache = app.extensions['dashboard_cache']
+        assert isinstance(snapshot_cache.backend, SQLiteCache)
+        assert snapshot_cache.ttl == 300
+        fragments = app.extensions['fragment_cache']
+        assert fragments.max_entries == 5000
+        assert app.jinja_env.globals['cached_fragment'] is cached_fragment
+
+
+class TestDashboardSnapshot:
+    """Test dashboard_snapshot() and write-driven invalidation."""
+
+    def test_second_call_is_a_hit(self, db_session, make_project, dashboard_cache):
+        """The dashboard is only built once per day until a write."""
+        make_project()
+        today = date.today()
+
+        first = dashboard_snapshot(today)
+        second = dashboard_snapshot(today)
+
+        assert second is first
+        assert (dashboard_cache.stats.hits, dashboard_cache.stats.misses) == (1, 1)
+
+    def test_keyed_by_date(self, db_session, dashboard_cache):
+        """A different day is a separate entry."""
+        dashboard_snapshot(date.today())
+        dashboard_snapshot(date.today() + timedelta(days=1))
+
+        assert dashboard_cache.stats.misses == 2
+        assert len(dashboard_cache.backend) == 2
+
+    def test_commit_after_flush_invalidates(self, db_session, make_project, make_task, dashboard_cache):
+        """Committing ORM changes clears the cache."""
+        project = make_project()
+        dashboard_snapshot(date.today())
+
+        make_task(project)
+
+        assert len(dashboard_cache.backend) == 0
+        assert dashboard_snapshot(date.today()).due_today[0].id == project.id
+
+    def test_bulk_update_invalidates(self, db_session, make_project, dashboard_cache):
+        """Bulk UPDATE statements through the session clear the cache on commit."""
+        make_project()
+        dashboard_snapshot(date.today())
+
+        db_session.execute(db.update(Project).values(priority='high'))
+        db_session.commit()
+
+        assert len(dashboard_cache.backend) == 0
+
+    def test_rollback_does_not_invalidate(self, db_session, make_project, dashboard_cache):
+        """Changes that are rolled back leave the cache alone."""
+        make_project()
+        dashboard_snapshot(date.today())
+        invalidations = dashboard_cache.stats.invalidations
+
+        db_session.add(Project(client_name='Rolled Back', project_name='Matter',
+                               assigner='Test Partner', assigned_attorneys='Test Attorney'))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert len(dashboard_cache.backend) == 1
+        assert dashboard_cache.stats.invalidations == invalidations
+
+    def test_read_only_commit_does_not_invalidate(self, db_session, dashboard_cache):
+        """A commit without writes keeps the snapshot."""
+        dashboard_snapshot(date.today())
+
+        db_session.execute(db.select(Project)).all()
+        db_session.commit()
+
+        assert len(dashboard_cache.backend) == 1
+
+    def test_snapshot_built_before_a_commit_is_not_served(self, make_project, dashboard_cache, monkeypatch):
+        """A build that read its data before another request's commit cannot outlive that commit."""
+        make_project('Before')
+        build = cache.build_dashboard
+
+        def build_then_concurrent_write(today, change_id):
+            snapshot = build(today, change_id)
+            # Another request commits (and clears the cache) before this one stores its snapshot
+            make_project('After')
+            return snapshot
+
+        monkeypatch.setattr(cache, 'build_dashboard', build_then_concurrent_write)
+        stale = dashboard_snapshot(date.today())
+        monkeypatch.setattr(cache, 'build_dashboard', build)
+
+        fresh = dashboard_snapshot(date.today())
+        assert fresh is not stale
+        assert {card.client_name for card in fresh.no_tasks} == {'Before', 'After'}
+
+    def test_other_tables_do_not_invalidate(self, db_session, dashboard_cache):
+        """Writes to tables the dashboard does not show keep the snapshot."""
+        dashboard_snapshot(date.today())
+
+        db_session.add(Job(kind='export'))
+        db_session.commit()
+        db_session.execute(db.update(Job).values(status='failed'))
+        db_session.commit()
+
+        assert len(dashboard_cache.backend) == 1
+        assert dashboard_cache.stats.invalidations == 0
+
+    def test_invalidate_outside_app_context_is_noop(self):
+        """invalidate() is safe where no app is active."""
+        results = []
+        thread = threading.Thread(target=lambda: results.append(cache.invalidate()))
+        thread.start()
+        thread.join()
+
+        assert results == [None]
+
+    def test_get_cache_returns_app_cache(self, app):
+        """get_cache() is the instance created by create_app()."""
+        assert get_cache() is app.extensions['dashboard_cache']
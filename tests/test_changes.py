@@ -0,0 +1,272 @@
+"""Tests for app/changes.py - the change log behind /api/v1/changes."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select, update
+
+from app import db
+from app.changes import ChangesPruned, compact_changes, latest_change_id, read_changes
+from app.models import ChangeLog, Milestone, StatusUpdate, Task
+
+
+def logged_since(since):
+    """(table, record_id, operation) for every entry after `since`."""
+    return db.session.execute(
+        select(ChangeLog.table_name, ChangeLog.record_id, ChangeLog.operation)
+        .where(ChangeLog.id > since).order_by(ChangeLog.id)
+    ).tuples().all()
+
+
+@pytest.fixture
+def clean_log(db_session):
+    """Start with an empty change log."""
+    db_session.execute(ChangeLog.__table__.delete())
+    db_session.commit()
+    return db_session
+
+
+class TestTriggers:
+    """Every write to a tracked table is logged."""
+
+    def test_inserts_updates_and_deletes(self, db_session, make_project):
+        """ORM writes to each table append entries in order."""
+        since = latest_change_id()
+        project = make_project()
+        task = Task(project_id=project.id, target_type='self', target_name='Self',
+                    due_date=date.today())
+        note = StatusUpdate(project_id=project.id, notes='Started')
+        milestone = Milestone(project_id=project.id, name='Filing', date=date.today())
+        db_session.add_all([task, note, milestone])
+        db_session.commit()
+        task.completed = True
+        db_session.commit()
+        db_session.delete(milestone)
+        db_session.commit()
+
+        logged = logged_since(since)
+        assert logged[0] == ('projects', project.id, 'insert')
+        # The ORM picks the insert order within one flush
+        assert set(logged[1:4]) == {
+            ('tasks', task.id, 'insert'),
+            ('status_updates', note.id, 'insert'),
+            ('milestones', milestone.id, 'insert'),
+        }
+        assert logged[4:] == [('tasks', task.id, 'update'), ('milestones', milestone.id, 'delete')]
+
+    def test_entries_carry_project_and_time(self, db_session, sample_task):
+        """Child entries record their project; changed_at reads back as a datetime."""
+        entry = db_session.scalars(
+            select(ChangeLog).where(ChangeLog.table_name == 'tasks')
+            .order_by(ChangeLog.id.desc())
+        ).first()
+
+        assert entry.project_id == sample_task.project_id
+        assert repr(entry) == f'<ChangeLog {entry.id} insert tasks/{sample_task.id}>'
+        assert abs(datetime.utcnow() - entry.changed_at) < timedelta(minutes=1)
+
+    def test_bulk_sql_is_logged(self, db_session, sample_task):
+        """Bulk UPDATEs that bypass the ORM are captured."""
+        since = latest_change_id()
+
+        db_session.execute(update(Task).values(priority='high'))
+        db_session.commit()
+
+        assert logged_since(since) == [('tasks', sample_task.id, 'update')]
+
+    def test_moved_child_is_logged_under_both_projects(self, db_session, make_project, sample_task):
+        """Moving a task logs it for the project it left as well as the one it joined."""
+        old_project_id = sample_task.project_id
+        other = make_project('Globex')
+        since = latest_change_id()
+
+        sample_task.project_id = other.id
+        db_session.commit()
+
+        entries = db_session.execute(
+            select(ChangeLog.record_id, ChangeLog.project_id).where(ChangeLog.id > since)
+            .order_by(ChangeLog.id)
+        ).all()
+        assert entries == [(sample_task.id, old_project_id), (sample_task.id, other.id)]
+
+    def test_rollup_recompute_is_not_logged(self, db_session, sample_project):
+        """A child write logs the child only, not the project's rollup refresh."""
+        since = latest_change_id()
+
+        db_session.add(StatusUpdate(project_id=sample_project.id, notes='Note'))
+        db_session.commit()
+
+        assert [entry[0] for entry in logged_since(since)] == ['status_updates']
+
+    def test_project_edits_are_logged(self, db_session, sample_project):
+        """Changing a project's own columns is logged."""
+        since = latest_change_id()
+
+        sample_project.priority = 'low'
+        db_session.commit()
+
+        assert logged_since(since) == [('projects', sample_project.id, 'update')]
+
+    def test_non_sqlite_engines_are_skipped(self):
+        """The DDL hook does nothing on other dialects."""
+        from app.changes import _create_change_triggers
+
+        class FakeDialect:
+            name = 'postgresql'
+
+        class FakeConnection:
+            dialect = FakeDialect()
+
+            def exec_driver_sql(self, statement):
+                raise AssertionError('should not run DDL')
+
+        _create_change_triggers(db.metadata, FakeConnection())
+
+    def test_create_all_adds_triggers(self, tmp_path):
+        """A fresh database gets the triggers from create_all()."""
+        engine = create_engine(f'sqlite:///{tmp_path / "fresh.db"}')
+        db.metadata.create_all(engine)
+
+        with engine.connect() as connection:
+            names = connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'change_log_%'"
+            ).scalars().all()
+        assert len(names) == 12
+
+    def test_create_all_replaces_old_triggers(self, tmp_path):
+        """create_all() swaps in the current trigger bodies on an existing database."""
+        engine = create_engine(f'sqlite:///{tmp_path / "old.db"}')
+        db.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql('DROP TRIGGER change_log_tasks_au')
+            connection.exec_driver_sql(
+                'CREATE TRIGGER change_log_tasks_au AFTER UPDATE ON tasks BEGIN SELECT 1; END'
+            )
+
+        db.metadata.create_all(engine)
+
+        with engine.connect() as connection:
+            body = connection.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'change_log_tasks_au'"
+            ).scalar()
+        assert 'old.project_id IS NOT new.project_id' in body
+
+
+class TestReadChanges:
+    """Test read_changes()."""
+
+    def test_batches_and_cursor(self, clean_log, make_project):
+        """Entries come oldest first in bounded batches with a resume cursor."""
+        for i in range(3):
+            make_project(client_name=f'Client {i}')
+        start = latest_change_id() - 3
+
+        first = read_changes(start, limit=2)
+        second = read_changes(first.cursor, limit=2)
+
+        assert [c['operation'] for c in first.changes] == ['insert', 'insert']
+        assert first.has_more
+        assert len(second.changes) == 1
+        assert not second.has_more
+        assert read_changes(second.cursor).changes == []
+        assert read_changes(second.cursor).cursor == second.cursor
+
+    def test_data_is_current_row_state(self, clean_log, make_project):
+        """Each entry carries the row as it is now, or None once deleted."""
+        project = make_project()
+        project.client_name = 'Renamed'
+        clean_log.commit()
+        gone = make_project(client_name='Gone')
+        clean_log.delete(gone)
+        clean_log.commit()
+
+        start = latest_change_id() - 4
+        batch = read_changes(start, serializers={'projects': lambda p: {'name': p.client_name}})
+
+        assert [c['data'] for c in batch.changes] == [
+            {'name': 'Renamed'}, {'name': 'Renamed'}, None, None,
+        ]
+
+    def test_without_serializers_data_is_none(self, db_session, make_project):
+        """Serializers are optional."""
+        since = latest_change_id()
+        make_project()
+
+        assert read_changes(since).changes[0]['data'] is None
+
+    def test_pruned_cursor_raises(self, clean_log, make_project):
+        """A cursor before the oldest retained entry is rejected."""
+        make_project()
+        make_project()
+        oldest = db.session.scalar(select(func.min(ChangeLog.id)))
+        clean_log.execute(ChangeLog.__table__.delete().where(ChangeLog.id == oldest))
+        clean_log.commit()
+
+        with pytest.raises(ChangesPruned):
+            read_changes(oldest - 1)
+        assert len(read_changes(oldest).changes) == 1
+
+    def test_latest_change_id_survives_an_emptied_log(self, clean_log, make_project):
+        """The current cursor does not go back to 0 when entries are deleted."""
+        make_project()
+        latest = latest_change_id()
+        clean_log.execute(ChangeLog.__table__.delete())
+        clean_log.commit()
+
+        assert latest > 0
+        assert latest_change_id() == latest
+
+    def test_empty_log(self, clean_log):
+        """An empty log returns nothing and keeps the cursor."""
+        batch = read_changes(7)
+
+        assert (batch.changes, batch.cursor, batch.has_more) == ([], 7, False)
+
+
+class TestCompactChanges:
+    """Test retention."""
+
+    def test_deletes_old_entries_but_keeps_newest(self, clean_log, make_project):
+        """Entries past retention are removed except the most recent one."""
+        make_project()
+        make_project()
+        clean_log.execute(update(ChangeLog).values(changed_at=datetime.utcnow() - timedelta(days=100)))
+        clean_log.commit()
+
+        assert compact_changes(90) == 1
+        assert clean_log.scalar(select(func.count(ChangeLog.id))) == 1
+
+    def test_recent_entries_are_kept(self, clean_log, make_project):
+        """Nothing inside the retention window is removed."""
+        make_project()
+        make_project()
+
+        assert compact_changes(90) == 0
+
+    def test_command_uses_config_default(self, runner, app, clean_log):
+        """flask compact-changes falls back to CHANGE_LOG_RETENTION_DAYS."""
+        result = runner.invoke(args=['compact-changes'])
+
+        assert result.exit_code == 0
+        assert f'older than {app.config["CHANGE_LOG_RETENTION_DAYS"]} day(s)' in result.output
+
+    def test_command_days_option(self, runner, clean_log, make_project):
+        """--days overrides the configured retention."""
+        make_project()
+        make_project()
+
+        result = runner.invoke(args=['compact-changes', '--days', '0'])
+
+        assert 'Deleted 1 change(s) older than 0 day(s).' in result.output
+
+
+class TestRegisterListeners:
+    """Test listener registration."""
+
+    def test_register_listeners_is_idempotent(self, app):
+        """Registering twice does not attach the DDL hook twice."""
+        from sqlalchemy import event
+        from app.changes import _create_change_triggers, register_listeners
+
+        register_listeners()
+
+        assert event.contains(db.metadata, 'after_create', _create_change_triggers)
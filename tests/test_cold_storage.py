@@ -0,0 +1,252 @@
+"""Tests for app/cold_storage.py - archived history in the cold tables."""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, select
+
+from app import db
+from app.changes import latest_change_id
+from app.cold_storage import archive_backlog, archive_job, cold_storage_backlog, move_to_cold, restore_from_cold
+from app.models import (
+    ChangeLog, ColdMilestone, ColdStatusUpdate, ColdTask, Milestone, Project, StatusUpdate, Task,
+)
+from app.rollups import find_rollup_drift, rebuild_rollups
+from app.search import SEARCH_TABLE, search
+
+
+def count(model, project_id):
+    return db.session.scalar(select(func.count()).where(model.project_id == project_id))
+
+
+def index_rows():
+    return db.session.execute(db.text(f'SELECT rowid, kind, record_id, project_id FROM {SEARCH_TABLE}')).all()
+
+
+def add_history(db_session, project):
+    """Give `project` a pending and a completed task, a milestone and an update."""
+    pending = Task(project_id=project.id, target_type='client', target_name='Pending',
+                   due_date=date.today())
+    done = Task(project_id=project.id, target_type='self', target_name='Done',
+                due_date=date.today(), completed=True, completed_at=datetime.utcnow())
+    milestone = Milestone(project_id=project.id, name='Hearing', date=date.today())
+    update = StatusUpdate(project_id=project.id, notes='Settled')
+    db_session.add_all([pending, done, milestone, update])
+    db_session.commit()
+    return pending, done, milestone, update
+
+
+class TestMoveToCold:
+    """Test move_to_cold() and restore_from_cold()."""
+
+    def test_round_trip_keeps_rows_and_ids(self, db_session, sample_project):
+        """Children leave the hot tables and come back unchanged."""
+        pending, done, milestone, update = add_history(db_session, sample_project)
+        ids = {pending.id, done.id}
+
+        assert move_to_cold(sample_project) == 4
+        db_session.commit()
+
+        assert sample_project.in_cold_storage
+        assert [count(model, sample_project.id) for model in (Task, Milestone, StatusUpdate)] == [0, 0, 0]
+        assert {task.id for task in db_session.scalars(select(ColdTask))} == ids
+
+        assert restore_from_cold(sample_project) == 4
+        db_session.commit()
+
+        assert not sample_project.in_cold_storage
+        assert count(ColdTask, sample_project.id) == 0
+        assert {task.id for task in sample_project.tasks} == ids
+        assert sample_project.get_status_updates_ordered()[0].notes == 'Settled'
+
+    def test_rollups_are_frozen_while_cold(self, db_session, sample_project):
+        """A cold project keeps its rollups; rebuilds and drift checks skip it."""
+        pending, _, _, update = add_history(db_session, sample_project)
+        pending_id, updated = pending.id, update.created_at
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        assert rebuild_rollups() == 0
+        assert find_rollup_drift() == []
+        assert sample_project.pending_task_count == 1
+        assert sample_project.rollup_last_update_at == updated
+
+        restore_from_cold(sample_project)
+        db_session.commit()
+        assert sample_project.rollup_next_task_id == pending_id
+
+    def test_id_taken_on_the_other_side_is_renumbered(self, db_session, make_task, sample_project):
+        """A row whose id is already used in the target table gets a fresh id."""
+        task_id = make_task(sample_project, target_name='Clash').id
+        other = Project(client_name='Other', project_name='Matter', assigner='Self',
+                        assigned_attorneys='Me')
+        db_session.add(other)
+        db_session.flush()
+        db_session.add(ColdTask(id=task_id, project_id=other.id, target_type='self',
+                                target_name='Resident', due_date=date.today(), priority='medium',
+                                completed=False))
+        db_session.commit()
+
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        names = dict(db_session.execute(select(ColdTask.target_name, ColdTask.id)).all())
+        assert names['Resident'] == task_id
+        assert names['Clash'] != task_id
+
+
+class TestMoveTriggers:
+    """A move is not a delete to the search index or the change log."""
+
+    def test_history_stays_searchable(self, db_session, sample_project):
+        """Cold rows keep their search entries, through a round trip."""
+        add_history(db_session, sample_project)
+        indexed = index_rows()
+
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        assert index_rows() == indexed
+        assert [result.kind for result in search('settled')] == ['update']
+
+        restore_from_cold(sample_project)
+        db_session.commit()
+        assert sorted(index_rows()) == sorted(indexed)
+
+    def test_deleting_a_cold_row_removes_its_entry(self, db_session, sample_project):
+        """A cold row that really goes takes its search entry with it."""
+        add_history(db_session, sample_project)
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        db_session.execute(delete(ColdStatusUpdate))
+        db_session.commit()
+
+        assert search('settled') == []
+
+    def test_moves_log_no_deletes(self, db_session, sample_project):
+        """Sync clients see the project archived, not its history deleted; unarchiving re-sends it."""
+        pending, done, milestone, update = add_history(db_session, sample_project)
+        since = latest_change_id()
+
+        move_to_cold(sample_project)
+        db_session.commit()
+        restored = latest_change_id()
+        restore_from_cold(sample_project)
+        db_session.commit()
+
+        archived = db_session.scalars(
+            select(ChangeLog.operation).where(ChangeLog.id > since, ChangeLog.id <= restored)
+        ).all()
+        assert archived == ['update']
+        unarchived = db_session.execute(
+            select(ChangeLog.table_name, ChangeLog.record_id, ChangeLog.operation)
+            .where(ChangeLog.id > restored, ChangeLog.table_name != 'projects')
+        ).all()
+        assert set(unarchived) == {
+            ('tasks', pending.id, 'insert'), ('tasks', done.id, 'insert'),
+            ('milestones', milestone.id, 'insert'), ('status_updates', update.id, 'insert'),
+        }
+
+
+class TestColdReads:
+    """Project accessors read from cold storage while the project is archived."""
+
+    def test_accessors_read_cold_rows(self, db_session, sample_project):
+        """Pending/completed children, next task/milestone and the latest update."""
+        pending_id = add_history(db_session, sample_project)[0].id
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        assert [t.target_name for t in sample_project.get_pending_tasks()] == ['Pending']
+        assert [t.target_name for t in sample_project.get_completed_tasks()] == ['Done']
+        assert [m.name for m in sample_project.get_pending_milestones()] == ['Hearing']
+        assert sample_project.get_completed_milestones() == []
+        assert isinstance(sample_project.next_task, ColdTask)
+        assert sample_project.next_task.id == pending_id
+        assert isinstance(sample_project.next_milestone, ColdMilestone)
+        assert isinstance(sample_project.latest_status_update, ColdStatusUpdate)
+        assert sample_project.get_status_preview()['text'] == 'Settled'
+
+    def test_rollup_id_of_another_project_is_ignored(self, db_session, make_project, make_task,
+                                                     sample_project):
+        """next_task never returns a row belonging to a different project."""
+        other = make_project('Other', assigner='Self', assigned_attorneys='Me')
+        task = make_task(other, target_name='Theirs')
+
+        sample_project.rollup_next_task_id = task.id
+
+        assert sample_project.next_task is None
+
+    def test_reprs(self, db_session, sample_project):
+        """Cold models have readable reprs."""
+        add_history(db_session, sample_project)
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        assert repr(db_session.scalars(select(ColdTask)).first()).startswith('<ColdTask Pending by')
+        assert repr(db_session.scalars(select(ColdMilestone)).first()) == \
+            f'<ColdMilestone Hearing for project {sample_project.id}>'
+        update = db_session.scalars(select(ColdStatusUpdate)).first()
+        assert repr(update) == f'<ColdStatusUpdate {update.id} for project {sample_project.id}>'
+
+
+class TestArchiveBacklog:
+    """Test archive_backlog() and the archive-cold command."""
+
+    def test_moves_projects_archived_before_cold_storage(self, db_session, sample_project):
+        """Archived projects with hot children are moved; their edit date becomes the archive date."""
+        add_history(db_session, sample_project)
+        sample_project.status = 'archived'
+        sample_project.updated_at = datetime.utcnow() - timedelta(days=30)
+        db_session.commit()
+        edited = sample_project.updated_at
+
+        assert cold_storage_backlog() == 1
+        assert archive_backlog() == 1
+        db_session.expire_all()
+
+        assert sample_project.archived_at == edited
+        assert sample_project.updated_at == edited
+        assert count(Task, sample_project.id) == 0
+        assert count(ColdStatusUpdate, sample_project.id) == 1
+        assert cold_storage_backlog() == 0
+        assert archive_backlog() == 0
+
+    def test_command(self, runner, db_session, sample_project):
+        """flask archive-cold reports how many projects moved."""
+        sample_project.status = 'archived'
+        db_session.commit()
+
+        result = runner.invoke(args=['archive-cold'])
+
+        assert 'Moved 1 archived project(s) to cold storage.' in result.output
+
+    def test_init_db_moves_backlog(self, runner, db_session, sample_project):
+        """init-db moves the backlog of an upgraded database."""
+        sample_project.status = 'archived'
+        db_session.commit()
+
+        result = runner.invoke(args=['init-db'])
+
+        assert 'Moved 1 archived project(s) to cold storage.' in result.output
+
+
+class TestArchiveJob:
+    """Test archive_job(), the background move after archiving."""
+
+    def test_moves_archived_project(self, db_session, sample_project):
+        """The project's children are moved to the cold tables."""
+        add_history(db_session, sample_project)
+        sample_project.status = 'archived'
+        db_session.commit()
+
+        assert archive_job(None, sample_project.id) == {'moved': 4}
+        assert sample_project.in_cold_storage
+        assert archive_job(None, sample_project.id) == {'moved': 0}
+
+    def test_skips_unarchived_or_deleted_project(self, db_session, sample_project):
+        """A project unarchived (or deleted) before the job ran is left alone."""
+        add_history(db_session, sample_project)
+
+        assert archive_job(None, sample_project.id) == {'moved': 0}
+        assert archive_job(None, 999) == {'moved': 0}
+        assert count(Task, sample_project.id) == 2
@@ -38,7 +38,15 @@ class TestConfig:
         importlib.reload(config)
 
         assert str(config.DATA_DIR) == str(custom_dir)
-        assert custom_dir.exists()
+
+    def test_import_does_not_create_data_dir(self, monkeypatch, tmp_path):
+        """Importing config has no filesystem side effects; init-db creates the directory."""
+        custom_dir = tmp_path / 'custom_data'
+        monkeypatch.setenv('WORKLIST_DATA_DIR', str(custom_dir))
+        import config
+        importlib.reload(config)
+
+        assert not custom_dir.exists()
 
     def test_database_uri_format(self):
         """Database URI is properly formatted SQLite path."""
@@ -52,3 +60,87 @@ class TestConfig:
         import config
 
         assert config.Config.SQLALCHEMY_TRACK_MODIFICATIONS is False
+
+    def test_default_sqlite_profile_is_production(self, monkeypatch):
+        """Production SQLite profile is used when env var not set."""
+        monkeypatch.delenv('WORKLIST_SQLITE_PROFILE', raising=False)
+        import config
+        importlib.reload(config)
+
+        assert config.SQLITE_PROFILE == 'production'
+        assert config.Config.SQLITE_PRAGMAS['journal_mode'] == 'WAL'
+        assert config.Config.SQLITE_PRAGMAS['synchronous'] == 'NORMAL'
+        assert config.Config.SQLALCHEMY_ENGINE_OPTIONS['pool_recycle'] == 3600
+
+    def test_sqlite_profile_from_environment(self, monkeypatch):
+        """WORKLIST_SQLITE_PROFILE selects another profile."""
+        monkeypatch.setenv('WORKLIST_SQLITE_PROFILE', 'test')
+        import config
+        importlib.reload(config)
+
+        assert config.Config.SQLITE_PRAGMAS['synchronous'] == 'OFF'
+        assert config.Config.SQLALCHEMY_ENGINE_OPTIONS == {}
+
+    def test_unknown_sqlite_profile_rejected(self, monkeypatch):
+        """An unknown profile name fails loudly at import."""
+        import pytest
+        import config
+
+        monkeypatch.setenv('WORKLIST_SQLITE_PROFILE', 'turbo')
+        with pytest.raises(ValueError, match='turbo'):
+            importlib.reload(config)
+
+        monkeypatch.setenv('WORKLIST_SQLITE_PROFILE', 'test')
+        importlib.reload(config)
+
+    def test_query_stats_defaults(self, monkeypatch):
+        """Query instrumentation is on with a 100 ms slow-query threshold by default."""
+        monkeypatch.delenv('WORKLIST_QUERY_STATS', raising=False)
+        monkeypatch.delenv('WORKLIST_SLOW_QUERY_MS', raising=False)
+        import config
+        importlib.reload(config)
+
+        assert config.Config.QUERY_STATS_ENABLED is True
+        assert config.Config.SLOW_QUERY_THRESHOLD_MS == 100
+
+    def test_query_stats_from_environment(self, monkeypatch):
+        """Query instrumentation can be tuned or disabled from the environment."""
+        monkeypatch.setenv('WORKLIST_QUERY_STATS', '0')
+        monkeypatch.setenv('WORKLIST_SLOW_QUERY_MS', '25')
+        import config
+        importlib.reload(config)
+
+        assert config.Config.QUERY_STATS_ENABLED is False
+        assert config.Config.SLOW_QUERY_THRESHOLD_MS == 25
+
+    def test_dashboard_cache_defaults(self, monkeypatch):
+        """The dashboard cache is in-process with a 5 minute ttl by default."""
+        monkeypatch.delenv('WORKLIST_DASHBOARD_CACHE', raising=False)
+        monkeypatch.delenv('WORKLIST_DASHBOARD_CACHE_TTL', raising=False)
+        import config
+        importlib.reload(config)
+
+        assert config.Config.DASHBOARD_CACHE_BACKEND == 'memory'
+        assert config.Config.DASHBOARD_CACHE_TTL == 300
+        assert config.Config.DASHBOARD_CACHE_PATH == config.DATA_DIR / 'dashboard_cache.db'
+
+    def test_dashboard_cache_from_environment(self, monkeypatch):
+        """The dashboard cache backend and ttl come from the environment."""
+        monkeypatch.setenv('WORKLIST_DASHBOARD_CACHE', 'sqlite')
+        monkeypatch.setenv('WORKLIST_DASHBOARD_CACHE_TTL', '60')
+        import config
+        importlib.reload(config)
+
+        assert config.Config.DASHBOARD_CACHE_BACKEND == 'sqlite'
+        assert config.Config.DASHBOARD_CACHE_TTL == 60
+
+    def test_change_log_retention(self, monkeypatch):
+        """Change log retention defaults to 90 days and comes from the environment."""
+        monkeypatch.delenv('WORKLIST_CHANGE_LOG_RETENTION_DAYS', raising=False)
+        import config
+        importlib.reload(config)
+        assert config.Config.CHANGE_LOG_RETENTION_DAYS == 90
+
+        monkeypatch.setenv('WORKLIST_CHANGE_LOG_RETENTION_DAYS', '7')
+        importlib.reload(config)
+        assert config.Config.CHANGE_LOG_RETENTION_DAYS == 7
@@ -0,0 +1,265 @@
+"""Tests for app/dashboard_engine.py - batched dashboard data loading."""
+import logging
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import update
+
+from app.changes import latest_change_id
+from app.dashboard_engine import ProjectCard, TaskView, bucket_for, build_dashboard, load_project_cards
+from app.models import Milestone, Project, StatusUpdate
+
+
+class TestLoadProjectCards:
+    """Test load_project_cards() view construction."""
+
+    def test_returns_card_per_active_project(self, db_session, make_project):
+        """One card is built for each active project."""
+        active = make_project('Active Client')
+        make_project('Archived Client', status='archived')
+
+        cards = load_project_cards()
+
+        assert list(cards) == [active.id]
+        assert cards[active.id].client_name == 'Active Client'
+
+    def test_card_tasks_are_pending_and_ordered(self, db_session, make_project, make_task):
+        """Cards carry pending tasks ordered by due date."""
+        project = make_project('Tasks Client')
+        later = make_task(project, 5)
+        sooner = make_task(project, 1)
+        make_task(project, 0, completed=True)
+
+        card = load_project_cards()[project.id]
+
+        assert [t.id for t in card.tasks] == [sooner.id, later.id]
+        assert card.next_task.id == sooner.id
+
+    def test_card_milestones_are_pending_and_ordered(self, db_session, make_project):
+        """Cards carry pending milestones ordered by date."""
+        project = make_project('Milestone Client')
+        db_session.add_all([
+            Milestone(project_id=project.id, name='Second', date=date.today() + timedelta(days=9)),
+            Milestone(project_id=project.id, name='First', date=date.today() + timedelta(days=2)),
+            Milestone(project_id=project.id, name='Done', date=date.today(), completed=True),
+        ])
+        db_session.commit()
+
+        card = load_project_cards()[project.id]
+
+        assert [m.name for m in card.milestones] == ['First', 'Second']
+
+    def test_card_uses_latest_status_update(self, db_session, make_project):
+        """Status preview comes from the most recent update only."""
+        project = make_project('Update Client')
+        db_session.add(StatusUpdate(project_id=project.id, notes='Old news',
+                                    created_at=datetime.utcnow() - timedelta(days=3)))
+        db_session.add(StatusUpdate(project_id=project.id, notes='Line 1\nLine 2\nLine 3\nLine 4'))
+        db_session.commit()
+
+        card = load_project_cards()[project.id]
+
+        assert card.status_preview['text'] == 'Line 1\nLine 2\nLine 3'
+        assert card.status_preview['has_more'] is True
+        assert card.days_since_update == 0
+
+    def test_card_without_updates_uses_created_at(self, db_session, make_project):
+        """days_since_update falls back to the project creation date."""
+        project = make_project('Quiet Client',
+                               created_at=datetime.utcnow() - timedelta(days=9))
+
+        card = load_project_cards()[project.id]
+
+        assert card.status_preview is None
+        assert card.days_since_update == 9
+        assert card.staleness_level == 'warning'
+
+    def test_staleness_counts_calendar_days(self, db_session, make_project):
+        """A project last touched late on a day is a whole day older the next morning."""
+        project = make_project('Late Client',
+                               created_at=datetime.combine(date.today() - timedelta(days=7), time(23, 59)))
+
+        card = load_project_cards()[project.id]
+
+        assert card.days_since_update == 7
+        assert card.staleness_level == 'warning'
+        assert load_project_cards(today=date.today() + timedelta(days=7))[project.id].staleness_level == 'critical'
+
+    def test_project_filter_narrows_results(self, db_session, make_project):
+        """An extra SQL filter restricts which cards are built."""
+        wanted = make_project('Wanted Client')
+        make_project('Other Client')
+
+        cards = load_project_cards(Project.id == wanted.id)
+
+        assert list(cards) == [wanted.id]
+
+
+class TestCardVersion:
+    """Test the version stamp behind ProjectCard.fragment_key()."""
+
+    def test_version_moves_with_child_writes(self, db_session, make_project, make_task):
+        """Inserting, editing and deleting a task each give the card a new version."""
+        project = make_project('Versioned Client')
+        versions = [load_project_cards()[project.id].version]
+
+        task = make_task(project, 1)
+        versions.append(load_project_cards()[project.id].version)
+        task.description = 'Edited'
+        db_session.commit()
+        versions.append(load_project_cards()[project.id].version)
+        db_session.delete(task)
+        db_session.commit()
+        versions.append(load_project_cards()[project.id].version)
+
+        assert versions == sorted(set(versions))
+
+    def test_version_is_per_project(self, db_session, make_project, make_task):
+        """A write to one project leaves other cards' versions alone."""
+        project = make_project('Quiet Client')
+        other = make_project('Busy Client')
+        before = load_project_cards()[project.id].version
+
+        make_task(other, 1)
+
+        assert load_project_cards()[project.id].version == before
+
+    def test_fragment_key(self, db_session, make_project):
+        """The key combines id, version, staleness and the date."""
+        project = make_project('Keyed Client')
+        card = load_project_cards()[project.id]
+        today = date.today()
+
+        assert card.fragment_key(today) == (project.id, card.version, 0, today)
+        assert card.fragment_key(today) != card.fragment_key(today + timedelta(days=1))
+
+
+class TestBuildDashboard:
+    """Test build_dashboard() bucketing and sorting."""
+
+    def test_buckets_by_next_task_due_date(self, db_session, make_project, make_task):
+        """Projects land in the bucket of their earliest pending task."""
+        overdue = make_project('Overdue')
+        make_task(overdue, -2)
+        tomorrow = make_project('Tomorrow')
+        make_task(tomorrow, 1)
+        week = make_project('Week')
+        make_task(week, 6)
+        later = make_project('Later')
+        make_task(later, 12)
+        hidden = make_project('Hidden')
+        make_task(hidden, 30)
+        idle = make_project('Idle')
+
+        dashboard = build_dashboard(date.today())
+
+        assert [c.id for c in dashboard.due_today] == [overdue.id]
+        assert [c.id for c in dashboard.due_tomorrow] == [tomorrow.id]
+        assert [c.id for c in dashboard.due_this_week] == [week.id]
+        assert [c.id for c in dashboard.due_later] == [later.id]
+        assert [c.id for c in dashboard.no_tasks] == [idle.id]
+
+    def test_same_due_date_sorted_by_priority(self, db_session, make_project, make_task):
+        """Ties on due date are broken by task priority."""
+        low = make_project('Low')
+        make_task(low, 3, priority='low')
+        high = make_project('High')
+        make_task(high, 3, priority='high')
+
+        dashboard = build_dashboard()
+
+        assert [c.id for c in dashboard.due_this_week] == [high.id, low.id]
+
+    def test_no_tasks_sorted_most_stale_first(self, db_session, make_project):
+        """Projects without tasks are ordered by staleness."""
+        fresh = make_project('Fresh')
+        stale = make_project('Stale', created_at=datetime.utcnow() - timedelta(days=20))
+
+        dashboard = build_dashboard()
+
+        assert [c.id for c in dashboard.no_tasks] == [stale.id, fresh.id]
+
+    def test_sort_keys_follow_list_order(self, db_session, make_project, make_task):
+        """Sorting a list's cards by sort_key reproduces the list order."""
+        for name, days, priority in [('A', 3, 'low'), ('B', 3, 'high'), ('C', 2, 'medium'), ('D', 3, 'high')]:
+            make_task(make_project(name), days, priority=priority)
+        make_project('Fresh')
+        make_project('Stale', created_at=datetime.utcnow() - timedelta(days=20))
+
+        dashboard = build_dashboard()
+
+        for cards in (dashboard.due_this_week, dashboard.no_tasks):
+            assert len(cards) > 1
+            assert sorted(cards, key=lambda card: card.sort_key) == cards
+
+    def test_card_past_the_window_is_skipped(self, app, db_session, make_project, make_task, caplog):
+        """A card whose rollup drifted from its tasks is logged, not filed under due_later."""
+        drifted = make_project('Drifted')
+        make_task(drifted, 30)
+        db_session.execute(update(Project).where(Project.id == drifted.id)
+                           .values(rollup_next_task_due=date.today()))
+        db_session.commit()
+
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            dashboard = build_dashboard()
+
+        assert dashboard.due_today == dashboard.due_later == []
+        assert [r.getMessage() for r in caplog.records] == [
+            f'Project {drifted.id} fits no dashboard list; its rollups may be stale'
+        ]
+
+    def test_records_change_id(self, db_session, make_project):
+        """The dashboard remembers the change log position it was built at."""
+        make_project('Logged')
+
+        assert build_dashboard().change_id == latest_change_id()
+        assert build_dashboard(change_id=3).change_id == 3
+
+    def test_query_count_independent_of_project_count(self, db_session, make_project, make_task,
+                                                      query_counter):
+        """Building the dashboard costs the same number of queries for 1 or 20 projects."""
+        first = make_project('Project 0')
+        make_task(first, 0)
+        db_session.add(StatusUpdate(project_id=first.id, notes='Update'))
+        db_session.commit()
+
+        with query_counter() as small:
+            build_dashboard()
+
+        for i in range(1, 20):
+            project = make_project(f'Project {i}')
+            make_task(project, i % 10)
+            db_session.add(StatusUpdate(project_id=project.id, notes='Update'))
+            db_session.add(Milestone(project_id=project.id, name='M', date=date.today()))
+        db_session.commit()
+
+        with query_counter() as large:
+            build_dashboard()
+
+        assert small.count == large.count == 4
+
+
+class TestBucketFor:
+    """Test bucket_for() - which dashboard list a card belongs in."""
+
+    def make_card(self, days=None):
+        card = ProjectCard(id=1, client_name='Client', project_name='Matter', priority='medium',
+                           days_since_update=0)
+        if days is not None:
+            card.tasks.append(TaskView(1, 1, 'self', 'Self', date.today() + timedelta(days=days),
+                                       '', 'medium'))
+        return card
+
+    def test_buckets(self):
+        """Lists follow the next task's due date; no tasks has its own list."""
+        today = date.today()
+
+        assert bucket_for(self.make_card(), today) == 'no_tasks'
+        assert bucket_for(self.make_card(-3), today) == 'due_today'
+        assert bucket_for(self.make_card(0), today) == 'due_today'
+        assert bucket_for(self.make_card(1), today) == 'due_tomorrow'
+        assert bucket_for(self.make_card(7), today) == 'due_this_week'
+        assert bucket_for(self.make_card(14), today) == 'due_later'
+
+    def test_too_far_out_is_not_shown(self):
+        """Cards whose next task is over two weeks away belong nowhere."""
+        assert bucket_for(self.make_card(15), date.today()) is None
@@ -0,0 +1,288 @@
+"""Tests for app/importer.py - bulk import from CSV and JSON Lines."""
+import json
+from io import StringIO
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db, importer
+from app.importer import ImportResult, detect_format, import_file, import_rows, read_rows
+from app.models import Job, Project, ProjectAttorney, StatusUpdate
+from app.rollups import find_rollup_drift
+from app.search import search
+
+PROJECT_CSV = (
+    'client_name,project_name,matter_number,assigner,assigned_attorneys,priority,estimated_hours,initial_update\n'
+    'Globex,Merger,M-1,Partner Smith,"Associate Jones, Associate Lee",high,12,Kickoff held\n'
+    ',Missing Client,M-2,Partner Smith,Associate Jones,medium,,\n'
+    'Initech,Lease,M-3,Partner Smith,Associate Lee,low,,\n'
+)
+
+
+def jsonl(*rows):
+    return StringIO(''.join(json.dumps(row) + '\n' for row in rows))
+
+
+def count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+class TestReadRows:
+    """Test read_rows() and detect_format()."""
+
+    def test_csv(self):
+        """CSV rows are dicts keyed by the header, numbered by file line."""
+        rows = list(read_rows(StringIO('a,b\n1,2\n\n3,4\n'), 'csv'))
+
+        assert rows == [(2, {'a': '1', 'b': '2'}, None), (4, {'a': '3', 'b': '4'}, None)]
+
+    def test_jsonl(self):
+        """Blank lines are skipped; bad lines become errors."""
+        rows = list(read_rows(StringIO('{"a": 1}\n\nnot json\n[1]\n'), 'jsonl'))
+
+        assert rows == [(1, {'a': 1}, None), (3, None, 'Invalid JSON.'), (4, None, 'Expected a JSON object.')]
+
+    def test_detect_format(self):
+        assert detect_format('firm.CSV') == 'csv'
+        assert detect_format('/tmp/tasks.ndjson') == 'jsonl'
+        with pytest.raises(ValueError, match='Unsupported file type'):
+            detect_format('tasks.xlsx')
+
+
+class TestImportProjects:
+    """Test importing projects."""
+
+    def test_valid_rows_imported_bad_rows_reported(self, db_session):
+        """A bad row is reported by line and skipped; the others are created."""
+        result = import_rows('projects', StringIO(PROJECT_CSV), 'csv')
+
+        assert (result.imported, result.error_count) == (2, 1)
+        assert result.errors == [(3, 'Client name is required.')]
+        globex = Project.query.filter_by(client_name='Globex').one()
+        assert globex.estimated_hours == 12.0
+        assert globex.status == 'active'
+        assert globex.created_at == globex.updated_at
+
+    def test_attorneys_updates_and_rollups(self, db_session):
+        """New projects are linked to attorneys, get their initial update and current rollups."""
+        import_rows('projects', StringIO(PROJECT_CSV), 'csv')
+
+        globex = Project.query.filter_by(client_name='Globex').one()
+        assert sorted((link.attorney.name, link.role) for link in globex.attorney_links) == [
+            ('Associate Jones', 'attorney'), ('Associate Lee', 'attorney'), ('Partner Smith', 'assigner'),
+        ]
+        assert [update.notes for update in globex.status_updates] == ['Kickoff held']
+        assert globex.rollup_last_update_at is not None
+        assert count(StatusUpdate) == 1
+        assert find_rollup_drift() == []
+        assert [(hit.kind, hit.project_id) for hit in search('Globex')] == [('project', globex.id)]
+
+    def test_chunks_commit_separately(self, db_session):
+        """Each chunk is its own transaction."""
+        result = import_rows('projects', StringIO(PROJECT_CSV), 'csv', chunk_size=1)
+
+        assert result.imported == 2
+        assert count(ProjectAttorney) == 5
+
+    def test_nothing_valid(self, db_session):
+        """A chunk without valid rows inserts nothing."""
+        result = import_rows('projects', StringIO('{"client_name": "Only"}\n[1]\n'), 'jsonl')
+
+        assert result.imported == 0
+        assert result.errors[0][1].startswith('Project name is required.')
+        assert result.errors[1] == (2, 'Expected a JSON object.')
+        assert count(Project) == 0
+
+    def test_unknown_kind(self, db_session):
+        with pytest.raises(ValueError, match="Unknown import kind 'milestones'"):
+            import_rows('milestones', StringIO(''), 'csv')
+
+
+class TestImportChildren:
+    """Test importing tasks and status updates."""
+
+    def test_tasks_by_id_and_matter_number(self, db_session, sample_project):
+        """Tasks name their project by id or matter number; rollups follow."""
+        result = import_rows('tasks', jsonl(
+            {'project_id': sample_project.id, 'target_name': 'Client', 'due_date': '2026-05-01'},
+            {'matter_number': '2024-001', 'target_name': 'Court', 'due_date': '2026-04-01', 'priority': 'high'},
+        ), 'jsonl')
+
+        assert result.as_dict() == {'kind': 'tasks', 'imported': 2, 'error_count': 0, 'errors': []}
+        db_session.expire_all()
+        assert sample_project.pending_task_count == 2
+        assert sample_project.next_task.target_name == 'Court'
+        assert find_rollup_drift() == []
+
+    def test_project_errors(self, db_session, sample_project):
+        """Unknown, inactive, ambiguous or missing projects reject the row with its other errors."""
+        archived = Project(client_name='Old', project_name='Closed', matter_number='OLD-1',
+                           assigner='A', assigned_attorneys='B', status='archived')
+        twin_a = Project(client_name='Twin', project_name='A', matter_number='T-1', assigner='A', assigned_attorneys='B')
+        twin_b = Project(client_name='Twin', project_name='B', matter_number='T-1', assigner='A', assigned_attorneys='B')
+        db_session.add_all([archived, twin_a, twin_b])
+        db_session.commit()
+
+        result = import_rows('tasks', jsonl(
+            {'project_id': 999, 'target_name': 'X', 'due_date': '2026-05-01'},
+            {'project_id': 'abc', 'target_name': 'X', 'due_date': '2026-05-01'},
+            {'matter_number': 'OLD-1', 'target_name': 'X', 'due_date': '2026-05-01'},
+            {'matter_number': 'T-1', 'target_name': 'X', 'due_date': '2026-05-01'},
+            {'target_name': 'X'},
+        ), 'jsonl')
+
+        assert result.imported == 0
+        assert result.errors == [
+            (1, 'Project not found or not active.'),
+            (2, 'Project not found or not active.'),
+            (3, 'Project not found or not active.'),
+            (4, 'Matter number T-1 matches more than one active project.'),
+            (5, 'A project_id or matter_number is required. Due date is required.'),
+        ]
+
+    def test_updates(self, db_session, sample_project):
+        """Status updates use the status update form's rules; parse errors are reported."""
+        result = import_rows('updates', StringIO(
+            f'{{"project_id": {sample_project.id}, "notes": "Filed"}}\n'
+            f'{{"project_id": {sample_project.id}}}\n'
+            '{oops\n'
+        ), 'jsonl')
+
+        assert result.imported == 1
+        assert result.errors == [(2, 'Status update notes are required.'), (3, 'Invalid JSON.')]
+        db_session.expire_all()
+        assert sample_project.latest_status_update.notes == 'Filed'
+
+    def test_reported_errors_are_capped(self, db_session, monkeypatch):
+        """Past MAX_REPORTED_ERRORS rejected rows are only counted."""
+        monkeypatch.setattr(importer, 'MAX_REPORTED_ERRORS', 2)
+
+        result = import_rows('updates', jsonl(*[{}] * 3), 'jsonl')
+
+        assert result.error_count == 3
+        assert len(result.errors) == 2
+
+
+class TestImportFile:
+    """Test import_file() and import_job()."""
+
+    def test_csv_with_byte_order_mark(self, db_session, tmp_path):
+        """Spreadsheet CSVs with a BOM keep their first column name."""
+        path = tmp_path / 'projects.csv'
+        path.write_text(PROJECT_CSV, encoding='utf-8-sig')
+
+        assert import_file('projects', path).imported == 2
+
+    def test_job_deletes_upload(self, db_session, tmp_path):
+        """The import job returns the result and removes the uploaded file."""
+        path = tmp_path / 'upload.jsonl'
+        path.write_text('{}\n')
+
+        result = importer.import_job(None, 'updates', str(path), 'jsonl')
+
+        assert result['error_count'] == 1
+        assert not path.exists()
+
+    def test_undecodable_rows_are_reported(self, db_session, sample_project, tmp_path):
+        """A row that is not UTF-8 is rejected by line; the rows around it are imported."""
+        path = tmp_path / 'updates.csv'
+        path.write_bytes(b'project_id,notes\n'
+                         + f'{sample_project.id},Filed\n'.encode()
+                         + f'{sample_project.id},Caf\xe9 meeting\n'.encode('latin-1')
+                         + f'{sample_project.id},Served\n'.encode())
+
+        result = import_file('updates', path)
+
+        assert result.imported == 2
+        assert result.errors == [(3, 'Not valid UTF-8 text.')]
+
+    def test_undecodable_jsonl_line(self, db_session, sample_project, tmp_path):
+        path = tmp_path / 'updates.jsonl'
+        path.write_bytes(b'{"notes": "caf\xe9"}\n'
+                         + json.dumps({'project_id': sample_project.id, 'notes': 'Filed'}).encode())
+
+        result = import_file('updates', path)
+
+        assert result.imported == 1
+        assert result.errors == [(1, 'Not valid UTF-8 text.')]
+
+    def test_job_resumes_after_its_last_chunk(self, db_session, sample_project, monkeypatch):
+        """A job run again after a crash skips the chunks it already committed."""
+        text = '{}\n' + ''.join(
+            json.dumps({'project_id': sample_project.id, 'notes': f'Note {n}'}) + '\n' for n in range(4)
+        )
+        job = Job(kind='import', params={}, status='running')
+        db_session.add(job)
+        db_session.commit()
+        import_updates = importer._CHUNK_IMPORTERS['updates']
+        chunks = []
+
+        def crash_on_second_chunk(rows, result):
+            chunks.append(rows)
+            if len(chunks) == 2:
+                raise RuntimeError('worker killed')
+            import_updates(rows, result)
+
+        monkeypatch.setitem(importer._CHUNK_IMPORTERS, 'updates', crash_on_second_chunk)
+        with pytest.raises(RuntimeError):
+            import_rows('updates', StringIO(text), 'jsonl', chunk_size=2, job=job)
+        db_session.rollback()
+
+        assert job.result['line'] == 2
+        assert count(StatusUpdate) == 1
+
+        monkeypatch.setitem(importer._CHUNK_IMPORTERS, 'updates', import_updates)
+        result = import_rows('updates', StringIO(text), 'jsonl', chunk_size=2, job=job)
+
+        assert (result.imported, result.error_count) == (4, 1)
+        assert [line for line, _ in result.errors] == [1]
+        assert sorted(update.notes for update in StatusUpdate.query) == [f'Note {n}' for n in range(4)]
+
+    def test_result_errors(self):
+        result = ImportResult('tasks')
+        result.reject(4, ['Invalid priority.', 'Due date is required.'])
+
+        assert result.errors == [(4, 'Invalid priority. Due date is required.')]
+
+
+class TestImportCommand:
+    """Test flask import."""
+
+    def test_imports_and_reports(self, runner, db_session, tmp_path):
+        """Rejected rows are listed and the exit code is 1."""
+        path = tmp_path / 'projects.csv'
+        path.write_text(PROJECT_CSV)
+
+        result = runner.invoke(args=['import', 'projects', str(path)])
+
+        assert result.exit_code == 1
+        assert 'line 3: Client name is required.' in result.output
+        assert 'Imported 2 projects; 1 row(s) rejected.' in result.output
+
+    def test_clean_import(self, runner, db_session, sample_project, tmp_path):
+        """--format overrides the extension; a clean import exits 0."""
+        path = tmp_path / 'updates.txt'
+        path.write_text(f'{{"project_id": {sample_project.id}, "notes": "Filed"}}\n')
+
+        result = runner.invoke(args=['import', 'updates', str(path), '--format', 'jsonl'])
+
+        assert result.exit_code == 0
+        assert 'Imported 1 updates; 0 row(s) rejected.' in result.output
+
+    def test_unknown_extension(self, runner, db_session, tmp_path):
+        path = tmp_path / 'updates.txt'
+        path.write_text('')
+
+        result = runner.invoke(args=['import', 'updates', str(path)])
+
+        assert result.exit_code == 2
+        assert 'Unsupported file type' in result.output
+
+    def test_more_errors_than_listed(self, runner, db_session, tmp_path, monkeypatch):
+        monkeypatch.setattr(importer, 'MAX_REPORTED_ERRORS', 1)
+        path = tmp_path / 'updates.jsonl'
+        path.write_text('{}\n{}\n{}\n')
+
+        result = runner.invoke(args=['import', 'updates', str(path)])
+
+        assert '... and 2 more.' in result.output
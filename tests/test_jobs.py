@@ -0,0 +1,231 @@
+"""Tests for app/jobs.py - the background job runner."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, jobs
+from app.jobs import (
+    JobRunner, enqueue, job_directory, job_output_path, prune_jobs, run_job,
+)
+from app.models import Job
+
+calls = []
+
+
+def record_job(job, **params):
+    """Job function for tests: remembers its params."""
+    calls.append(params)
+    return {'seen': params}
+
+
+def failing_job(job):
+    raise RuntimeError('disk full')
+
+
+@pytest.fixture(autouse=True)
+def test_kinds(app, tmp_path, monkeypatch):
+    """Test job kinds, and job files under a temporary directory."""
+    calls.clear()
+    monkeypatch.setitem(jobs.JOB_KINDS, 'record', 'tests.test_jobs:record_job')
+    monkeypatch.setitem(jobs.JOB_KINDS, 'fail', 'tests.test_jobs:failing_job')
+    monkeypatch.setitem(app.config, 'JOB_OUTPUT_DIR', tmp_path)
+
+
+@pytest.fixture
+def pool_runner(app, monkeypatch):
+    """A JobRunner with one worker thread, shut down after the test."""
+    monkeypatch.setitem(app.config, 'JOB_WORKERS', 1)
+    runner = JobRunner(app)
+    monkeypatch.setitem(app.extensions, 'jobs', runner)
+    yield runner
+    runner.shutdown()
+
+
+def add_job(db_session, kind='record', **columns):
+    job = Job(kind=kind, params={}, **columns)
+    db_session.add(job)
+    db_session.commit()
+    return job
+
+
+class TestEnqueue:
+    """Test enqueue() and run_job()."""
+
+    def test_runs_inline_without_workers(self, db_session):
+        """With JOB_WORKERS = 0 the job has finished when enqueue() returns."""
+        job = enqueue('record', project_id=7)
+
+        db_session.refresh(job)
+        assert calls == [{'project_id': 7}]
+        assert job.status == 'succeeded'
+        assert job.result == {'seen': {'project_id': 7}}
+        assert job.started_at == job.heartbeat_at <= job.finished_at
+
+    def test_failure_is_recorded(self, db_session, caplog):
+        """An exception fails the job with its message and is logged."""
+        job = enqueue('fail')
+
+        db_session.refresh(job)
+        assert job.status == 'failed'
+        assert job.error == 'RuntimeError: disk full'
+        assert job.result is None
+        assert job.done
+        assert 'fail) failed' in caplog.text
+
+    def test_unknown_kind(self, db_session):
+        """Only kinds in JOB_KINDS can be queued."""
+        with pytest.raises(ValueError, match="Unknown job kind 'mystery'"):
+            enqueue('mystery')
+
+        assert Job.query.count() == 0
+
+    def test_resumes_stale_jobs(self, db_session):
+        """Queuing a job also runs again the jobs whose process stopped heartbeating."""
+        silent = datetime.utcnow() - timedelta(hours=1)
+        stale = add_job(db_session, status='running', started_at=silent, heartbeat_at=silent)
+
+        enqueue('record', n=1)
+
+        db_session.refresh(stale)
+        assert stale.status == 'succeeded'
+        assert len(calls) == 2
+
+    def test_job_is_claimed_once(self, app, db_session):
+        """A job another process already claimed is not run again."""
+        job = add_job(db_session)
+
+        run_job(app, job.id)
+        run_job(app, job.id)
+
+        assert len(calls) == 1
+
+
+class TestJobRunner:
+    """Test the per-process thread pool."""
+
+    def test_pool_runs_jobs(self, db_session, pool_runner):
+        """Jobs run on the pool; shutdown() waits for them."""
+        job_ids = [enqueue('record', n=n).id for n in range(3)]
+
+        pool_runner.shutdown()
+
+        db_session.expire_all()
+        assert [db.session.get(Job, id).status for id in job_ids] == ['succeeded'] * 3
+        assert sorted(call['n'] for call in calls) == [0, 1, 2]
+
+    def test_start_is_idempotent(self, db_session, pool_runner):
+        """The pool starts once per process."""
+        pool = pool_runner.start()
+
+        assert pool_runner.start() is pool
+
+    def test_start_recovers_jobs(self, db_session, pool_runner):
+        """Starting the pool runs queued jobs and requeues those silent for JOB_STALE_SECONDS."""
+        now = datetime.utcnow()
+        silent = now - timedelta(hours=1)
+        queued = add_job(db_session)
+        stale = add_job(db_session, status='running', started_at=silent, heartbeat_at=silent)
+        # Rows without a heartbeat go by started_at
+        stale_start = add_job(db_session, status='running', started_at=silent)
+        unclaimed = add_job(db_session, status='running')
+        alive = add_job(db_session, status='running', started_at=silent, heartbeat_at=now)
+
+        pool_runner.start()
+        pool_runner.shutdown()
+
+        db_session.expire_all()
+        assert {queued.status, stale.status, stale_start.status, unclaimed.status} == {'succeeded'}
+        assert alive.status == 'running'
+        assert len(calls) == 4
+
+    def test_resume_stale(self, app, db_session, pool_runner):
+        """A running pool picks up jobs that went stale after it started."""
+        pool_runner.start()
+        silent = datetime.utcnow() - timedelta(hours=1)
+        stale = add_job(db_session, status='running', started_at=silent, heartbeat_at=silent)
+
+        assert pool_runner.resume_stale() == 1
+        assert pool_runner.resume_stale() == 0
+        pool_runner.shutdown()
+
+        db_session.expire_all()
+        assert stale.status == 'succeeded'
+
+    def test_start_without_workers(self, db_session):
+        """JOB_WORKERS = 0 has no pool to start."""
+        assert jobs.get_runner().start() is None
+
+
+
+class TestHeartbeat:
+    """Test the heartbeat a running job records."""
+
+    class Stopped:
+        """Stands in for the stop event: one beat, then stop."""
+
+        def __init__(self):
+            self.waits = 0
+
+        def wait(self, timeout):
+            self.waits += 1
+            return self.waits > 1
+
+    def test_beat(self, app, db_session):
+        """Each beat moves the running job's heartbeat forward."""
+        silent = datetime.utcnow() - timedelta(hours=1)
+        job = add_job(db_session, status='running', started_at=silent, heartbeat_at=silent)
+
+        jobs._heartbeat(app, job.id, self.Stopped())
+
+        db_session.refresh(job)
+        assert job.heartbeat_at > silent
+
+    def test_failed_beat_is_logged(self, app, db_session, monkeypatch, caplog):
+        """A failed beat is logged and does not stop the job."""
+        def update(model):
+            raise RuntimeError('database is locked')
+
+        monkeypatch.setattr(jobs, 'update', update)
+
+        jobs._heartbeat(app, 1, self.Stopped())
+
+        assert 'Heartbeat of job 1 failed' in caplog.text
+
+
+class TestJobFiles:
+    """Test job output files and pruning."""
+
+    def test_output_path(self, app, db_session, tmp_path):
+        """Each job writes under its own directory and records the file name."""
+        job = add_job(db_session)
+
+        path = job_output_path(job, 'out.csv')
+
+        assert path == tmp_path / str(job.id) / 'out.csv'
+        assert path.parent.is_dir()
+        assert job.output_file == 'out.csv'
+        assert job_directory(job.id) == path.parent
+
+    def test_prune_jobs(self, db_session):
+        """Finished jobs past the retention period are deleted with their files."""
+        old = datetime.utcnow() - timedelta(days=10)
+        stale = add_job(db_session, status='succeeded', finished_at=old)
+        recent = add_job(db_session, status='failed', finished_at=datetime.utcnow())
+        running = add_job(db_session, status='running')
+        job_output_path(stale, 'out.csv').write_text('x')
+        stale_id = stale.id
+
+        assert prune_jobs(7) == 1
+
+        assert not job_directory(stale_id).exists()
+        assert {job.id for job in Job.query} == {recent.id, running.id}
+
+    def test_command(self, runner, app, db_session):
+        """flask prune-jobs falls back to JOB_RETENTION_DAYS; --days overrides it."""
+        add_job(db_session, status='succeeded', finished_at=datetime.utcnow() - timedelta(hours=1))
+
+        result = runner.invoke(args=['prune-jobs'])
+        assert f'Deleted 0 job(s) finished over {app.config["JOB_RETENTION_DAYS"]} day(s) ago.' in result.output
+
+        result = runner.invoke(args=['prune-jobs', '--days', '0'])
+        assert 'Deleted 1 job(s) finished over 0 day(s) ago.' in result.output
@@ -0,0 +1,287 @@
+"""Tests for app/live.py - live dashboard updates over Server-Sent Events."""
+import json
+import logging
+from datetime import date
+
+import pytest
+
+from app import live
+from app.changes import latest_change_id
+from app.live import Batch, ChangeFeed, batch_events, format_event, load_batch, stream
+from app.models import Milestone
+
+
+@pytest.fixture
+def feed(app, monkeypatch):
+    """A fresh ChangeFeed whose thread never polls by itself; tests call poll()."""
+    change_feed = ChangeFeed(app, interval=3600)
+    monkeypatch.setitem(app.extensions, 'live_feed', change_feed)
+    return change_feed
+
+
+def parse_events(text):
+    """(event, data) pairs from SSE text, skipping comments and retry lines."""
+    events = []
+    for message in text.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class TestLoadBatch:
+    """Test load_batch() - cards of the projects changed since a cursor."""
+
+    def test_only_changed_projects(self, db_session, make_project, make_task):
+        """Projects without changes after `since` are not loaded."""
+        quiet = make_project('Quiet Client')
+        busy = make_project('Busy Client')
+        since = latest_change_id()
+
+        make_task(busy, target_name='Live Task')
+        batch = load_batch(since, date.today())
+
+        assert batch.last_id == latest_change_id()
+        assert list(batch.cards) == [busy.id]
+        assert batch.cards[busy.id].tasks[0].target_name == 'Live Task'
+        assert quiet.id not in batch.cards
+
+    def test_moved_children_update_both_cards(self, db_session, make_project, make_task):
+        """A task or milestone moved to another project refreshes the card it left too."""
+        source = make_project('Source Client')
+        target = make_project('Target Client')
+        task = make_task(source, target_name='Moving Task')
+        milestone = Milestone(project_id=source.id, name='Moving Hearing', date=date.today())
+        db_session.add(milestone)
+        db_session.commit()
+        since = latest_change_id()
+
+        task.project_id = milestone.project_id = target.id
+        db_session.commit()
+        batch = load_batch(since, date.today())
+
+        assert set(batch.cards) == {source.id, target.id}
+        assert batch.cards[source.id].tasks == [] and batch.cards[source.id].milestones == []
+        assert [view.target_name for view in batch.cards[target.id].tasks] == ['Moving Task']
+        assert [view.name for view in batch.cards[target.id].milestones] == ['Moving Hearing']
+
+    def test_inactive_project_has_no_card(self, db_session, make_project):
+        """A project that left the active list maps to None."""
+        project = make_project()
+        since = latest_change_id()
+
+        project.status = 'completed'
+        db_session.commit()
+
+        assert load_batch(since, date.today()).cards == {project.id: None}
+
+    def test_nothing_changed(self, db_session, make_project):
+        """An up-to-date cursor gives an empty batch."""
+        make_project()
+
+        batch = load_batch(latest_change_id(), date.today())
+
+        assert batch.cards == {}
+
+    def test_too_many_changes(self, db_session, make_project, monkeypatch):
+        """Past MAX_CARDS_PER_BATCH projects the batch asks for a reload."""
+        monkeypatch.setattr(live, 'MAX_CARDS_PER_BATCH', 1)
+        since = latest_change_id()
+        make_project('First')
+        make_project('Second')
+
+        assert load_batch(since, date.today()).cards is None
+
+
+class TestBatchEvents:
+    """Test the SSE text sent for a batch."""
+
+    def test_format_event(self):
+        """Messages carry an optional id, the event name and JSON data."""
+        assert format_event('card', {'id': 1}) == 'event: card\ndata: {"id": 1}\n\n'
+        assert format_event('reload', {}, 7) == 'id: 7\nevent: reload\ndata: {}\n\n'
+
+    def test_card_event(self, app, db_session, make_project, make_task):
+        """A changed card is sent with its list, sort key and markup."""
+        project = make_project()
+        since = latest_change_id()
+        make_task(project, days=1, target_name='Live Task')
+        batch = load_batch(since, date.today())
+
+        with app.test_request_context():
+            events = parse_events(batch_events(batch))
+
+        [(event, data)] = events
+        assert event == 'card'
+        assert data['id'] == project.id
+        assert data['bucket'] == 'due_tomorrow'
+        assert data['sort_key'] == batch.cards[project.id].sort_key
+        assert data['today'] == date.today().isoformat()
+        assert f'data-project-id="{project.id}"' in data['html']
+        assert 'Live Task' in data['html']
+
+    def test_removal_events(self, app, db_session, make_project, make_task):
+        """Inactive projects and cards too far out are sent without a list."""
+        far = make_project('Far Client')
+        since = latest_change_id()
+        make_task(far, days=30)
+        batch = load_batch(since, date.today())
+        batch.cards[999] = None
+
+        with app.test_request_context():
+            events = parse_events(batch_events(batch))
+
+        assert events == [
+            ('card', {'id': far.id, 'bucket': None, 'today': date.today().isoformat()}),
+            ('card', {'id': 999, 'bucket': None, 'today': date.today().isoformat()}),
+        ]
+
+    def test_reload_event(self):
+        """A batch without cards tells the page to reload."""
+        assert batch_events(Batch(5, date.today())) == format_event('reload', {}, 5)
+
+
+class TestChangeFeed:
+    """Test the per-process poller and its subscribers."""
+
+    def test_poll_publishes_to_subscribers(self, db_session, make_project, make_task, feed):
+        """Every subscriber gets the same batch, once."""
+        project = make_project()
+        first, position = feed.subscribe(latest_change_id())
+        second, _ = feed.subscribe(0)
+
+        make_task(project)
+        feed.poll()
+        feed.poll()
+
+        assert position == feed.last_id - 1
+        batch = first.get_nowait()
+        assert second.get_nowait() is batch
+        assert list(batch.cards) == [project.id]
+        assert first.empty() and second.empty()
+
+    def test_unsubscribe(self, db_session, make_project, make_task, feed):
+        """Unsubscribed queues get nothing more."""
+        project = make_project()
+        subscription, _ = feed.subscribe(latest_change_id())
+        feed.unsubscribe(subscription)
+
+        make_task(project)
+        feed.poll()
+
+        assert subscription.empty()
+
+    def test_subscriber_limit(self, app, db_session):
+        """Past max_streams subscribers, subscribe() turns the stream away."""
+        change_feed = ChangeFeed(app, interval=3600, max_streams=1)
+        subscription, _ = change_feed.subscribe(latest_change_id())
+
+        assert change_feed.subscribe(latest_change_id()) is None
+
+        change_feed.unsubscribe(subscription)
+        assert change_feed.subscribe(latest_change_id()) is not None
+
+    def test_thread_stops_without_subscribers(self, app, db_session, caplog):
+        """The polling thread logs failures and exits once nobody listens."""
+        change_feed = ChangeFeed(app, interval=0.01)
+        subscription, _ = change_feed.subscribe(latest_change_id())
+        thread = change_feed._thread
+
+        def failing_poll():
+            change_feed.unsubscribe(subscription)
+            raise RuntimeError('database is locked')
+
+        change_feed.poll = failing_poll
+        with caplog.at_level(logging.ERROR):
+            thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert change_feed._thread is None
+        assert 'Live dashboard poll failed' in caplog.text
+
+
+class TestStream:
+    """Test stream(), the body of one /events connection."""
+
+    def test_streams_published_batches(self, app, db_session, make_project, make_task, feed, monkeypatch):
+        """After the retry hint, each new batch is sent as card events."""
+        monkeypatch.setattr(live, 'KEEPALIVE_SECONDS', 0.05)
+        monkeypatch.setitem(app.config, 'LIVE_STREAM_SECONDS', 1)
+        project = make_project()
+        project_id = project.id
+
+        with app.test_request_context():
+            events = stream()
+            assert next(events) == f'retry: {live.RETRY_MS}\n\n'
+
+            make_task(project)
+            feed.poll()
+            card_events = parse_events(next(events))
+            rest = list(events)
+
+        assert [data['id'] for _, data in card_events] == [project_id]
+        assert set(rest) == {': keepalive\n\n'}
+        assert not feed._subscribers
+
+    def test_catches_up_behind_feed(self, app, db_session, make_project, make_task, feed):
+        """A client behind the feed first gets what it missed."""
+        project = make_project()
+        since = latest_change_id()
+        make_task(project)
+        feed.subscribe(latest_change_id())
+
+        with app.test_request_context():
+            events = stream(since)
+            next(events)
+            card_events = parse_events(next(events))
+            events.close()
+
+        assert [data['id'] for _, data in card_events] == [project.id]
+
+    def test_skips_batches_already_seen(self, app, db_session, make_project, feed, monkeypatch):
+        """Batches up to the client's position are not sent again; idle time sends keep-alives."""
+        monkeypatch.setattr(live, 'KEEPALIVE_SECONDS', 0.01)
+        make_project()
+
+        with app.test_request_context():
+            events = stream(latest_change_id())
+            next(events)
+            for subscription in feed._subscribers:
+                subscription.put(Batch(latest_change_id(), date.today(), {}))
+
+            assert next(events) == ': keepalive\n\n'
+            assert next(events) == ': keepalive\n\n'
+            events.close()
+
+    def test_ends_after_stream_seconds(self, app, db_session, feed, monkeypatch):
+        """The stream ends so the browser reconnects and frees the thread."""
+        monkeypatch.setitem(app.config, 'LIVE_STREAM_SECONDS', 0)
+
+        with app.test_request_context():
+            assert list(stream()) == [f'retry: {live.RETRY_MS}\n\n']
+
+        assert not feed._subscribers
+
+    def test_busy_worker_answers_like_a_poll(self, app, db_session, make_project, make_task, feed):
+        """With every stream slot taken, a client gets what it missed and a long retry."""
+        feed.max_streams = 0
+        project = make_project()
+        since = latest_change_id()
+        make_task(project)
+
+        with app.test_request_context():
+            up_to_date = list(stream())
+            behind = list(stream(since))
+
+        assert up_to_date == [f'retry: {live.BUSY_RETRY_MS}\n\n']
+        assert behind[0] == up_to_date[0]
+        assert [data['id'] for _, data in parse_events(''.join(behind))] == [project.id]
+        assert not feed._subscribers
+
+    def test_client_ahead_of_database_reloads(self, app, db_session, feed):
+        """A cursor past the newest change means another database: reload."""
+        with app.test_request_context():
+            latest = latest_change_id()
+            assert list(stream(latest + 10)) == [format_event('reload', {}, latest)]
+
+        assert not feed._subscribers
@@ -106,6 +106,40 @@ class TestProjectModel:
         assert StatusUpdate.query.filter_by(project_id=project_id).count() == 0
 
 
+class TestAttorneyModels:
+    """Test Attorney and ProjectAttorney."""
+
+    def test_project_links_to_its_attorneys(self, sample_project):
+        """Saving a project links its assigner and attorneys."""
+        links = {(link.attorney.name, link.role) for link in sample_project.attorney_links}
+
+        assert links == {('Associate Jones', 'attorney'), ('Partner Smith', 'assigner')}
+
+    def test_reprs(self, sample_project):
+        """Attorney and ProjectAttorney __repr__ return readable strings."""
+        link = next(link for link in sample_project.attorney_links if link.role == 'assigner')
+
+        assert repr(link.attorney) == '<Attorney Partner Smith>'
+        assert repr(link) == f'<ProjectAttorney {link.attorney_id} assigner of project {sample_project.id}>'
+
+
+
+class TestJobModel:
+    """Test Job model."""
+
+    def test_defaults_and_done(self, db_session):
+        """A new job is queued; succeeded and failed jobs are done."""
+        from app.models import Job
+        job = Job(kind='export')
+        db_session.add(job)
+        db_session.commit()
+
+        assert (job.status, job.params, job.done) == ('queued', {}, False)
+        assert repr(job) == f'<Job {job.id} export queued>'
+        job.status = 'failed'
+        assert job.done
+
+
 class TestTaskModel:
     """Test Task model behavior."""
 
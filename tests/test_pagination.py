@@ -0,0 +1,211 @@
+"""Tests for app/pagination.py - keyset pagination."""
+import base64
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Project, Task, priority_rank
+from app.pagination import (
+    MAX_PER_PAGE, InvalidCursor, SortKey, decode_cursor, encode_cursor, paginate,
+)
+
+
+def make_projects(db_session, count, **kwargs):
+    """Create and commit `count` active projects named Client 00, Client 01, ..."""
+    projects = [
+        Project(client_name=f'Client {i:02d}', project_name='Matter',
+                assigner='Test Partner', assigned_attorneys='Test Attorney', **kwargs)
+        for i in range(count)
+    ]
+    db_session.add_all(projects)
+    db_session.commit()
+    return projects
+
+
+def walk(statement, sort_keys, per_page, sort_name=''):
+    """Follow next cursors from the first page; return the list of pages."""
+    pages = [paginate(statement, sort_keys, per_page=per_page, sort_name=sort_name)]
+    while pages[-1].has_next:
+        pages.append(paginate(statement, sort_keys, pages[-1].next_cursor,
+                              per_page=per_page, sort_name=sort_name))
+    return pages
+
+
+class TestCursorTokens:
+    """Test encode_cursor()/decode_cursor() round trips and validation."""
+
+    def test_round_trip_preserves_types(self):
+        """Dates, datetimes, strings and ints survive a round trip."""
+        values = [date(2025, 1, 2), datetime(2025, 1, 2, 3, 4, 5, 6), 'Acme', 7]
+        token = encode_cursor('n', values, 'client_name:asc')
+
+        assert decode_cursor(token, 'client_name:asc', 4) == ('n', values)
+
+    def test_token_is_url_safe(self):
+        """Tokens carry no characters that need escaping in a query string."""
+        token = encode_cursor('p', ['???>>>', 1])
+        assert token.replace('-', '').replace('_', '').isalnum()
+
+    @pytest.mark.parametrize('token', ['not-a-cursor', '!!!', 'e30', 'WzFd', ''])
+    def test_rejects_malformed_tokens(self, token):
+        """Garbage, non-JSON and wrongly-shaped payloads are InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
+
+    def test_rejects_unknown_direction(self):
+        """Only next ('n') and previous ('p') cursors exist."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(encode_cursor('x', [1]))
+
+    def test_rejects_unknown_value_type(self):
+        """Tagged values other than date/datetime are rejected."""
+        token = encode_cursor('n', [{'decimal': '1.0'}])
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
+
+    @pytest.mark.parametrize('value', [[1, 2], {'id': 1}])
+    def test_rejects_untagged_containers(self, value):
+        """Lists and untagged objects cannot be bound as sort values."""
+        raw = json.dumps({'d': 'n', 's': '', 'k': [value]}).encode()
+        token = base64.urlsafe_b64encode(raw).decode()
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
+
+    def test_rejects_cursor_from_another_sort(self):
+        """A token made for one sort order is refused by another."""
+        token = encode_cursor('n', ['Acme', 1], 'client_name:asc')
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token, 'client_name:desc', 2)
+
+    def test_rejects_wrong_key_count(self):
+        """The number of values must match the number of sort keys."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(encode_cursor('n', ['Acme']), '', 2)
+
+
+class TestPaginate:
+    """Test paginate() page boundaries and navigation."""
+
+    def test_first_page_without_cursor(self, db_session):
+        """The first page has a next cursor but no previous cursor."""
+        make_projects(db_session, 5)
+
+        page = paginate(select(Project), [SortKey(Project.client_name), SortKey(Project.id)],
+                        per_page=2)
+
+        assert [p.client_name for p in page.items] == ['Client 00', 'Client 01']
+        assert page.has_next
+        assert not page.has_prev
+
+    def test_walks_every_row_once(self, db_session):
+        """Following next cursors visits each row exactly once, in order."""
+        make_projects(db_session, 7)
+
+        pages = walk(select(Project), [SortKey(Project.client_name), SortKey(Project.id)], 3)
+
+        names = [p.client_name for page in pages for p in page.items]
+        assert names == [f'Client {i:02d}' for i in range(7)]
+        assert [len(page.items) for page in pages] == [3, 3, 1]
+        assert not pages[-1].has_next
+        assert all(page.has_prev for page in pages[1:])
+
+    def test_previous_cursor_returns_previous_page(self, db_session):
+        """Going back from page 3 gives page 2, then page 1 without a prev link."""
+        make_projects(db_session, 7)
+        sort_keys = [SortKey(Project.client_name), SortKey(Project.id)]
+        pages = walk(select(Project), sort_keys, 3)
+
+        back = paginate(select(Project), sort_keys, pages[2].prev_cursor, per_page=3)
+        assert back.items == pages[1].items
+        assert back.has_next and back.has_prev
+
+        first = paginate(select(Project), sort_keys, back.prev_cursor, per_page=3)
+        assert first.items == pages[0].items
+        assert not first.has_prev
+        assert first.has_next
+
+    def test_ties_are_split_by_id(self, db_session):
+        """Rows sharing a sort value are neither skipped nor repeated."""
+        projects = [
+            Project(client_name='Same', project_name=f'Matter {i}',
+                    assigner='Test Partner', assigned_attorneys='Test Attorney')
+            for i in range(5)
+        ]
+        db_session.add_all(projects)
+        db_session.commit()
+
+        pages = walk(select(Project), [SortKey(Project.client_name), SortKey(Project.id)], 2)
+
+        ids = [p.id for page in pages for p in page.items]
+        assert ids == sorted(p.id for p in projects)
+
+    def test_mixed_directions(self, db_session):
+        """Each sort key can have its own direction."""
+        make_projects(db_session, 3, priority='low')
+        make_projects(db_session, 3, priority='high')
+        sort_keys = [SortKey(priority_rank(Project.priority), descending=True),
+                     SortKey(Project.id)]
+
+        pages = walk(select(Project), sort_keys, 2)
+
+        rows = [(p.priority, p.id) for page in pages for p in page.items]
+        assert rows == sorted(rows, key=lambda row: (row[0] != 'low', row[1]))
+
+    def test_datetime_and_date_keys(self, db_session):
+        """Date and datetime sort keys round-trip through the cursor."""
+        projects = make_projects(db_session, 4)
+        now = datetime.utcnow()
+        for offset, project in enumerate(projects):
+            project.created_at = now - timedelta(days=offset)
+            db_session.add(Task(project_id=project.id, target_type='self', target_name='Self',
+                                due_date=date.today() + timedelta(days=offset)))
+        db_session.commit()
+
+        by_created = walk(select(Project), [SortKey(Project.created_at, descending=True),
+                                            SortKey(Project.id, descending=True)], 1)
+        by_due = walk(select(Task), [SortKey(Task.due_date), SortKey(Task.id)], 1)
+
+        assert [page.items[0].id for page in by_created] == [p.id for p in projects]
+        assert [page.items[0].project_id for page in by_due] == [p.id for p in projects]
+
+    def test_column_statements_return_tuples(self, db_session):
+        """Selecting columns yields plain tuples without the sort key values."""
+        make_projects(db_session, 2)
+
+        page = paginate(select(Project.client_name, Project.priority),
+                        [SortKey(Project.client_name), SortKey(Project.id)])
+
+        assert page.items == [('Client 00', 'medium'), ('Client 01', 'medium')]
+
+    def test_per_page_is_clamped(self, db_session):
+        """per_page is forced into 1..MAX_PER_PAGE."""
+        make_projects(db_session, 2)
+        sort_keys = [SortKey(Project.id)]
+
+        assert paginate(select(Project), sort_keys, per_page=0).per_page == 1
+        assert paginate(select(Project), sort_keys, per_page=10 ** 6).per_page == MAX_PER_PAGE
+
+    def test_empty_result(self, db_session):
+        """No rows means no cursors."""
+        page = paginate(select(Project), [SortKey(Project.id)])
+
+        assert page.items == []
+        assert not page.has_next and not page.has_prev
+
+    def test_invalid_cursor_raises(self, db_session):
+        """paginate() surfaces bad tokens as InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            paginate(select(Project), [SortKey(Project.id)], 'garbage')
+
+    def test_page_cost_is_one_query(self, db_session, query_counter):
+        """A deep page costs a single query, like the first."""
+        make_projects(db_session, 30)
+        sort_keys = [SortKey(Project.client_name), SortKey(Project.id)]
+        pages = walk(select(Project), sort_keys, 5)
+
+        with query_counter() as counter:
+            paginate(select(Project), sort_keys, pages[-1].prev_cursor, per_page=5)
+
+        assert counter.count == 1
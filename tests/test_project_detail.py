@@ -0,0 +1,83 @@
+"""Tests for app/project_detail.py - the project detail loader."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from werkzeug.exceptions import NotFound
+
+from app.cold_storage import move_to_cold
+from app.models import ColdStatusUpdate, Milestone, StatusUpdate, Task
+from app.project_detail import UPDATE_CHUNK_SIZE, load_project_detail, update_chunk
+
+
+def add_updates(db_session, project, count):
+    start = datetime.utcnow() - timedelta(days=count)
+    db_session.add_all([
+        StatusUpdate(project_id=project.id, notes=f'Update {i}', created_at=start + timedelta(days=i))
+        for i in range(count)
+    ])
+    db_session.commit()
+
+
+class TestLoadProjectDetail:
+    """Test load_project_detail()."""
+
+    def test_splits_milestones_and_orders_tasks(self, app, db_session, sample_project):
+        """Milestones split into upcoming (soonest first) and completed (latest first)."""
+        today = date.today()
+        db_session.add_all([
+            Milestone(project_id=sample_project.id, name='Trial', date=today + timedelta(days=30)),
+            Milestone(project_id=sample_project.id, name='Hearing', date=today + timedelta(days=3)),
+            Milestone(project_id=sample_project.id, name='Filing', date=today - timedelta(days=20),
+                      completed=True),
+            Milestone(project_id=sample_project.id, name='Answer', date=today - timedelta(days=5),
+                      completed=True),
+            Task(project_id=sample_project.id, target_type='self', target_name='Low',
+                 due_date=today, priority='low'),
+            Task(project_id=sample_project.id, target_type='self', target_name='High',
+                 due_date=today, priority='high'),
+            Task(project_id=sample_project.id, target_type='self', target_name='Done',
+                 due_date=today, completed=True, completed_at=datetime.utcnow()),
+        ])
+        db_session.commit()
+
+        with app.test_request_context(f'/projects/{sample_project.id}'):
+            detail = load_project_detail(sample_project.id)
+
+        assert detail.project.id == sample_project.id
+        assert [m.name for m in detail.pending_milestones] == ['Hearing', 'Trial']
+        assert [m.name for m in detail.completed_milestones] == ['Answer', 'Filing']
+        assert [t.target_name for t in detail.pending_tasks] == ['High', 'Low']
+        assert [t.target_name for t in detail.completed_tasks.items] == ['Done']
+        assert detail.updates.items == []
+
+    def test_missing_project_is_404(self, app, db_session):
+        """An unknown id aborts with 404."""
+        with app.test_request_context('/projects/999'), pytest.raises(NotFound):
+            load_project_detail(999)
+
+
+class TestUpdateChunk:
+    """Test update_chunk()."""
+
+    def test_chunks_newest_first(self, db_session, sample_project):
+        """Updates come UPDATE_CHUNK_SIZE at a time, each chunk continuing the last."""
+        add_updates(db_session, sample_project, UPDATE_CHUNK_SIZE + 5)
+
+        first = update_chunk(sample_project)
+        second = update_chunk(sample_project, first.next_cursor)
+
+        assert len(first.items) == UPDATE_CHUNK_SIZE
+        assert first.items[0].notes == f'Update {UPDATE_CHUNK_SIZE + 4}'
+        assert [u.notes for u in second.items] == [f'Update {i}' for i in range(4, -1, -1)]
+        assert not second.has_next
+
+    def test_cold_project_reads_cold_updates(self, db_session, sample_project):
+        """An archived project's updates come from cold storage."""
+        add_updates(db_session, sample_project, 2)
+        move_to_cold(sample_project)
+        db_session.commit()
+
+        chunk = update_chunk(sample_project)
+
+        assert all(isinstance(update, ColdStatusUpdate) for update in chunk.items)
+        assert [u.notes for u in chunk.items] == ['Update 1', 'Update 0']
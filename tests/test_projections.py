@@ -0,0 +1,97 @@
+"""Tests for app/projections.py - task and milestone list read models."""
+from datetime import date, timedelta
+
+from werkzeug.datastructures import MultiDict
+
+from app.models import Milestone, Task
+from app.projections import (
+    ListFilters, MilestoneRow, TaskRow, pending_milestone_page, pending_task_page,
+)
+
+
+def make_milestone(db_session, project, days, **kwargs):
+    milestone = Milestone(project_id=project.id, name='Hearing',
+                          date=date.today() + timedelta(days=days), **kwargs)
+    db_session.add(milestone)
+    db_session.commit()
+    return milestone
+
+
+class TestListFilters:
+    """Test ListFilters.from_args()."""
+
+    def test_reads_all_filters(self):
+        """Attorney, target type and ISO dates are parsed."""
+        filters = ListFilters.from_args(MultiDict({
+            'attorney': ' Jones ', 'target_type': 'client',
+            'start': '2024-01-01', 'end': '2024-02-01',
+        }))
+
+        assert filters == ListFilters('Jones', 'client', date(2024, 1, 1), date(2024, 2, 1))
+
+    def test_bad_or_missing_values_are_ignored(self):
+        """Unparseable dates and missing parameters mean no filter."""
+        filters = ListFilters.from_args(MultiDict({'start': 'yesterday', 'end': ''}))
+
+        assert filters == ListFilters()
+        assert filters.conditions(Task.due_date) == []
+
+
+class TestPendingTaskPage:
+    """Test pending_task_page()."""
+
+    def test_rows_inline_project_fields(self, app, db_session, make_project, make_task):
+        """Rows are slotted TaskRow objects carrying the project's names."""
+        project = make_project('Acme')
+        task = make_task(project, 1, description='Call back')
+        make_task(project, 0, completed=True)
+
+        with app.test_request_context('/tasks/'):
+            page = pending_task_page(ListFilters())
+
+        assert page.items == [TaskRow(
+            id=task.id, project_id=project.id, client_name='Acme', project_name='Matter',
+            target_type='self', target_name='Self', due_date=task.due_date,
+            description='Call back', priority='medium',
+        )]
+        assert not hasattr(page.items[0], '__dict__')
+
+    def test_filters_apply_in_sql(self, app, db_session, make_project, make_task):
+        """Attorney, target type and the due date window narrow the rows."""
+        jones = make_project('Jones Client')
+        smith = make_project('Smith Client', assigned_attorneys='Associate Smith')
+        wanted = make_task(jones, 3, target_type='client')
+        make_task(jones, 3, target_type='self')
+        make_task(jones, 10, target_type='client')
+        make_task(smith, 3, target_type='client')
+
+        filters = ListFilters(attorney='Associate Jones', target_type='client',
+                              start=date.today() + timedelta(days=1),
+                              end=date.today() + timedelta(days=5))
+        with app.test_request_context('/tasks/'):
+            page = pending_task_page(filters)
+
+        assert [row.id for row in page.items] == [wanted.id]
+
+
+class TestPendingMilestonePage:
+    """Test pending_milestone_page()."""
+
+    def test_rows_and_filters(self, app, db_session, make_project):
+        """Milestone rows carry project names; attorney and dates filter them."""
+        jones = make_project('Jones Client')
+        smith = make_project('Smith Client', assigned_attorneys='Associate Smith')
+        soon = make_milestone(db_session, jones, 2, description='Oral argument')
+        make_milestone(db_session, jones, 30)
+        make_milestone(db_session, jones, 2, completed=True)
+        make_milestone(db_session, smith, 2)
+
+        filters = ListFilters(attorney='Associate Jones', end=date.today() + timedelta(days=7))
+        with app.test_request_context('/milestones/'):
+            page = pending_milestone_page(filters)
+
+        assert page.items == [MilestoneRow(
+            id=soon.id, project_id=jones.id, client_name='Jones Client',
+            project_name='Matter', name='Hearing', date=soon.date,
+            description='Oral argument',
+        )]
@@ -0,0 +1,95 @@
+"""Tests for app/query_stats.py - per-request SQL instrumentation."""
+import logging
+
+from flask import Flask
+
+from app import db, query_stats
+
+
+class TestServerTiming:
+    """Test the Server-Timing response header."""
+
+    def test_header_reports_query_count(self, client, sample_project):
+        """Pages that query the database report count and duration."""
+        response = client.get(f'/projects/{sample_project.id}')
+
+        timing = response.headers['Server-Timing']
+        assert timing.startswith('db;dur=')
+        assert 'queries"' in timing
+        count = int(timing.split('desc="')[1].split(' ')[0])
+        assert count > 0
+
+    def test_no_header_without_queries(self, client, db_session):
+        """Responses that never touched the database get no header."""
+        response = client.get('/static/css/style.css')
+
+        assert 'Server-Timing' not in response.headers
+        response.close()
+
+
+class TestSlowQueryLog:
+    """Test slow-query logging."""
+
+    def test_slow_queries_logged_with_endpoint(self, app, client, db_session, caplog, monkeypatch):
+        """Statements over the threshold are logged with the endpoint name."""
+        monkeypatch.setitem(app.config, 'SLOW_QUERY_THRESHOLD_MS', 0)
+
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            client.get('/')
+
+        messages = [r.getMessage() for r in caplog.records if 'Slow query' in r.getMessage()]
+        assert messages
+        assert all(' in dashboard.index: ' in m for m in messages)
+
+    def test_fast_queries_not_logged(self, app, client, db_session, caplog):
+        """Statements under the threshold are not logged."""
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            client.get('/')
+
+        assert not [r for r in caplog.records if 'Slow query' in r.getMessage()]
+
+
+class TestCurrentStats:
+    """Test current_stats()."""
+
+    def test_none_outside_request(self, app, db_session):
+        """Queries run outside a request (CLI, jobs) are not tracked."""
+        import threading
+
+        seen = []
+
+        def run_outside_request():
+            with app.app_context():
+                db.session.execute(db.text('SELECT 1'))
+                seen.append(query_stats.current_stats())
+
+        thread = threading.Thread(target=run_outside_request)
+        thread.start()
+        thread.join()
+
+        assert seen == [None]
+
+    def test_accumulates_within_request(self, app, db_session):
+        """Each statement increments the request's counter."""
+        with app.test_request_context('/'):
+            db.session.execute(db.text('SELECT 1'))
+            db.session.execute(db.text('SELECT 2'))
+            stats = query_stats.current_stats()
+
+        assert stats.count == 2
+        assert stats.duration_ms >= 0
+
+
+class TestInitApp:
+    """Test instrumentation registration."""
+
+    def test_disabled_registers_nothing(self):
+        """QUERY_STATS_ENABLED = False installs no hooks."""
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['QUERY_STATS_ENABLED'] = False
+        db.init_app(app)
+
+        query_stats.init_app(app)
+
+        assert app.after_request_funcs == {}
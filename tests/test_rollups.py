@@ -0,0 +1,227 @@
+"""Tests for app/rollups.py - denormalized project rollups."""
+from datetime import date, datetime, timedelta
+
+from app import db
+from app.models import Milestone, Project, StatusUpdate, Task
+from app.rollups import find_rollup_drift, rebuild_rollups, recompute_rollups
+
+
+class TestRollupMaintenance:
+    """Rollups are recomputed whenever children are flushed."""
+
+    def test_new_project_has_empty_rollups(self, sample_project):
+        """A project without children has zero/None rollups."""
+        assert sample_project.rollup_pending_tasks == 0
+        assert sample_project.rollup_next_task_id is None
+        assert sample_project.rollup_last_update_at is None
+        assert sample_project.rollup_next_milestone_id is None
+
+    def test_adding_tasks_updates_next_task(self, sample_project, db_session, make_task):
+        """Adding tasks updates count, next task id, due date and priority."""
+        make_task(sample_project, 5)
+        soonest = make_task(sample_project, 2, priority='high')
+
+        assert sample_project.rollup_pending_tasks == 2
+        assert sample_project.rollup_next_task_id == soonest.id
+        assert sample_project.rollup_next_task_due == soonest.due_date
+        assert sample_project.rollup_next_task_priority == 'high'
+
+    def test_completing_task_advances_next_task(self, sample_project, db_session, make_task):
+        """Completing the next task moves the rollup to the following one."""
+        first = make_task(sample_project, 1)
+        second = make_task(sample_project, 4)
+
+        first.completed = True
+        db_session.commit()
+
+        assert sample_project.rollup_pending_tasks == 1
+        assert sample_project.rollup_next_task_id == second.id
+
+    def test_snoozing_task_reorders_next_task(self, sample_project, db_session, make_task):
+        """Changing a due date is reflected in the next task rollup."""
+        first = make_task(sample_project, 1)
+        second = make_task(sample_project, 4)
+
+        first.due_date = date.today() + timedelta(days=10)
+        db_session.commit()
+
+        assert sample_project.rollup_next_task_id == second.id
+
+    def test_moving_task_updates_both_projects(self, sample_project, db_session, make_task):
+        """Moving a task to another project recomputes old and new parents."""
+        other = Project(client_name='Other', project_name='Other Matter',
+                        assigner='Self', assigned_attorneys='Someone')
+        db_session.add(other)
+        db_session.commit()
+        task = make_task(sample_project, 3)
+
+        task.project_id = other.id
+        db_session.commit()
+
+        assert sample_project.rollup_pending_tasks == 0
+        assert sample_project.rollup_next_task_id is None
+        assert other.rollup_pending_tasks == 1
+        assert other.rollup_next_task_id == task.id
+
+    def test_deleting_task_updates_rollups(self, sample_project, db_session, make_task):
+        """Deleting a task recomputes its project's rollups."""
+        task = make_task(sample_project, 3)
+
+        db_session.delete(task)
+        db_session.commit()
+
+        assert sample_project.rollup_pending_tasks == 0
+        assert sample_project.rollup_next_task_id is None
+
+    def test_milestone_complete_and_uncomplete(self, sample_project, db_session):
+        """Milestone completion toggles the next milestone rollup."""
+        milestone = Milestone(project_id=sample_project.id, name='Filing',
+                              date=date.today() + timedelta(days=7))
+        db_session.add(milestone)
+        db_session.commit()
+        assert sample_project.rollup_next_milestone_id == milestone.id
+        assert sample_project.rollup_next_milestone_date == milestone.date
+
+        milestone.completed = True
+        db_session.commit()
+        assert sample_project.rollup_next_milestone_id is None
+
+        milestone.completed = False
+        db_session.commit()
+        assert sample_project.rollup_next_milestone_id == milestone.id
+
+    def test_status_update_sets_last_update(self, sample_project, db_session):
+        """Adding a status update records its timestamp."""
+        update = StatusUpdate(project_id=sample_project.id, notes='Progress')
+        db_session.add(update)
+        db_session.commit()
+
+        assert sample_project.rollup_last_update_at == update.created_at
+
+    def test_last_activity_starts_at_creation(self, sample_project):
+        """A new project's last activity is its creation time."""
+        assert sample_project.rollup_last_activity_at == sample_project.created_at
+        assert sample_project.last_activity_at == sample_project.created_at
+
+    def test_last_activity_follows_updates_and_completions(self, sample_project, db_session, make_task):
+        """Status updates and task completions both count as activity."""
+        sample_project.created_at = datetime.utcnow() - timedelta(days=30)
+        db_session.commit()
+        assert sample_project.rollup_last_activity_at == sample_project.created_at
+
+        update = StatusUpdate(project_id=sample_project.id, notes='Progress',
+                              created_at=datetime.utcnow() - timedelta(days=10))
+        db_session.add(update)
+        db_session.commit()
+        assert sample_project.rollup_last_activity_at == update.created_at
+
+        task = make_task(sample_project, 1)
+        assert sample_project.rollup_last_activity_at == update.created_at
+        task.completed = True
+        task.completed_at = datetime.utcnow()
+        db_session.commit()
+        assert sample_project.rollup_last_activity_at == task.completed_at
+        assert sample_project.days_since_update == 0
+
+        task.completed = False
+        task.completed_at = None
+        db_session.commit()
+        assert sample_project.rollup_last_activity_at == update.created_at
+
+    def test_rollups_visible_before_commit(self, sample_project, db_session):
+        """A plain flush also refreshes rollups on loaded projects."""
+        db_session.add(Task(project_id=sample_project.id, target_type='self', target_name='Self',
+                            due_date=date.today()))
+        db_session.flush()
+
+        assert sample_project.rollup_pending_tasks == 1
+
+    def test_recompute_does_not_touch_updated_at(self, sample_project, db_session, make_task):
+        """Recomputing rollups leaves the project's updated_at alone."""
+        sample_project.updated_at = datetime(2020, 1, 1)
+        db_session.commit()
+
+        make_task(sample_project, 1)
+
+        assert sample_project.updated_at == datetime(2020, 1, 1)
+
+
+class TestRecomputeAndDrift:
+    """Explicit recompute, rebuild and drift detection."""
+
+    def test_bulk_sql_write_needs_explicit_recompute(self, sample_project, db_session, make_task):
+        """Bulk SQL bypasses the hooks; recompute_rollups catches up."""
+        make_task(sample_project, 1)
+        db_session.execute(db.update(Task).values(completed=True))
+        db_session.commit()
+        assert find_rollup_drift() == [sample_project.id]
+
+        recompute_rollups(db_session.connection(), [sample_project.id])
+        db_session.commit()
+
+        assert find_rollup_drift() == []
+        assert sample_project.rollup_pending_tasks == 0
+
+    def test_rebuild_rollups_fixes_drift(self, sample_project, db_session, make_task):
+        """rebuild_rollups recomputes every project."""
+        make_task(sample_project, 1)
+        db_session.execute(db.update(Project).values(rollup_pending_tasks=7))
+        db_session.commit()
+        assert find_rollup_drift() == [sample_project.id]
+
+        assert rebuild_rollups() == 1
+
+        assert find_rollup_drift() == []
+        assert sample_project.rollup_pending_tasks == 1
+
+
+class TestRebuildRollupsCommand:
+    """Test the rebuild-rollups CLI command."""
+
+    def test_rebuild_reports_no_drift(self, runner, sample_project):
+        """Clean databases report no drift and rebuild all projects."""
+        result = runner.invoke(args=['rebuild-rollups'])
+
+        assert result.exit_code == 0
+        assert 'No rollup drift found.' in result.output
+        assert 'Rebuilt rollups for 1 project(s).' in result.output
+
+    def test_rebuild_repairs_drift(self, runner, sample_project, db_session):
+        """Drifted projects are listed and repaired."""
+        db_session.execute(db.update(Project).values(rollup_pending_tasks=3))
+        db_session.commit()
+
+        result = runner.invoke(args=['rebuild-rollups'])
+
+        assert f'1 project(s) with drifted rollups: {sample_project.id}' in result.output
+        assert find_rollup_drift() == []
+
+    def test_check_exits_nonzero_on_drift(self, runner, sample_project, db_session):
+        """--check reports drift without repairing it."""
+        db_session.execute(db.update(Project).values(rollup_pending_tasks=3))
+        db_session.commit()
+
+        result = runner.invoke(args=['rebuild-rollups', '--check'])
+
+        assert result.exit_code == 1
+        assert find_rollup_drift() == [sample_project.id]
+
+    def test_check_exits_zero_without_drift(self, runner, sample_project):
+        """--check succeeds when rollups are consistent."""
+        result = runner.invoke(args=['rebuild-rollups', '--check'])
+
+        assert result.exit_code == 0
+        assert 'Rebuilt' not in result.output
+
+
+class TestRegisterListeners:
+    """Test listener registration."""
+
+    def test_register_listeners_is_idempotent(self, app):
+        """Registering twice does not attach the hooks twice."""
+        from sqlalchemy import event
+        from app.rollups import _after_flush, register_listeners
+
+        register_listeners()
+
+        assert event.contains(db.session, 'after_flush', _after_flush)
@@ -0,0 +1,176 @@
+"""Tests for app/schema.py - in-place schema upgrades."""
+from app import db
+from app import schema
+from app.schema import (
+    SCHEMA_VERSION, add_missing_columns, create_missing_indexes, schema_is_current,
+    schema_version, upgrade_database,
+)
+
+
+def run_ddl(db_session, *statements):
+    """Simulate an older database file by running raw DDL.
+
+    Pooled SQLite connections can keep a stale view of a table after
+    ALTER TABLE ... DROP COLUMN, so start from fresh connections afterwards.
+    """
+    for statement in statements:
+        db_session.execute(db.text(statement))
+    db_session.commit()
+    db_session.remove()
+    db.engine.dispose()
+
+
+def explain(sql, **params):
+    """Return the EXPLAIN QUERY PLAN detail lines for `sql`."""
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}'), params).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+class TestAddMissingColumns:
+    """Test add_missing_columns()."""
+
+    def test_no_changes_on_current_schema(self, db_session):
+        """An up-to-date database needs no new columns."""
+        assert add_missing_columns() == []
+
+    def test_adds_dropped_column(self, db_session):
+        """A column missing from an existing table is added back."""
+        run_ddl(db_session, 'ALTER TABLE projects DROP COLUMN rollup_next_milestone_date')
+
+        assert add_missing_columns() == ['projects.rollup_next_milestone_date']
+
+        columns = [c['name'] for c in db.inspect(db.engine).get_columns('projects')]
+        assert 'rollup_next_milestone_date' in columns
+
+    def test_skips_missing_tables(self, db_session):
+        """Tables that do not exist yet are left to create_all()."""
+        run_ddl(db_session, 'DROP TABLE status_updates')
+        try:
+            assert add_missing_columns() == []
+        finally:
+            db.create_all()
+
+
+class TestCreateMissingIndexes:
+    """Test create_missing_indexes()."""
+
+    def test_no_changes_on_current_schema(self, db_session):
+        """An up-to-date database needs no new indexes."""
+        assert create_missing_indexes() == []
+
+    def test_recreates_composite_indexes(self, db_session):
+        """Composite indexes missing from an old database are created."""
+        run_ddl(db_session,
+                'DROP INDEX ix_tasks_project_completed_due',
+                'DROP INDEX ix_status_updates_project_created')
+
+        assert sorted(create_missing_indexes()) == [
+            'ix_status_updates_project_created',
+            'ix_tasks_project_completed_due',
+        ]
+
+    def test_skips_missing_tables(self, db_session):
+        """Indexes of tables that do not exist yet are left to create_all()."""
+        run_ddl(db_session, 'DROP TABLE status_updates')
+        try:
+            assert create_missing_indexes() == []
+        finally:
+            db.create_all()
+
+
+class TestQueryPlans:
+    """The hot per-project queries are served by the composite indexes."""
+
+    def test_pending_tasks_use_composite_index(self, db_session):
+        """Pending tasks for a project are read in due_date order from the index."""
+        plan = explain('SELECT * FROM tasks WHERE project_id = :p AND completed = 0 '
+                       'ORDER BY due_date', p=1)
+        assert 'ix_tasks_project_completed_due' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_pending_milestones_use_composite_index(self, db_session):
+        """Pending milestones for a project are read in date order from the index."""
+        plan = explain('SELECT * FROM milestones WHERE project_id = :p AND completed = 0 '
+                       'ORDER BY date', p=1)
+        assert 'ix_milestones_project_completed_date' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_latest_update_uses_composite_index(self, db_session):
+        """The latest status update for a project is one index seek."""
+        plan = explain('SELECT * FROM status_updates WHERE project_id = :p '
+                       'ORDER BY created_at DESC LIMIT 1', p=1)
+        assert 'ix_status_updates_project_created' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_completed_tasks_page_uses_composite_index(self, db_session):
+        """A page of completed-task history is read in completed_at order from the index."""
+        plan = explain('SELECT * FROM tasks WHERE project_id = :p AND completed = 1 '
+                       'ORDER BY completed_at DESC, id DESC LIMIT 51', p=1)
+        assert 'ix_tasks_project_completed_at' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_attorney_filter_uses_indexes(self, db_session):
+        """Projects for an attorney are an index seek on name, then on the link table."""
+        plan = explain('SELECT project_id FROM project_attorneys JOIN attorneys '
+                       'ON attorneys.id = project_attorneys.attorney_id '
+                       'WHERE attorneys.name = :n AND project_attorneys.role = :r',
+                       n='Jones', r='attorney')
+        assert 'ix_project_attorneys_attorney_role' in plan
+        assert 'SCAN' not in plan
+
+    def test_stale_filter_is_a_range_scan(self, db_session):
+        """"No activity for N days" is a range on the status/last activity index."""
+        plan = explain("SELECT id FROM projects WHERE status = 'active' "
+                       'AND rollup_last_activity_at <= :cutoff', cutoff='2020-01-01')
+        assert 'ix_projects_status_last_activity' in plan
+        assert 'rollup_last_activity_at<?' in plan
+
+
+class TestSchemaVersion:
+    """Test the user_version schema check and upgrade_database()."""
+
+    def test_upgrade_brings_old_database_current(self, db_session):
+        """A database behind SCHEMA_VERSION is current after upgrade_database()."""
+        run_ddl(db_session, 'PRAGMA user_version = 0')
+        assert schema_version() == 0
+        assert not schema_is_current()
+
+        messages = []
+        upgrade_database(echo=messages.append)
+
+        assert schema_version() == SCHEMA_VERSION
+        assert schema_is_current()
+        assert messages == []
+
+    def test_missing_database_file_is_version_zero(self, db_session, monkeypatch, tmp_path):
+        """A database file that does not exist yet has never been upgraded."""
+        monkeypatch.setattr(schema, '_database_file', lambda: str(tmp_path / 'worklist.db'))
+
+        assert schema_version() == 0
+
+    def test_existing_database_file_reports_user_version(self, db_session, monkeypatch, tmp_path):
+        """An existing database file is asked for its recorded version."""
+        run_ddl(db_session, f'PRAGMA user_version = {SCHEMA_VERSION}')
+        database = tmp_path / 'worklist.db'
+        database.touch()
+        monkeypatch.setattr(schema, '_database_file', lambda: str(database))
+
+        assert schema_version() == SCHEMA_VERSION
+
+    def test_upgrade_in_memory_database(self, db_session, monkeypatch):
+        """An in-memory database has no directory to create."""
+        run_ddl(db_session, 'PRAGMA user_version = 0')
+        monkeypatch.setattr(schema, '_database_file', lambda: None)
+
+        upgrade_database(echo=lambda message: None)
+
+        assert schema_is_current()
+
+    def test_upgrade_creates_data_directory(self, db_session, monkeypatch, tmp_path):
+        """upgrade_database() creates the directory of the database file."""
+        data_dir = tmp_path / 'data'
+        monkeypatch.setattr(schema, '_database_file', lambda: str(data_dir / 'worklist.db'))
+
+        upgrade_database(echo=lambda message: None)
+
+        assert data_dir.is_dir()
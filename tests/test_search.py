@@ -0,0 +1,294 @@
+"""Tests for app/search.py - FTS5 full-text search."""
+from datetime import date
+
+from sqlalchemy import create_engine, update
+
+from app import db
+from app.cold_storage import move_to_cold
+from app.models import Milestone, StatusUpdate, Task
+from app.search import (
+    SEARCH_TABLE, build_match_query, rebuild_search_index, search, search_index_needs_rebuild,
+)
+
+
+def index_rows():
+    """Return (rowid, kind, record_id, project_id, title, body) for every index entry."""
+    return db.session.execute(db.text(
+        f'SELECT rowid, kind, record_id, project_id, title, body FROM {SEARCH_TABLE} ORDER BY rowid'
+    )).all()
+
+
+class TestIndexSync:
+    """The triggers keep search_index in step with the source tables."""
+
+    def test_new_rows_are_indexed(self, db_session, make_project):
+        """Inserting a project and its children adds one entry each."""
+        project = make_project(matter_number='2024-077')
+        db_session.add_all([
+            StatusUpdate(project_id=project.id, notes='Filed the provisional'),
+            Task(project_id=project.id, target_type='client', target_name='Jane Client',
+                 due_date=date.today(), description='Sign the declaration'),
+            Milestone(project_id=project.id, name='Office action', date=date.today(),
+                      description='Response due'),
+        ])
+        db_session.commit()
+
+        kinds = {row.kind: row for row in index_rows()}
+        assert set(kinds) == {'project', 'update', 'task', 'milestone'}
+        assert kinds['project'].title == 'Acme Corp: Matter'
+        assert '2024-077' in kinds['project'].body
+        assert kinds['update'].body == 'Filed the provisional'
+        assert kinds['task'].title == 'Jane Client'
+        assert kinds['milestone'].body == 'Response due'
+        assert all(row.project_id == project.id for row in kinds.values())
+        assert kinds['task'].rowid == kinds['task'].record_id * 4 + 2
+
+    def test_updates_replace_the_entry(self, db_session, make_project):
+        """Editing an indexed column re-indexes the row."""
+        project = make_project()
+
+        project.client_name = 'Globex'
+        db_session.commit()
+
+        assert [row.title for row in index_rows()] == ['Globex: Matter']
+        assert search('acme') == []
+        assert len(search('globex')) == 1
+
+    def test_bulk_sql_updates_are_indexed(self, db_session, make_project, make_task):
+        """Bulk UPDATEs that bypass the ORM are still picked up."""
+        project = make_project()
+        make_task(project, description='old words')
+
+        db_session.execute(update(Task).values(description='fresh words'))
+        db_session.commit()
+
+        assert search('old') == []
+        assert search('fresh')[0].kind == 'task'
+
+    def test_unwatched_columns_do_not_reindex(self, db_session, make_project):
+        """Rollup and status writes leave the project entry alone."""
+        project = make_project()
+        before = index_rows()
+
+        project.priority = 'low'
+        project.status = 'archived'
+        db_session.commit()
+
+        assert index_rows() == before
+
+    def test_deletes_remove_entries(self, db_session, make_project):
+        """Deleting a project removes it and its children from the index."""
+        project = make_project()
+        db_session.add(StatusUpdate(project_id=project.id, notes='Gone soon'))
+        db_session.commit()
+
+        db_session.delete(project)
+        db_session.commit()
+
+        assert index_rows() == []
+
+    def test_moving_a_child_updates_its_project(self, db_session, make_project):
+        """Reassigning a task to another project follows it in the index."""
+        first = make_project()
+        second = make_project(client_name='Globex')
+        task = Task(project_id=first.id, target_type='self', target_name='Mover',
+                    due_date=date.today())
+        db_session.add(task)
+        db_session.commit()
+
+        task.project_id = second.id
+        db_session.commit()
+
+        assert search('mover')[0].project_id == second.id
+
+
+class TestRebuild:
+    """Test rebuild_search_index() and the CLI command."""
+
+    def test_rebuild_restores_a_cleared_index(self, db_session, make_project):
+        """Rebuilding re-creates every entry from the source tables."""
+        project = make_project()
+        db_session.add(StatusUpdate(project_id=project.id, notes='Back again'))
+        db_session.commit()
+        expected = index_rows()
+        db_session.execute(db.text(f'DELETE FROM {SEARCH_TABLE}'))
+        db_session.commit()
+
+        assert search_index_needs_rebuild()
+        assert rebuild_search_index() == 2
+        assert index_rows() == expected
+        assert not search_index_needs_rebuild()
+
+    def test_unindexed_cold_history_needs_rebuild(self, db_session, sample_project_with_updates):
+        """Cold rows moved before cold storage was indexed are picked up by a rebuild."""
+        move_to_cold(sample_project_with_updates)
+        db_session.commit()
+        expected = index_rows()
+        db_session.execute(db.text(f"DELETE FROM {SEARCH_TABLE} WHERE kind = 'update'"))
+        db_session.commit()
+
+        assert search_index_needs_rebuild()
+        assert rebuild_search_index() == 3
+        assert index_rows() == expected
+
+    def test_empty_database_needs_no_rebuild(self, db_session):
+        """Nothing to index means nothing to rebuild."""
+        assert not search_index_needs_rebuild()
+
+    def test_rebuild_command(self, runner, sample_project):
+        """flask rebuild-search-index reports how many records it indexed."""
+        result = runner.invoke(args=['rebuild-search-index'])
+
+        assert result.exit_code == 0
+        assert 'Indexed 1 record(s) for search.' in result.output
+
+    def test_init_db_fills_a_new_index(self, runner, app, db_session, make_project):
+        """init-db indexes existing data the first time the index is created."""
+        make_project()
+        db_session.execute(db.text(f'DELETE FROM {SEARCH_TABLE}'))
+        db_session.commit()
+
+        result = runner.invoke(args=['init-db'])
+
+        assert 'Indexed 1 record(s) for search.' in result.output
+        assert len(search('acme')) == 1
+
+    def test_init_db_skips_rebuild_when_current(self, runner, sample_project):
+        """init-db leaves an up-to-date index alone."""
+        result = runner.invoke(args=['init-db'])
+
+        assert 'for search' not in result.output
+
+    def test_non_sqlite_engines_are_skipped(self):
+        """The DDL hooks do nothing on other dialects."""
+        from app.search import _create_search_index, _drop_search_index
+
+        class FakeDialect:
+            name = 'postgresql'
+
+        class FakeConnection:
+            dialect = FakeDialect()
+
+            def exec_driver_sql(self, statement):
+                raise AssertionError('should not run DDL')
+
+        _create_search_index(db.metadata, FakeConnection())
+        _drop_search_index(db.metadata, FakeConnection())
+
+    def test_drop_all_removes_the_index(self, tmp_path):
+        """drop_all() drops search_index along with the tables."""
+        engine = create_engine(f'sqlite:///{tmp_path / "drop.db"}')
+        db.metadata.create_all(engine)
+        db.metadata.drop_all(engine)
+
+        with engine.connect() as connection:
+            # sqlite_sequence (for AUTOINCREMENT) is internal and cannot be dropped
+            names = connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE name != 'sqlite_sequence'"
+            ).scalars().all()
+        assert names == []
+
+
+class TestBuildMatchQuery:
+    """Test conversion of user input into FTS5 syntax."""
+
+    def test_words_become_quoted_prefixes(self):
+        """Each word must match, as a prefix."""
+        assert build_match_query('acme pat') == '"acme"* "pat"*'
+
+    def test_operators_and_quotes_are_neutralized(self):
+        """FTS5 syntax in user input is treated as plain text."""
+        assert build_match_query('a OR "b" NEAR(c)') == '"a"* "OR"* "b"* "NEAR(c)"*'
+
+    def test_blank_input(self):
+        """Whitespace or bare quotes give an empty query."""
+        assert build_match_query('  " ') == ''
+
+
+class TestSearch:
+    """Test ranking, highlighting and escaping of results."""
+
+    def test_matches_every_source(self, db_session, make_project):
+        """Notes, task descriptions, milestones and project fields are searchable."""
+        project = make_project(matter_number='M-42')
+        db_session.add_all([
+            StatusUpdate(project_id=project.id, notes='Depositions scheduled'),
+            Task(project_id=project.id, target_type='self', target_name='Self',
+                 due_date=date.today(), description='Prepare deposition outline'),
+            Milestone(project_id=project.id, name='Deposition day', date=date.today()),
+        ])
+        db_session.commit()
+
+        assert {r.kind for r in search('deposition')} == {'update', 'task', 'milestone'}
+        assert search('M-42')[0].kind == 'project'
+        assert search('jones')[0].kind == 'project'
+
+    def test_title_matches_rank_first(self, db_session, make_project):
+        """A hit in the title outranks the same word in a body."""
+        project = make_project(client_name='Initech')
+        db_session.add(StatusUpdate(project_id=project.id, notes='Initech called about Initech'))
+        db_session.commit()
+
+        results = search('initech')
+
+        assert [r.kind for r in results] == ['project', 'update']
+        assert results[0].rank < results[1].rank
+
+    def test_snippets_are_highlighted_and_escaped(self, db_session, make_project):
+        """Matched words are wrapped in <mark>; source HTML is escaped."""
+        project = make_project()
+        db_session.add(StatusUpdate(project_id=project.id, notes='<script>x</script> patent filed'))
+        db_session.commit()
+
+        result = [r for r in search('patent') if r.kind == 'update'][0]
+
+        assert '<mark>patent</mark>' in result.snippet
+        assert '&lt;script&gt;' in result.snippet
+        assert '<script>' not in result.snippet
+        assert result.client_name == 'Acme Corp'
+        assert result.project_status == 'active'
+
+    def test_all_words_must_match(self, db_session, make_project):
+        """Multiple words narrow the results."""
+        make_project()
+        make_project(client_name='Acme Labs', project_name='Trademark')
+
+        assert len(search('acme')) == 2
+        assert len(search('acme trademark')) == 1
+
+    def test_limit_is_clamped(self, db_session, make_project):
+        """limit is forced into 1..MAX_LIMIT."""
+        for i in range(3):
+            make_project(project_name=f'Matter {i}')
+
+        assert len(search('acme', limit=0)) == 1
+        assert len(search('acme', limit=10 ** 6)) == 3
+
+    def test_empty_query_returns_nothing(self, db_session, make_project):
+        """No searchable words means no query at all."""
+        make_project()
+
+        assert search('"') == []
+
+    def test_as_dict(self, db_session, make_project):
+        """Results serialize to plain JSON-able values."""
+        make_project()
+
+        result = search('acme')[0].as_dict()
+
+        assert result['kind'] == 'project'
+        assert result['title'] == '<mark>Acme</mark> Corp: Matter'
+        assert isinstance(result['rank'], float)
+
+
+class TestRegisterListeners:
+    """Test listener registration."""
+
+    def test_register_listeners_is_idempotent(self, app):
+        """Registering twice does not attach the DDL hooks twice."""
+        from sqlalchemy import event
+        from app.search import _create_search_index, register_listeners
+
+        register_listeners()
+
+        assert event.contains(db.metadata, 'after_create', _create_search_index)
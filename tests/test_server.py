@@ -0,0 +1,78 @@
+"""Tests for app/server.py - production worker sizing and fork safety."""
+import os
+import runpy
+from pathlib import Path
+
+import pytest
+
+from app import db, server
+
+ROOT = Path(__file__).parent.parent
+
+
+class TestWorkerSizing:
+    """Test worker_count() and thread_count()."""
+
+    def test_workers_derived_from_cpus(self, monkeypatch):
+        """Two workers per CPU plus one by default."""
+        monkeypatch.delenv('WORKLIST_WORKERS', raising=False)
+
+        assert server.worker_count(cpus=4) == 9
+        assert server.worker_count() == 2 * (os.cpu_count() or 1) + 1
+
+    def test_workers_from_environment(self, monkeypatch):
+        """WORKLIST_WORKERS overrides the derived count."""
+        monkeypatch.setenv('WORKLIST_WORKERS', '3')
+
+        assert server.worker_count(cpus=4) == 3
+
+    def test_threads(self, monkeypatch):
+        """Two threads per worker plus one per live stream unless WORKLIST_THREADS says otherwise."""
+        monkeypatch.delenv('WORKLIST_THREADS', raising=False)
+        monkeypatch.setattr(server.Config, 'LIVE_MAX_STREAMS', 4)
+        assert server.thread_count() == 6
+        assert server.thread_count(live_streams=0) == 2
+
+        monkeypatch.setenv('WORKLIST_THREADS', '8')
+        assert server.thread_count() == 8
+
+    def test_gunicorn_config(self, monkeypatch):
+        """gunicorn.conf.py preloads the app and uses the derived sizing."""
+        monkeypatch.setenv('WORKLIST_DASHBOARD_CACHE', 'memory')
+        monkeypatch.setenv('WORKLIST_WORKERS', '5')
+
+        settings = runpy.run_path(str(ROOT / 'gunicorn.conf.py'))
+
+        assert settings['preload_app'] is True
+        assert settings['workers'] == 5
+        assert settings['worker_class'] == 'gthread'
+
+
+class TestForkSafety:
+    """Forked processes never share pooled SQLite connections with their parent."""
+
+    def test_reset_pools_replaces_engine_pool(self, app):
+        """_reset_pools() gives every registered engine a new, empty pool."""
+        with app.app_context():
+            pool = db.engine.pool
+
+            server._reset_pools()
+
+            assert db.engine.pool is not pool
+            assert db.session.execute(db.text('SELECT 1')).scalar() == 1
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+    def test_forked_child_starts_with_new_pool(self, app):
+        """The at-fork hook runs in the child, leaving the parent's pool alone."""
+        with app.app_context():
+            pool_id = id(db.engine.pool)
+            db.session.execute(db.text('SELECT 1'))
+            db.session.remove()
+
+            pid = os.fork()
+            if pid == 0:  # child process
+                os._exit(0 if id(db.engine.pool) != pool_id else 1)
+            _, status = os.waitpid(pid, 0)
+
+            assert os.waitstatus_to_exitcode(status) == 0
+            assert id(db.engine.pool) == pool_id
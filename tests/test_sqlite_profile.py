@@ -0,0 +1,78 @@
+"""Tests for app/sqlite_profile.py - per-connection SQLite pragmas."""
+import sqlite3
+
+from flask import Flask
+
+from app import db, sqlite_profile
+
+
+def make_app(uri, pragmas):
+    """Create a bare app bound to `uri` with the given pragmas."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLITE_PRAGMAS'] = pragmas
+    db.init_app(app)
+    sqlite_profile.init_app(app)
+    return app
+
+
+def pragma(app, name):
+    with app.app_context():
+        with db.engine.connect() as connection:
+            return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+
+class TestApplyPragmas:
+    """Test apply_pragmas()."""
+
+    def test_sets_each_pragma(self, tmp_path):
+        """Every configured pragma is applied to the raw connection."""
+        connection = sqlite3.connect(tmp_path / 'raw.db')
+
+        sqlite_profile.apply_pragmas(connection, {'journal_mode': 'WAL', 'busy_timeout': 2500})
+
+        assert connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert connection.execute('PRAGMA busy_timeout').fetchone()[0] == 2500
+        connection.close()
+
+
+class TestInitApp:
+    """Test the connect hook registration."""
+
+    def test_test_profile_applied_to_app_engine(self, app):
+        """The test suite's engine runs with the test profile."""
+        assert pragma(app, 'synchronous') == 0
+        assert pragma(app, 'busy_timeout') == 1000
+
+    def test_production_profile_enables_wal(self, tmp_path):
+        """The production profile switches file databases to WAL."""
+        import config
+        app = make_app(f"sqlite:///{tmp_path / 'prod.db'}",
+                       config.SQLITE_PROFILES['production']['pragmas'])
+
+        assert pragma(app, 'journal_mode') == 'wal'
+        assert pragma(app, 'synchronous') == 1
+        assert pragma(app, 'busy_timeout') == 5000
+
+    def test_no_pragmas_leaves_defaults(self, tmp_path):
+        """Without configured pragmas no hook is installed."""
+        app = make_app(f"sqlite:///{tmp_path / 'plain.db'}", {})
+
+        assert pragma(app, 'journal_mode') == 'delete'
+
+    def test_non_sqlite_engine_skipped(self, monkeypatch):
+        """Pragmas are only applied to SQLite engines."""
+        from sqlalchemy import event
+
+        listened = []
+        monkeypatch.setattr(event, 'listens_for', lambda *args: listened.append(args))
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLITE_PRAGMAS'] = {'synchronous': 'OFF'}
+        db.init_app(app)
+        with app.app_context():
+            monkeypatch.setattr(db.engine.dialect, 'name', 'postgresql')
+
+        sqlite_profile.init_app(app)
+
+        assert listened == []
@@ -0,0 +1,67 @@
+"""Tests for app/validators.py - rules shared by the forms and the importer."""
+from datetime import date
+
+from app.validators import validate_project, validate_task, validate_update
+
+PROJECT = {
+    'client_name': ' Acme Corp ', 'project_name': 'Patent Application', 'assigner': 'Partner Smith',
+    'assigned_attorneys': 'Associate Jones', 'priority': 'high',
+}
+
+
+class TestValidateProject:
+    """Test validate_project()."""
+
+    def test_valid(self):
+        """Values are stripped; blank optional fields become None."""
+        values, errors = validate_project({**PROJECT, 'matter_number': ' ', 'estimated_hours': 12})
+
+        assert errors == []
+        assert values['client_name'] == 'Acme Corp'
+        assert values['matter_number'] is None
+        assert values['estimated_hours'] == 12.0
+        assert 'actual_hours' not in values
+
+    def test_errors_in_form_order(self):
+        """Every missing or bad field is reported."""
+        _, errors = validate_project({'priority': 'urgent', 'estimated_hours': 'ten'})
+
+        assert errors == [
+            'Client name is required.', 'Project name is required.', 'Assigner is required.',
+            'Assigned attorneys is required.', 'Priority must be high, medium, or low.',
+            'Estimated hours must be a valid number.',
+        ]
+
+    def test_actual_hours(self):
+        """Actual hours are only read when asked for."""
+        values, errors = validate_project({**PROJECT, 'actual_hours': '-1'}, with_actual_hours=True)
+
+        assert errors == ['Actual hours cannot be negative.']
+        assert values['actual_hours'] == -1.0
+
+
+class TestValidateTask:
+    """Test validate_task()."""
+
+    def test_defaults(self):
+        """Target type and priority default as on the form."""
+        values, errors = validate_task({'target_name': 'Bob', 'due_date': '2026-03-01'})
+
+        assert errors == []
+        assert values == {'target_type': 'self', 'target_name': 'Bob', 'due_date': date(2026, 3, 1),
+                          'description': None, 'priority': 'medium'}
+
+    def test_errors(self):
+        """Bad choices and dates are reported."""
+        _, errors = validate_task({'target_type': 'judge', 'priority': 'urgent', 'due_date': '03/01/2026'})
+
+        assert errors == ['Target name is required.', 'Invalid target type.', 'Invalid priority.',
+                          'Due date must be a valid date (YYYY-MM-DD).']
+
+
+class TestValidateUpdate:
+    """Test validate_update()."""
+
+    def test_notes_required(self):
+        assert validate_update({'notes': ' Filed '}) == ({'notes': 'Filed'}, [])
+        assert validate_update({})[1] == ['Status update notes are required.']
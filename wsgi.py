@@ -0,0 +1,9 @@
+"""WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+run.py starts the single-process development server instead.
+"""
+from app import create_app
+
+app = create_app()